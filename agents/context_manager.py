@@ -21,6 +21,7 @@ from langchain_core.messages import (
 )
 import tiktoken
 import logging
+import os
 
 from agents.utils import get_llm
 
@@ -32,6 +33,14 @@ MAX_MESSAGES = 10  # Maximum messages in context (excluding system)
 MAX_TOOL_RESULT_CHARS = 12000  # Truncate long tool results (increased for troubleshooting KB with images)
 CHARS_PER_TOKEN_ESTIMATE = 4  # Rough estimate for non-tiktoken
 
+# Prompt layout for domain agents:
+# - "prefix_stable": system + frozen summaries first, history trimmed in whole
+#   blocks so the token prefix only changes every PROMPT_TRIM_BLOCK messages
+#   (lets llama.cpp/vLLM reuse cached KV for the system prompt and tools)
+# - "sliding": legacy per-message sliding window
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "prefix_stable")
+PROMPT_TRIM_BLOCK = int(os.getenv("PROMPT_TRIM_BLOCK", "4"))
+
 
 def estimate_tokens(text: str) -> int:
     """
@@ -182,6 +191,118 @@ def apply_sliding_window(
     return final_messages
 
 
+def _truncate_if_tool_result(msg: BaseMessage) -> BaseMessage:
+    if isinstance(msg, ToolMessage) and len(msg.content or "") > MAX_TOOL_RESULT_CHARS:
+        return ToolMessage(
+            content=truncate_tool_result(msg.content),
+            tool_call_id=msg.tool_call_id,
+            name=getattr(msg, 'name', None)
+        )
+    return msg
+
+
+def apply_prefix_stable_window(
+    messages: List[BaseMessage],
+    max_tokens: int = MAX_CONTEXT_TOKENS,
+    max_messages: int = MAX_MESSAGES,
+    block_size: int = PROMPT_TRIM_BLOCK,
+) -> List[BaseMessage]:
+    """
+    Trim history in coarse, aligned blocks so consecutive turns share a prefix.
+
+    Unlike apply_sliding_window, the window start only moves in multiples of
+    ``block_size`` counted from the start of the conversation. Between moves
+    new turns are purely appended, so the server-side KV cache for everything
+    before them (system prompt, tool schemas, frozen summary, older turns)
+    stays valid.
+
+    Strategy:
+    1. System messages (e.g. compress_if_needed summaries) go first, untouched
+    2. Pick the earliest block-aligned start that fits max_messages/max_tokens
+    3. Never start on a ToolMessage whose tool call was trimmed away
+
+    Args:
+        messages: List of messages to process
+        max_tokens: Maximum tokens to allow
+        max_messages: Maximum number of non-system messages
+        block_size: Number of messages dropped at a time
+
+    Returns:
+        Trimmed list of messages
+    """
+    if not messages:
+        return messages
+
+    system_messages = [m for m in messages if isinstance(m, SystemMessage)]
+    other_messages = [
+        _truncate_if_tool_result(m) for m in messages if not isinstance(m, SystemMessage)
+    ]
+
+    system_tokens = sum(estimate_message_tokens(m) for m in system_messages)
+    remaining_tokens = max(max_tokens - system_tokens, 500)
+    block_size = max(1, block_size)
+
+    # Suffix token sums, so fitting each candidate start is O(1)
+    suffix_tokens = [0] * (len(other_messages) + 1)
+    for i in range(len(other_messages) - 1, -1, -1):
+        suffix_tokens[i] = suffix_tokens[i + 1] + estimate_message_tokens(other_messages[i])
+
+    last = len(other_messages) - 1
+    start = 0
+    while start < last and (
+        len(other_messages) - start > max_messages or suffix_tokens[start] > remaining_tokens
+    ):
+        start = min(start + block_size, last)
+
+    # Orphaned tool results (their AIMessage was trimmed) are rejected by the server
+    while start < last and isinstance(other_messages[start], ToolMessage):
+        start += 1
+
+    result_messages = other_messages[start:]
+    if start > 0:
+        logger.info(
+            f"Prefix-stable context: kept {len(result_messages)} of {len(other_messages)} messages "
+            f"(~{suffix_tokens[start] + system_tokens} tokens, block={block_size})"
+        )
+
+    return system_messages + result_messages
+
+
+def build_agent_messages(
+    system_prompt: str,
+    messages: List[BaseMessage],
+    max_tokens: int = MAX_CONTEXT_TOKENS,
+    max_messages: int = MAX_MESSAGES,
+) -> List:
+    """
+    Assemble the prompt for a domain agent according to PROMPT_LAYOUT.
+
+    Args:
+        system_prompt: System prompt for the agent
+        messages: Conversation history
+        max_tokens: Maximum tokens for history
+        max_messages: Maximum history messages
+
+    Returns:
+        Message list ready for LLM invocation
+    """
+    if PROMPT_LAYOUT == "prefix_stable":
+        managed_messages = apply_prefix_stable_window(
+            messages,
+            max_tokens=max_tokens,
+            max_messages=max_messages,
+        )
+    else:
+        managed_messages = apply_sliding_window(
+            messages,
+            max_tokens=max_tokens,
+            max_messages=max_messages,
+            keep_system=False
+        )
+
+    return [("system", system_prompt)] + managed_messages
+
+
 def prepare_messages_for_agent(
     messages: List[BaseMessage],
     system_prompt: str,
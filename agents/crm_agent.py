@@ -1,7 +1,7 @@
 from langchain_core.messages import SystemMessage
 from agents.state import AgentState
-from agents.utils import get_llm, SPEECH_FORMAT_INSTRUCTION
-from agents.context_manager import apply_sliding_window
+from agents.utils import get_llm_with_tools, prompt_cache_kwargs, SPEECH_FORMAT_INSTRUCTION
+from agents.context_manager import build_agent_messages
 from tools.crm_tools import (
     get_leads,
     predict_churn,
@@ -21,19 +21,19 @@ Handle leads, opportunities, customer data, and churn prediction. Use tools for
 """
 
 def crm_agent_node(state: AgentState):
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(CRM_TOOLS)
+    llm_with_tools = get_llm_with_tools(CRM_TOOLS)
     
     # Apply context management
-    managed_messages = apply_sliding_window(
+    messages = build_agent_messages(
+        CRM_SYSTEM_PROMPT,
         state["messages"],
         max_tokens=6000,
         max_messages=8,
-        keep_system=False
     )
     
-    response = llm_with_tools.invoke([
-        ("system", CRM_SYSTEM_PROMPT),
-    ] + managed_messages)
+    response = llm_with_tools.invoke(
+        messages,
+        **prompt_cache_kwargs(state.get("session_id")),
+    )
     
     return {"messages": [response], "current_agent": "crm_agent"}
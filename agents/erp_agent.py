@@ -1,7 +1,7 @@
 from langchain_core.messages import SystemMessage
 from agents.state import AgentState
-from agents.utils import get_llm, SPEECH_FORMAT_INSTRUCTION
-from agents.context_manager import apply_sliding_window
+from agents.utils import get_llm_with_tools, prompt_cache_kwargs, SPEECH_FORMAT_INSTRUCTION
+from agents.context_manager import build_agent_messages
 from tools.erp_tools import (
     get_purchase_orders,
     get_inventory_levels,
@@ -43,20 +43,20 @@ def erp_agent_node(state: AgentState):
     """
     ERP Agent node execution with context management.
     """
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(ERP_TOOLS)
+    llm_with_tools = get_llm_with_tools(ERP_TOOLS)
     
     # Apply context management to prevent overflow
-    managed_messages = apply_sliding_window(
+    messages = build_agent_messages(
+        ERP_SYSTEM_PROMPT,
         state["messages"],
         max_tokens=6000,  # Leave room for response
         max_messages=8,
-        keep_system=False
     )
     
-    response = llm_with_tools.invoke([
-        ("system", ERP_SYSTEM_PROMPT),
-    ] + managed_messages)
+    response = llm_with_tools.invoke(
+        messages,
+        **prompt_cache_kwargs(state.get("session_id")),
+    )
     
     return {
         "messages": [response],
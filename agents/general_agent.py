@@ -1,8 +1,8 @@
 """General agent for cross-domain queries and general assistance."""
 from langchain_core.messages import SystemMessage
 from agents.state import AgentState
-from agents.utils import get_llm, SPEECH_FORMAT_INSTRUCTION
-from agents.context_manager import apply_sliding_window
+from agents.utils import get_llm_with_tools, prompt_cache_kwargs, SPEECH_FORMAT_INSTRUCTION
+from agents.context_manager import build_agent_messages
 from tools.rag_tools import search_knowledge_base
 
 GENERAL_TOOLS = [
@@ -28,19 +28,19 @@ def general_agent_node(state: AgentState):
     """
     General Agent node with context management.
     """
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(GENERAL_TOOLS)
+    llm_with_tools = get_llm_with_tools(GENERAL_TOOLS)
     
-    managed_messages = apply_sliding_window(
+    messages = build_agent_messages(
+        GENERAL_SYSTEM_PROMPT,
         state["messages"],
         max_tokens=6000,
         max_messages=8,
-        keep_system=False
     )
     
-    response = llm_with_tools.invoke([
-        ("system", GENERAL_SYSTEM_PROMPT),
-    ] + managed_messages)
+    response = llm_with_tools.invoke(
+        messages,
+        **prompt_cache_kwargs(state.get("session_id")),
+    )
     
     return {
         "messages": [response],
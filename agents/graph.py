@@ -1,5 +1,4 @@
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from agents.state import AgentState
 from agents.router import router_node, route_decision
 from agents.erp_agent import erp_agent_node, ERP_TOOLS
@@ -9,6 +8,7 @@ from agents.oa_agent import oa_agent_node, OA_TOOLS
 from agents.mold_agent import mold_agent_node, MOLD_TOOLS
 from agents.general_agent import general_agent_node, GENERAL_TOOLS
 from agents.react_node import react_loop
+from agents.tool_executor import execute_tool_calls
 from langchain_core.messages import AIMessage, BaseMessage
 import logging
 
@@ -38,7 +38,14 @@ for tool in ALL_TOOLS:
         seen.add(tool.name)
         UNIQUE_TOOLS.append(tool)
 
-tools_node = ToolNode(UNIQUE_TOOLS)
+TOOLS_BY_NAME = {tool.name: tool for tool in UNIQUE_TOOLS}
+
+
+def tools_node(state: AgentState):
+    """Execute the tool calls of the last AI message concurrently."""
+    last_message = state["messages"][-1]
+    tool_calls = getattr(last_message, "tool_calls", None) or []
+    return {"messages": execute_tool_calls(tool_calls, TOOLS_BY_NAME)}
 
 def router_node_with_hooks(state: AgentState):
     """Router node with lifecycle hooks."""
@@ -63,8 +70,8 @@ def tools_node_with_hooks(state: AgentState):
     # Run BEFORE_TOOL_CALL hooks
     state = _hook_runner.run_sync(HookEvent.BEFORE_TOOL_CALL, state)
 
-    # Execute tools
-    result = tools_node.invoke(state)
+    # Execute tools (all calls from one message run concurrently)
+    result = tools_node(state)
 
     # Merge result into state
     if isinstance(result, dict):
@@ -169,9 +176,8 @@ app = workflow.compile()
 
 def react_node_wrapper(state: AgentState):
     """Execute the ReAct loop using all available tools."""
-    tool_objects = {tool.name: tool for tool in UNIQUE_TOOLS}
     tool_names = [tool.name for tool in UNIQUE_TOOLS]
-    return react_loop(state=state, available_tools=tool_names, tool_objects=tool_objects)
+    return react_loop(state=state, available_tools=tool_names, tool_objects=TOOLS_BY_NAME)
 
 
 react_workflow = StateGraph(AgentState)
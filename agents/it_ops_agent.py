@@ -1,7 +1,7 @@
 from langchain_core.messages import SystemMessage
 from agents.state import AgentState
-from agents.utils import get_llm, SPEECH_FORMAT_INSTRUCTION
-from agents.context_manager import apply_sliding_window
+from agents.utils import get_llm_with_tools, prompt_cache_kwargs, SPEECH_FORMAT_INSTRUCTION
+from agents.context_manager import build_agent_messages
 from tools.it_ops_tools import (
     query_system_logs,
     get_active_alerts,
@@ -18,18 +18,18 @@ Handle system status, troubleshooting, logs, and incidents. Use tools for data.
 """
 
 def it_ops_agent_node(state: AgentState):
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(IT_OPS_TOOLS)
+    llm_with_tools = get_llm_with_tools(IT_OPS_TOOLS)
     
-    managed_messages = apply_sliding_window(
+    messages = build_agent_messages(
+        IT_OPS_SYSTEM_PROMPT,
         state["messages"],
         max_tokens=6000,
         max_messages=8,
-        keep_system=False
     )
     
-    response = llm_with_tools.invoke([
-        ("system", IT_OPS_SYSTEM_PROMPT),
-    ] + managed_messages)
+    response = llm_with_tools.invoke(
+        messages,
+        **prompt_cache_kwargs(state.get("session_id")),
+    )
     
     return {"messages": [response], "current_agent": "it_ops_agent"}
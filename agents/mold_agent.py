@@ -11,8 +11,8 @@ image and document analysis.
 import os
 from langchain_core.messages import SystemMessage, AIMessage, ToolMessage, HumanMessage
 from agents.state import AgentState
-from agents.utils import get_llm, SPEECH_FORMAT_INSTRUCTION
-from agents.context_manager import apply_sliding_window
+from agents.utils import get_llm_with_tools, prompt_cache_kwargs, SPEECH_FORMAT_INSTRUCTION
+from agents.context_manager import build_agent_messages
 import uuid
 from tools.troubleshooting_tools import (
     search_troubleshooting_kb,
@@ -93,9 +93,9 @@ VLM_ENHANCEMENT = """
 - `analyze_image_realtime`: Analyze defect images (15-30s)
 - `analyze_document_realtime`: Analyze PDF/Excel reports
 - `compare_images`: Compare images with historical cases
-- `find_similar_defects`: Analyze image + search similar cases
+- `find_similar_defects`: Visual match of an image against all case images (<1s); describe=true adds a VLM description in the background
 
-For image queries: analyze_image_realtime → search_troubleshooting_kb → compare_images"""
+For image queries: find_similar_defects first; analyze_image_realtime only when a description is needed"""
 
 # Build final system prompt
 # Note: SPEECH instruction is now integrated into MOLD_SYSTEM_PROMPT_BASE
@@ -127,19 +127,19 @@ def _extract_user_query(messages) -> str:
 
 def mold_agent_node(state: AgentState):
     """Mold service agent node for LangGraph"""
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(MOLD_TOOLS)
+    llm_with_tools = get_llm_with_tools(MOLD_TOOLS)
 
-    managed_messages = apply_sliding_window(
+    messages = build_agent_messages(
+        MOLD_SYSTEM_PROMPT,
         state["messages"],
         max_tokens=4000,
         max_messages=6,
-        keep_system=False
     )
 
-    response = llm_with_tools.invoke([
-        ("system", MOLD_SYSTEM_PROMPT),
-    ] + managed_messages)
+    response = llm_with_tools.invoke(
+        messages,
+        **prompt_cache_kwargs(state.get("session_id")),
+    )
 
     # If the LLM skipped tool calling on the first pass (no prior ToolMessage),
     # force a search_troubleshooting_kb call so the frontend always gets card data.
@@ -1,7 +1,7 @@
 from langchain_core.messages import SystemMessage
 from agents.state import AgentState
-from agents.utils import get_llm, SPEECH_FORMAT_INSTRUCTION
-from agents.context_manager import apply_sliding_window
+from agents.utils import get_llm_with_tools, prompt_cache_kwargs, SPEECH_FORMAT_INSTRUCTION
+from agents.context_manager import build_agent_messages
 from tools.oa_tools import (
     draft_email,
     schedule_meeting,
@@ -18,18 +18,18 @@ Handle emails, documents, scheduling, and approvals. Use tools for actions.
 """
 
 def oa_agent_node(state: AgentState):
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(OA_TOOLS)
+    llm_with_tools = get_llm_with_tools(OA_TOOLS)
     
-    managed_messages = apply_sliding_window(
+    messages = build_agent_messages(
+        OA_SYSTEM_PROMPT,
         state["messages"],
         max_tokens=6000,
         max_messages=8,
-        keep_system=False
     )
     
-    response = llm_with_tools.invoke([
-        ("system", OA_SYSTEM_PROMPT),
-    ] + managed_messages)
+    response = llm_with_tools.invoke(
+        messages,
+        **prompt_cache_kwargs(state.get("session_id")),
+    )
     
     return {"messages": [response], "current_agent": "oa_agent"}
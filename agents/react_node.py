@@ -9,6 +9,7 @@ import logging
 import os
 import re
 import time
+import uuid
 from typing import Any, Dict, List, Optional, Literal
 
 from pydantic import BaseModel, Field
@@ -16,6 +17,7 @@ from langchain_core.messages import HumanMessage, AIMessage
 
 from agents.state import AgentState, ReasoningStep
 from agents.utils import get_llm
+from agents.tool_executor import execute_tool_calls
 
 logger = logging.getLogger(__name__)
 
@@ -195,6 +197,9 @@ def execute_tool(tool_name: str, tool_args: Dict[str, Any], available_tools: Dic
     """
     Execute a tool by name with given arguments.
 
+    Runs through the shared tool executor, so the call gets the same
+    per-tool timeout and latency metrics as graph tool calls.
+
     Args:
         tool_name: Name of the tool to execute
         tool_args: Arguments for the tool
@@ -206,13 +211,10 @@ def execute_tool(tool_name: str, tool_args: Dict[str, Any], available_tools: Dic
     if tool_name not in available_tools:
         return f"Error: Tool '{tool_name}' not found"
 
-    tool = available_tools[tool_name]
-    try:
-        result = tool.invoke(tool_args)
-        return str(result) if result is not None else "No result"
-    except Exception as exc:
-        logger.error("Tool execution failed for %s: %s", tool_name, exc)
-        return f"Error executing {tool_name}: {str(exc)}"
+    tool_call = {"name": tool_name, "args": tool_args, "id": f"react_{uuid.uuid4().hex[:8]}"}
+    message = execute_tool_calls([tool_call], available_tools)[0]
+    # Errors come back already in ToolNode's "Error: ... Please fix your mistakes." form
+    return str(message.content) if message.content not in (None, "") else "No result"
 
 
 def react_loop(
@@ -60,6 +60,26 @@ DOMAIN_TO_AGENT_MAP = {
 }
 
 
+_router_chain = None
+
+
+def _get_router_chain():
+    """Build the prompt | structured-output chain once per process."""
+    global _router_chain
+    if _router_chain is None:
+        llm = get_llm(temperature=0.1) # Low temp for classification
+
+        # Qwen supports function calling, so we use with_structured_output(RouteDecision)
+        structured_llm = llm.with_structured_output(RouteDecision)
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", ROUTER_SYSTEM_PROMPT),
+            ("placeholder", "{messages}"),
+        ])
+        _router_chain = prompt | structured_llm
+    return _router_chain
+
+
 def router_node(state: AgentState):
     """
     Analyzes the latest message and decides the next agent.
@@ -90,14 +110,8 @@ def router_node(state: AgentState):
                 "context": merged_context,
             }
 
-    # Standard LLM-based routing
-    llm = get_llm(temperature=0.1) # Low temp for classification
-
-    # Simple structured output wrapper since we are using Qwen
-    # We can ask it to output JSON directly or use with_structured_output if supported by the backend/library combo.
-    # Qwen supports function calling, so we can try .with_structured_output(RouteDecision)
-
-    structured_llm = llm.with_structured_output(RouteDecision)
+    # Standard LLM-based routing (chain is built once and reused across turns)
+    chain = _get_router_chain()
 
     # Apply sliding window to prevent context overflow
     # Router only needs recent context for classification
@@ -108,14 +122,6 @@ def router_node(state: AgentState):
         keep_system=False
     )
 
-    # Create prompt
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", ROUTER_SYSTEM_PROMPT),
-        ("placeholder", "{messages}"),
-    ])
-
-    chain = prompt | structured_llm
-
     try:
         decision: RouteDecision = chain.invoke({"messages": messages})
         primary_domain = DESTINATION_DOMAIN_MAP.get(decision.destination, "general")
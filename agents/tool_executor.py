@@ -0,0 +1,196 @@
+"""
+Concurrent tool execution for BestBox agents.
+
+When the LLM emits several tool calls in one message (e.g. a KB search plus
+a structured search, or two ERP lookups), they are independent and can run
+at the same time:
+
+1. Async-native tools (StructuredTool with a coroutine) are awaited directly
+2. Sync tools run in a bounded, process-wide thread pool
+3. Each call gets its own timeout; a slow tool yields an error ToolMessage
+   instead of stalling the whole step
+4. Results are returned in the same order as the tool calls
+
+A thread can't be interrupted, so a sync tool that times out keeps running
+in the pool until it returns, and it still holds one of the
+TOOL_MAX_WORKERS threads. Calls still queued for a thread are dropped. The
+number of abandoned calls still running is logged and available from
+abandoned_tool_calls(). While it is non-zero, fewer threads are free for
+new calls.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import ToolMessage
+
+logger = logging.getLogger(__name__)
+
+try:
+    from services.observability import tool_execution_success, tool_latency_seconds
+    TOOL_METRICS_AVAILABLE = True
+except ImportError:
+    TOOL_METRICS_AVAILABLE = False
+
+# Configuration
+TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "8"))
+TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", "60"))
+
+# Same wording as LangGraph's ToolNode so agent prompts behave the same
+TOOL_CALL_ERROR_TEMPLATE = "Error: {error}\n Please fix your mistakes."
+
+_tool_pool = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS, thread_name_prefix="bestbox-tool")
+
+# Sync calls that timed out but are still occupying a pool thread
+_abandoned_lock = threading.Lock()
+_abandoned_calls = 0
+
+
+def abandoned_tool_calls() -> int:
+    """Number of timed-out sync tool calls still running in the pool."""
+    return _abandoned_calls
+
+
+def _abandon(tool_name: str, future) -> None:
+    global _abandoned_calls
+    with _abandoned_lock:
+        _abandoned_calls += 1
+        running = _abandoned_calls
+    logger.warning(
+        f"Tool {tool_name} is still running after its timeout; "
+        f"{running} abandoned call(s) hold tool threads (TOOL_MAX_WORKERS={TOOL_MAX_WORKERS})"
+    )
+
+    def _finished(_):
+        global _abandoned_calls
+        with _abandoned_lock:
+            _abandoned_calls -= 1
+            left = _abandoned_calls
+        logger.info(f"Abandoned tool call {tool_name} finished; {left} still running")
+
+    future.add_done_callback(_finished)
+
+
+def _is_async_tool(tool: Any) -> bool:
+    return asyncio.iscoroutinefunction(getattr(tool, "coroutine", None))
+
+
+def _record(tool_name: str, status: str, elapsed: float) -> None:
+    if TOOL_METRICS_AVAILABLE:
+        tool_execution_success.labels(tool_name=tool_name, status=status).inc()
+        tool_latency_seconds.labels(tool_name=tool_name, status=status).observe(elapsed)
+
+
+def _to_tool_message(output: Any, tool_call: Dict[str, Any]) -> ToolMessage:
+    if isinstance(output, ToolMessage):
+        return output
+    content = output if isinstance(output, (str, list)) else str(output)
+    return ToolMessage(content=content, name=tool_call["name"], tool_call_id=tool_call["id"])
+
+
+def _error_message(tool_call: Dict[str, Any], error: str) -> ToolMessage:
+    return ToolMessage(
+        content=TOOL_CALL_ERROR_TEMPLATE.format(error=error),
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+        status="error",
+    )
+
+
+async def _run_one(
+    tool_call: Dict[str, Any],
+    tools_by_name: Dict[str, Any],
+    timeout: float,
+) -> ToolMessage:
+    tool_name = tool_call["name"]
+    tool = tools_by_name.get(tool_name)
+    if tool is None:
+        _record(tool_name, "error", 0.0)
+        return _error_message(
+            tool_call,
+            f"{tool_name} is not a valid tool, try one of [{', '.join(tools_by_name)}].",
+        )
+
+    # Passing the full ToolCall makes the tool return a ToolMessage (keeps artifacts)
+    call_input = {**tool_call, "type": "tool_call"}
+    start = time.perf_counter()
+    try:
+        if _is_async_tool(tool):
+            output = await asyncio.wait_for(tool.ainvoke(call_input), timeout=timeout)
+        else:
+            # Fresh context copy per call: tools read request-scoped ContextVars
+            # (e.g. BESTBOX_TOOL_RESULTS_SESSION_ID) and a Context can't be shared across threads
+            ctx = contextvars.copy_context()
+            pending = _tool_pool.submit(ctx.run, tool.invoke, call_input)
+            try:
+                output = await asyncio.wait_for(asyncio.wrap_future(pending), timeout=timeout)
+            except asyncio.TimeoutError:
+                # Cancelling only drops calls still queued; a running one keeps its thread
+                if not pending.cancel() and not pending.done():
+                    _abandon(tool_name, pending)
+                raise
+    except asyncio.TimeoutError:
+        elapsed = time.perf_counter() - start
+        logger.warning(f"Tool {tool_name} timed out after {elapsed:.1f}s")
+        _record(tool_name, "timeout", elapsed)
+        return _error_message(tool_call, f"{tool_name} timed out after {timeout:.0f}s")
+    except Exception as e:
+        elapsed = time.perf_counter() - start
+        logger.error(f"Tool execution failed for {tool_name}: {e}")
+        _record(tool_name, "error", elapsed)
+        return _error_message(tool_call, repr(e))
+
+    _record(tool_name, "success", time.perf_counter() - start)
+    return _to_tool_message(output, tool_call)
+
+
+async def aexecute_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    tools_by_name: Dict[str, Any],
+    timeout: Optional[float] = None,
+) -> List[ToolMessage]:
+    """
+    Run all tool calls from one AI message concurrently.
+
+    Args:
+        tool_calls: ``AIMessage.tool_calls`` entries (name, args, id)
+        tools_by_name: Mapping of tool name to tool object
+        timeout: Per-call timeout in seconds (default TOOL_TIMEOUT_SECONDS)
+
+    Returns:
+        ToolMessages in the same order as ``tool_calls``
+    """
+    timeout = timeout or TOOL_TIMEOUT_SECONDS
+    return list(await asyncio.gather(
+        *(_run_one(call, tools_by_name, timeout) for call in tool_calls)
+    ))
+
+
+def execute_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    tools_by_name: Dict[str, Any],
+    timeout: Optional[float] = None,
+) -> List[ToolMessage]:
+    """
+    Synchronous entry point for graph nodes.
+
+    LangGraph runs sync nodes in a worker thread, so there is normally no
+    running event loop here and we can drive the async executor directly.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(aexecute_tool_calls(tool_calls, tools_by_name, timeout))
+
+    # Called from an event-loop thread: don't block it re-entrantly, hop to a helper thread
+    ctx = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(
+            ctx.run, asyncio.run, aexecute_tool_calls(tool_calls, tools_by_name, timeout)
+        ).result()
@@ -1,15 +1,42 @@
 from langchain_openai import ChatOpenAI
 from langchain_openai import OpenAIEmbeddings
+from langchain_core.callbacks import BaseCallbackHandler
 import os
+import threading
+import time
+import zlib
 import httpx
 import logging
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    from services.observability import (
+        llm_call_latency,
+        llm_node_tokens,
+        llm_client_cache,
+        llm_ttft_seconds,
+        llm_prefill_tokens,
+    )
+    LLM_METRICS_AVAILABLE = True
+except ImportError:
+    LLM_METRICS_AVAILABLE = False
+
 # Configuration for local services - use environment variables with defaults
 LLM_BASE_URL = os.environ.get("LLM_BASE_URL", "http://127.0.0.1:8001/v1")
 EMBEDDINGS_BASE_URL = os.environ.get("EMBEDDINGS_BASE_URL", "http://127.0.0.1:8004/v1")
 
+# Connection pool sizing for the shared LLM HTTP client
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE = int(os.environ.get("LLM_MAX_KEEPALIVE", "16"))
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "120"))
+
+# llama.cpp prompt-cache hints: cache_prompt keeps the KV for the shared prefix,
+# id_slot pins a session to one of LLM_SLOTS server slots (llama-server --parallel)
+LLM_CACHE_HINTS = os.environ.get("LLM_CACHE_HINTS", "true").lower() == "true"
+LLM_SLOTS = int(os.environ.get("LLM_SLOTS", "0"))
+
 SPEECH_FORMAT_INSTRUCTION = """
 RESPONSE FORMAT:
 You MUST format your response in two parts:
@@ -21,28 +48,203 @@ Example:
 Based on the financial reports, the Q4 revenue hit $15M... (rest of detailed answer)
 """
 
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    Records per-node LLM latency and token usage.
+
+    The node name comes from the ``langgraph_node`` metadata LangGraph attaches
+    to every run; calls made outside the graph are reported as ``direct``.
+    """
+
+    def __init__(self):
+        self._runs: Dict[Any, Tuple[str, float]] = {}
+        self._first_token_seen: set = set()
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, metadata: Optional[Dict[str, Any]]):
+        node = (metadata or {}).get("langgraph_node") or "direct"
+        with self._lock:
+            self._runs[run_id] = (node, time.perf_counter())
+
+    def _finish(self, run_id) -> Optional[str]:
+        with self._lock:
+            entry = self._runs.pop(run_id, None)
+            self._first_token_seen.discard(run_id)
+        if entry is None:
+            return None
+        node, started = entry
+        if LLM_METRICS_AVAILABLE:
+            llm_call_latency.labels(node=node).observe(time.perf_counter() - started)
+        return node
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        with self._lock:
+            if run_id in self._first_token_seen:
+                return
+            entry = self._runs.get(run_id)
+            if entry is None:
+                return
+            self._first_token_seen.add(run_id)
+        node, started = entry
+        if LLM_METRICS_AVAILABLE:
+            llm_ttft_seconds.labels(node=node).observe(time.perf_counter() - started)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node = self._finish(run_id)
+        if node is None or not LLM_METRICS_AVAILABLE:
+            return
+        input_tokens, output_tokens, cached_tokens = _extract_token_usage(response)
+        if input_tokens:
+            llm_node_tokens.labels(node=node, direction="input").inc(input_tokens)
+            # Prefill = prompt tokens the server actually had to process
+            llm_prefill_tokens.labels(node=node).observe(max(input_tokens - cached_tokens, 0))
+        if output_tokens:
+            llm_node_tokens.labels(node=node, direction="output").inc(output_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+
+def _extract_token_usage(response) -> Tuple[int, int, int]:
+    """Pull (input, output, cached input) token counts from an LLMResult, if the server sent them."""
+    for generations in response.generations or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0), cached or 0
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    cached = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0), cached or 0
+
+
+# Process-wide LLM client registry. All graph nodes share one pooled HTTP
+# client, so keep-alive connections to llama-server survive across turns.
+_llm_lock = threading.Lock()
+_llm_clients: Dict[Tuple[float, int], ChatOpenAI] = {}
+_bound_llms: Dict[Tuple[float, int, Tuple[str, ...]], Any] = {}
+_http_client: Optional[httpx.Client] = None
+_metrics_callback = LLMMetricsCallback()
+
+
+def _get_http_client() -> httpx.Client:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            ),
+        )
+    return _http_client
+
+
+def _resolve_max_tokens(max_tokens: int) -> int:
+    return int(os.environ.get("LLM_MAX_TOKENS", str(max_tokens)))
+
+
 def get_llm(temperature: float = 0.7, max_tokens: int = 4096):
     """
     Get the configured ChatOpenAI instance connected to local llama-server.
 
+    Instances are cached per (temperature, max_tokens) and share a single
+    keep-alive HTTP connection pool, so repeated calls are cheap.
+
     Note: The startup script unsets proxy environment variables to ensure local
     services can communicate directly without going through proxies.
 
     Environment variables:
     - LLM_BASE_URL: URL of the LLM server (default: http://127.0.0.1:8001/v1)
     - LLM_MAX_TOKENS: Maximum tokens for response (default: 4096)
+    - LLM_MAX_CONNECTIONS / LLM_MAX_KEEPALIVE: HTTP pool limits (default: 32 / 16)
     """
-    response_max_tokens = int(os.environ.get("LLM_MAX_TOKENS", str(max_tokens)))
-    logger.info(f"Creating LLM client with base_url={LLM_BASE_URL}, max_tokens={response_max_tokens}")
-    return ChatOpenAI(
-        base_url=LLM_BASE_URL,
-        api_key="sk-no-key-required",  # Local server doesn't need real API key
-        model=os.environ.get("LLM_MODEL", "qwen3-30b-a3b"),
-        temperature=temperature,
-        streaming=True,
-        max_retries=2,  # Retry on transient failures
-        max_tokens=response_max_tokens,  # Ensure response isn't truncated
-    )
+    response_max_tokens = _resolve_max_tokens(max_tokens)
+    key = (temperature, response_max_tokens)
+
+    llm = _llm_clients.get(key)
+    if llm is not None:
+        if LLM_METRICS_AVAILABLE:
+            llm_client_cache.labels(result="hit").inc()
+        return llm
+
+    with _llm_lock:
+        llm = _llm_clients.get(key)
+        if llm is None:
+            logger.info(
+                f"Creating LLM client with base_url={LLM_BASE_URL}, "
+                f"temperature={temperature}, max_tokens={response_max_tokens}"
+            )
+            llm = ChatOpenAI(
+                base_url=LLM_BASE_URL,
+                api_key="sk-no-key-required",  # Local server doesn't need real API key
+                model=os.environ.get("LLM_MODEL", "qwen3-30b-a3b"),
+                temperature=temperature,
+                streaming=True,
+                stream_usage=True,  # Ask for usage in the final chunk for token metrics
+                max_retries=2,  # Retry on transient failures
+                max_tokens=response_max_tokens,  # Ensure response isn't truncated
+                http_client=_get_http_client(),
+                callbacks=[_metrics_callback],
+            )
+            _llm_clients[key] = llm
+            if LLM_METRICS_AVAILABLE:
+                llm_client_cache.labels(result="miss").inc()
+    return llm
+
+
+def get_llm_with_tools(tools: Sequence[Any], temperature: float = 0.7, max_tokens: int = 4096):
+    """
+    Get a cached ``bind_tools`` result for the given tool list.
+
+    Tool lists are keyed by tool name, so agents that bind the same tools on
+    every turn reuse the same bound runnable instead of re-serializing schemas.
+    """
+    llm = get_llm(temperature=temperature, max_tokens=max_tokens)
+    key = (temperature, _resolve_max_tokens(max_tokens), tuple(tool.name for tool in tools))
+
+    bound = _bound_llms.get(key)
+    if bound is None:
+        with _llm_lock:
+            bound = _bound_llms.get(key)
+            if bound is None:
+                bound = llm.bind_tools(list(tools))
+                _bound_llms[key] = bound
+    return bound
+
+
+def prompt_cache_kwargs(session_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Invocation kwargs that let llama-server reuse the KV cache across turns.
+
+    Pass the result to ``invoke``: ``llm.invoke(messages, **prompt_cache_kwargs(sid))``.
+    Sessions are pinned to a slot with a stable hash so the same conversation
+    keeps landing on the slot that already holds its prefix.
+    """
+    if not LLM_CACHE_HINTS:
+        return {}
+    extra_body: Dict[str, Any] = {"cache_prompt": True}
+    if session_id and LLM_SLOTS > 0:
+        extra_body["id_slot"] = zlib.crc32(session_id.encode("utf-8")) % LLM_SLOTS
+    return {"extra_body": extra_body}
+
+
+def clear_llm_cache():
+    """Drop all cached LLM clients (e.g. after changing LLM_* env vars in tests)."""
+    global _http_client
+    with _llm_lock:
+        _llm_clients.clear()
+        _bound_llms.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
 
 class LocalBGEEmbeddings(OpenAIEmbeddings):
     """
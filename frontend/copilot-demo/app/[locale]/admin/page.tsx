@@ -25,13 +25,16 @@ interface ReasoningStep {
 }
 
 interface SessionMessage {
+  id: string;
   role: string;
   content: string;
+  has_reasoning_trace?: boolean;
   reasoning_trace?: string | ReasoningStep[];
 }
 
 interface SessionDetail extends Session {
   messages: SessionMessage[];
+  next_before?: string | null;
 }
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE || "http://localhost:8000";
@@ -96,6 +99,48 @@ export default function AdminSessionsPage() {
     setLoading(false);
   };
 
+  const loadOlderMessages = async () => {
+    if (!selectedSession?.next_before) return;
+    setLoading(true);
+    try {
+      const res = await fetch(
+        `${API_BASE}/admin/sessions/${selectedSession.id}?before=${selectedSession.next_before}`,
+        { headers: getAuthHeaders() },
+      );
+      if (res.ok) {
+        const data: SessionDetail = await res.json();
+        setSelectedSession({
+          ...selectedSession,
+          messages: [...data.messages, ...selectedSession.messages],
+          next_before: data.next_before,
+        });
+      }
+    } catch (e) {
+      console.error("Failed to load older messages:", e);
+    }
+    setLoading(false);
+  };
+
+  const loadReasoningTrace = async (messageId: string) => {
+    if (!selectedSession) return;
+    try {
+      const res = await fetch(`${API_BASE}/admin/sessions/${selectedSession.id}/messages/${messageId}`, {
+        headers: getAuthHeaders(),
+      });
+      if (res.ok) {
+        const data = await res.json();
+        setSelectedSession({
+          ...selectedSession,
+          messages: selectedSession.messages.map((m) =>
+            m.id === messageId ? { ...m, reasoning_trace: data.reasoning_trace ?? [] } : m,
+          ),
+        });
+      }
+    } catch (e) {
+      console.error("Failed to load reasoning trace:", e);
+    }
+  };
+
   const rateSession = async (sessionId: string, rating: "good" | "bad") => {
     await fetch(`${API_BASE}/admin/sessions/${sessionId}/rating`, {
       method: "POST",
@@ -171,10 +216,20 @@ export default function AdminSessionsPage() {
               </div>
 
               <div className="space-y-3">
-                {selectedSession.messages?.map((msg, idx) => (
-                  <div key={idx} className="border border-gray-200 rounded-lg p-3">
+                {selectedSession.next_before && (
+                  <button className="text-sm text-blue-600 hover:underline" onClick={loadOlderMessages}>
+                    {t("sessions.loadOlder")}
+                  </button>
+                )}
+                {selectedSession.messages?.map((msg) => (
+                  <div key={msg.id} className="border border-gray-200 rounded-lg p-3">
                     <div className="text-xs uppercase text-gray-400 mb-2">{msg.role}</div>
                     <div className="text-sm text-gray-800 whitespace-pre-wrap mb-3">{msg.content}</div>
+                    {msg.has_reasoning_trace && msg.reasoning_trace === undefined && (
+                      <button className="text-xs text-blue-600 hover:underline" onClick={() => loadReasoningTrace(msg.id)}>
+                        {t("sessions.showReasoning")}
+                      </button>
+                    )}
                     {msg.reasoning_trace && parseReasoningTrace(msg.reasoning_trace).length > 0 && (
                       <ReasoningTrace steps={parseReasoningTrace(msg.reasoning_trace)} />
                     )}
@@ -0,0 +1,29 @@
+-- Migration 007: Knowledge base document catalog
+-- One row per indexed document so the admin UI can list, count and filter
+-- documents without scrolling every chunk in Qdrant. Maintained by the
+-- admin indexing/delete paths; existing collections are backfilled from
+-- Qdrant on first listing (recorded in kb_catalog_backfills).
+
+CREATE TABLE IF NOT EXISTS kb_documents (
+    collection VARCHAR(255) NOT NULL,
+    doc_id VARCHAR(255) NOT NULL,
+    source_file TEXT NOT NULL DEFAULT '',
+    file_type VARCHAR(20) NOT NULL DEFAULT '',
+    domain VARCHAR(50) NOT NULL DEFAULT '',
+    upload_date TIMESTAMPTZ,
+    uploaded_by VARCHAR(100) NOT NULL DEFAULT '',
+    has_images BOOLEAN NOT NULL DEFAULT FALSE,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (collection, doc_id)
+);
+
+CREATE TABLE IF NOT EXISTS kb_catalog_backfills (
+    collection VARCHAR(255) PRIMARY KEY,
+    documents INTEGER NOT NULL,
+    completed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Indexes for admin listing queries
+CREATE INDEX IF NOT EXISTS idx_kb_documents_listing ON kb_documents(collection, upload_date DESC NULLS LAST, doc_id);
+CREATE INDEX IF NOT EXISTS idx_kb_documents_filters ON kb_documents(collection, domain, file_type);
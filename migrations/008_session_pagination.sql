@@ -0,0 +1,36 @@
+-- Migration 008: Paginated session retrieval
+-- Keyset pagination of session messages by (created_at, id) and per-session
+-- summary counters maintained by SessionStore's batched message writes, so
+-- the admin list and detail views never aggregate over session_messages.
+-- Run: psql -h localhost -U bestbox -d bestbox -f migrations/008_session_pagination.sql
+-- (SessionStore.create also applies the columns and indexes at startup, see
+-- services/session_store.init_session_tables)
+
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS tokens_prompt_total BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS tokens_completion_total BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP;
+
+-- Backfill counters for existing sessions
+UPDATE sessions s
+SET message_count = m.messages,
+    tokens_prompt_total = m.tokens_prompt,
+    tokens_completion_total = m.tokens_completion,
+    last_message_at = m.last_message_at
+FROM (
+    SELECT session_id,
+           COUNT(*) AS messages,
+           COALESCE(SUM(tokens_prompt), 0) AS tokens_prompt,
+           COALESCE(SUM(tokens_completion), 0) AS tokens_completion,
+           MAX(created_at) AS last_message_at
+    FROM session_messages
+    GROUP BY session_id
+) m
+WHERE s.id = m.session_id;
+
+-- Latest-page-first message listing (replaces idx_messages_session)
+CREATE INDEX IF NOT EXISTS idx_messages_session_created ON session_messages(session_id, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_messages_session;
+
+-- Filtered admin session listing
+CREATE INDEX IF NOT EXISTS idx_sessions_user_started ON sessions(user_id, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sessions_status_started ON sessions(status, started_at DESC);
@@ -87,7 +87,8 @@ class PluginAPI:
         self,
         event: HookEvent,
         handler: Callable[[HookContext], Any],
-        priority: int = 100
+        priority: int = 100,
+        read_only: bool = False
     ) -> None:
         """
         Register a lifecycle hook.
@@ -96,12 +97,16 @@ class PluginAPI:
             event: Hook event to listen for
             handler: Hook handler function
             priority: Priority (lower runs earlier)
+            read_only: Set for hooks that only observe (logging, metrics,
+                auditing). They run concurrently in the background and
+                their return value is ignored.
         """
         self.registry.register_hook(
             self.plugin_name,
             event.value,
             handler,
-            priority
+            priority,
+            read_only
         )
 
     def register_channel(
@@ -4,7 +4,9 @@ Hook runner for lifecycle events.
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import time
+from typing import Any, Dict, Optional, Set
 from concurrent.futures import ThreadPoolExecutor
 
 from .api import HookEvent, HookContext
@@ -12,10 +14,32 @@ from .registry import PluginRegistry
 
 logger = logging.getLogger(__name__)
 
+try:
+    from services.observability import plugin_hook_latency, plugin_hook_errors
+    HOOK_METRICS_AVAILABLE = True
+except ImportError:
+    HOOK_METRICS_AVAILABLE = False
+
+# Hooks slower than this are logged so a misbehaving plugin is visible
+HOOK_SLOW_THRESHOLD_MS = float(os.getenv("HOOK_SLOW_THRESHOLD_MS", "100"))
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 
 class HookRunner:
     """
     Executes lifecycle hooks in priority order.
+
+    Handler chains are precompiled by the registry. Mutating hooks run inline
+    in priority order and may replace the state. Read-only hooks get a
+    snapshot of the state and are dispatched in the background without
+    blocking the graph step.
     """
 
     def __init__(self, registry: Optional[PluginRegistry] = None):
@@ -26,7 +50,72 @@ class HookRunner:
             registry: PluginRegistry instance (defaults to singleton)
         """
         self.registry = registry or PluginRegistry()
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bestbox-hook")
+        self._background: Set[asyncio.Task] = set()
+
+    def _observe(self, event: HookEvent, plugin_name: str, started: float, failed: bool = False) -> None:
+        elapsed = time.perf_counter() - started
+        if HOOK_METRICS_AVAILABLE:
+            plugin_hook_latency.labels(plugin=plugin_name, event=event.value).observe(elapsed)
+            if failed:
+                plugin_hook_errors.labels(plugin=plugin_name, event=event.value).inc()
+        if elapsed * 1000 > HOOK_SLOW_THRESHOLD_MS:
+            logger.warning(
+                f"Slow hook {event.value} from plugin {plugin_name}: {elapsed * 1000:.0f}ms"
+            )
+
+    def _call_sync(self, event: HookEvent, handler_info: Dict[str, Any], context: HookContext) -> Any:
+        """Call a sync handler with timing and error isolation."""
+        started = time.perf_counter()
+        try:
+            result = handler_info["handler"](context)
+        except Exception as e:
+            self._observe(event, handler_info["plugin"], started, failed=True)
+            logger.error(
+                f"Error in hook {event.value} from plugin {handler_info['plugin']}: {e}",
+                exc_info=True
+            )
+            return None
+        self._observe(event, handler_info["plugin"], started)
+        return result
+
+    async def _call_async(self, event: HookEvent, handler_info: Dict[str, Any], context: HookContext) -> Any:
+        """Await an async handler with timing and error isolation."""
+        started = time.perf_counter()
+        try:
+            result = await handler_info["handler"](context)
+        except Exception as e:
+            self._observe(event, handler_info["plugin"], started, failed=True)
+            logger.error(
+                f"Error in hook {event.value} from plugin {handler_info['plugin']}: {e}",
+                exc_info=True
+            )
+            return None
+        self._observe(event, handler_info["plugin"], started)
+        return result
+
+    def _make_context(self, event, state, handler_info, metadata) -> HookContext:
+        return HookContext(
+            event=event,
+            state=state,
+            plugin_name=handler_info["plugin"],
+            metadata=metadata
+        )
+
+    def _dispatch_read_only(self, event, chain, state, metadata, loop=None) -> None:
+        """Fire-and-forget read-only hooks on a snapshot of the state."""
+        snapshot = dict(state)
+        for handler_info in chain.read_only:
+            context = self._make_context(event, snapshot, handler_info, metadata)
+            if asyncio.iscoroutinefunction(handler_info["handler"]):
+                if loop is not None:
+                    task = loop.create_task(self._call_async(event, handler_info, context))
+                    self._background.add(task)
+                    task.add_done_callback(self._background.discard)
+                else:
+                    self._executor.submit(asyncio.run, self._call_async(event, handler_info, context))
+            else:
+                self._executor.submit(self._call_sync, event, handler_info, context)
 
     async def run(
         self,
@@ -45,48 +134,32 @@ class HookRunner:
             metadata: Event-specific metadata
 
         Returns:
-            Modified state after all hooks have run
+            Modified state after all mutating hooks have run
         """
-        if metadata is None:
-            metadata = {}
-
-        handlers = self.registry.get_hook_handlers(event.value)
-
-        if not handlers:
+        chain = self.registry.get_hook_chain(event.value)
+        if not chain:
             return state
 
-        logger.debug(f"Running {len(handlers)} hooks for {event.value}")
-
-        # Run hooks in priority order
-        for handler_info in handlers:
-            plugin_name = handler_info["plugin"]
-            handler = handler_info["handler"]
+        if metadata is None:
+            metadata = {}
 
-            try:
-                context = HookContext(
-                    event=event,
-                    state=state,
-                    plugin_name=plugin_name,
-                    metadata=metadata
-                )
+        logger.debug(f"Running {len(chain.handlers)} hooks for {event.value}")
 
-                # Check if handler is async
-                if asyncio.iscoroutinefunction(handler):
-                    result = await handler(context)
-                else:
-                    # Run sync handler in executor
-                    loop = asyncio.get_event_loop()
-                    result = await loop.run_in_executor(self._executor, handler, context)
+        # Mutating hooks in priority order; sync handlers are called inline
+        # (hooks are expected to be quick, and a thread hop costs more than most hooks)
+        for handler_info in chain.mutating:
+            context = self._make_context(event, state, handler_info, metadata)
+            if asyncio.iscoroutinefunction(handler_info["handler"]):
+                result = await self._call_async(event, handler_info, context)
+            else:
+                result = self._call_sync(event, handler_info, context)
 
-                # If handler returns modified state, use it
-                if result is not None and isinstance(result, dict):
-                    state = result
+            # If handler returns modified state, use it
+            if result is not None and isinstance(result, dict):
+                state = result
 
-            except Exception as e:
-                logger.error(
-                    f"Error in hook {event.value} from plugin {plugin_name}: {e}",
-                    exc_info=True
-                )
+        if chain.read_only:
+            self._dispatch_read_only(event, chain, state, metadata, loop=asyncio.get_running_loop())
 
         return state
 
@@ -105,42 +178,36 @@ class HookRunner:
             metadata: Event-specific metadata
 
         Returns:
-            Modified state after all hooks have run
+            Modified state after all mutating hooks have run
         """
-        if metadata is None:
-            metadata = {}
-
-        handlers = self.registry.get_hook_handlers(event.value)
-
-        if not handlers:
+        chain = self.registry.get_hook_chain(event.value)
+        if not chain:
             return state
 
-        logger.debug(f"Running {len(handlers)} hooks for {event.value} (sync)")
-
-        for handler_info in handlers:
-            plugin_name = handler_info["plugin"]
-            handler = handler_info["handler"]
-
-            try:
-                context = HookContext(
-                    event=event,
-                    state=state,
-                    plugin_name=plugin_name,
-                    metadata=metadata
-                )
-
-                # Run handler synchronously
-                result = handler(context)
-
-                # If handler returns modified state, use it
-                if result is not None and isinstance(result, dict):
-                    state = result
+        if metadata is None:
+            metadata = {}
 
-            except Exception as e:
-                logger.error(
-                    f"Error in hook {event.value} from plugin {plugin_name}: {e}",
-                    exc_info=True
-                )
+        logger.debug(f"Running {len(chain.handlers)} hooks for {event.value} (sync)")
+
+        for handler_info in chain.mutating:
+            context = self._make_context(event, state, handler_info, metadata)
+            if asyncio.iscoroutinefunction(handler_info["handler"]):
+                if _in_event_loop():
+                    logger.warning(
+                        f"Skipping async hook {event.value} from plugin {handler_info['plugin']}: "
+                        f"run_sync called inside an event loop, use run() instead"
+                    )
+                    continue
+                result = asyncio.run(self._call_async(event, handler_info, context))
+            else:
+                result = self._call_sync(event, handler_info, context)
+
+            # If handler returns modified state, use it
+            if result is not None and isinstance(result, dict):
+                state = result
+
+        if chain.read_only:
+            self._dispatch_read_only(event, chain, state, metadata)
 
         return state
 
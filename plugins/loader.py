@@ -196,6 +196,7 @@ class PluginLoader:
                     event=hook_data["event"],
                     handler=hook_data["handler"],
                     priority=hook_data.get("priority", 100),
+                    read_only=hook_data.get("read_only", False),
                 ))
 
             # Module path is parent directory name
@@ -299,7 +300,7 @@ class PluginLoader:
                     # Try lowercase value
                     event = HookEvent(event_str)
 
-                api.register_hook(event, handler, hook_def.priority)
+                api.register_hook(event, handler, hook_def.priority, hook_def.read_only)
 
             except Exception as e:
                 logger.error(
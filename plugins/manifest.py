@@ -44,6 +44,7 @@ class HookDefinition:
     event: str  # HookEvent enum value
     handler: str  # Module path to handler function
     priority: int = 100  # Lower = runs earlier
+    read_only: bool = False  # Observe-only hook, runs fire-and-forget
 
 
 @dataclass
@@ -80,7 +81,10 @@ class PluginManifest:
                 "env_vars": self.requires.env_vars,
             },
             "tools": [t.to_dict() for t in self.tools],
-            "hooks": [{"event": h.event, "handler": h.handler, "priority": h.priority} for h in self.hooks],
+            "hooks": [
+                {"event": h.event, "handler": h.handler, "priority": h.priority, "read_only": h.read_only}
+                for h in self.hooks
+            ],
             "channels": self.channels,
             "http_routes": self.http_routes,
             "author": self.author,
@@ -5,7 +5,8 @@ Manages all loaded plugins, tools, hooks, and HTTP routes.
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Callable
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from langchain_core.tools import BaseTool, StructuredTool
 
 from .manifest import PluginManifest, ToolDefinition
@@ -13,6 +14,25 @@ from .manifest import PluginManifest, ToolDefinition
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class HookChain:
+    """
+    Precompiled, immutable handler chain for one hook event.
+
+    Built once when a hook is registered, so the hot path (every graph step)
+    only does a dict lookup.
+    """
+    handlers: Tuple[Dict[str, Any], ...] = ()  # All handlers, priority order
+    mutating: Tuple[Dict[str, Any], ...] = ()  # May return a new state; run in order
+    read_only: Tuple[Dict[str, Any], ...] = ()  # Observe only; run concurrently, not awaited
+
+    def __bool__(self) -> bool:
+        return bool(self.handlers)
+
+
+EMPTY_HOOK_CHAIN = HookChain()
+
+
 class PluginRegistry:
     """
     Singleton registry for all plugins and their components.
@@ -32,7 +52,8 @@ class PluginRegistry:
 
         self._plugins: Dict[str, PluginManifest] = {}
         self._tools: Dict[str, BaseTool] = {}  # tool_name -> BaseTool
-        self._hooks: Dict[str, List[Dict[str, Any]]] = {}  # event -> [{plugin, handler, priority}]
+        self._hooks: Dict[str, List[Dict[str, Any]]] = {}  # event -> [{plugin, handler, priority, read_only}]
+        self._hook_chains: Dict[str, HookChain] = {}  # event -> compiled chain
         self._channels: Dict[str, List[Dict[str, Any]]] = {}  # plugin_name -> channel configs
         self._http_routes: List[Dict[str, Any]] = []  # [{plugin, route, handler}]
 
@@ -83,7 +104,8 @@ class PluginRegistry:
         plugin_name: str,
         event: str,
         handler: Callable,
-        priority: int = 100
+        priority: int = 100,
+        read_only: bool = False
     ) -> None:
         """
         Register a hook handler.
@@ -93,6 +115,7 @@ class PluginRegistry:
             event: Hook event name (from HookEvent enum)
             handler: Callable hook handler
             priority: Priority (lower runs earlier)
+            read_only: Handler never modifies state (runs fire-and-forget)
         """
         if event not in self._hooks:
             self._hooks[event] = []
@@ -101,12 +124,26 @@ class PluginRegistry:
             "plugin": plugin_name,
             "handler": handler,
             "priority": priority,
+            "read_only": read_only,
         })
 
         # Sort by priority
         self._hooks[event].sort(key=lambda x: x["priority"])
-
-        logger.info(f"Registered hook: {event} (from {plugin_name}, priority {priority})")
+        self._compile_hook_chain(event)
+
+        logger.info(
+            f"Registered hook: {event} (from {plugin_name}, priority {priority}"
+            f"{', read-only' if read_only else ''})"
+        )
+
+    def _compile_hook_chain(self, event: str) -> None:
+        """Rebuild the immutable handler chain for an event."""
+        handlers = tuple(self._hooks.get(event, []))
+        self._hook_chains[event] = HookChain(
+            handlers=handlers,
+            mutating=tuple(h for h in handlers if not h["read_only"]),
+            read_only=tuple(h for h in handlers if h["read_only"]),
+        )
 
     def register_channel(self, plugin_name: str, channel_type: str, config: Dict[str, Any]) -> None:
         """
@@ -181,7 +218,19 @@ class PluginRegistry:
         Returns:
             List of hook handler dicts with plugin, handler, priority
         """
-        return self._hooks.get(event, [])
+        return list(self.get_hook_chain(event).handlers)
+
+    def get_hook_chain(self, event: str) -> HookChain:
+        """
+        Get the precompiled handler chain for an event.
+
+        Args:
+            event: Hook event name
+
+        Returns:
+            HookChain (empty if no handlers are registered)
+        """
+        return self._hook_chains.get(event, EMPTY_HOOK_CHAIN)
 
     def get_channels(self, plugin_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -211,6 +260,7 @@ class PluginRegistry:
         self._plugins.clear()
         self._tools.clear()
         self._hooks.clear()
+        self._hook_chains.clear()
         self._channels.clear()
         self._http_routes.clear()
         logger.info("PluginRegistry cleared")
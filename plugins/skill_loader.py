@@ -133,6 +133,7 @@ class SkillLoader:
                     event=hook_data["event"],
                     handler=hook_data["handler"],
                     priority=hook_data.get("priority", 100),
+                    read_only=hook_data.get("read_only", False),
                 ))
 
             # Determine module path from skill directory structure
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Per-request admin auth overhead: legacy verification vs cached verification.
+
+Starts a local stand-in IdP (OIDC discovery + JWKS endpoint on 127.0.0.1)
+with a freshly generated RSA key, then authenticates the same bearer tokens
+repeatedly, the way get_current_user does for every admin request:
+
+- legacy: the previous flow, i.e. OIDC verification first (JWKS downloaded
+  on every call), then the self-issued HS256 JWT as a fallback
+- cached: admin_auth.verify_token (header/issuer peeking, JWKS cache,
+  verified-token LRU)
+
+Both a self-issued admin JWT and an IdP-signed RS256 token are measured, and
+the number of JWKS downloads the IdP served is reported.
+
+Usage:
+    python scripts/benchmark_admin_auth.py --requests 500
+    python scripts/benchmark_admin_auth.py --requests 500 --output auth.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from authlib.jose import JsonWebKey, JsonWebToken  # noqa: E402
+
+from services import admin_auth  # noqa: E402
+
+
+class StandInIdP:
+    """Minimal OIDC provider: discovery document and JWKS."""
+
+    def __init__(self):
+        self.key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": "bench-1"})
+        self.jwks_hits = 0
+        self.runner = None
+        self.base_url = ""
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/.well-known/openid-configuration", self._discovery)
+        app.router.add_get("/jwks.json", self._jwks)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+    async def _discovery(self, request):
+        return web.json_response({"issuer": self.base_url, "jwks_uri": f"{self.base_url}/jwks.json"})
+
+    async def _jwks(self, request):
+        self.jwks_hits += 1
+        return web.json_response({"keys": [self.key.as_dict(is_private=False)]})
+
+    def issue(self) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": self.base_url, "sub": "alice", "preferred_username": "alice",
+            "groups": ["engineer"], "iat": now, "exp": now + 3600,
+        }
+        token = JsonWebToken(["RS256"]).encode({"alg": "RS256", "kid": "bench-1"}, claims, self.key)
+        return token.decode()
+
+
+async def legacy_verify(token: str) -> Dict[str, Any]:
+    """The pre-cache flow: download the JWKS on every call, then try the local JWT."""
+    import aiohttp
+    from authlib.jose.errors import JoseError
+
+    claims = None
+    try:
+        metadata = await admin_auth.get_oidc_metadata()
+        async with aiohttp.ClientSession() as session:
+            async with session.get(metadata["jwks_uri"], timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                jwks = await resp.json()
+        decoded = JsonWebToken(["RS256"]).decode(token, JsonWebKey.import_key_set(jwks))
+        decoded.validate()
+        claims = {"sub": decoded["sub"], "token_type": "oidc"}
+    except (JoseError, ValueError):
+        pass
+    return claims or admin_auth.decode_jwt_token(token)
+
+
+async def measure(verify, token: str, requests: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        claims = await verify(token)
+        samples.append((time.perf_counter() - start) * 1e6)
+        assert claims, "token failed verification"
+    samples.sort()
+    return {
+        "mean_us": round(statistics.mean(samples), 1),
+        "p50_us": round(samples[len(samples) // 2], 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+    }
+
+
+async def run(requests: int) -> Dict[str, Any]:
+    idp = StandInIdP()
+    await idp.start()
+    admin_auth.OIDC_DISCOVERY_URL = f"{idp.base_url}/.well-known/openid-configuration"
+
+    tokens = {
+        "local_jwt": admin_auth.create_jwt_token("u-1", "admin", "admin"),
+        "oidc_rs256": idp.issue(),
+    }
+    results: Dict[str, Any] = {}
+    try:
+        for mode, verify in (("legacy", legacy_verify), ("cached", admin_auth.verify_token)):
+            admin_auth.clear_oidc_caches()
+            results[mode] = {}
+            for kind, token in tokens.items():
+                idp.jwks_hits = 0
+                stats = await measure(verify, token, requests)
+                stats["jwks_downloads"] = idp.jwks_hits
+                results[mode][kind] = stats
+    finally:
+        await idp.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Authentications per token type")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests))
+
+    print(f"{'mode':>7} | {'token':>11} | {'mean µs':>9} | {'p50 µs':>9} | {'p95 µs':>9} | {'JWKS fetches':>12}")
+    for mode, by_token in results.items():
+        for kind, s in by_token.items():
+            print(f"{mode:>7} | {kind:>11} | {s['mean_us']:>9} | {s['p50_us']:>9} | "
+                  f"{s['p95_us']:>9} | {s['jwks_downloads']:>12}")
+
+    if args.output:
+        payload = {
+            "metadata": {"timestamp": datetime.now().isoformat(), "requests": args.requests},
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
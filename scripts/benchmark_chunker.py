@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Chunker throughput and memory on a large text file.
+
+Generates (or reads) a large mixed Chinese/English markdown document and
+chunks it three ways, reporting MB/s, chunk count, mean chunk tokens and the
+peak Python heap (tracemalloc, measured in a separate pass so it doesn't
+skew the timing):
+
+- char_window: the previous DocumentIndexer/_hierarchical_chunk approach,
+  fixed 1000-char windows with 200-char overlap over the whole string
+- streaming_whole: StreamingChunker over the text already loaded in memory
+- streaming_file: StreamingChunker fed 1 MB blocks read from disk, chunks
+  consumed as a generator (the intended ingest path for large documents)
+
+Token counts come from the embedding tokenizer when it is in the local HF
+cache, otherwise from chunker.estimate_tokens (printed at start).
+
+Usage:
+    python scripts/benchmark_chunker.py --size-mb 50
+    python scripts/benchmark_chunker.py --input big.md --output chunker.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.rag_pipeline.chunker import StreamingChunker, get_token_counter  # noqa: E402
+
+BLOCK_CHARS = 1 << 20
+
+
+def generate(path: str, size_mb: int) -> None:
+    zh = "模具型腔表面出现披锋，建议检查分型面贴合度并修正间隙。试模后确认产品尺寸合格！"
+    en = "Check the parting line clearance and re-polish the cavity surface. Re-run the T1 trial. "
+    target = size_mb * 1024 * 1024
+    written = 0
+    section = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            block = f"## 第{section}节 Section {section}\n\n" + ((zh + en) * 6 + "\n\n") * 5
+            f.write(block)
+            written += len(block.encode("utf-8"))
+            section += 1
+
+
+def char_window(text: str, chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+    start = 0
+    while start < len(text):
+        chunk = text[start:start + chunk_size]
+        if chunk.strip():
+            yield chunk
+        start += chunk_size - overlap
+
+
+def read_blocks(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as f:
+        while True:
+            block = f.read(BLOCK_CHARS)
+            if not block:
+                return
+            yield block
+
+
+def run_mode(name: str, path: str, count_tokens) -> Callable[[], Iterator]:
+    chunker = StreamingChunker(max_tokens=512, overlap_tokens=64, count_tokens=count_tokens)
+    if name == "char_window":
+        return lambda: char_window(open(path, encoding="utf-8").read())
+    if name == "streaming_whole":
+        return lambda: chunker.iter_chunks(open(path, encoding="utf-8").read())
+    return lambda: chunker.iter_chunks(read_blocks(path))
+
+
+def measure(name: str, path: str, size_mb: float, count_tokens) -> Dict:
+    make = run_mode(name, path, count_tokens)
+
+    start = time.perf_counter()
+    tokens = []
+    count = 0
+    for chunk in make():
+        count += 1
+        if isinstance(chunk, dict):
+            tokens.append(chunk["token_count"])
+    elapsed = time.perf_counter() - start
+
+    # Peak heap in a second pass; chunks are consumed and dropped like an indexer would
+    tracemalloc.start()
+    for _ in make():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(elapsed, 2),
+        "mb_per_s": round(size_mb / elapsed, 2),
+        "chunks": count,
+        "mean_chunk_tokens": round(statistics.mean(tokens), 1) if tokens else None,
+        "peak_heap_mb": round(peak / 1024 / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--input", default=None, help="Chunk this file instead of a generated one")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    path = args.input
+    tmp = None
+    if not path:
+        tmp = tempfile.NamedTemporaryFile(suffix=".md", delete=False)
+        tmp.close()
+        path = tmp.name
+        generate(path, args.size_mb)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    count_tokens = get_token_counter()
+    print(f"input: {path} ({size_mb:.1f} MB)")
+
+    results = {}
+    try:
+        for name in ("char_window", "streaming_whole", "streaming_file"):
+            results[name] = measure(name, path, size_mb, count_tokens)
+            r = results[name]
+            print(f"{name:>16}: {r['mb_per_s']:>6} MB/s  {r['chunks']:>7} chunks  "
+                  f"mean tokens {r['mean_chunk_tokens']}  peak heap {r['peak_heap_mb']} MB")
+    finally:
+        if tmp:
+            os.unlink(path)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), "size_mb": round(size_mb, 1)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
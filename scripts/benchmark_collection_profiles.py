@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Recall@k, latency and memory across Qdrant collection profiles.
+
+Builds one collection per profile (services/qdrant_profiles.py) from the
+same synthetic corpus: clustered, normalized BGE-M3-sized vectors with
+troubleshooting-issue-sized payloads (problem/solution text, an images list,
+insights). For each profile it reports:
+
+- recall@k against exact top-k computed in numpy
+- p50/p95 query latency with payloads, unfiltered and with a keyword filter
+- Qdrant resident memory growth while the collection was built and queried
+  (/proc/<pid>/status with --pid, else the server's /metrics
+  memory_resident_bytes)
+
+Profiles only take effect on a Qdrant server; without --qdrant-host the
+local in-process mode is used as a smoke test (no quantization, no HNSW,
+RSS of this process).
+
+Usage:
+    python scripts/benchmark_collection_profiles.py --qdrant-host localhost --points 50000
+    python scripts/benchmark_collection_profiles.py --qdrant-host localhost --pid $(pgrep qdrant) --output profiles.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient, models  # noqa: E402
+
+from services.qdrant_profiles import (  # noqa: E402
+    PROFILES,
+    collection_params,
+    search_params,
+    vector_params,
+)
+
+DOMAINS = ["mold", "erp", "crm", "it_ops"]
+
+
+def make_corpus(points: int, dim: int, clusters: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=points)
+    vectors = centers[labels] + 0.35 * rng.normal(size=(points, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors, labels
+
+
+def make_queries(vectors: np.ndarray, count: int, seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(0, len(vectors), size=count)]
+    queries = picks + 0.25 * rng.normal(size=picks.shape).astype(np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def payload(i: int, label: int, payload_kb: int) -> Dict[str, Any]:
+    filler = "模具型腔表面出现披锋，建议检查分型面贴合度并修正间隙。"
+    text = (filler * (payload_kb * 1024 // len(filler.encode("utf-8")) + 1))[: payload_kb * 340]
+    return {
+        "issue_id": f"TS-{label}-{i}",
+        "case_id": f"TS-{label}",
+        "domain": DOMAINS[i % len(DOMAINS)],
+        "problem": text[: len(text) // 2],
+        "solution": text[len(text) // 2:],
+        "images": [{"image_id": f"img-{i}-{n}", "vl_description": filler, "defect_type": "披锋"} for n in range(3)],
+        "key_insights": [filler] * 3,
+    }
+
+
+class MemoryProbe:
+    def __init__(self, url: Optional[str], pid: Optional[int]):
+        self.url = url
+        self.pid = pid or (None if url else os.getpid())
+
+    def rss_mb(self) -> Optional[float]:
+        if self.pid:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+            return None
+        try:
+            for line in requests.get(f"{self.url}/metrics", timeout=5).text.splitlines():
+                if line.startswith("memory_resident_bytes"):
+                    return float(line.split()[-1]) / 1024 / 1024
+        except requests.exceptions.RequestException:
+            pass
+        return None
+
+
+def wait_green(client: QdrantClient, name: str, timeout: float = 1800) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if client.get_collection(name).status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(1)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def run_profile(
+    client: QdrantClient, probe: MemoryProbe, profile: str, vectors: np.ndarray, labels: np.ndarray,
+    queries: np.ndarray, truth: np.ndarray, args,
+) -> Dict[str, Any]:
+    name = f"bench_profile_{profile}"
+    if client.collection_exists(name):
+        client.delete_collection(name)
+
+    rss_before = probe.rss_mb()
+    start = time.perf_counter()
+    client.create_collection(
+        collection_name=name, vectors_config=vector_params(vectors.shape[1], profile=profile),
+        **collection_params(profile),
+    )
+    client.create_payload_index(name, "domain", models.PayloadSchemaType.KEYWORD)
+    for lo in range(0, len(vectors), args.batch):
+        hi = min(lo + args.batch, len(vectors))
+        client.upsert(name, points=models.Batch(
+            ids=list(range(lo, hi)),
+            vectors=vectors[lo:hi].tolist(),
+            payloads=[payload(i, int(labels[i]), args.payload_kb) for i in range(lo, hi)],
+        ), wait=True)
+    wait_green(client, name)
+    build_s = time.perf_counter() - start
+
+    params = search_params(profile)
+    hits, latencies, filtered = 0, [], []
+    domain_filter = models.Filter(must=[models.FieldCondition(key="domain", match=models.MatchValue(value="mold"))])
+    for qi, query in enumerate(queries):
+        t0 = time.perf_counter()
+        points = client.query_points(name, query=query.tolist(), limit=args.k, search_params=params,
+                                     with_payload=True).points
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len({p.id for p in points} & set(truth[qi].tolist()))
+
+        t0 = time.perf_counter()
+        client.query_points(name, query=query.tolist(), limit=args.k, query_filter=domain_filter,
+                            search_params=params, with_payload=True)
+        filtered.append((time.perf_counter() - t0) * 1000)
+
+    rss_after = probe.rss_mb()
+    if not args.keep:
+        client.delete_collection(name)
+
+    return {
+        f"recall@{args.k}": round(hits / (len(queries) * args.k), 4),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "filtered_p50_ms": round(statistics.median(filtered), 2),
+        "build_s": round(build_s, 1),
+        "rss_growth_mb": round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--points", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--payload-kb", type=int, default=4, help="Approximate text payload per point")
+    parser.add_argument("--batch", type=int, default=512)
+    parser.add_argument("--qdrant-host", default=None, help="Qdrant server (default: local in-process mode)")
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--pid", type=int, default=None, help="Qdrant server PID for RSS via /proc")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark collections")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    if args.qdrant_host:
+        client = QdrantClient(host=args.qdrant_host, port=args.qdrant_port, timeout=300)
+        probe = MemoryProbe(f"http://{args.qdrant_host}:{args.qdrant_port}", args.pid)
+    else:
+        print("No --qdrant-host: local mode ignores quantization/HNSW, results are a smoke test only")
+        client = QdrantClient(":memory:")
+        probe = MemoryProbe(None, None)
+
+    vectors, labels = make_corpus(args.points, args.dim, args.clusters)
+    queries = make_queries(vectors, args.queries)
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, : args.k]
+
+    results = {}
+    for profile in args.profiles:
+        results[profile] = r = run_profile(client, probe, profile, vectors, labels, queries, truth, args)
+        print(f"{profile:>9}: recall@{args.k} {r[f'recall@{args.k}']:<6}  p50 {r['p50_ms']:>7} ms  "
+              f"p95 {r['p95_ms']:>7} ms  filtered p50 {r['filtered_p50_ms']:>7} ms  "
+              f"RSS +{r['rss_growth_mb']} MB  build {r['build_s']}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+DocumentIndexer throughput: per-chunk embedding vs batched, pipelined indexing.
+
+Indexes a synthetic mixed Chinese/English corpus through DocumentIndexer
+against a local stub embeddings server (aiohttp, BGE-M3-shaped 1024-d
+vectors) and an in-process Qdrant (qdrant_client ":memory:", or a real
+server with --qdrant-host), and reports documents/minute for:
+
+- serial: the previous loop, one /embed request per chunk, one upsert at the end
+- batched: DocumentIndexer.index_document (token-budgeted batches, bounded
+  concurrency, upserts overlapped with embedding)
+
+The stub models a GPU embedder: each request costs a fixed overhead plus a
+per-input cost, and at most --server-parallel requests are served at once.
+
+Usage:
+    python scripts/benchmark_document_indexing.py --docs 20
+    python scripts/benchmark_document_indexing.py --docs 20 --qdrant-host localhost
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient, models as qmodels  # noqa: E402
+
+VECTOR_SIZE = 1024
+
+
+class StubEmbedder:
+    def __init__(self, request_ms: float, item_ms: float, parallel: int):
+        self.request_ms = request_ms
+        self.item_ms = item_ms
+        self.parallel = asyncio.Semaphore(parallel)
+        self.requests = 0
+        self.vector = [0.03125] * VECTOR_SIZE
+        self.runner = None
+        self.url = ""
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/embed", self._embed)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+    async def _embed(self, request):
+        body = await request.json()
+        inputs = body["inputs"]
+        self.requests += 1
+        async with self.parallel:
+            await asyncio.sleep((self.request_ms + self.item_ms * len(inputs)) / 1000)
+        return web.json_response({"embeddings": [self.vector] * len(inputs)})
+
+
+def build_corpus(docs: int, chars: int) -> List[str]:
+    zh = "模具型腔表面出现披锋，建议检查分型面贴合度并修正间隙。"
+    en = "Check the parting line clearance and re-polish the cavity surface. "
+    paragraph = (zh + en) * 4 + "\n\n"
+    return [(f"# 文档 {d}\n\n" + paragraph * (chars // len(paragraph) + 1))[:chars] for d in range(docs)]
+
+
+async def serial_index(indexer, text: str, metadata: Dict[str, Any]) -> bool:
+    """The previous index_document loop: one embedding request per chunk."""
+    points = []
+    for i, chunk in enumerate(indexer._chunk_text(text)):
+        vector = await indexer.embeddings.get_embedding(chunk)
+        if not vector:
+            continue
+        points.append(qmodels.PointStruct(
+            id=str(uuid.uuid4()), vector=vector,
+            payload={"source": metadata["source"], "chunk_index": i, "text": chunk},
+        ))
+    if points:
+        indexer.qdrant.upsert(collection_name=indexer.collection, points=points)
+    return bool(points)
+
+
+async def run_mode(mode: str, corpus: List[str], qdrant: QdrantClient, stub: StubEmbedder) -> Dict[str, Any]:
+    from services.rag_pipeline.document_indexer import DocumentIndexer
+
+    collection = f"bench_indexing_{mode}"
+    if qdrant.collection_exists(collection):
+        qdrant.delete_collection(collection)
+    indexer = DocumentIndexer(collection_name=collection, qdrant_client=qdrant)
+
+    stub.requests = 0
+    start = time.perf_counter()
+    for d, text in enumerate(corpus):
+        metadata = {"source": f"doc-{d}.txt", "domain": "mold", "title": f"doc {d}"}
+        if mode == "serial":
+            ok = await serial_index(indexer, text, metadata)
+        else:
+            ok = await indexer.index_document(text, metadata)
+        assert ok, f"{mode}: indexing failed for doc {d}"
+    elapsed = time.perf_counter() - start
+
+    points = qdrant.count(collection).count
+    qdrant.delete_collection(collection)
+    await indexer.embeddings.aclose()
+    return {
+        "seconds": round(elapsed, 2),
+        "docs_per_minute": round(len(corpus) / elapsed * 60, 1),
+        "points": points,
+        "embed_requests": stub.requests,
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    stub = StubEmbedder(args.request_ms, args.item_ms, args.server_parallel)
+    await stub.start()
+    os.environ["EMBEDDINGS_URL"] = stub.url
+    qdrant = QdrantClient(host=args.qdrant_host, port=args.qdrant_port) if args.qdrant_host else QdrantClient(":memory:")
+
+    corpus = build_corpus(args.docs, args.chars)
+    try:
+        return {mode: await run_mode(mode, corpus, qdrant, stub) for mode in ("serial", "batched")}
+    finally:
+        await stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--chars", type=int, default=100_000, help="Characters per document")
+    parser.add_argument("--request-ms", type=float, default=8.0, help="Stub per-request overhead")
+    parser.add_argument("--item-ms", type=float, default=1.0, help="Stub per-input cost")
+    parser.add_argument("--server-parallel", type=int, default=2, help="Stub concurrent requests")
+    parser.add_argument("--qdrant-host", default=None, help="Use a Qdrant server instead of :memory:")
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    for mode, r in results.items():
+        print(f"{mode:>8}: {r['docs_per_minute']:>8} docs/min  {r['seconds']:>7}s  "
+              f"{r['points']} points  {r['embed_requests']} /embed requests")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
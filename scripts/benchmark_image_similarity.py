@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Offline recall benchmark for the troubleshooting image index.
+
+Indexes the extracted case images under data/troubleshooting/processed
+(via the embeddings service's /embed_image) into a scratch collection, then
+queries it two ways:
+
+- near-duplicate: each query image is a perturbed copy of an indexed image
+  (crop, small rotation, brightness change, JPEG re-encode), the way a new
+  photo of the same defect would differ. Reports recall@k of the image's
+  own issue.
+- leave-one-out: each query is an original image with itself excluded from
+  the index. Reports how often another image of the same issue or case is
+  in the top k, and defect-type precision@k where VL labels exist.
+
+Latency is reported separately for the image embedding and the grouped kNN.
+The VLM path (find_similar_defects before this index) needs 15-30 s per
+query for comparison.
+
+Usage:
+    python scripts/benchmark_image_similarity.py
+    python scripts/benchmark_image_similarity.py --queries 300 --k 5 --output image_recall.json
+    python scripts/benchmark_image_similarity.py --qdrant-host localhost --embeddings-url http://localhost:8004
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from PIL import Image, ImageEnhance
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient  # noqa: E402
+from qdrant_client.models import FieldCondition, Filter, MatchValue  # noqa: E402
+
+from services.troubleshooting.image_index import (  # noqa: E402
+    ImageEmbeddingClient,
+    TroubleshootingImageIndex,
+    resolve_image_path,
+)
+
+
+def load_cases(processed_dir: Path, limit: int) -> List[Dict]:
+    cases = []
+    for path in sorted(processed_dir.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            case = json.load(f)
+        if isinstance(case, dict) and case.get("case_id") and isinstance(case.get("issues"), list):
+            cases.append(case)
+        if limit and len(cases) >= limit:
+            break
+    return cases
+
+
+def perturb(src: Path, dst: Path, rng: random.Random) -> None:
+    with Image.open(src) as img:
+        img = img.convert("RGB")
+        w, h = img.size
+        keep = rng.uniform(0.85, 0.95)
+        left, top = rng.uniform(0, 1 - keep) * w, rng.uniform(0, 1 - keep) * h
+        img = img.crop((int(left), int(top), int(left + keep * w), int(top + keep * h)))
+        img = img.rotate(rng.uniform(-5, 5), expand=False, fillcolor=(128, 128, 128))
+        img = ImageEnhance.Brightness(img).enhance(rng.uniform(0.85, 1.15))
+        img.save(dst, "JPEG", quality=rng.randint(70, 90))
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processed-dir", default="data/troubleshooting/processed")
+    parser.add_argument("--cases", type=int, default=0, help="Limit number of case files (0 = all)")
+    parser.add_argument("--queries", type=int, default=200, help="Query images per mode")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--embeddings-url", default="")
+    parser.add_argument("--qdrant-host", default=None, help="Qdrant server (default: local in-process mode)")
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    cases = load_cases(Path(args.processed_dir), args.cases)
+    issues, images = [], []
+    for case in cases:
+        for issue in case["issues"]:
+            issue_id = f"{case['case_id']}-{issue['issue_number']}-{issue.get('excel_row')}"
+            found = [img for img in issue.get("images", []) if resolve_image_path(img)]
+            if found:
+                issues.append((issue_id, issue["issue_number"], found))
+                images.extend((case["case_id"], issue_id, img) for img in found)
+    if not images:
+        print(f"No extracted images with files found under {args.processed_dir}")
+        return 1
+    print(f"{len(cases)} cases, {len(issues)} issues with images, {len(images)} images")
+
+    client = (QdrantClient(host=args.qdrant_host, port=args.qdrant_port, timeout=300)
+              if args.qdrant_host else QdrantClient(":memory:"))
+    index = TroubleshootingImageIndex(client, ImageEmbeddingClient(args.embeddings_url),
+                                      collection="bench_troubleshooting_images")
+    if client.collection_exists(index.collection):
+        client.delete_collection(index.collection)
+
+    start = time.perf_counter()
+    by_case: Dict[str, list] = {}
+    for case_id, issue_id, img in images:
+        by_case.setdefault(case_id, []).append((issue_id, img))
+    for case_id, entries in by_case.items():
+        grouped: Dict[str, tuple] = {}
+        for issue_id, img in entries:
+            grouped.setdefault(issue_id, (issue_id, None, []))[2].append(img)
+        index.index_case_images(case_id, list(grouped.values()))
+    index_s = time.perf_counter() - start
+    print(f"Indexed in {index_s:.1f}s ({len(images) / index_s:.1f} images/s)")
+
+    rng = random.Random(args.seed)
+    sample = rng.sample(images, min(args.queries, len(images)))
+    embed_ms, knn_ms = [], []
+    dup_hits = 0
+    loo_issue_hits = loo_case_hits = loo_queries = 0
+    type_matches = type_total = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n, (case_id, issue_id, img) in enumerate(sample):
+            query_path = Path(tmp) / f"q{n}.jpg"
+            perturb(resolve_image_path(img), query_path, rng)
+            t0 = time.perf_counter()
+            vector = index.embedder.embed_files([query_path])[0]
+            t1 = time.perf_counter()
+            groups = index.search(vector, top_k=args.k)
+            t2 = time.perf_counter()
+            embed_ms.append((t1 - t0) * 1000)
+            knn_ms.append((t2 - t1) * 1000)
+            dup_hits += any(g["issue_id"] == issue_id for g in groups)
+
+            # Leave-one-out needs at least one other image in the same case
+            if len(by_case[case_id]) < 2:
+                continue
+            loo_queries += 1
+            vector = index.embedder.embed_files([resolve_image_path(img)])[0]
+            others = index.search(vector, top_k=args.k, query_filter=Filter(
+                must_not=[FieldCondition(key="image_id", match=MatchValue(value=img["image_id"]))]
+            ))
+            loo_issue_hits += any(g["issue_id"] == issue_id for g in others)
+            loo_case_hits += any(g["case_id"] == case_id for g in others)
+            if img.get("defect_type"):
+                for g in others:
+                    if g["images"][0].get("defect_type"):
+                        type_total += 1
+                        type_matches += g["images"][0]["defect_type"] == img["defect_type"]
+
+    client.delete_collection(index.collection)
+
+    results = {
+        f"near_duplicate_issue_recall@{args.k}": round(dup_hits / len(sample), 4),
+        f"leave_one_out_issue_hit@{args.k}": round(loo_issue_hits / loo_queries, 4) if loo_queries else None,
+        f"leave_one_out_case_hit@{args.k}": round(loo_case_hits / loo_queries, 4) if loo_queries else None,
+        f"defect_type_precision@{args.k}": round(type_matches / type_total, 4) if type_total else None,
+        "embed_p50_ms": round(statistics.median(embed_ms), 1),
+        "knn_p50_ms": round(statistics.median(knn_ms), 2),
+        "total_p95_ms": round(percentile([e + q for e, q in zip(embed_ms, knn_ms)], 0.95), 1),
+        "images_indexed": len(images),
+        "index_s": round(index_s, 1),
+    }
+    for name, value in results.items():
+        print(f"{name:>34}: {value}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
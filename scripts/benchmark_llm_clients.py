@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+LLM client overhead benchmark.
+
+Compares the per-turn overhead of building a fresh ChatOpenAI + bind_tools on
+every call (the old agents/utils.get_llm behaviour) against the shared client
+registry (get_llm / get_llm_with_tools), under concurrent load.
+
+A tiny OpenAI-compatible stub server is started in-process so the numbers
+reflect client construction and connection setup, not model latency.
+
+Usage:
+    python scripts/benchmark_llm_clients.py --concurrency 16 --turns 400
+"""
+
+import argparse
+import httpx
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers /v1/chat/completions with a fixed two-chunk SSE stream."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        chunks = [
+            {"id": "stub", "object": "chat.completion.chunk", "model": "stub",
+             "choices": [{"index": 0, "delta": {"role": "assistant", "content": "ok"}, "finish_reason": None}]},
+            {"id": "stub", "object": "chat.completion.chunk", "model": "stub",
+             "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+             "usage": {"prompt_tokens": 12, "completion_tokens": 1, "total_tokens": 13}},
+        ]
+        body = "".join(f"data: {json.dumps(c)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_stub_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def fresh_client_turn(tools):
+    """Old behaviour: new ChatOpenAI (and HTTP pool) on every call."""
+    from langchain_openai import ChatOpenAI
+    from agents.utils import LLM_BASE_URL
+
+    t0 = time.perf_counter()
+    llm = ChatOpenAI(
+        base_url=LLM_BASE_URL,
+        api_key="sk-no-key-required",
+        model="stub",
+        temperature=0.7,
+        streaming=True,
+        max_retries=2,
+        max_tokens=256,
+        http_client=httpx.Client(),
+    )
+    bound = llm.bind_tools(tools)
+    setup = time.perf_counter() - t0
+    bound.invoke("ping")
+    return setup, time.perf_counter() - t0
+
+
+def registry_turn(tools):
+    """New behaviour: shared client and cached bind_tools."""
+    from agents.utils import get_llm_with_tools
+
+    t0 = time.perf_counter()
+    bound = get_llm_with_tools(tools, max_tokens=256)
+    setup = time.perf_counter() - t0
+    bound.invoke("ping")
+    return setup, time.perf_counter() - t0
+
+
+def run(mode_fn, tools, concurrency: int, turns: int) -> dict:
+    setups, totals = [], []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for setup, total in pool.map(lambda _: mode_fn(tools), range(turns)):
+            setups.append(setup * 1000)
+            totals.append(total * 1000)
+    wall = time.perf_counter() - start
+
+    def pct(values, p):
+        values = sorted(values)
+        return round(values[min(len(values) - 1, int(len(values) * p))], 3)
+
+    return {
+        "turns": turns,
+        "wall_seconds": round(wall, 3),
+        "turns_per_second": round(turns / wall, 1),
+        "setup_ms_mean": round(statistics.mean(setups), 3),
+        "setup_ms_p95": pct(setups, 0.95),
+        "turn_ms_p50": pct(totals, 0.50),
+        "turn_ms_p95": pct(totals, 0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    os.environ["LLM_BASE_URL"] = start_stub_server()
+    os.environ.setdefault("LLM_MODEL", "stub")
+
+    # Import after LLM_BASE_URL points at the stub
+    from agents.erp_agent import ERP_TOOLS
+
+    print(f"Stub LLM at {os.environ['LLM_BASE_URL']}, concurrency={args.concurrency}, turns={args.turns}")
+
+    results = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "concurrency": args.concurrency,
+            "tools_bound": len(ERP_TOOLS),
+        },
+        "fresh_client_per_turn": run(fresh_client_turn, ERP_TOOLS, args.concurrency, args.turns),
+        "shared_registry": run(registry_turn, ERP_TOOLS, args.concurrency, args.turns),
+    }
+
+    for mode in ("fresh_client_per_turn", "shared_registry"):
+        r = results[mode]
+        print(f"{mode:>22}: setup {r['setup_ms_mean']:.3f} ms mean / {r['setup_ms_p95']:.3f} ms p95, "
+              f"turn p50 {r['turn_ms_p50']:.2f} ms, {r['turns_per_second']} turns/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for GOT-OCR /ocr/batch on CPU, with a small model stub.
+
+Posts a batch of synthetic A4 page scans (300 dpi PNGs, so every page goes
+through the MAX_IMAGE_SIZE resize) to the real /ocr/batch endpoint. The GOT
+model is replaced by a small CPU stub. The stub has a conv encoder and a fixed
+number of decode steps over the whole batch, so, like autoregressive
+generation, the cost per model call grows much more slowly than the batch
+size. It reports pages per second for:
+
+- sequential: the previous handler (decode, resize and run the model one
+  file at a time, on the event loop)
+- batched: the OCRBatcher path at each --batch-sizes value, with
+  --preprocess-workers decoding/resizing threads
+
+Usage:
+    python scripts/benchmark_ocr_batch.py
+    python scripts/benchmark_ocr_batch.py --pages 64 --batch-sizes 1,4,8,16 --decode-steps 128
+    python scripts/benchmark_ocr_batch.py --output ocr_batch.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import httpx
+import numpy as np
+import torch
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ocr import got_ocr_service  # noqa: E402
+from services.ocr.ocr_batcher import OCRBatcher  # noqa: E402
+
+
+class StubGOT(torch.nn.Module):
+    """CPU stand-in for GOT-OCR: conv encoder + fixed-length decode over a padded batch."""
+
+    def __init__(self, decode_steps: int, hidden: int, input_size: int = 256):
+        super().__init__()
+        self.input_size = input_size
+        self.decode_steps = decode_steps
+        self.encoder = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 16, kernel_size=8, stride=8),
+            torch.nn.ReLU(),
+            torch.nn.AdaptiveAvgPool2d(8),
+            torch.nn.Flatten(),
+            torch.nn.Linear(16 * 8 * 8, hidden),
+        )
+        self.step = torch.nn.Linear(hidden, hidden)
+
+    @torch.inference_mode()
+    def infer(self, images: List[Image.Image], ocr_type: str = "ocr") -> List[str]:
+        # Pad every page onto a fixed canvas, the way GOT's processor squares its input
+        batch = np.zeros((len(images), self.input_size, self.input_size, 3), dtype=np.float32)
+        for i, image in enumerate(images):
+            image = image.copy()
+            image.thumbnail((self.input_size, self.input_size))
+            batch[i, :image.height, :image.width] = np.asarray(image, dtype=np.float32) / 255
+        h = self.encoder(torch.from_numpy(batch).permute(0, 3, 1, 2))
+        for _ in range(self.decode_steps):
+            h = torch.tanh(self.step(h))
+        return [f"page text {float(v):.3f}" for v in h[:, 0]]
+
+
+def make_pages(count: int) -> List[bytes]:
+    pages = []
+    for n in range(count):
+        image = Image.new("RGB", (2480, 3508), "white")
+        draw = ImageDraw.Draw(image)
+        for line in range(60):
+            draw.text((150, 150 + line * 52), f"Page {n} line {line}: mold flash, short shot, sink mark " * 3,
+                      fill="black")
+        buf = io.BytesIO()
+        image.save(buf, "PNG", compress_level=1)
+        pages.append(buf.getvalue())
+    return pages
+
+
+async def post_batch(pages: List[bytes]) -> float:
+    transport = httpx.ASGITransport(app=got_ocr_service.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://ocr", timeout=None) as client:
+        files = [("files", (f"page{i}.png", content, "image/png")) for i, content in enumerate(pages)]
+        start = time.perf_counter()
+        resp = await client.post("/ocr/batch", files=files)
+        elapsed = time.perf_counter() - start
+    resp.raise_for_status()
+    results = resp.json()
+    assert len(results) == len(pages) and all(r["success"] for r in results), results[:3]
+    return elapsed
+
+
+async def run_sequential(pages: List[bytes], model: StubGOT) -> Dict:
+    # Previous /ocr/batch: each file decoded, resized and inferred in turn on the event loop
+    start = time.perf_counter()
+    for content in pages:
+        model.infer([got_ocr_service.preprocess_image(content)])
+    elapsed = time.perf_counter() - start
+    return {"mode": "sequential", "batch_size": 1, "seconds": round(elapsed, 2),
+            "pages_per_s": round(len(pages) / elapsed, 2)}
+
+
+async def run_batched(pages: List[bytes], model: StubGOT, batch_size: int, workers: int) -> Dict:
+    batcher = OCRBatcher(model.infer, got_ocr_service.preprocess_image,
+                         batch_size=batch_size, preprocess_workers=workers)
+    got_ocr_service._batcher = batcher
+    try:
+        elapsed = await post_batch(pages)
+    finally:
+        await batcher.close()
+        got_ocr_service._batcher = None
+    return {"mode": "batched", "batch_size": batch_size, "seconds": round(elapsed, 2),
+            "pages_per_s": round(len(pages) / elapsed, 2), "model_calls": int(batcher.stats["batches"])}
+
+
+async def main_async(args) -> List[Dict]:
+    pages = make_pages(args.pages)
+    model = StubGOT(args.decode_steps, args.hidden).eval()
+    model.infer([Image.new("RGB", (64, 64))])  # warm up torch
+
+    results = [await run_sequential(pages, model)]
+    print(f"  sequential: {results[0]['pages_per_s']} pages/s")
+    for batch_size in [int(b) for b in args.batch_sizes.split(",") if b.strip()]:
+        r = await run_batched(pages, model, batch_size, args.preprocess_workers)
+        results.append(r)
+        print(f"  batched (batch {batch_size}): {r['pages_per_s']} pages/s, {r['model_calls']} model calls")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=32, help="Pages in the uploaded batch")
+    parser.add_argument("--batch-sizes", default="1,4,8", help="Comma-separated OCR_BATCH_SIZE values")
+    parser.add_argument("--preprocess-workers", type=int, default=4)
+    parser.add_argument("--decode-steps", type=int, default=512, help="Stub decode steps per model call")
+    parser.add_argument("--hidden", type=int, default=2048, help="Stub decoder width")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    print(f"{args.pages} pages, {torch.get_num_threads()} torch threads, {os.cpu_count()} CPUs")
+    results = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
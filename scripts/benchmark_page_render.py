@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Validation throughput benchmark for troubleshooting page rendering.
+
+Renders a set of troubleshooting workbooks (Excel -> PDF -> page PNGs, the
+part of VLM mapping validation that runs before any VLM call) and reports
+workbooks per minute for:
+
+- legacy: a fresh `libreoffice --headless` process per workbook and serial
+  page rasterization
+- pooled: the persistent office conversion pool (OFFICE_POOL_SIZE workers)
+  and parallel, streaming rasterization (VLM_RENDER_WORKERS)
+
+Workbooks are submitted --concurrency at a time, the way batch enrichment
+validates several cases at once. With --validate the full ValidationPipeline
+(extraction + rendering + VLM validation) is timed instead; it renders with
+the pipeline's own configuration (OFFICE_POOL_ENABLED) and needs the VLM
+service.
+
+Usage:
+    python scripts/benchmark_page_render.py
+    python scripts/benchmark_page_render.py --input-dir docs --limit 20 --concurrency 4
+    python scripts/benchmark_page_render.py --modes pooled --validate --concurrency 4 --output render_throughput.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.troubleshooting.excel_extractor import ExcelTroubleshootingExtractor  # noqa: E402
+from services.troubleshooting.office_converter import OfficeConverterPool  # noqa: E402
+from services.troubleshooting.page_renderer import PageRenderer  # noqa: E402
+from services.troubleshooting.validation_pipeline import ValidationPipeline  # noqa: E402
+
+
+def run_mode(mode: str, workbooks: List[Path], args, work_dir: Path) -> Dict:
+    pool = OfficeConverterPool(size=args.pool_size) if mode == "pooled" else None
+    render_workers = args.render_workers if mode == "pooled" else 1
+    extractor = ExcelTroubleshootingExtractor(output_dir=work_dir / "extracted")
+    latencies: List[float] = []
+    pages = 0
+    failures = 0
+
+    if pool is not None:
+        # Daemon startup is paid once per process, not per workbook
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(pool.workers)) as executor:
+            list(executor.map(pool._ensure_running, pool.workers))
+        print(f"  [{mode}] pool of {len(pool.workers)} started in {time.perf_counter() - start:.1f}s")
+
+    def render_one(index_and_path):
+        index, path = index_and_path
+        t0 = time.perf_counter()
+        case_data = extractor.extract_case(path)
+        out_dir = work_dir / mode / f"{index:03d}"
+        if args.validate:
+            pipeline = ValidationPipeline(output_dir=out_dir, skip_review_queue=True)
+            asyncio.run(pipeline.validate_case(path, case_data))
+            count = case_data.get("vlm_validation", {}).get("pages_processed", 0)
+        else:
+            renderer = PageRenderer(output_dir=out_dir, office_pool=pool, render_workers=render_workers,
+                                    use_office_pool=pool is not None)
+            count = len(renderer.render(path, case_data).page_images)
+        return time.perf_counter() - t0, count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(render_one, item) for item in enumerate(workbooks)]
+        for future in futures:
+            try:
+                seconds, count = future.result()
+                latencies.append(seconds)
+                pages += count
+            except Exception as exc:
+                failures += 1
+                print(f"  [{mode}] failed: {exc}")
+    wall = time.perf_counter() - start
+
+    if pool is not None:
+        pool.close()
+
+    done = len(latencies)
+    return {
+        "workbooks": done,
+        "failures": failures,
+        "pages": pages,
+        "wall_s": round(wall, 2),
+        "workbooks_per_min": round(done / wall * 60, 2) if wall else None,
+        "pages_per_s": round(pages / wall, 2) if wall else None,
+        "latency_p50_s": round(statistics.median(latencies), 2) if latencies else None,
+        "latency_max_s": round(max(latencies), 2) if latencies else None,
+        "pool_stats": dict(pool.stats) if pool is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input-dir", default="docs")
+    parser.add_argument("--limit", type=int, default=10, help="Workbooks to render (0 = all)")
+    parser.add_argument("--modes", default="legacy,pooled", help="Comma-separated: legacy, pooled")
+    parser.add_argument("--concurrency", type=int, default=2, help="Workbooks in flight")
+    parser.add_argument("--pool-size", type=int, default=2, help="Office workers in pooled mode")
+    parser.add_argument("--render-workers", type=int, default=4, help="Rasterization threads in pooled mode")
+    parser.add_argument("--validate", action="store_true", help="Time the full ValidationPipeline")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    workbooks = sorted(p for p in Path(args.input_dir).rglob("*.xls*") if not p.name.startswith("~$"))
+    if args.limit:
+        workbooks = workbooks[:args.limit]
+    if not workbooks:
+        print(f"No workbooks found under {args.input_dir}")
+        return 1
+    print(f"{len(workbooks)} workbooks, concurrency {args.concurrency}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            results[mode] = run_mode(mode, workbooks, args, Path(tmp))
+            r = results[mode]
+            print(f"  [{mode}] {r['workbooks_per_min']} workbooks/min, {r['pages_per_s']} pages/s, "
+                  f"p50 {r['latency_p50_s']}s, {r['failures']} failures")
+
+    if "legacy" in results and "pooled" in results and results["legacy"]["workbooks_per_min"]:
+        speedup = results["pooled"]["workbooks_per_min"] / results["legacy"]["workbooks_per_min"]
+        print(f"Speedup: {speedup:.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
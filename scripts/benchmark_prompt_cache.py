@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Prompt-prefix reuse benchmark: sliding window vs prefix-stable layout.
+
+Replays a synthetic multi-turn mold-agent conversation (two agent calls per
+user turn: one that emits the tool call, one that answers from the tool
+result) and, for every call, reports how many prompt tokens must be
+prefilled: tokens after the longest prefix shared with the previous call's
+prompt, i.e. what llama.cpp/vLLM cannot reuse from the KV cache. Token counts
+use context_manager.estimate_tokens.
+
+With --llm-url the prompts are also sent to a running llama-server with
+cache_prompt enabled, and the server-reported prompt_n (tokens actually
+prefilled) and the client-side TTFT are recorded.
+
+Usage:
+    python scripts/benchmark_prompt_cache.py --turns 12
+    python scripts/benchmark_prompt_cache.py --turns 12 --llm-url http://127.0.0.1:8001/v1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage  # noqa: E402
+from langchain_core.messages import convert_to_openai_messages  # noqa: E402
+
+from agents import context_manager  # noqa: E402
+from agents.mold_agent import MOLD_SYSTEM_PROMPT  # noqa: E402
+
+
+def build_conversation(turns: int) -> List[List]:
+    """Return the message history as seen by each agent call."""
+    history = []
+    snapshots = []
+    for i in range(turns):
+        history.append(HumanMessage(content=f"第{i + 1}个问题：产品表面出现披锋，T{i % 3}试模，怎么解决？"))
+        snapshots.append(list(history))
+        call_id = f"call_{i}"
+        history.append(AIMessage(content="", tool_calls=[{
+            "id": call_id, "name": "search_troubleshooting_kb", "args": {"query": f"披锋 {i}"}
+        }]))
+        history.append(ToolMessage(
+            content=json.dumps({"results": [{"case_id": f"TS-{i}-{j}", "solution": "加铁0.03mm修正间隙" * 8}
+                                            for j in range(3)]}, ensure_ascii=False),
+            tool_call_id=call_id,
+        ))
+        snapshots.append(list(history))
+        history.append(AIMessage(content=f"找到3个披锋案例。建议参考案例{i}-1。"))
+    return snapshots
+
+
+def render(messages) -> str:
+    """Serialize a prompt the way a chat template would, in order."""
+    normalized = []
+    for m in messages:
+        if isinstance(m, tuple):
+            normalized.append({"role": m[0], "content": m[1]})
+        else:
+            normalized.append(convert_to_openai_messages(m))
+    return json.dumps(normalized, ensure_ascii=False)
+
+
+def common_prefix_len(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def measure_server(llm_url: str, messages, session_slot: int) -> Dict[str, Optional[float]]:
+    payload = {
+        "model": os.environ.get("LLM_MODEL", "qwen3-30b-a3b"),
+        "messages": json.loads(render(messages)),
+        "max_tokens": 8,
+        "stream": True,
+        "cache_prompt": True,
+        "id_slot": session_slot,
+    }
+    start = time.perf_counter()
+    ttft = None
+    prompt_n = None
+    with requests.post(f"{llm_url}/chat/completions", json=payload, stream=True, timeout=300) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if not line or not line.startswith(b"data: ") or line == b"data: [DONE]":
+                continue
+            chunk = json.loads(line[6:])
+            if ttft is None and chunk.get("choices") and chunk["choices"][0].get("delta", {}).get("content"):
+                ttft = time.perf_counter() - start
+            if "timings" in chunk:
+                prompt_n = chunk["timings"].get("prompt_n")
+    return {"ttft_ms": round(ttft * 1000, 1) if ttft else None, "server_prompt_n": prompt_n}
+
+
+def run_layout(layout: str, snapshots, llm_url: Optional[str], slot: int) -> Dict:
+    context_manager.PROMPT_LAYOUT = layout
+    previous = ""
+    per_call = []
+    for call, history in enumerate(snapshots, start=1):
+        prompt = context_manager.build_agent_messages(MOLD_SYSTEM_PROMPT, history, max_tokens=4000, max_messages=6)
+        text = render(prompt)
+        reused = common_prefix_len(previous, text)
+        row = {
+            "call": call,
+            "prompt_tokens": context_manager.estimate_tokens(text),
+            "prefill_tokens": context_manager.estimate_tokens(text[reused:]),
+        }
+        if llm_url:
+            row.update(measure_server(llm_url, prompt, slot))
+        per_call.append(row)
+        previous = text
+
+    steady = per_call[1:] or per_call
+    summary = {
+        "mean_prefill_tokens": round(statistics.mean(r["prefill_tokens"] for r in steady), 1),
+        "mean_prompt_tokens": round(statistics.mean(r["prompt_tokens"] for r in steady), 1),
+    }
+    ttfts = [r["ttft_ms"] for r in steady if r.get("ttft_ms")]
+    if ttfts:
+        summary["mean_ttft_ms"] = round(statistics.mean(ttfts), 1)
+    return {"summary": summary, "calls": per_call}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--llm-url", default=None, help="llama-server /v1 URL for live TTFT measurement")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    snapshots = build_conversation(args.turns)
+    results = {
+        "metadata": {"timestamp": datetime.now().isoformat(), "turns": args.turns,
+                     "block_size": context_manager.PROMPT_TRIM_BLOCK, "llm_url": args.llm_url},
+        # Different slots so the two layouts don't share one KV cache
+        "sliding": run_layout("sliding", snapshots, args.llm_url, slot=0),
+        "prefix_stable": run_layout("prefix_stable", snapshots, args.llm_url, slot=1),
+    }
+
+    print(f"{'call':>4} | {'sliding prefill':>16} | {'prefix-stable prefill':>22}")
+    for a, b in zip(results["sliding"]["calls"], results["prefix_stable"]["calls"]):
+        print(f"{a['call']:>4} | {a['prefill_tokens']:>16} | {b['prefill_tokens']:>22}")
+    for layout in ("sliding", "prefix_stable"):
+        print(f"{layout:>14}: {results[layout]['summary']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+First-utterance latency and memory benchmark for the speech sidecar.
+
+Simulates N LiveKit rooms arriving at once, each in its own job process (as
+LiveKit runs them), and feeds every room one utterance. Reports:
+
+- first-utterance latency: job start -> final transcript (plus the first
+  synthesized reply with --tts)
+- total RSS with all rooms live: every job process, plus the sidecar
+
+Modes:
+- inprocess: each job process loads Whisper (and TTS) on first use, as
+  livekit_local.get_shared_asr / get_shared_tts do without a sidecar
+- sidecar: one warm sidecar (python -m services.speech.sidecar) and thin
+  RemoteASR / RemoteTTS clients in the job processes. Sidecar startup is
+  paid once and reported separately.
+
+Usage:
+    python scripts/benchmark_speech_sidecar.py
+    python scripts/benchmark_speech_sidecar.py --rooms 1,4,8 --audio sample_16k.wav --tts
+    python scripts/benchmark_speech_sidecar.py --modes sidecar --socket /tmp/bestbox-speech.sock --output sidecar.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import psutil
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+FRAME_SAMPLES = 320  # 20ms at 16kHz, the frame size LiveKit hands LocalSpeechStream
+
+
+def load_audio(path: Optional[str]) -> np.ndarray:
+    """16kHz mono PCM16 utterance; a synthetic voiced tone if no file is given."""
+    if path:
+        with wave.open(path, "rb") as wf:
+            if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise SystemExit(f"{path}: expected 16kHz mono PCM16")
+            return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    t = np.arange(int(16000 * 2.0)) / 16000
+    voiced = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return (voiced * envelope * 4000).astype(np.int16)
+
+
+def run_room(mode: str, socket_path: str, pcm: np.ndarray, tts_text: str, results, release) -> None:
+    """One job process: attach (or load), transcribe an utterance, optionally reply."""
+    start = time.perf_counter()
+    if mode == "sidecar":
+        from services.speech.sidecar import RemoteASR, RemoteTTS
+        asr = RemoteASR(socket_path)
+        tts = RemoteTTS(socket_path) if tts_text else None
+    else:
+        from services.speech.asr import ASRConfig, StreamingASR
+        from services.speech.tts import StreamingTTS, TTSConfig
+        asr = StreamingASR(ASRConfig())
+        tts = StreamingTTS(TTSConfig(sample_rate=24000, fallback_to_piper=True)) if tts_text else None
+
+    transcript = ""
+    for i in range(0, len(pcm), FRAME_SAMPLES):
+        result = asr.feed_audio(pcm[i:i + FRAME_SAMPLES])
+        if result and result["type"] == "final":
+            transcript = result["text"]
+    if not transcript:
+        transcript = asr.finalize().get("text", "")
+    asr_ms = (time.perf_counter() - start) * 1000
+
+    reply_ms = None
+    if tts is not None:
+        tts_start = time.perf_counter()
+        tts.synthesize(tts_text)
+        reply_ms = (time.perf_counter() - tts_start) * 1000
+
+    results.put({
+        "pid": os.getpid(),
+        "asr_ms": round(asr_ms, 1),
+        "tts_ms": round(reply_ms, 1) if reply_ms is not None else None,
+        "first_utterance_ms": round(asr_ms + (reply_ms or 0), 1),
+        "transcript": transcript,
+    })
+    # Stay alive (models resident) until the parent has measured RSS
+    release.wait()
+
+
+def start_sidecar(socket_path: str, with_tts: bool, timeout: float) -> subprocess.Popen:
+    from services.speech.sidecar import ping
+
+    cmd = [sys.executable, "-m", "services.speech.sidecar", "--socket", socket_path]
+    if not with_tts:
+        cmd.append("--no-tts")
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"Sidecar exited with code {proc.returncode}")
+        try:
+            ping(socket_path)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit(f"Sidecar not ready after {timeout:.0f}s")
+
+
+def run_rooms(mode: str, rooms: int, socket_path: str, pcm: np.ndarray, args) -> Dict:
+    ctx = mp.get_context("spawn")
+    results, release = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=run_room, args=(mode, socket_path, pcm, args.tts_text if args.tts else "", results, release))
+             for _ in range(rooms)]
+    for p in procs:
+        p.start()
+    try:
+        per_room: List[Dict] = [results.get(timeout=args.room_timeout) for _ in procs]
+        rss = {p.pid: psutil.Process(p.pid).memory_info().rss / 1024 / 1024 for p in procs}
+        sidecar_rss = None
+        if mode == "sidecar":
+            from services.speech.sidecar import ping
+            sidecar_rss = ping(socket_path)["rss_mb"]
+    finally:
+        release.set()
+        for p in procs:
+            p.join(timeout=10)
+            if p.is_alive():
+                p.terminate()
+
+    latencies = [r["first_utterance_ms"] for r in per_room]
+    return {
+        "mode": mode,
+        "rooms": rooms,
+        "first_utterance_p50_ms": round(statistics.median(latencies), 1),
+        "first_utterance_max_ms": round(max(latencies), 1),
+        "jobs_rss_mb": round(sum(rss.values()), 1),
+        "sidecar_rss_mb": sidecar_rss,
+        "total_rss_mb": round(sum(rss.values()) + (sidecar_rss or 0), 1),
+        "per_room": per_room,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", default="1,4", help="Comma-separated room counts")
+    parser.add_argument("--modes", default="inprocess,sidecar", help="Comma-separated: inprocess, sidecar")
+    parser.add_argument("--audio", default=None, help="16kHz mono PCM16 WAV utterance (default: synthetic)")
+    parser.add_argument("--tts", action="store_true", help="Include the first TTS reply in the latency")
+    parser.add_argument("--tts-text", default="好的，我来帮您查一下。")
+    parser.add_argument("--socket", default=None, help="Use an already running sidecar on this socket")
+    parser.add_argument("--startup-timeout", type=float, default=300)
+    parser.add_argument("--room-timeout", type=float, default=600)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    pcm = load_audio(args.audio)
+    room_counts = [int(n) for n in args.rooms.split(",") if n.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    print(f"Utterance {len(pcm) / 16000:.1f}s, rooms {room_counts}, TTS {'on' if args.tts else 'off'}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            sidecar = None
+            socket_path = args.socket or os.path.join(tmp, "speech.sock")
+            if mode == "sidecar" and not args.socket:
+                start = time.perf_counter()
+                sidecar = start_sidecar(socket_path, args.tts, args.startup_timeout)
+                print(f"  [sidecar] warm in {time.perf_counter() - start:.1f}s (once, before any room)")
+            try:
+                for rooms in room_counts:
+                    r = run_rooms(mode, rooms, socket_path, pcm, args)
+                    results.append(r)
+                    print(f"  [{mode}] {rooms} rooms: first utterance p50 {r['first_utterance_p50_ms']:.0f}ms, "
+                          f"max {r['first_utterance_max_ms']:.0f}ms, total RSS {r['total_rss_mb']:.0f}MB")
+            finally:
+                if sidecar is not None:
+                    sidecar.terminate()
+                    sidecar.wait(timeout=30)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Concurrent /v1/troubleshooting/query throughput.
+
+Fires --requests SEMANTIC queries at --concurrency against the agent API
+handler (in-process ASGI) and reports requests/s and latency percentiles for:
+
+- legacy: the previous handler, which built a HybridSearcher (and with it a
+  new QdrantClient, an embeddings health check and a fresh synonym cache) per
+  request and ran the synchronous search on the event loop
+- shared: agent_api.direct_troubleshooting_query, reusing one HybridSearcher
+  and the process-wide Qdrant client from services.qdrant_clients, with the
+  search run in a worker thread
+
+Embeddings, reranker, LLM and Qdrant are a local stand-in (aiohttp, own
+thread and loop) with fixed per-call latencies; the Qdrant stand-in speaks
+REST, so gRPC is disabled unless --qdrant-host points at a real server with a
+populated troubleshooting_issues collection. PostgreSQL and Redis are not
+needed (the searcher degrades without them, identically in both modes).
+
+Usage:
+    python scripts/benchmark_troubleshooting_query.py --requests 200 --concurrency 16
+    python scripts/benchmark_troubleshooting_query.py --qdrant-host localhost --output tsq.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VECTOR_SIZE = 1024
+QUERIES = ["披锋怎么解决", "模具表面污染如何处理", "火花纹问题的解决方法", "缩水怎么改善"]
+
+
+class StandIn:
+    """Embeddings + reranker + LLM + Qdrant REST stand-in on its own loop."""
+
+    def __init__(self, embed_ms: float, rerank_ms: float, qdrant_ms: float):
+        self.embed_ms = embed_ms
+        self.rerank_ms = rerank_ms
+        self.qdrant_ms = qdrant_ms
+        self.url = ""
+        self.port = 0
+        self.qdrant_connections = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get("/health", self._ok)
+        app.router.add_post("/embed", self._embed)
+        app.router.add_post("/rerank", self._rerank)
+        app.router.add_post("/v1/chat/completions", self._chat)
+        app.router.add_get("/", self._qdrant_root)
+        app.router.add_post("/collections/{name}/points/query", self._qdrant_query)
+        runner = web.AppRunner(app)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server = site._server
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _ok(self, request):
+        return web.json_response({"status": "ok"})
+
+    async def _embed(self, request):
+        body = await request.json()
+        await asyncio.sleep(self.embed_ms / 1000)
+        return web.json_response({"embeddings": [[0.03125] * VECTOR_SIZE for _ in body["inputs"]]})
+
+    async def _rerank(self, request):
+        body = await request.json()
+        await asyncio.sleep(self.rerank_ms / 1000)
+        n = len(body["passages"])
+        return web.json_response({"ranked_indices": list(range(n)), "scores": [0.9 - i * 0.01 for i in range(n)]})
+
+    async def _chat(self, request):
+        content = '{"mode": "ISSUE_LEVEL", "intent": "SEMANTIC", "confidence": 0.9}'
+        return web.json_response({"choices": [{"message": {"content": content}}]})
+
+    async def _qdrant_root(self, request):
+        return web.json_response({"title": "qdrant - vector search engine", "version": "1.12.0"})
+
+    async def _qdrant_query(self, request):
+        body = await request.json()
+        await asyncio.sleep(self.qdrant_ms / 1000)
+        limit = body.get("limit", 10)
+        points = [
+            {
+                "id": i, "version": 0, "score": 0.9 - i * 0.01,
+                "payload": {
+                    "case_id": f"TS-{i}", "issue_id": f"TS-{i}-1", "part_number": "1947688",
+                    "problem": "产品披锋", "solution": "修正分型面间隙", "result_t1": "OK", "images": [],
+                },
+            }
+            for i in range(limit)
+        ]
+        return web.json_response({"result": {"points": points}, "status": "ok", "time": 0.0})
+
+
+def configure_env(args, stand_in: StandIn) -> None:
+    """Point every service the searcher touches at the stand-in (before imports)."""
+    os.environ["EMBEDDINGS_URL"] = stand_in.url
+    os.environ["RERANKER_URL"] = stand_in.url
+    os.environ["LLM_BASE_URL"] = stand_in.url
+    os.environ["TROUBLESHOOTING_LLM_URL"] = stand_in.url
+    os.environ.setdefault("POSTGRES_HOST", "127.0.0.1")
+    os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:1/0")
+    if args.qdrant_host:
+        os.environ["QDRANT_HOST"] = args.qdrant_host
+        os.environ["QDRANT_PORT"] = str(args.qdrant_port)
+    else:
+        os.environ["QDRANT_HOST"] = "127.0.0.1"
+        os.environ["QDRANT_PORT"] = str(stand_in.port)
+        os.environ["QDRANT_PREFER_GRPC"] = "false"
+
+
+def build_app():
+    from fastapi import FastAPI, HTTPException
+    from qdrant_client import QdrantClient
+
+    from services import agent_api
+    from services.agent_api import TroubleshootingQueryRequest, TroubleshootingQueryResponse
+    from services.troubleshooting import searcher as searcher_module
+
+    app = FastAPI()
+    app.post("/v1/troubleshooting/query", response_model=TroubleshootingQueryResponse)(
+        agent_api.direct_troubleshooting_query
+    )
+
+    @app.post("/legacy/troubleshooting/query", response_model=TroubleshootingQueryResponse)
+    async def legacy_query(request: TroubleshootingQueryRequest):
+        """The previous handler: new searcher + client per request, search on the loop."""
+        from services.troubleshooting.hybrid_searcher import HybridSearcher
+
+        start_time = time.time()
+        original = searcher_module.get_qdrant_client
+        searcher_module.get_qdrant_client = lambda host, port: QdrantClient(host=host, port=port)
+        try:
+            searcher = HybridSearcher(
+                qdrant_host=os.environ["QDRANT_HOST"],
+                qdrant_port=int(os.environ["QDRANT_PORT"]),
+                llm_url=os.environ["LLM_BASE_URL"],
+                embeddings_url=os.environ["EMBEDDINGS_URL"],
+            )
+        finally:
+            searcher_module.get_qdrant_client = original
+        try:
+            result = searcher.search(query=request.query, mode=request.mode, top_k=request.top_k)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return TroubleshootingQueryResponse(
+            query=result["query"], expanded_query=result["expanded_query"], mode=result["mode"],
+            total_found=result["total_found"], results=result["results"],
+            latency_ms=int((time.time() - start_time) * 1000),
+        )
+
+    return app
+
+
+async def run_mode(app, path: str, total: int, concurrency: int) -> Dict[str, Any]:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(QUERIES[i % len(QUERIES)])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                query = queue.get_nowait()
+                t0 = time.perf_counter()
+                resp = await client.post(path, json={"query": query, "mode": "SEMANTIC", "top_k": 5})
+                latencies.append((time.perf_counter() - t0) * 1000)
+                if resp.status_code != 200 or not resp.json().get("results"):
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests_per_s": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "errors": errors,
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    app = build_app()
+    results = {}
+    for mode, path in (("legacy", "/legacy/troubleshooting/query"), ("shared", "/v1/troubleshooting/query")):
+        # Warm-up (imports, first client/searcher construction)
+        await run_mode(app, path, total=4, concurrency=1)
+        results[mode] = await run_mode(app, path, args.requests, args.concurrency)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--embed-ms", type=float, default=15.0, help="Stand-in embedding latency")
+    parser.add_argument("--rerank-ms", type=float, default=20.0, help="Stand-in reranker latency")
+    parser.add_argument("--qdrant-ms", type=float, default=5.0, help="Stand-in Qdrant query latency")
+    parser.add_argument("--qdrant-host", default=None, help="Use a real Qdrant server instead of the stand-in")
+    parser.add_argument("--qdrant-port", type=int, default=6333)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    stand_in = StandIn(args.embed_ms, args.rerank_ms, args.qdrant_ms)
+    stand_in.start()
+    configure_env(args, stand_in)
+
+    results = asyncio.run(run(args))
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for mode, r in results.items():
+        print(f"{mode:>8}: {r['requests_per_s']:>7} req/s  p50 {r['p50_ms']:>7} ms  "
+              f"p95 {r['p95_ms']:>7} ms  errors {r['errors']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": {"timestamp": datetime.now().isoformat(), **vars(args)},
+                       "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
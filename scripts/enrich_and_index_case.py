@@ -96,6 +96,12 @@ async def process_case_pipeline(
         
         vlm_count = enriched_case.get('vlm_processed_count', 0)
         logger.info(f"✅ VLM Enrichment complete. Processed {vlm_count} images.")
+        dedup = enriched_case.get('vlm_dedup')
+        if dedup:
+            logger.info(
+                f"   Dedup: {dedup['reused']}/{dedup['images']} reused (ratio {dedup['dedup_ratio']:.0%}), "
+                f"{dedup['submitted']} VLM jobs, ~{dedup['vlm_seconds_saved']:.0f}s VLM time saved"
+            )
         
         # Save enriched JSON for inspection
         json_path = output_dir / f"{enriched_case['case_id']}_enriched.json"
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the backends agent_api talks to, for load testing.
+
+Each stand-in is a small FastAPI app speaking the same HTTP API as the real
+service, with deterministic output and configurable service time, so
+scripts/loadtest.py can drive agent_api end to end on any machine:
+
+- llm: OpenAI-compatible /v1/chat/completions (streaming and not), with a
+  configurable time to first token, token rate and concurrent slots. Replies
+  follow the request: json_schema output (router), ReAct JSON, the
+  troubleshooting classifiers and Text-to-SQL prompts, a tool call for a
+  share of tool-enabled requests (--tool-rate), otherwise a plain answer
+- embeddings: /embed (BGE-M3 style), 1024-dim vectors hashed from the text
+  around a shared direction, so any query is close enough to any document to
+  pass the searchers' score thresholds
+- reranker: /rerank, scoring passages by the same vectors
+- vlm: the VLM job API (/api/v1/health, /api/v1/jobs/upload, /api/v1/jobs/{id})
+- qdrant: Qdrant's REST API over an in-memory local-mode client (collections,
+  upsert, query, batch and grouped query, scroll, count)
+
+Every stand-in also serves /health and /stats (calls and service seconds per
+route), which the harness diffs to report per-backend load.
+
+Usage:
+    python scripts/loadtest_standins.py llm --port 18001 --ttft-ms 200 --tokens-per-s 40
+    python scripts/loadtest_standins.py embeddings --port 18004 --latency-ms 5
+    python scripts/loadtest_standins.py qdrant --port 18333
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+EMBEDDING_DIM = 1024
+# Weight of the direction shared by every vector: cosine between any two is ~w²/(w²+1)
+SHARED_WEIGHT = 1.7
+
+ANSWER_TEXT = (
+    "Based on the knowledge base, the most likely cause is a process setting "
+    "outside the validated window. Check the recorded parameters against the "
+    "last successful trial, adjust one variable at a time and confirm the "
+    "result on the next run before closing the issue. "
+)
+
+# Router destinations picked by keywords in the user's message
+ROUTE_KEYWORDS = [
+    ("mold_agent", ("披锋", "拉白", "火花纹", "模具", "缩水", "污染", "mold", "flash", "defect")),
+    ("erp_agent", ("vendor", "supplier", "procurement", "invoice", "inventory", "采购", "供应商")),
+    ("crm_agent", ("customer", "lead", "deal", "客户")),
+    ("it_ops_agent", ("server", "vpn", "alert", "log", "服务器")),
+    ("oa_agent", ("meeting", "leave", "calendar", "会议")),
+]
+
+# Prompts the troubleshooting pipeline sends with plain chat completions
+CANNED_JSON = [
+    ("搜索意图分类器", {"mode": "ISSUE_LEVEL", "confidence": 0.9, "reasoning": "issue query"}),
+    ("查询意图分类器", {"intent": "SEMANTIC", "confidence": 0.9, "reasoning": "how-to query"}),
+    ("请生成SQL查询", {
+        "sql": "SELECT issue_id, case_id, problem, solution FROM troubleshooting_issues "
+               "WHERE result_t1 = 'OK' OR result_t2 = 'OK' LIMIT 50",
+        "explanation": "successful issues",
+    }),
+]
+
+
+class ServiceStats:
+    """Per-route call counts and service time, served at /stats."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.routes: Dict[str, Dict[str, float]] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def record(self, route: str, seconds: float, status: int) -> None:
+        entry = self.routes.setdefault(route, {"calls": 0, "errors": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if status >= 400:
+            entry["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "routes": {k: dict(v) for k, v in self.routes.items()},
+        }
+
+
+def _create_app(name: str) -> FastAPI:
+    """App with /health, /stats and per-route timing (streamed bodies included)."""
+    app = FastAPI(title=f"loadtest {name} stand-in")
+    stats = ServiceStats()
+    app.state.stats = stats
+
+    @app.middleware("http")
+    async def _timing(request: Request, call_next):
+        if request.url.path in ("/health", "/stats"):
+            return await call_next(request)
+        start = time.perf_counter()
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        response = await call_next(request)
+        route = request.scope.get("route")
+        key = f"{request.method} {route.path}" if route is not None else f"unmatched {request.method} {request.url.path}"
+
+        body = response.body_iterator
+
+        async def _timed_body():
+            try:
+                async for part in body:
+                    yield part
+            finally:
+                stats.in_flight -= 1
+                stats.record(key, time.perf_counter() - start, response.status_code)
+
+        response.body_iterator = _timed_body()
+        return response
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy", "service": name}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats.snapshot()
+
+    return app
+
+
+# ==========================================================
+# Embeddings and reranker
+# ==========================================================
+
+_SHARED = np.random.default_rng(0).standard_normal(EMBEDDING_DIM)
+_SHARED /= np.linalg.norm(_SHARED)
+
+
+def embed_text(text: str) -> List[float]:
+    """Deterministic unit vector for ``text`` (same text, same vector)."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    noise = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+    noise /= np.linalg.norm(noise)
+    vector = SHARED_WEIGHT * _SHARED + noise
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def create_embeddings_app(latency_ms: float = 5.0, per_text_ms: float = 0.5) -> FastAPI:
+    app = _create_app("embeddings")
+
+    async def _embed(texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep((latency_ms + per_text_ms * len(texts)) / 1000)
+        return [embed_text(t) for t in texts]
+
+    @app.post("/embed")
+    async def embed(request: Request):
+        body = await request.json()
+        inputs = body.get("inputs", [])
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        return {"embeddings": await _embed(texts)}
+
+    @app.post("/v1/embeddings")
+    async def openai_embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        vectors = await _embed(texts)
+        return {
+            "object": "list",
+            "model": body.get("model", "bge-m3"),
+            "data": [{"object": "embedding", "index": i, "embedding": v} for i, v in enumerate(vectors)],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+def create_reranker_app(latency_ms: float = 10.0, per_passage_ms: float = 1.0) -> FastAPI:
+    app = _create_app("reranker")
+
+    @app.post("/rerank")
+    async def rerank(request: Request):
+        body = await request.json()
+        passages = body.get("passages", [])
+        await asyncio.sleep((latency_ms + per_passage_ms * len(passages)) / 1000)
+        query = np.array(embed_text(body.get("query", "")))
+        scores = [float(np.dot(query, embed_text(p))) for p in passages]
+        ranked = sorted(range(len(passages)), key=lambda i: scores[i], reverse=True)
+        return {"ranked_indices": ranked, "scores": [scores[i] for i in ranked]}
+
+    return app
+
+
+# ==========================================================
+# LLM
+# ==========================================================
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def choose_route(options: List[Any], question: str) -> Any:
+    """Pick an enum value, preferring router destinations matched by keyword."""
+    lowered = question.lower()
+    for destination, keywords in ROUTE_KEYWORDS:
+        if destination in options and any(k in lowered for k in keywords):
+            return destination
+    return "general_agent" if "general_agent" in options else options[0]
+
+
+def fill_schema(schema: Dict[str, Any], question: str, defs: Optional[Dict[str, Any]] = None) -> Any:
+    """A value satisfying a (strict) JSON schema, shaped by the question."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return fill_schema(defs[schema["$ref"].split("/")[-1]], question, defs)
+    if "enum" in schema:
+        return choose_route(schema["enum"], question)
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"] or schema["anyOf"]
+        return fill_schema(options[0], question, defs)
+    kind = schema.get("type")
+    if kind == "object":
+        return {k: fill_schema(v, question, defs) for k, v in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind == "integer":
+        return schema.get("default", 1)
+    if kind == "number":
+        return schema.get("default", 0.9)
+    if kind == "boolean":
+        return schema.get("default", False)
+    if kind == "null":
+        return None
+    return "load test stand-in reply"
+
+
+def tool_arguments(parameters: Dict[str, Any], question: str) -> Dict[str, Any]:
+    """Arguments for a tool call: the question for query-like fields, filler for other required ones."""
+    args = {}
+    required = set(parameters.get("required", []))
+    for name, schema in parameters.get("properties", {}).items():
+        if "query" in name or "question" in name:
+            args[name] = question
+        elif name in required:
+            args[name] = fill_schema(schema, question, parameters.get("$defs", {}))
+    return args
+
+
+class LLMStandIn:
+    """Reply planning and pacing for the LLM stand-in."""
+
+    def __init__(
+        self,
+        ttft_ms: float = 200.0,
+        tokens_per_s: float = 40.0,
+        answer_tokens: int = 60,
+        tool_rate: float = 0.5,
+        max_concurrency: int = 0,
+        preferred_tools: Tuple[str, ...] = ("search_troubleshooting_kb", "search_knowledge_base"),
+        seed: int = 0,
+    ):
+        self.ttft_s = ttft_ms / 1000
+        self.token_interval_s = 1.0 / tokens_per_s if tokens_per_s > 0 else 0.0
+        self.answer_tokens = answer_tokens
+        self.tool_rate = tool_rate
+        self.preferred_tools = preferred_tools
+        self.rng = random.Random(seed)
+        self.slots = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+
+    def answer(self) -> str:
+        words = re.findall(r"\S+\s*", ANSWER_TEXT)
+        return "".join(words[i % len(words)] for i in range(self.answer_tokens)).strip()
+
+    def plan(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Decide the reply: {"content": str} or {"tool_call": {"name", "arguments"}}."""
+        messages = body.get("messages", [])
+        prompt = "\n".join(_message_text(m) for m in messages)
+        question = next((_message_text(m) for m in reversed(messages) if m.get("role") == "user"), "")
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"].get("schema", {})
+            return {"content": json.dumps(fill_schema(schema, question), ensure_ascii=False)}
+
+        if "Decide your next action. Respond in JSON" in prompt:
+            match = re.search(r"User question: (.*)", prompt)
+            react_question = match.group(1).strip() if match else question
+            if "None yet." in prompt and self.rng.random() < self.tool_rate:
+                decision = {"reasoning": "Look it up first.", "action": "tool",
+                            "tool": "search_knowledge_base", "args": {"query": react_question}}
+            else:
+                decision = {"reasoning": "Enough context to answer.", "action": "answer", "response": self.answer()}
+            return {"content": json.dumps(decision, ensure_ascii=False)}
+
+        for marker, reply in CANNED_JSON:
+            if marker in prompt:
+                return {"content": json.dumps(reply, ensure_ascii=False)}
+
+        tools = {t["function"]["name"]: t["function"] for t in body.get("tools") or [] if t.get("type") == "function"}
+        last_role = messages[-1].get("role") if messages else None
+        if tools and last_role == "user" and self.rng.random() < self.tool_rate:
+            name = next((t for t in self.preferred_tools if t in tools), next(iter(tools)))
+            arguments = tool_arguments(tools[name].get("parameters", {}), question)
+            return {"tool_call": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)}}
+
+        return {"content": self.answer()}
+
+    async def acquire(self) -> None:
+        if self.slots is not None:
+            await self.slots.acquire()
+
+    def release(self) -> None:
+        if self.slots is not None:
+            self.slots.release()
+
+
+def _pieces(text: str, size: int = 0) -> List[str]:
+    """Split text into streamed tokens (words, or fixed-size slices)."""
+    if size:
+        return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+    return re.findall(r"\S+\s*|\s+", text) or [""]
+
+
+def create_llm_app(llm: LLMStandIn) -> FastAPI:
+    app = _create_app("llm")
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "loadtest-llm", "object": "model", "owned_by": "loadtest"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        reply = llm.plan(body)
+        model = body.get("model", "loadtest-llm")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        prompt_tokens = len(json.dumps(body.get("messages", []), ensure_ascii=False)) // 4
+
+        if "tool_call" in reply:
+            call = reply["tool_call"]
+            tokens = _pieces(call["arguments"], size=16)
+        else:
+            tokens = _pieces(reply["content"])
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                 "total_tokens": prompt_tokens + len(tokens)}
+
+        if not body.get("stream"):
+            await llm.acquire()
+            try:
+                await asyncio.sleep(llm.ttft_s + llm.token_interval_s * max(len(tokens) - 1, 0))
+            finally:
+                llm.release()
+            message: Dict[str, Any] = {"role": "assistant", "content": reply.get("content")}
+            finish = "stop"
+            if "tool_call" in reply:
+                message["tool_calls"] = [{"id": f"call_{uuid.uuid4().hex[:8]}", "type": "function",
+                                          "function": reply["tool_call"]}]
+                finish = "tool_calls"
+            return {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": message, "logprobs": None, "finish_reason": finish}],
+                "usage": usage,
+            }
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            payload = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": model, "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish}],
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def generate():
+            await llm.acquire()
+            try:
+                await asyncio.sleep(llm.ttft_s)
+                if "tool_call" in reply:
+                    yield chunk({"role": "assistant", "content": None, "tool_calls": [{
+                        "index": 0, "id": f"call_{uuid.uuid4().hex[:8]}", "type": "function",
+                        "function": {"name": reply["tool_call"]["name"], "arguments": ""},
+                    }]})
+                    for i, piece in enumerate(tokens):
+                        if i:
+                            await asyncio.sleep(llm.token_interval_s)
+                        yield chunk({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]})
+                    yield chunk({}, "tool_calls")
+                else:
+                    for i, piece in enumerate(tokens):
+                        if i:
+                            await asyncio.sleep(llm.token_interval_s)
+                        yield chunk({"role": "assistant", "content": piece} if i == 0 else {"content": piece})
+                    yield chunk({}, "stop")
+                if include_usage:
+                    final = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [], "usage": usage}
+                    yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                llm.release()
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    return app
+
+
+# ==========================================================
+# VLM job service
+# ==========================================================
+
+def create_vlm_app(job_seconds: float = 2.0) -> FastAPI:
+    app = _create_app("vlm")
+    jobs: Dict[str, float] = {}
+
+    @app.get("/api/v1/health")
+    async def vlm_health():
+        return {"status": "healthy", "model": "loadtest-vlm", "queue_depth": len(jobs)}
+
+    @app.post("/api/v1/jobs/upload")
+    async def upload(request: Request):
+        await request.body()
+        job_id = f"job-{uuid.uuid4().hex[:12]}"
+        jobs[job_id] = time.time() + job_seconds
+        return {
+            "job_id": job_id,
+            "status": "pending",
+            "estimated_duration": f"{job_seconds:.0f}s",
+            "check_status_url": f"/api/v1/jobs/{job_id}",
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    @app.get("/api/v1/jobs/{job_id}")
+    async def job_status(job_id: str):
+        ready_at = jobs.get(job_id)
+        if ready_at is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if time.time() < ready_at:
+            return {"job_id": job_id, "status": "processing", "progress": 0.5}
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "result": {
+                "job_id": job_id,
+                "document_summary": "Load test stand-in analysis.",
+                "key_insights": ["stand-in"],
+                "tags": ["loadtest"],
+                "metadata": {"confidence_score": 0.9, "processing_model": "loadtest-vlm"},
+            },
+        }
+
+    return app
+
+
+# ==========================================================
+# Qdrant (REST facade over local mode)
+# ==========================================================
+
+def create_qdrant_app() -> FastAPI:
+    from qdrant_client import QdrantClient
+    from qdrant_client.http import models
+
+    app = _create_app("qdrant")
+    client = QdrantClient(":memory:")
+    try:
+        version = metadata.version("qdrant-client")
+    except metadata.PackageNotFoundError:
+        version = "1.12.0"
+
+    def ok(result: Any) -> JSONResponse:
+        if hasattr(result, "model_dump"):
+            result = result.model_dump(mode="json")
+        elif isinstance(result, list):
+            result = [r.model_dump(mode="json") if hasattr(r, "model_dump") else r for r in result]
+        return JSONResponse({"result": result, "status": "ok", "time": 0.0})
+
+    def completed() -> JSONResponse:
+        return ok({"operation_id": 0, "status": "completed"})
+
+    def query_kwargs(req) -> Dict[str, Any]:
+        return {
+            "query": req.query,
+            "using": req.using,
+            "prefetch": req.prefetch,
+            "query_filter": req.filter,
+            "search_params": req.params,
+            "score_threshold": req.score_threshold,
+            "with_payload": req.with_payload if req.with_payload is not None else False,
+            "with_vectors": req.with_vector if req.with_vector is not None else False,
+            "lookup_from": req.lookup_from,
+        }
+
+    def require(name: str) -> None:
+        if not client.collection_exists(name):
+            raise HTTPException(status_code=404, detail=f"Collection `{name}` doesn't exist!")
+
+    @app.get("/")
+    async def root():
+        return {"title": "qdrant - vector search engine (loadtest stand-in)", "version": version}
+
+    @app.get("/collections")
+    async def list_collections():
+        return ok(client.get_collections())
+
+    @app.get("/collections/{name}/exists")
+    async def collection_exists(name: str):
+        return ok({"exists": client.collection_exists(name)})
+
+    @app.get("/collections/{name}")
+    async def get_collection(name: str):
+        require(name)
+        return ok(client.get_collection(name))
+
+    @app.put("/collections/{name}")
+    async def create_collection(name: str, request: Request):
+        req = models.CreateCollection.model_validate(await request.json())
+        client.create_collection(name, vectors_config=req.vectors, sparse_vectors_config=req.sparse_vectors)
+        return ok(True)
+
+    @app.delete("/collections/{name}")
+    async def delete_collection(name: str):
+        return ok(client.delete_collection(name))
+
+    @app.put("/collections/{name}/index")
+    async def create_index(name: str, request: Request):
+        req = models.CreateFieldIndex.model_validate(await request.json())
+        client.create_payload_index(name, req.field_name, req.field_schema)
+        return completed()
+
+    @app.put("/collections/{name}/points")
+    async def upsert(name: str, request: Request):
+        require(name)
+        body = await request.json()
+        if "batch" in body:
+            points = models.PointsBatch.model_validate(body).batch
+        else:
+            points = models.PointsList.model_validate(body).points
+        client.upsert(name, points=points)
+        return completed()
+
+    @app.post("/collections/{name}/points")
+    async def retrieve(name: str, request: Request):
+        require(name)
+        req = models.PointRequest.model_validate(await request.json())
+        return ok(client.retrieve(name, req.ids, with_payload=req.with_payload if req.with_payload is not None else True,
+                                  with_vectors=req.with_vector or False))
+
+    @app.post("/collections/{name}/points/delete")
+    async def delete_points(name: str, request: Request):
+        require(name)
+        body = await request.json()
+        selector = (models.PointIdsList.model_validate(body) if "points" in body
+                    else models.FilterSelector.model_validate(body))
+        client.delete(name, points_selector=selector)
+        return completed()
+
+    @app.post("/collections/{name}/points/query")
+    async def query(name: str, request: Request):
+        require(name)
+        req = models.QueryRequest.model_validate(await request.json())
+        return ok(client.query_points(name, limit=req.limit or 10, offset=req.offset, **query_kwargs(req)))
+
+    @app.post("/collections/{name}/points/query/batch")
+    async def query_batch(name: str, request: Request):
+        require(name)
+        req = models.QueryRequestBatch.model_validate(await request.json())
+        return ok([client.query_points(name, limit=r.limit or 10, offset=r.offset, **query_kwargs(r))
+                   for r in req.searches])
+
+    @app.post("/collections/{name}/points/query/groups")
+    async def query_groups(name: str, request: Request):
+        require(name)
+        req = models.QueryGroupsRequest.model_validate(await request.json())
+        return ok(client.query_points_groups(
+            name, group_by=req.group_by, limit=req.limit or 10, group_size=req.group_size or 3,
+            with_lookup=req.with_lookup, **query_kwargs(req),
+        ))
+
+    @app.post("/collections/{name}/points/scroll")
+    async def scroll(name: str, request: Request):
+        require(name)
+        req = models.ScrollRequest.model_validate(await request.json())
+        points, next_offset = client.scroll(
+            name, scroll_filter=req.filter, limit=req.limit or 10, offset=req.offset, order_by=req.order_by,
+            with_payload=req.with_payload if req.with_payload is not None else True,
+            with_vectors=req.with_vector or False,
+        )
+        return ok({"points": [p.model_dump(mode="json") for p in points], "next_page_offset": next_offset})
+
+    @app.post("/collections/{name}/points/count")
+    async def count(name: str, request: Request):
+        require(name)
+        req = models.CountRequest.model_validate(await request.json())
+        return ok(client.count(name, count_filter=req.filter, exact=True))
+
+    return app
+
+
+# ==========================================================
+# CLI
+# ==========================================================
+
+def build_app(args: argparse.Namespace) -> FastAPI:
+    if args.service == "llm":
+        return create_llm_app(LLMStandIn(
+            ttft_ms=args.ttft_ms,
+            tokens_per_s=args.tokens_per_s,
+            answer_tokens=args.answer_tokens,
+            tool_rate=args.tool_rate,
+            max_concurrency=args.max_concurrency,
+            seed=args.seed,
+        ))
+    if args.service == "embeddings":
+        return create_embeddings_app(latency_ms=args.latency_ms)
+    if args.service == "reranker":
+        return create_reranker_app(latency_ms=args.latency_ms)
+    if args.service == "vlm":
+        return create_vlm_app(job_seconds=args.job_seconds)
+    return create_qdrant_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("service", choices=["llm", "embeddings", "reranker", "vlm", "qdrant"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--ttft-ms", type=float, default=200.0, help="llm: time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=40.0, help="llm: decode rate per request")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="llm: tokens in a plain answer")
+    parser.add_argument("--tool-rate", type=float, default=0.5, help="llm: share of tool-enabled turns that call a tool")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="llm: concurrent generation slots (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="llm: seed for tool-call decisions")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="embeddings/reranker: base service time")
+    parser.add_argument("--job-seconds", type=float, default=2.0, help="vlm: time until a job completes")
+    args = parser.parse_args()
+
+    uvicorn.run(build_app(args), host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
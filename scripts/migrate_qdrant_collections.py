@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Convert existing Qdrant collections to a storage/quantization profile.
+
+Applies a profile from services/qdrant_profiles.py in place with
+update_collection (quantization, on-disk vectors and payload, HNSW m and
+ef_construct) and creates any missing keyword payload indexes. Qdrant
+rebuilds segments in the background; the collection stays searchable
+throughout, and --wait blocks until it reports green again.
+
+Usage:
+    python scripts/migrate_qdrant_collections.py --dry-run
+    python scripts/migrate_qdrant_collections.py --profile int8 --wait
+    python scripts/migrate_qdrant_collections.py --profile full --collections troubleshooting_issues
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qdrant_client.models import CollectionStatus  # noqa: E402
+
+from services.qdrant_clients import get_qdrant_client  # noqa: E402
+from services.qdrant_profiles import (  # noqa: E402
+    PROFILES,
+    QDRANT_COLLECTION_PROFILE,
+    migration_diff,
+    payload_indexes,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def describe(info) -> str:
+    """One-line summary of a collection's current storage settings."""
+    params = info.config.params
+    quantization = info.config.quantization_config
+    kind = "none"
+    if quantization is not None:
+        kind = "int8" if getattr(quantization, "scalar", None) else "binary" if getattr(quantization, "binary", None) else "other"
+    return (
+        f"points={info.points_count} quantization={kind} "
+        f"on_disk_payload={params.on_disk_payload} hnsw_m={info.config.hnsw_config.m} "
+        f"ef_construct={info.config.hnsw_config.ef_construct}"
+    )
+
+
+def dense_vector_names(info) -> tuple:
+    vectors = info.config.params.vectors
+    return tuple(vectors.keys()) if isinstance(vectors, dict) else ("",)
+
+
+def migrate_collection(client, name: str, profile: str, dry_run: bool) -> None:
+    info = client.get_collection(name)
+    logger.info(f"{name}: {describe(info)}")
+
+    existing_indexes = set(info.payload_schema or {})
+    missing = [(f, s) for f, s in payload_indexes(name) if f not in existing_indexes]
+
+    if dry_run:
+        logger.info(f"   would apply profile '{profile}' and index {[f for f, _ in missing] or 'nothing'}")
+        return
+
+    client.update_collection(collection_name=name, **migration_diff(profile, dense_vector_names(info)))
+    for field, schema in missing:
+        client.create_payload_index(name, field, schema)
+    logger.info(f"   applied profile '{profile}', indexed {[f for f, _ in missing] or 'nothing new'}")
+
+
+def wait_green(client, names, timeout: float) -> None:
+    deadline = time.time() + timeout
+    pending = set(names)
+    while pending and time.time() < deadline:
+        for name in list(pending):
+            if client.get_collection(name).status == CollectionStatus.GREEN:
+                logger.info(f"{name}: {describe(client.get_collection(name))} (green)")
+                pending.discard(name)
+        if pending:
+            time.sleep(2)
+    if pending:
+        logger.warning(f"Still optimizing after {timeout:.0f}s: {sorted(pending)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default=QDRANT_COLLECTION_PROFILE, choices=sorted(PROFILES))
+    parser.add_argument("--collections", nargs="*", help="Collections to migrate (default: all)")
+    parser.add_argument("--host", default=None, help="Qdrant host (default: QDRANT_HOST)")
+    parser.add_argument("--port", type=int, default=None, help="Qdrant port (default: QDRANT_PORT)")
+    parser.add_argument("--dry-run", action="store_true", help="Show current settings and planned changes only")
+    parser.add_argument("--wait", action="store_true", help="Wait for optimization to finish")
+    parser.add_argument("--timeout", type=float, default=1800, help="Seconds to --wait at most")
+    args = parser.parse_args()
+
+    client = get_qdrant_client(args.host, args.port)
+    names = args.collections or [c.name for c in client.get_collections().collections]
+
+    for name in names:
+        try:
+            migrate_collection(client, name, args.profile, args.dry_run)
+        except Exception as e:
+            logger.error(f"{name}: migration failed: {e}")
+
+    if args.wait and not args.dry_run:
+        wait_green(client, names, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,13 +22,12 @@ sys.path.insert(0, str(project_root))
 
 import requests
 import uuid
-import re
-import hashlib
-from qdrant_client.models import Distance, PointStruct, SparseVector
+from qdrant_client.models import Distance, PointStruct
 from typing import List, Dict, Any
 from services.rag_pipeline.ingest import DocumentIngester
 from services.rag_pipeline.chunker import TextChunker
 from services.rag_pipeline.vector_store import VectorStore
+from services.rag_pipeline.sparse_encoder import encode_documents, sparse_vector_name
 
 
 def get_embeddings(texts: List[str], timeout: int = 30) -> List[List[float]]:
@@ -51,19 +50,6 @@ def get_embeddings(texts: List[str], timeout: int = 30) -> List[List[float]]:
     return response.json()["embeddings"]
 
 
-def build_sparse_vector(text: str, size: int = 65536) -> SparseVector:
-    """Build a simple hashed sparse vector for BM25-style hybrid search."""
-    term_counts: Dict[int, int] = {}
-    for token in re.findall(r"[A-Za-z0-9_]+", text.lower()):
-        token_hash = hashlib.md5(token.encode("utf-8")).hexdigest()
-        idx = int(token_hash[:8], 16) % size
-        term_counts[idx] = term_counts.get(idx, 0) + 1
-
-    indices = list(term_counts.keys())
-    values = [float(term_counts[i]) for i in indices]
-    return SparseVector(indices=indices, values=values)
-
-
 def seed_knowledge_base():
     """Main seeding function."""
     print("🚀 Starting knowledge base seeding...")
@@ -145,21 +131,21 @@ def seed_knowledge_base():
                 chunk_texts = [chunk["text"] for chunk in chunks]
                 print(f"     Generating embeddings...")
                 embeddings = get_embeddings(chunk_texts, timeout=30)
+                sparse_vectors = encode_documents(chunk_texts)
 
                 # Step 4: Prepare Qdrant documents
                 points = []
                 doc_stem = doc_path.stem
 
-                for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+                for i, (chunk, embedding, sparse_vector) in enumerate(zip(chunks, embeddings, sparse_vectors)):
                     chunk_id = f"{doc_stem}_chunk{i}"
 
-                    sparse_vector = build_sparse_vector(chunk["text"])
+                    vector = {"": embedding}
+                    if sparse_vector is not None:
+                        vector[sparse_vector_name()] = sparse_vector
                     point = PointStruct(
                         id=str(uuid.uuid4()),  # Use UUID for Qdrant
-                        vector={
-                            "": embedding,
-                            "text": sparse_vector,
-                        },
+                        vector=vector,
                         payload={
                             "chunk_id": chunk_id,
                             "text": chunk["text"],
@@ -360,7 +360,7 @@ if [ "${ENABLE_SLACK_GATEWAY:-false}" = "true" ]; then
     else
         echo "Starting Slack Gateway..."
         # We don't have a specific start script, so running python directly in background
-        nohup $PYTHON_EXEC services/slack_gateway.py > slack_gateway.log 2>&1 &
+        nohup $PYTHON_EXEC -m services.slack_gateway > slack_gateway.log 2>&1 &
         sleep 1
         echo -e "${GREEN}✓ Slack Gateway started${NC}"
     fi
@@ -372,7 +372,7 @@ if [ "${ENABLE_TELEGRAM_GATEWAY:-false}" = "true" ]; then
         echo -e "${YELLOW}Telegram Gateway already running${NC}"
     else
         echo "Starting Telegram Gateway..."
-        nohup $PYTHON_EXEC services/telegram_gateway.py > telegram_gateway.log 2>&1 &
+        nohup $PYTHON_EXEC -m services.telegram_gateway > telegram_gateway.log 2>&1 &
         sleep 1
         echo -e "${GREEN}✓ Telegram Gateway started${NC}"
     fi
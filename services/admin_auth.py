@@ -7,10 +7,13 @@ Roles: admin, engineer, viewer.
 PostgreSQL tables: admin_users, audit_log (created by migrations/005_admin_rbac.sql).
 """
 
+import asyncio
 import os
 import logging
 import hashlib
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
@@ -153,17 +156,30 @@ OIDC_DISCOVERY_URL = os.getenv(
 OIDC_CLIENT_ID = os.getenv("OIDC_CLIENT_ID", "bestbox-admin")
 OIDC_CLIENT_SECRET = os.getenv("OIDC_CLIENT_SECRET", "bestbox-secret")
 
+# JWKS is refetched after the TTL, or early when a token names an unknown kid
+# (key rotation); unknown-kid refreshes are rate limited so forged kids can't
+# turn every request into a JWKS download
+OIDC_JWKS_TTL_SECONDS = int(os.getenv("OIDC_JWKS_TTL_SECONDS", "3600"))
+OIDC_JWKS_MIN_REFRESH_SECONDS = int(os.getenv("OIDC_JWKS_MIN_REFRESH_SECONDS", "30"))
+
+# Verified OIDC tokens are remembered briefly (never past their exp)
+OIDC_TOKEN_CACHE_SIZE = int(os.getenv("OIDC_TOKEN_CACHE_SIZE", "1024"))
+OIDC_TOKEN_CACHE_TTL_SECONDS = int(os.getenv("OIDC_TOKEN_CACHE_TTL_SECONDS", "60"))
+
 _oidc_metadata_cache: Optional[Dict[str, Any]] = None
 _oidc_cache_time: float = 0
 
+_jwks_cache: Optional[Dict[str, Any]] = None  # {"key_set", "kids", "fetched_at"}
+_jwks_lock: Optional[asyncio.Lock] = None
+_verified_tokens: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
 
 async def get_oidc_metadata() -> Dict[str, Any]:
     """Fetch OIDC discovery metadata (cached for 5 minutes)."""
     global _oidc_metadata_cache, _oidc_cache_time
-    import time as _time
     import aiohttp
 
-    now = _time.time()
+    now = time.time()
     if _oidc_metadata_cache and (now - _oidc_cache_time) < 300:
         return _oidc_metadata_cache
 
@@ -182,37 +198,154 @@ async def get_oidc_metadata() -> Dict[str, Any]:
     return _oidc_metadata_cache or {}
 
 
+async def _fetch_jwks(jwks_uri: str) -> Optional[Dict[str, Any]]:
+    import aiohttp
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(
+                jwks_uri, timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status != 200:
+                    return None
+                return await resp.json()
+    except Exception as e:
+        logger.warning(f"Failed to fetch OIDC JWKS: {e}")
+        return None
+
+
+async def get_jwks(kid: Optional[str] = None):
+    """Return the IdP key set, refreshing on TTL expiry or an unseen ``kid``.
+
+    Returns an authlib ``KeySet`` or ``None`` if no keys could be loaded.
+    """
+    global _jwks_cache, _jwks_lock
+    from authlib.jose import JsonWebKey
+
+    def _usable(cache, now) -> bool:
+        if cache is None or now - cache["fetched_at"] >= OIDC_JWKS_TTL_SECONDS:
+            return False
+        if kid and kid not in cache["kids"]:
+            # Unknown key: allow a refresh unless we just did one
+            return now - cache["fetched_at"] < OIDC_JWKS_MIN_REFRESH_SECONDS
+        return True
+
+    if _usable(_jwks_cache, time.monotonic()):
+        return _jwks_cache["key_set"]
+
+    if _jwks_lock is None:
+        _jwks_lock = asyncio.Lock()
+    async with _jwks_lock:
+        # Another request may have refreshed while we waited
+        if _usable(_jwks_cache, time.monotonic()):
+            return _jwks_cache["key_set"]
+
+        metadata = await get_oidc_metadata()
+        jwks_uri = metadata.get("jwks_uri")
+        if not jwks_uri:
+            logger.error("OIDC metadata missing jwks_uri")
+            return _jwks_cache["key_set"] if _jwks_cache else None
+
+        jwks = await _fetch_jwks(jwks_uri)
+        if jwks is None:
+            # Keep serving the last good keys through an IdP outage
+            return _jwks_cache["key_set"] if _jwks_cache else None
+
+        _jwks_cache = {
+            "key_set": JsonWebKey.import_key_set(jwks),
+            "kids": {k.get("kid") for k in jwks.get("keys", [])},
+            "fetched_at": time.monotonic(),
+        }
+        return _jwks_cache["key_set"]
+
+
+def peek_token(token: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Decode a JWT's header and claims WITHOUT verifying it.
+
+    Only used to pick a verifier; returns ``(header, claims)`` or ``None`` if
+    the token is not a well-formed JWT.
+    """
+    import json
+    import base64
+
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        header, claims = (
+            json.loads(base64.urlsafe_b64decode(part + "=" * (-len(part) % 4)))
+            for part in parts[:2]
+        )
+    except Exception:
+        return None
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        return None
+    return header, claims
+
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cached_claims(token: str) -> Optional[Dict[str, Any]]:
+    key = _token_cache_key(token)
+    entry = _verified_tokens.get(key)
+    if entry is None:
+        return None
+    claims, expires_at = entry
+    if expires_at <= time.time():
+        _verified_tokens.pop(key, None)
+        return None
+    _verified_tokens.move_to_end(key)
+    return dict(claims)
+
+
+def _remember_claims(token: str, claims: Dict[str, Any], exp: Optional[float]) -> None:
+    expires_at = time.time() + OIDC_TOKEN_CACHE_TTL_SECONDS
+    if exp:
+        expires_at = min(expires_at, float(exp))
+    key = _token_cache_key(token)
+    _verified_tokens[key] = (dict(claims), expires_at)
+    _verified_tokens.move_to_end(key)
+    while len(_verified_tokens) > OIDC_TOKEN_CACHE_SIZE:
+        _verified_tokens.popitem(last=False)
+
+
+def clear_oidc_caches() -> None:
+    """Drop cached metadata, JWKS and verified tokens."""
+    global _oidc_metadata_cache, _oidc_cache_time, _jwks_cache
+    _oidc_metadata_cache = None
+    _oidc_cache_time = 0
+    _jwks_cache = None
+    _verified_tokens.clear()
+
+
 async def verify_oidc_token(token: str) -> Optional[Dict[str, Any]]:
     """Verify an OIDC access/id token from Authelia.
 
     Returns user claims ``{sub, username, role, groups, token_type}`` or ``None``.
     """
     try:
-        from authlib.jose import JsonWebToken, JsonWebKey
+        from authlib.jose import JsonWebToken
         from authlib.jose.errors import JoseError
     except ImportError:
         logger.debug("authlib not installed – OIDC verification skipped")
         return None
 
-    import aiohttp
+    cached = _cached_claims(token)
+    if cached is not None:
+        return cached
 
     try:
-        metadata = await get_oidc_metadata()
-        jwks_uri = metadata.get("jwks_uri")
-        if not jwks_uri:
-            logger.error("OIDC metadata missing jwks_uri")
-            return None
+        peeked = peek_token(token)
+        kid = peeked[0].get("kid") if peeked else None
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                jwks_uri, timeout=aiohttp.ClientTimeout(total=5)
-            ) as resp:
-                if resp.status != 200:
-                    return None
-                jwks = await resp.json()
+        key_set = await get_jwks(kid)
+        if key_set is None:
+            return None
 
         jwt = JsonWebToken(["RS256"])
-        claims = jwt.decode(token, JsonWebKey.import_key_set(jwks))
+        claims = jwt.decode(token, key_set)
         claims.validate()
 
         username = claims.get("preferred_username") or claims.get("sub")
@@ -225,13 +358,15 @@ async def verify_oidc_token(token: str) -> Optional[Dict[str, Any]]:
         elif "engineer" in groups:
             role = "engineer"
 
-        return {
+        user = {
             "sub": claims["sub"],
             "username": username,
             "role": role,
             "groups": groups,
             "token_type": "oidc",
         }
+        _remember_claims(token, user, claims.get("exp"))
+        return user
 
     except JoseError as e:
         logger.debug(f"OIDC token verification failed: {e}")
@@ -241,6 +376,22 @@ async def verify_oidc_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+async def verify_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a bearer token with the verifier its header/issuer point to.
+
+    Self-issued tokens (HS256, no issuer) are checked locally without touching
+    the IdP; everything else goes to OIDC verification.
+    """
+    peeked = peek_token(token)
+    if peeked is None:
+        return None
+    header, claims = peeked
+
+    if header.get("alg") == JWT_ALGORITHM and not claims.get("iss"):
+        return decode_jwt_token(token)
+    return await verify_oidc_token(token)
+
+
 # ------------------------------------------------------------------
 # Database operations
 # ------------------------------------------------------------------
@@ -109,7 +109,7 @@ async def get_current_user(
     if os.getenv("ADMIN_DEV_MODE", "").lower() in ("1", "true", "yes"):
         return {"sub": "dev", "username": "dev-admin", "role": "admin"}
 
-    from services.admin_auth import decode_jwt_token, verify_oidc_token
+    from services.admin_auth import verify_token
 
     token = None
 
@@ -132,13 +132,8 @@ async def get_current_user(
     if not token:
         raise HTTPException(status_code=401, detail="Authorization required")
 
-    # Try OIDC verification first (Authelia tokens)
-    oidc_claims = await verify_oidc_token(token)
-    if oidc_claims:
-        return oidc_claims
-
-    # Fall back to self-issued JWT
-    claims = decode_jwt_token(token)
+    # Self-issued JWTs are verified locally; Authelia tokens via cached JWKS
+    claims = await verify_token(token)
     if not claims:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
@@ -364,33 +359,17 @@ def _normalize_bbox(bbox: Any) -> Optional[List[float]]:
     return None
 
 
-async def _extract_images_from_pdf(
+def _plan_pdf_crops(
     pdf_path: Path,
     json_result: List[List[Dict[str, Any]]],
-    doc_id: str,
-    collection: str,
-    base_dir: Optional[Path] = None,
-    dpi: int = 200,
-) -> Dict[str, Dict[str, Any]]:
-    """Extract image regions from *pdf_path* using GLM-OCR bbox data.
-
-    Stores PNG crops under: data/uploads/images/{collection}/{doc_id}/p{page}_img{index}.png
+) -> tuple[List[Dict[str, Any]], int]:
+    """Select, clamp and deduplicate GLM-OCR image bboxes (no rendering).
 
-    Returns a manifest keyed by image_id (e.g. 'p0_img0').
+    Returns (crops, rejected_text_blocks); each crop has image_id, page, bbox,
+    rect (clamped to the page) and key (the placeholder lookup key).
     """
-    if fitz is None:
-        raise RuntimeError("pymupdf_not_installed")
-
-    # Basic path safety: keep within IMAGE_DIR
-    safe_collection = re.sub(r"[^A-Za-z0-9._\-]", "_", collection)
-    safe_doc_id = re.sub(r"[^A-Za-z0-9._\-]", "_", doc_id)
-
-    root_dir = base_dir or IMAGE_DIR
-    image_dir = root_dir / safe_collection / safe_doc_id
-    image_dir.mkdir(parents=True, exist_ok=True)
-
-    manifest: Dict[str, Dict[str, Any]] = {}
-    bbox_to_id: Dict[tuple[int, tuple[int, int, int, int]], str] = {}
+    crops: List[Dict[str, Any]] = []
+    seen: set[tuple[int, tuple[int, ...]]] = set()
     rejected_count = 0
 
     pdf = fitz.open(str(pdf_path))
@@ -399,8 +378,7 @@ async def _extract_images_from_pdf(
             if page_idx >= len(pdf):
                 continue
 
-            page = pdf[page_idx]
-            page_rect = page.rect
+            page_rect = pdf[page_idx].rect
             img_idx = 0
 
             for elem in page_elements or []:
@@ -413,6 +391,11 @@ async def _extract_images_from_pdf(
                 if not bbox:
                     continue
 
+                # The same region reported twice maps to one crop
+                bbox_key = (page_idx, tuple(int(round(v)) for v in bbox))
+                if bbox_key in seen:
+                    continue
+
                 x1, y1, x2, y2 = bbox
                 # Normalize ordering and clamp to page bounds
                 x0 = max(min(x1, x2), page_rect.x0)
@@ -422,61 +405,105 @@ async def _extract_images_from_pdf(
                 if x1c - x0 < 1 or y1c - y0 < 1:
                     continue
 
-                rect = fitz.Rect(x0, y0, x1c, y1c)
-                image_id = f"p{page_idx}_img{img_idx}"
-                out_path = image_dir / f"{image_id}.png"
-
-                try:
-                    pix = page.get_pixmap(clip=rect, dpi=dpi)
-                    pix.save(str(out_path))
-                except Exception as exc:
-                    logger.warning(
-                        f"Failed to crop image {image_id} from {pdf_path.name}: {exc}"
-                    )
-                    continue
-
-                bbox_key = (page_idx, tuple(int(round(v)) for v in bbox))
-                bbox_to_id[bbox_key] = image_id
-                manifest[image_id] = {
-                    "image_id": image_id,
+                seen.add(bbox_key)
+                crops.append({
+                    "image_id": f"p{page_idx}_img{img_idx}",
                     "page": page_idx,
                     "bbox": bbox,
-                    "path": str(out_path),
-                }
+                    "rect": (x0, y0, x1c, y1c),
+                    "key": bbox_key,
+                })
                 img_idx += 1
+    finally:
+        pdf.close()
+    return crops, rejected_count
 
-        if manifest:
-            heights = [img["bbox"][3] - img["bbox"][1] for img in manifest.values()]
-            avg_height = sum(heights) / len(heights)
-        else:
-            avg_height = 0.0
-        logger.info(
-            "Image extraction stats for %s: detected=%s images, avg_height=%.0fpt, rejected_text_blocks=%s",
-            pdf_path.name,
-            len(manifest),
-            avg_height,
-            rejected_count,
-        )
 
-        # Persist manifest to disk for debugging/cleanup
-        try:
-            (image_dir / "metadata.json").write_text(
-                json.dumps({"images": manifest}, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
-        except Exception:
-            pass
+async def _extract_images_from_pdf(
+    pdf_path: Path,
+    json_result: List[List[Dict[str, Any]]],
+    doc_id: str,
+    collection: str,
+    base_dir: Optional[Path] = None,
+    dpi: int = 200,
+    image_format: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Extract image regions from *pdf_path* using GLM-OCR bbox data.
 
-        # Store lookup mapping (used by placeholder replacement)
-        manifest["__bbox_to_id__"] = {  # type: ignore[assignment]
-            "data": {
-                f"{p}:{b[0]},{b[1]},{b[2]},{b[3]}": image_id
-                for (p, b), image_id in bbox_to_id.items()
-            }
+    Crops are rendered off the event loop, split by page across a process
+    pool (services.pdf_crops), and stored under:
+    data/uploads/images/{collection}/{doc_id}/p{page}_img{index}.jpg
+    (extension per PDF_CROP_FORMAT).
+
+    Returns a manifest keyed by image_id (e.g. 'p0_img0').
+    """
+    if fitz is None:
+        raise RuntimeError("pymupdf_not_installed")
+
+    import asyncio
+    from services.pdf_crops import PDF_CROP_FORMAT, render_crops
+
+    # Basic path safety: keep within IMAGE_DIR
+    safe_collection = re.sub(r"[^A-Za-z0-9._\-]", "_", collection)
+    safe_doc_id = re.sub(r"[^A-Za-z0-9._\-]", "_", doc_id)
+
+    root_dir = base_dir or IMAGE_DIR
+    image_dir = root_dir / safe_collection / safe_doc_id
+    image_dir.mkdir(parents=True, exist_ok=True)
+
+    crops, rejected_count = await asyncio.to_thread(_plan_pdf_crops, pdf_path, json_result)
+    rendered = await render_crops(
+        pdf_path,
+        [(c["page"], c["image_id"], c["rect"]) for c in crops],
+        image_dir,
+        dpi=dpi,
+        image_format=image_format or PDF_CROP_FORMAT,
+    )
+
+    manifest: Dict[str, Dict[str, Any]] = {}
+    bbox_to_id: Dict[tuple[int, tuple[int, ...]], str] = {}
+    for crop, (image_id, out_path, error) in zip(crops, rendered):
+        if error:
+            logger.warning(f"Failed to crop image {image_id} from {pdf_path.name}: {error}")
+            continue
+        bbox_to_id[crop["key"]] = image_id
+        manifest[image_id] = {
+            "image_id": image_id,
+            "page": crop["page"],
+            "bbox": crop["bbox"],
+            "path": out_path,
         }
-        return manifest
-    finally:
-        pdf.close()
+
+    if manifest:
+        heights = [img["bbox"][3] - img["bbox"][1] for img in manifest.values()]
+        avg_height = sum(heights) / len(heights)
+    else:
+        avg_height = 0.0
+    logger.info(
+        "Image extraction stats for %s: detected=%s images, avg_height=%.0fpt, rejected_text_blocks=%s",
+        pdf_path.name,
+        len(manifest),
+        avg_height,
+        rejected_count,
+    )
+
+    # Persist manifest to disk for debugging/cleanup
+    try:
+        (image_dir / "metadata.json").write_text(
+            json.dumps({"images": manifest}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+    except Exception:
+        pass
+
+    # Store lookup mapping (used by placeholder replacement)
+    manifest["__bbox_to_id__"] = {  # type: ignore[assignment]
+        "data": {
+            f"{p}:{b[0]},{b[1]},{b[2]},{b[3]}": image_id
+            for (p, b), image_id in bbox_to_id.items()
+        }
+    }
+    return manifest
 
 
 def _replace_image_placeholders(markdown: str, manifest: Dict[str, Dict[str, Any]]) -> str:
@@ -914,7 +941,7 @@ async def admin_upload_document(
         logger.info(f"Extracted {len(chunks)} chunks from {file.filename}")
 
         # Step 3: Embed and index into Qdrant
-        indexed_count = await _index_chunks(chunks, collection)
+        indexed_count = await _index_chunks(chunks, collection, pool)
         if indexed_count == 0:
             logger.error(
                 f"Indexing returned 0 for {file.filename} ({len(chunks)} chunks). "
@@ -976,7 +1003,7 @@ async def admin_upload_document(
 
         # Try fallback to legacy OCR pipeline
         try:
-            return await _fallback_upload(saved_path, file.filename or "", collection, domain)
+            return await _fallback_upload(saved_path, file.filename or "", collection, domain, pool)
         except Exception as fallback_err:
             logger.error(f"Fallback upload also failed: {fallback_err}")
             raise HTTPException(status_code=500, detail=f"Processing failed: {e}")
@@ -1069,14 +1096,11 @@ async def admin_upload_url(
     # Duplicate check: look for points with matching source_url in Qdrant
     if not body.force:
         try:
-            from qdrant_client import QdrantClient
+            from services.qdrant_clients import get_async_qdrant_client
             from qdrant_client.models import Filter, FieldCondition, MatchValue
 
-            qdrant = QdrantClient(
-                host=os.getenv("QDRANT_HOST", "localhost"),
-                port=int(os.getenv("QDRANT_PORT", "6333")),
-            )
-            points, _ = qdrant.scroll(
+            qdrant = get_async_qdrant_client()
+            points, _ = await qdrant.scroll(
                 collection_name=body.collection,
                 scroll_filter=Filter(
                     must=[
@@ -1167,7 +1191,7 @@ async def admin_delete_document(
     from services.admin_auth import log_audit
 
     pool = _get_db_pool(request)
-    deleted = await _delete_from_qdrant(doc_id, collection)
+    deleted = await _delete_from_qdrant(doc_id, collection, pool)
 
     if pool:
         await log_audit(
@@ -1191,17 +1215,16 @@ async def admin_list_collections(
     user: Dict = Depends(require_permission("view")),
 ):
     """List Qdrant collections with stats."""
+    import asyncio
+
     try:
-        from qdrant_client import QdrantClient
+        from services.qdrant_clients import get_async_qdrant_client
 
-        client = QdrantClient(
-            host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", "6333")),
-        )
-        collections = client.get_collections().collections
+        client = get_async_qdrant_client()
+        collections = (await client.get_collections()).collections
+        infos = await asyncio.gather(*(client.get_collection(col.name) for col in collections))
         result = []
-        for col in collections:
-            info = client.get_collection(col.name)
+        for col, info in zip(collections, infos):
             result.append({
                 "name": col.name,
                 "points_count": info.points_count,
@@ -1216,25 +1239,43 @@ async def admin_list_collections(
 
 @router.get("/kb/documents")
 async def admin_list_documents(
+    request: Request,
     collection: str = Query("mold_reference_kb"),
     domain: Optional[str] = None,
     file_type: Optional[str] = None,
     search: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    resync: bool = Query(False, description="Rebuild the document catalog from Qdrant"),
     user: Dict = Depends(require_permission("view")),
 ):
     """Paginated, filterable list of indexed documents."""
+    from services import kb_catalog
+
+    pool = _get_db_pool(request)
     try:
-        from qdrant_client import QdrantClient
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
+        from services.qdrant_clients import get_async_qdrant_client
 
-        client = QdrantClient(
-            host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", "6333")),
-        )
+        client = get_async_qdrant_client()
+
+        if pool:
+            # Catalog path: one row per document, filtered and paged in SQL
+            await kb_catalog.ensure_backfilled(pool, client, collection, force=resync)
+            documents, total = await kb_catalog.list_documents(
+                pool, collection,
+                domain=domain, file_type=file_type, search=search,
+                limit=limit, offset=offset,
+            )
+            return {
+                "documents": documents,
+                "total": total,
+                "limit": limit,
+                "offset": offset,
+            }
+
+        # No database: group chunks from Qdrant (catalog fields only, no text)
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
 
-        # Build filter conditions
         conditions = []
         if domain:
             conditions.append(
@@ -1244,66 +1285,21 @@ async def admin_list_documents(
             conditions.append(
                 FieldCondition(key="file_type", match=MatchValue(value=file_type))
             )
-
         scroll_filter = Filter(must=conditions) if conditions else None
 
-        # Scroll through ALL points to group by document.
-        # We need to see every chunk to build accurate document-level summaries.
-        all_points = []
-        page_offset = None
-        while True:
-            points, page_offset = client.scroll(
-                collection_name=collection,
-                scroll_filter=scroll_filter,
-                limit=100,
-                offset=page_offset,
-                with_payload=True,
-                with_vectors=False,
-            )
-            all_points.extend(points)
-            if page_offset is None:
-                break
-
-        # Group by doc_id (preferred) or source filename (fallback for
-        # points indexed without doc_id).
-        docs: Dict[str, Dict[str, Any]] = {}
-        for point in all_points:
-            payload = point.payload or {}
-            doc_id = payload.get("doc_id") or payload.get("source") or str(point.id)
-            if doc_id not in docs:
-                # Derive file_type from source filename if not stored
-                source = payload.get("source_file") or payload.get("source", "")
-                ft = payload.get("file_type", "")
-                if not ft and "." in source:
-                    ft = source.rsplit(".", 1)[-1].lower()
-                # Derive upload_date from timestamp if not stored
-                upload_date = payload.get("upload_date", "")
-                if not upload_date and payload.get("timestamp"):
-                    from datetime import datetime, timezone
-                    try:
-                        upload_date = datetime.fromtimestamp(
-                            payload["timestamp"], tz=timezone.utc
-                        ).isoformat()
-                    except (ValueError, OSError):
-                        pass
-                docs[doc_id] = {
-                    "doc_id": doc_id,
-                    "source_file": source,
-                    "file_type": ft,
-                    "domain": payload.get("domain", ""),
-                    "upload_date": upload_date,
-                    "uploaded_by": payload.get("uploaded_by", ""),
-                    "chunk_count": 0,
-                    "has_images": payload.get("has_images", False),
-                }
-            docs[doc_id]["chunk_count"] += 1
-
-        # Apply pagination at document level
-        doc_list = list(docs.values())
-        paginated = doc_list[offset : offset + limit]
+        payloads = await kb_catalog.scan_collection(client, collection, scroll_filter)
+        doc_list = list(kb_catalog.summarize_payloads(payloads).values())
+        if search:
+            needle = search.lower()
+            doc_list = [
+                d for d in doc_list
+                if needle in d["source_file"].lower() or needle in d["doc_id"].lower()
+            ]
+        for doc in doc_list:
+            doc["upload_date"] = doc["upload_date"].isoformat() if doc["upload_date"] else ""
 
         return {
-            "documents": paginated,
+            "documents": doc_list[offset : offset + limit],
             "total": len(doc_list),
             "limit": limit,
             "offset": offset,
@@ -1322,17 +1318,14 @@ async def admin_get_document(
 ):
     """Document detail: all chunks, images, metadata for a given doc_id."""
     try:
-        from qdrant_client import QdrantClient
+        from services.qdrant_clients import get_async_qdrant_client
         from qdrant_client.models import Filter, FieldCondition, MatchValue
 
-        client = QdrantClient(
-            host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", "6333")),
-        )
+        client = get_async_qdrant_client()
 
         # Try doc_id field first, fall back to source field for points
         # that were indexed without doc_id.
-        points, _ = client.scroll(
+        points, _ = await client.scroll(
             collection_name=collection,
             scroll_filter=Filter(
                 must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_id))]
@@ -1343,7 +1336,7 @@ async def admin_get_document(
         )
 
         if not points:
-            points, _ = client.scroll(
+            points, _ = await client.scroll(
                 collection_name=collection,
                 scroll_filter=Filter(
                     must=[FieldCondition(key="source", match=MatchValue(value=doc_id))]
@@ -1427,14 +1420,11 @@ async def admin_reindex_document(
 
     # Find the original file from Qdrant metadata
     try:
-        from qdrant_client import QdrantClient
+        from services.qdrant_clients import get_async_qdrant_client
         from qdrant_client.models import Filter, FieldCondition, MatchValue
 
-        client = QdrantClient(
-            host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", "6333")),
-        )
-        points, _ = client.scroll(
+        client = get_async_qdrant_client()
+        points, _ = await client.scroll(
             collection_name=collection,
             scroll_filter=Filter(
                 must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_id))]
@@ -1455,7 +1445,7 @@ async def admin_reindex_document(
         raise HTTPException(status_code=503, detail=f"Qdrant error: {e}")
 
     # Delete existing chunks
-    await _delete_from_qdrant(doc_id, collection)
+    await _delete_from_qdrant(doc_id, collection, pool)
 
     if pool:
         await log_audit(
@@ -1482,7 +1472,8 @@ async def admin_search_test(
 ):
     """Test search against the knowledge base — returns ranked results."""
     try:
-        from qdrant_client import QdrantClient
+        from services.qdrant_clients import get_async_qdrant_client
+        from services.qdrant_profiles import search_params
         import httpx
 
         embeddings_url = os.getenv(
@@ -1502,17 +1493,15 @@ async def admin_search_test(
                 raise HTTPException(status_code=500, detail="Embedding service returned no vectors")
             query_vector = embeddings[0]
 
-        qdrant = QdrantClient(
-            host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", "6333")),
-        )
+        qdrant = get_async_qdrant_client()
 
-        results = qdrant.search(
+        results = (await qdrant.query_points(
             collection_name=body.collection,
-            query_vector=query_vector,
+            query=query_vector,
+            search_params=search_params(),
             limit=body.limit,
             with_payload=True,
-        )
+        )).points
 
         return {
             "query": body.query,
@@ -1551,7 +1540,7 @@ async def admin_bulk_delete(
     total_deleted = 0
 
     for doc_id in body.doc_ids:
-        deleted = await _delete_from_qdrant(doc_id, body.collection)
+        deleted = await _delete_from_qdrant(doc_id, body.collection, pool)
         total_deleted += deleted
 
     if pool:
@@ -1773,7 +1762,7 @@ async def admin_get_glm_image(
     image_id: str,
     user: Dict = Depends(require_permission("view")),
 ):
-    """Serve GLM-OCR extracted PNG crops by collection/doc_id/image_id."""
+    """Serve GLM-OCR extracted crops by collection/doc_id/image_id."""
     # Tight validation to prevent path traversal
     if not re.fullmatch(r"[A-Za-z0-9._\-]+", collection):
         raise HTTPException(status_code=400, detail="Invalid collection")
@@ -1782,11 +1771,14 @@ async def admin_get_glm_image(
     if not re.fullmatch(r"p\d+_img\d+", image_id):
         raise HTTPException(status_code=400, detail="Invalid image_id")
 
-    filepath = IMAGE_DIR / collection / doc_id / f"{image_id}.png"
-    if not filepath.exists():
-        raise HTTPException(status_code=404, detail="Image not found")
+    from services.pdf_crops import CROP_MEDIA_TYPES
 
-    return FileResponse(filepath, media_type="image/png")
+    # Crop format is configurable (PDF_CROP_FORMAT); older documents have PNGs
+    for suffix, media_type in CROP_MEDIA_TYPES.items():
+        filepath = IMAGE_DIR / collection / doc_id / f"{image_id}{suffix}"
+        if filepath.exists():
+            return FileResponse(filepath, media_type=media_type)
+    raise HTTPException(status_code=404, detail="Image not found")
 
 
 # ------------------------------------------------------------------
@@ -1798,17 +1790,20 @@ def _hierarchical_chunk(
     source_file: str,
     domain: str,
     uploaded_by: str,
-    max_chunk_size: int = 1000,
-    overlap: int = 200,
+    max_chunk_tokens: int = 512,
+    overlap_tokens: int = 64,
     images: Optional[List[Dict[str, str]]] = None,
     doc_id: Optional[str] = None,
     processing_method: str = "docling",
 ) -> List[Dict[str, Any]]:
     """
     Generic hierarchical chunking for non-Excel documents.
-    Uses Docling's structured output to respect section boundaries.
+    Uses the shared StreamingChunker on Docling's markdown, so chunks follow
+    headings and sentence boundaries and are sized in embedding tokens.
     Links images to chunks based on <!-- image --> and <!-- image:ID --> placeholders.
     """
+    from services.rag_pipeline.chunker import StreamingChunker
+
     doc = docling_result.get("document", docling_result)
     doc_id = doc_id or str(uuid.uuid4())
 
@@ -1857,46 +1852,43 @@ def _hierarchical_chunk(
     elif images and not legacy_positions:
         legacy_image_positions = [(0, img) for img in images]
 
-    # Simple sliding-window chunking
+    chunker = StreamingChunker(max_tokens=max_chunk_tokens, overlap_tokens=overlap_tokens)
     chunks = []
-    start = 0
-    chunk_idx = 0
-    while start < len(text):
-        end = min(start + max_chunk_size, len(text))
-        chunk_text = text[start:end].strip()
-        if chunk_text:
-            # Find images whose placeholder falls within [start, end)
-            chunk_image_ids: List[str] = []
-            # Inline IDs
-            chunk_image_ids.extend([
-                image_id for pos, image_id in inline_image_positions
-                if start <= pos < end
-            ])
-            # Legacy mapped images
-            chunk_image_ids.extend([
-                img.get("image_id", "") for pos, img in legacy_image_positions
-                if start <= pos < end
-            ])
-            chunk_image_ids = [i for i in chunk_image_ids if i]
-
-            chunks.append({
-                "text": chunk_text,
-                "metadata": {
-                    "doc_id": doc_id,
-                    "source_file": source_file,
-                    "file_type": Path(source_file).suffix.lstrip("."),
-                    "domain": domain,
-                    "chunk_index": chunk_idx,
-                    "uploaded_by": uploaded_by,
-                    "upload_date": datetime.now(timezone.utc).isoformat(),
-                    "processing_method": processing_method,
-                    "has_images": len(chunk_image_ids) > 0,
-                    "image_ids": list(dict.fromkeys(chunk_image_ids)),
-                    "image_count": len(list(dict.fromkeys(chunk_image_ids))),
-                },
-            })
-            chunk_idx += 1
-        start = end - overlap if end < len(text) else end
+    for chunk_idx, piece in enumerate(chunker.iter_chunks(text)):
+        # The first chunk also owns anything before it (e.g. images mapped to position 0)
+        start = 0 if chunk_idx == 0 else piece["start_char"]
+        end = piece["end_char"]
+        # Find images whose placeholder falls within [start, end)
+        chunk_image_ids: List[str] = []
+        # Inline IDs
+        chunk_image_ids.extend([
+            image_id for pos, image_id in inline_image_positions
+            if start <= pos < end
+        ])
+        # Legacy mapped images
+        chunk_image_ids.extend([
+            img.get("image_id", "") for pos, img in legacy_image_positions
+            if start <= pos < end
+        ])
+        chunk_image_ids = [i for i in chunk_image_ids if i]
+
+        chunks.append({
+            "text": piece["text"],
+            "metadata": {
+                "doc_id": doc_id,
+                "source_file": source_file,
+                "file_type": Path(source_file).suffix.lstrip("."),
+                "domain": domain,
+                "chunk_index": chunk_idx,
+                "section": piece["section"] or "",
+                "uploaded_by": uploaded_by,
+                "upload_date": datetime.now(timezone.utc).isoformat(),
+                "processing_method": processing_method,
+                "has_images": len(chunk_image_ids) > 0,
+                "image_ids": list(dict.fromkeys(chunk_image_ids)),
+                "image_count": len(list(dict.fromkeys(chunk_image_ids))),
+            },
+        })
 
     # Set total_chunks on all chunks
     for c in chunks:
@@ -1991,12 +1983,15 @@ def _resolve_image_path(image_id: str) -> Optional[Path]:
 
 
 async def _index_chunks(
-    chunks: List[Dict[str, Any]], collection: str
+    chunks: List[Dict[str, Any]], collection: str, pool=None
 ) -> int:
-    """Embed and index chunks into Qdrant. Returns count of indexed chunks."""
+    """Embed and index chunks into Qdrant. Returns count of indexed chunks.
+
+    When *pool* is given the kb_documents catalog is updated as well.
+    """
     import httpx
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import PointStruct, VectorParams, Distance
+    from services.qdrant_clients import get_async_qdrant_client
+    from qdrant_client.models import PointStruct
 
     embeddings_url = os.getenv(
         "EMBEDDINGS_URL",
@@ -2022,19 +2017,13 @@ async def _index_chunks(
         return 0
 
     # Ensure collection exists
-    qdrant = QdrantClient(
-        host=os.getenv("QDRANT_HOST", "localhost"),
-        port=int(os.getenv("QDRANT_PORT", "6333")),
-    )
+    qdrant = get_async_qdrant_client()
 
     try:
-        qdrant.get_collection(collection)
+        await qdrant.get_collection(collection)
     except Exception:
         vector_size = len(embeddings[0]) if embeddings else 1024
-        qdrant.create_collection(
-            collection_name=collection,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )
+        await _create_kb_collection(qdrant, collection, vector_size)
 
     # Upsert points
     points = []
@@ -2043,7 +2032,8 @@ async def _index_chunks(
         payload = {**chunk["metadata"], "text": chunk["text"]}
         points.append(PointStruct(id=point_id, vector=embedding, payload=payload))
 
-    qdrant.upsert(collection_name=collection, points=points)
+    await qdrant.upsert(collection_name=collection, points=points)
+    await _record_in_catalog(pool, collection, points)
     return len(points)
 
 
@@ -2051,6 +2041,7 @@ async def _index_chunks_with_enrichment(
     chunks: List[Dict[str, Any]],
     enrichment_results: Optional[List] = None,
     collection: str = "mold_reference_kb",
+    pool=None,
 ) -> int:
     """Embed and index chunks into Qdrant, optionally adding enriched points.
 
@@ -2065,8 +2056,8 @@ async def _index_chunks_with_enrichment(
     Returns the total number of points upserted.
     """
     import httpx
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import PointStruct, VectorParams, Distance
+    from services.qdrant_clients import get_async_qdrant_client
+    from qdrant_client.models import PointStruct
 
     embeddings_url = os.getenv(
         "EMBEDDINGS_URL",
@@ -2134,19 +2125,13 @@ async def _index_chunks_with_enrichment(
     # ------------------------------------------------------------------
     # 3. Ensure Qdrant collection exists
     # ------------------------------------------------------------------
-    qdrant = QdrantClient(
-        host=os.getenv("QDRANT_HOST", "localhost"),
-        port=int(os.getenv("QDRANT_PORT", "6333")),
-    )
+    qdrant = get_async_qdrant_client()
 
     try:
-        qdrant.get_collection(collection)
+        await qdrant.get_collection(collection)
     except Exception:
         vector_size = len(embeddings[0]) if embeddings else 1024
-        qdrant.create_collection(
-            collection_name=collection,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
-        )
+        await _create_kb_collection(qdrant, collection, vector_size)
 
     # ------------------------------------------------------------------
     # 4. Build PointStruct list and upsert
@@ -2169,7 +2154,8 @@ async def _index_chunks_with_enrichment(
             point_ids_by_chunk[cidx] = {}
         point_ids_by_chunk[cidx][spec["chunk_type"]] = point_id
 
-    qdrant.upsert(collection_name=collection, points=points)
+    await qdrant.upsert(collection_name=collection, points=points)
+    await _record_in_catalog(pool, collection, points)
 
     # ------------------------------------------------------------------
     # 5. Apply enrichment metadata tags to both original & enriched points
@@ -2185,7 +2171,7 @@ async def _index_chunks_with_enrichment(
             ids_for_chunk = point_ids_by_chunk.get(i, {})
             for _ctype, pid in ids_for_chunk.items():
                 try:
-                    qdrant.set_payload(
+                    await qdrant.set_payload(
                         collection_name=collection,
                         payload=enrichment_meta,
                         points=[pid],
@@ -2198,20 +2184,47 @@ async def _index_chunks_with_enrichment(
     return len(points)
 
 
-async def _delete_from_qdrant(doc_id: str, collection: str) -> int:
-    """Delete all points matching a doc_id (or source filename) from Qdrant."""
+async def _create_kb_collection(qdrant, collection: str, vector_size: int) -> None:
+    """Create a KB collection with the configured profile and filter indexes."""
+    from services.qdrant_profiles import collection_params, payload_indexes, vector_params
+
+    await qdrant.create_collection(
+        collection_name=collection,
+        vectors_config=vector_params(vector_size),
+        **collection_params(),
+    )
+    for field, schema in payload_indexes(collection):
+        await qdrant.create_payload_index(collection, field, schema)
+
+
+async def _record_in_catalog(pool, collection: str, points: List[Any]) -> None:
+    """Add freshly upserted points to the kb_documents catalog (best effort)."""
+    if not pool or not points:
+        return
+    from services.kb_catalog import record_documents
+
     try:
-        from qdrant_client import QdrantClient
+        await record_documents(pool, collection, ((p.payload, p.id) for p in points))
+    except Exception as e:
+        logger.warning(f"KB catalog update failed for '{collection}': {e}")
+
+
+async def _delete_from_qdrant(doc_id: str, collection: str, pool=None) -> int:
+    """Delete all points matching a doc_id (or source filename) from Qdrant.
+
+    The catalog row is dropped only once Qdrant has deleted the points (or has
+    none left), so a failed delete keeps the document listed and retryable.
+    """
+    try:
+        from services.qdrant_clients import get_async_qdrant_client
         from qdrant_client.models import Filter, FieldCondition, MatchValue
 
-        qdrant = QdrantClient(
-            host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", "6333")),
-        )
+        qdrant = get_async_qdrant_client()
 
+        deleted = 0
         # Try doc_id field first, fall back to source field
         for field in ("doc_id", "source"):
-            points, _ = qdrant.scroll(
+            points, _ = await qdrant.scroll(
                 collection_name=collection,
                 scroll_filter=Filter(
                     must=[FieldCondition(key=field, match=MatchValue(value=doc_id))]
@@ -2221,22 +2234,31 @@ async def _delete_from_qdrant(doc_id: str, collection: str) -> int:
                 with_vectors=False,
             )
             if points:
-                qdrant.delete(
+                await qdrant.delete(
                     collection_name=collection,
                     points_selector=Filter(
                         must=[FieldCondition(key=field, match=MatchValue(value=doc_id))]
                     ),
                 )
-                return len(points)
-
-        return 0
+                deleted = len(points)
+                break
     except Exception as e:
         logger.error(f"Qdrant delete failed: {e}")
         return 0
 
+    if pool:
+        from services.kb_catalog import remove_document
+
+        try:
+            await remove_document(pool, collection, doc_id)
+        except Exception as e:
+            logger.warning(f"KB catalog delete failed for {doc_id}: {e}")
+
+    return deleted
+
 
 async def _fallback_upload(
-    saved_path: Path, filename: str, collection: str, domain: str
+    saved_path: Path, filename: str, collection: str, domain: str, pool=None
 ) -> Dict[str, Any]:
     """Fallback to legacy doc parsing service when Docling is unavailable."""
     from services.rag_pipeline.mold_document_ingester import MoldDocumentIngester
@@ -2258,6 +2280,18 @@ async def _fallback_upload(
     )
     await indexer.index_document(text=result["text"], metadata=result["metadata"])
 
+    if pool:
+        # DocumentIndexer doesn't report its points, so recount this one source
+        from services.kb_catalog import sync_document
+        from services.qdrant_clients import get_async_qdrant_client
+
+        try:
+            await sync_document(
+                pool, get_async_qdrant_client(), collection, result["metadata"].get("source", "unknown")
+            )
+        except Exception as e:
+            logger.warning(f"KB catalog update failed for {filename}: {e}")
+
     return {
         "status": "success",
         "filename": filename,
@@ -2363,11 +2397,11 @@ async def _process_url_job(
         if chunks:
             if enrichment_results is not None:
                 indexed = await _index_chunks_with_enrichment(
-                    chunks, enrichment_results, body.collection
+                    chunks, enrichment_results, body.collection, pool
                 )
             else:
                 indexed = await _index_chunks_with_enrichment(
-                    chunks, None, body.collection
+                    chunks, None, body.collection, pool
                 )
         else:
             indexed = 0
@@ -2394,6 +2428,8 @@ async def admin_list_services(
     from services.service_manager import get_service_manager
 
     manager = get_service_manager()
+    # Polled in the background from the first view on; answered from the snapshot
+    manager.start_refresher()
     services = await manager.get_all_services()
 
     return {
@@ -2572,7 +2608,7 @@ async def _process_batch(
                     uploaded_by=user.get("username", ""),
                 )
 
-            indexed = await _index_chunks(chunks, collection) if chunks else 0
+            indexed = await _index_chunks(chunks, collection, pool) if chunks else 0
 
             file_info["status"] = "completed"
             file_info["chunks"] = len(chunks)
@@ -75,7 +75,9 @@ from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from agents.graph import app as agent_app, react_app
 from agents.state import AgentState
 from services.session_store import SessionStore
+from services.write_behind import WriteBehindLog
 import uvicorn
+import asyncio
 import json
 import time
 import uuid
@@ -99,7 +101,7 @@ except ImportError:
 # Prometheus metrics
 try:
     from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-    from observability import (
+    from services.observability import (
         agent_requests,
         agent_latency,
         llm_tokens_generated,
@@ -143,11 +145,12 @@ app.add_middleware(
 
 db_pool: Optional[asyncpg.Pool] = None
 session_store: Optional[SessionStore] = None
+conversation_writer: Optional[WriteBehindLog] = None
 
 @app.on_event("startup")
 async def startup():
     """Initialize database connection pool and register plugin HTTP routes on startup"""
-    global db_pool, session_store
+    global db_pool, session_store, conversation_writer
 
     # Register plugin HTTP routes (plugins already loaded at module level)
     try:
@@ -196,6 +199,9 @@ async def startup():
         app.state.db_pool = db_pool
         logger.info("✅ Database connection pool initialized")
 
+        conversation_writer = WriteBehindLog(db_pool, "conversation_log", _write_conversations)
+        conversation_writer.start()
+
         try:
             from services.admin_auth import init_admin_tables
             await init_admin_tables(db_pool)
@@ -203,6 +209,13 @@ async def startup():
         except Exception as e:
             logger.warning(f"⚠️  Admin RBAC init failed: {e}")
 
+        try:
+            from services.kb_catalog import init_kb_catalog
+            await init_kb_catalog(db_pool)
+            logger.info("✅ KB document catalog initialized")
+        except Exception as e:
+            logger.warning(f"⚠️  KB catalog init failed: {e}")
+
     except Exception as e:
         logger.warning(f"⚠️  Database connection failed: {e}. Observability logging will be disabled.")
         db_pool = None
@@ -219,7 +232,10 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Close database connection pool on shutdown"""
-    global db_pool, session_store
+    global db_pool, session_store, conversation_writer
+    if conversation_writer:
+        await conversation_writer.close()
+        conversation_writer = None
     if db_pool:
         await db_pool.close()
         logger.info("Database connection pool closed")
@@ -227,6 +243,51 @@ async def shutdown():
         await session_store.close()
         logger.info("Session store closed")
 
+    from services.qdrant_clients import close_qdrant_clients
+    await close_qdrant_clients()
+
+    from services.service_manager import get_service_manager
+    await get_service_manager().close()
+
+async def _write_conversations(conn, records: List[Dict[str, Any]]) -> None:
+    """Write a batch of conversation turns: one session upsert per session, then the log rows."""
+    sessions: Dict[str, Dict[str, Any]] = {}
+    for r in records:
+        s = sessions.setdefault(r["session_id"], {"user_id": r["user_id"], "count": 0, "agents": {}, "last": 0.0})
+        s["count"] += 1
+        s["agents"][r["agent_type"]] = s["agents"].get(r["agent_type"], 0) + 1
+        s["last"] = max(s["last"], r["timestamp"])
+
+    # Sessions first: conversation_log.session_id references user_sessions
+    await conn.executemany("""
+        INSERT INTO user_sessions (session_id, user_id, total_messages, last_active_at, agents_used)
+        VALUES ($1, $2, $3, to_timestamp($4), $5::jsonb)
+        ON CONFLICT (session_id) DO UPDATE
+        SET total_messages = user_sessions.total_messages + EXCLUDED.total_messages,
+            last_active_at = GREATEST(user_sessions.last_active_at, EXCLUDED.last_active_at),
+            agents_used = COALESCE(user_sessions.agents_used, '{}'::jsonb) || (
+                SELECT jsonb_object_agg(key, COALESCE((user_sessions.agents_used->>key)::int, 0) + value::int)
+                FROM jsonb_each_text(EXCLUDED.agents_used)
+            )
+    """, [
+        (session_id, s["user_id"], s["count"], s["last"], json.dumps(s["agents"]))
+        for session_id, s in sessions.items()
+    ])
+
+    await conn.executemany("""
+        INSERT INTO conversation_log (
+            session_id, timestamp, user_message, agent_response, agent_type,
+            tool_calls, latency_ms, confidence, trace_id
+        ) VALUES ($1, to_timestamp($2), $3, $4, $5, $6, $7, $8, $9)
+    """, [
+        (
+            r["session_id"], r["timestamp"], r["user_message"], r["agent_response"], r["agent_type"],
+            r["tool_calls"], r["latency_ms"], r["confidence"], r["trace_id"],
+        )
+        for r in records
+    ])
+
+
 async def log_conversation(
     session_id: str,
     user_id: str,
@@ -240,41 +301,24 @@ async def log_conversation(
 ):
     """
     Log conversation to PostgreSQL for audit trail.
-    Runs asynchronously to not block API response.
+    Queued for the write-behind logger so the response isn't held up by the insert.
     """
-    if not db_pool:
+    if not conversation_writer:
         return  # Database not available
 
     try:
-        async with db_pool.acquire() as conn:
-            # Upsert session record
-            await conn.execute("""
-                INSERT INTO user_sessions (session_id, user_id, total_messages, last_active_at)
-                VALUES ($1, $2, 1, NOW())
-                ON CONFLICT (session_id) DO UPDATE
-                SET total_messages = user_sessions.total_messages + 1,
-                    last_active_at = NOW(),
-                    agents_used = user_sessions.agents_used || jsonb_build_object($3,
-                        COALESCE((user_sessions.agents_used->>$3)::int, 0) + 1
-                    )
-            """, session_id, user_id, agent_type)
-
-            # Insert conversation record
-            await conn.execute("""
-                INSERT INTO conversation_log (
-                    session_id, user_message, agent_response, agent_type,
-                    tool_calls, latency_ms, confidence, trace_id
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """,
-                session_id,
-                user_message,
-                agent_response,
-                agent_type,
-                json.dumps(tool_calls),
-                latency_ms,
-                confidence,
-                trace_id
-            )
+        await conversation_writer.submit({
+            "session_id": session_id,
+            "user_id": user_id,
+            "timestamp": time.time(),
+            "user_message": user_message,
+            "agent_response": agent_response,
+            "agent_type": agent_type,
+            "tool_calls": json.dumps(tool_calls),
+            "latency_ms": latency_ms,
+            "confidence": confidence,
+            "trace_id": trace_id,
+        })
     except Exception as e:
         logger.error(f"Failed to log conversation: {e}")
 
@@ -504,6 +548,31 @@ class TroubleshootingQueryResponse(BaseModel):
     latency_ms: int
 
 
+_hybrid_searcher = None
+
+
+def _get_hybrid_searcher():
+    """Process-wide HybridSearcher (its expander, SQL generator, cache and
+    Qdrant client are reused across requests instead of rebuilt per query)."""
+    global _hybrid_searcher
+    if _hybrid_searcher is None:
+        from services.troubleshooting.hybrid_searcher import HybridSearcher
+
+        _hybrid_searcher = HybridSearcher(
+            pg_host=os.getenv("POSTGRES_HOST", "localhost"),
+            pg_port=int(os.getenv("POSTGRES_PORT", "5432")),
+            pg_database=os.getenv("POSTGRES_DB", "bestbox"),
+            pg_user=os.getenv("POSTGRES_USER", "bestbox"),
+            pg_password=os.getenv("POSTGRES_PASSWORD", "bestbox"),
+            qdrant_host=os.getenv("QDRANT_HOST", "localhost"),
+            qdrant_port=int(os.getenv("QDRANT_PORT", "6333")),
+            # The troubleshooting components append /v1/chat/completions themselves
+            llm_url=os.getenv("LLM_BASE_URL", "http://localhost:8001").removesuffix("/v1"),
+            embeddings_url=os.getenv("EMBEDDINGS_URL", "http://localhost:8004"),
+        )
+    return _hybrid_searcher
+
+
 @app.post("/v1/troubleshooting/query", response_model=TroubleshootingQueryResponse)
 async def direct_troubleshooting_query(request: TroubleshootingQueryRequest):
     """
@@ -527,21 +596,11 @@ async def direct_troubleshooting_query(request: TroubleshootingQueryRequest):
     start_time = time.time()
 
     try:
-        from services.troubleshooting.hybrid_searcher import HybridSearcher
-
-        searcher = HybridSearcher(
-            pg_host=os.getenv("POSTGRES_HOST", "localhost"),
-            pg_port=int(os.getenv("POSTGRES_PORT", "5432")),
-            pg_database=os.getenv("POSTGRES_DB", "bestbox"),
-            pg_user=os.getenv("POSTGRES_USER", "bestbox"),
-            pg_password=os.getenv("POSTGRES_PASSWORD", "bestbox"),
-            qdrant_host=os.getenv("QDRANT_HOST", "localhost"),
-            qdrant_port=int(os.getenv("QDRANT_PORT", "6333")),
-            llm_url=os.getenv("LLM_BASE_URL", "http://localhost:8001"),
-            embeddings_url=os.getenv("EMBEDDINGS_URL", "http://localhost:8004"),
-        )
+        searcher = _get_hybrid_searcher()
 
-        result = searcher.search(
+        # The search pipeline is synchronous (HTTP, psycopg2, Qdrant); keep it off the event loop
+        result = await asyncio.to_thread(
+            searcher.search,
             query=request.query,
             mode=request.mode,  # type: ignore
             top_k=request.top_k,
@@ -1213,7 +1272,8 @@ async def responses_api_stream(request: ChatRequest, session_id_override: Option
                     "query_type": query_type,
                 },
                 "plan": [],
-                "step": 0
+                "step": 0,
+                "session_id": session_id_override or request.thread_id,
             }
 
             # 1. Send response.created event
@@ -1244,7 +1304,6 @@ async def responses_api_stream(request: ChatRequest, session_id_override: Option
             yield f"data: {json.dumps(output_item_added)}\n\n"
             
             # Scope tool-results storage to this request/session.
-            session_id = session_id_override or request.thread_id or str(uuid.uuid4())
             token = BESTBOX_TOOL_RESULTS_SESSION_ID.set(session_id)
             try:
                 result = await agent_app.ainvoke(cast(AgentState, inputs))
@@ -1342,11 +1401,56 @@ async def responses_api_stream(request: ChatRequest, session_id_override: Option
     
     return StreamingResponse(generate(), media_type="text/event-stream")
 
-async def chat_completion_stream(request: ChatRequest, session_id_override: Optional[str] = None):
+def progress_event(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a LangGraph astream_events (v2) event to a gateway progress event, if it is one."""
+    event_type = event.get("event", "")
+    if event_type == "on_tool_start":
+        return {"type": "tool_start", "tool": event.get("name")}
+    if event_type == "on_tool_end":
+        return {"type": "tool_end", "tool": event.get("name")}
+    if event_type == "on_chat_model_stream":
+        # Router output is a classification, not part of the answer
+        if (event.get("metadata") or {}).get("langgraph_node") == "router":
+            return None
+        chunk = event.get("data", {}).get("chunk")
+        text = getattr(chunk, "content", None)
+        if isinstance(text, str) and text:
+            return {"type": "token", "text": text}
+    return None
+
+
+def progress_chunk(chunk_id: str, model_name: str, progress: Dict[str, Any]) -> Dict[str, Any]:
+    """Empty-delta completion chunk carrying a progress event in bbx_progress."""
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model_name,
+        "choices": [{
+            "index": 0,
+            "delta": {},
+            "finish_reason": None
+        }],
+        "bbx_progress": progress
+    }
+
+
+async def chat_completion_stream(
+    request: ChatRequest,
+    session_id_override: Optional[str] = None,
+    user_id: str = "anonymous",
+):
     """Stream the response using SSE format"""
+    # Resolve the trace id while the request span is still current
+    current_span = trace.get_current_span() if OPENTELEMETRY_AVAILABLE else None
+    trace_id = format(current_span.get_span_context().trace_id, '032x') if current_span else "no-trace"
+
     async def generate():
+        start_time = time.time()
+        session_id = session_id_override or request.thread_id or str(uuid.uuid4())
+        user_message = ""
         try:
-            request_start_ms = int(time.time() * 1000)
+            request_start_ms = int(start_time * 1000)
             # Process the request
             messages_to_process = []
 
@@ -1365,6 +1469,10 @@ async def chat_completion_stream(request: ChatRequest, session_id_override: Opti
                 yield f"data: {json.dumps({'error': 'No messages provided'})}\n\n"
                 return
 
+            for msg in messages_to_process:
+                if msg.role == "user":
+                    user_message = parse_message_content(msg.content) if msg.content is not None else ""
+
             # Convert to LangChain messages
             lc_messages = []
             for msg in messages_to_process:
@@ -1395,19 +1503,37 @@ async def chat_completion_stream(request: ChatRequest, session_id_override: Opti
                     "query_type": query_type,
                 },
                 "plan": [],
-                "step": 0
+                "step": 0,
+                "session_id": session_id_override or request.thread_id,
             }
 
+            chunk_id = f"chatcmpl-{int(time.time())}"
+            model_name = request.model or "bestbox-agent"
+
             # Scope tool-results storage to this request/session.
-            session_id = session_id_override or request.thread_id or str(uuid.uuid4())
             token = BESTBOX_TOOL_RESULTS_SESSION_ID.set(session_id)
             try:
-                result = await agent_app.ainvoke(cast(AgentState, inputs))
+                if request.metadata and request.metadata.get("progress"):
+                    # Chat gateways: forward draft tokens and tool activity
+                    # while the graph runs; the final content follows as usual
+                    result = None
+                    async for event in agent_app.astream_events(cast(AgentState, inputs), version="v2"):
+                        if event.get("event") == "on_chain_end" and not event.get("parent_ids"):
+                            result = event["data"].get("output")
+                            continue
+                        progress = progress_event(event)
+                        if progress:
+                            yield f"data: {json.dumps(progress_chunk(chunk_id, model_name, progress), ensure_ascii=False)}\n\n"
+                    if result is None:
+                        raise RuntimeError("Agent stream ended without a final state")
+                else:
+                    result = await agent_app.ainvoke(cast(AgentState, inputs))
             finally:
                 BESTBOX_TOOL_RESULTS_SESSION_ID.reset(token)
             last_msg = result["messages"][-1]
             content = last_msg.content if hasattr(last_msg, 'content') else str(last_msg)
             current_agent = result.get("current_agent", "unknown")
+            confidence = result.get("confidence", 0.0)
 
             # ==========================================================
             # OPTION A: Get full tool results from global cache
@@ -1440,10 +1566,25 @@ async def chat_completion_stream(request: ChatRequest, session_id_override: Opti
                 except Exception as e:
                     logger.warning(f"Response validation failed in SSE stream: {e}")
 
+            latency_seconds = time.time() - start_time
+            if PROMETHEUS_AVAILABLE:
+                agent_requests.labels(agent_type=current_agent, user_id=user_id).inc()
+                agent_latency.labels(agent_type=current_agent).observe(latency_seconds)
+
+            await log_conversation(
+                session_id=session_id,
+                user_id=user_id,
+                user_message=user_message,
+                agent_response=content,
+                agent_type=current_agent,
+                tool_calls=[],
+                latency_ms=int(latency_seconds * 1000),
+                confidence=confidence,
+                trace_id=trace_id,
+            )
+
             # Stream the content in small chunks to avoid SSE line-size
             # truncation in CopilotKit / OpenAI SDK pipelines.
-            chunk_id = f"chatcmpl-{int(time.time())}"
-            model_name = request.model or "bestbox-agent"
             chunk_size = 200  # characters per delta
             for i in range(0, len(content), chunk_size):
                 chunk_text = content[i:i+chunk_size]
@@ -1480,6 +1621,17 @@ async def chat_completion_stream(request: ChatRequest, session_id_override: Opti
             
         except Exception as e:
             logger.error(f"Streaming error: {e}")
+            await log_conversation(
+                session_id=session_id,
+                user_id=user_id,
+                user_message=user_message,
+                agent_response=f"ERROR: {str(e)}",
+                agent_type="error",
+                tool_calls=[],
+                latency_ms=int((time.time() - start_time) * 1000),
+                confidence=0.0,
+                trace_id=trace_id,
+            )
             # Return an error message as content so frontend doesn't crash
             error_chunk = {
                 "id": f"chatcmpl-{int(time.time())}",
@@ -1802,18 +1954,36 @@ async def admin_list_sessions(
 @app.get("/admin/sessions/{session_id}")
 async def admin_get_session(
     session_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[uuid.UUID] = None,
     admin_token: str = Header(..., alias="admin-token"),
 ):
-    """Get full session with messages and reasoning traces."""
+    """Get a session with its latest page of messages (older pages via ?before=<message id>)."""
     verify_admin_token(admin_token)
     if not session_store:
         raise HTTPException(status_code=503, detail="Session store unavailable")
-    session = await session_store.get_session(session_id)
+    session = await session_store.get_session(session_id, limit, str(before) if before else None)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
 
 
+@app.get("/admin/sessions/{session_id}/messages/{message_id}")
+async def admin_get_session_message(
+    session_id: str,
+    message_id: str,
+    admin_token: str = Header(..., alias="admin-token"),
+):
+    """Get the reasoning trace and tool calls of one session message."""
+    verify_admin_token(admin_token)
+    if not session_store:
+        raise HTTPException(status_code=503, detail="Session store unavailable")
+    details = await session_store.get_message_details(session_id, message_id)
+    if not details:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return details
+
+
 @app.post("/admin/sessions/{session_id}/rating")
 async def admin_rate_session(
     session_id: str,
@@ -1851,7 +2021,9 @@ async def chat_completion_endpoint(
             session_id_override = request.thread_id
         elif bbx_session:
             session_id_override = f"ui-{bbx_session}"
-        return await chat_completion_stream(request, session_id_override=session_id_override)
+        return await chat_completion_stream(
+            request, session_id_override=session_id_override, user_id=user_id
+        )
 
     # ==========================================================
     # Observability Setup
@@ -1956,7 +2128,8 @@ async def chat_completion_endpoint(
             "query_type": query_type,
         },
         "plan": [],
-        "step": 0
+        "step": 0,
+        "session_id": session_id,
     }
 
     logger.info(f"Processing request with {len(lc_messages)} messages")
@@ -2034,14 +2207,8 @@ async def chat_completion_endpoint(
                 agent_type=current_agent
             ).observe(latency_seconds)
 
-            # Track tool executions (if any tool calls were made)
-            if tool_calls:
-                for tool_call in (tool_calls if isinstance(tool_calls, list) else [tool_calls]):
-                    tool_name = tool_call.get('name', 'unknown') if isinstance(tool_call, dict) else 'unknown'
-                    tool_execution_success.labels(
-                        tool_name=tool_name,
-                        status="success"
-                    ).inc()
+            # Per-tool success/error/timeout and latency are recorded by
+            # agents.tool_executor as each call completes
 
         # Log conversation to PostgreSQL
         await log_conversation(
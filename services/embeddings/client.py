@@ -1,3 +1,4 @@
+import asyncio
 import os
 import httpx
 import logging
@@ -16,6 +17,21 @@ class EmbeddingService:
         self.base_url = os.getenv("EMBEDDINGS_URL", "http://localhost:8004")
         if self.base_url.endswith("/v1"):
             self.base_url = self.base_url[:-3]
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Keep-alive client reused across batch calls on the same event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=60.0)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
             
     async def get_embedding(self, text: str) -> Optional[List[float]]:
         """
@@ -47,14 +63,13 @@ class EmbeddingService:
             return []
             
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/embed",
-                    json={"inputs": texts, "normalize": True}
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result.get("embeddings", [])
+            response = await self._get_client().post(
+                f"{self.base_url}/embed",
+                json={"inputs": texts, "normalize": True}
+            )
+            response.raise_for_status()
+            result = response.json()
+            return result.get("embeddings", [])
         except Exception as e:
             logger.error(f"Batch embedding failed: {e}")
             return []
@@ -69,6 +69,18 @@ class EmbedResponse(BaseModel):
     model: str
     inference_time_ms: float
 
+class SparseVectorOut(BaseModel):
+    indices: List[int]
+    values: List[float]
+
+class EmbedSparseResponse(BaseModel):
+    sparse: List[SparseVectorOut]
+    model: str
+    inference_time_ms: float
+
+class EmbedImageRequest(BaseModel):
+    images: List[str]  # base64-encoded image files
+
 class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
@@ -150,6 +162,103 @@ async def embed(request: EmbedRequest):
         inference_time_ms=round(elapsed_ms, 2)
     )
 
+# BGE-M3 lexical weights need the model's sparse head, which SentenceTransformer
+# doesn't load; FlagEmbedding is optional and loaded on first use
+sparse_model = None
+
+
+def _get_sparse_model():
+    global sparse_model
+    if sparse_model is None:
+        try:
+            from FlagEmbedding import BGEM3FlagModel
+        except ImportError:
+            raise HTTPException(
+                status_code=501,
+                detail="Sparse embeddings need FlagEmbedding: pip install FlagEmbedding",
+            )
+        model_name = os.environ.get("EMBEDDINGS_MODEL_NAME", DEFAULT_MODEL_NAME)
+        device = _resolve_device()
+        sparse_model = BGEM3FlagModel(model_name, use_fp16=device.startswith("cuda"), devices=device)
+        logger.info(f"Loaded BGE-M3 sparse head ({model_name}) on {device}")
+    return sparse_model
+
+
+@app.post("/embed_sparse", response_model=EmbedSparseResponse)
+async def embed_sparse(request: EmbedRequest):
+    """BGE-M3 lexical weights as sparse vectors (token id -> weight)."""
+    texts = request.inputs if isinstance(request.inputs, list) else [request.inputs]
+    flag_model = _get_sparse_model()
+
+    start = time.time()
+    output = flag_model.encode(
+        texts, return_dense=False, return_sparse=True, return_colbert_vecs=False
+    )
+    elapsed_ms = (time.time() - start) * 1000
+
+    sparse = []
+    for weights in output["lexical_weights"]:
+        indices = [int(token_id) for token_id in weights]
+        sparse.append(SparseVectorOut(indices=indices, values=[float(w) for w in weights.values()]))
+
+    return EmbedSparseResponse(
+        sparse=sparse,
+        model=os.environ.get("EMBEDDINGS_MODEL_NAME", DEFAULT_MODEL_NAME),
+        inference_time_ms=round(elapsed_ms, 2),
+    )
+
+# Vision encoder for image similarity (troubleshooting defect photos). A small
+# CLIP-family model keeps this usable on CPU; loaded on first use
+DEFAULT_IMAGE_MODEL_NAME = "openai/clip-vit-base-patch32"
+image_model = None
+image_processor = None
+
+
+def _get_image_model():
+    global image_model, image_processor
+    if image_model is None:
+        from transformers import AutoImageProcessor, AutoModel
+
+        model_name = os.environ.get("IMAGE_EMBEDDINGS_MODEL_NAME", DEFAULT_IMAGE_MODEL_NAME)
+        device = os.environ.get("IMAGE_EMBEDDINGS_DEVICE", "cpu")
+        start = time.time()
+        image_processor = AutoImageProcessor.from_pretrained(model_name)
+        image_model = AutoModel.from_pretrained(model_name).to(device).eval()
+        logger.info(f"Loaded image encoder {model_name} on {device} in {time.time() - start:.2f}s")
+    return image_model, image_processor
+
+
+@app.post("/embed_image", response_model=EmbedResponse)
+async def embed_image(request: EmbedImageRequest):
+    """Normalized image embeddings for visual similarity search."""
+    import base64
+    import io
+
+    import torch
+    from PIL import Image
+
+    if not request.images:
+        raise HTTPException(status_code=400, detail="No images provided")
+    try:
+        images = [Image.open(io.BytesIO(base64.b64decode(data))).convert("RGB") for data in request.images]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid image data: {e}")
+
+    vision_model, processor = _get_image_model()
+    start = time.time()
+    with torch.inference_mode():
+        inputs = processor(images=images, return_tensors="pt").to(vision_model.device)
+        features = vision_model.get_image_features(**inputs)
+        features = torch.nn.functional.normalize(features, dim=-1)
+    elapsed_ms = (time.time() - start) * 1000
+
+    return EmbedResponse(
+        embeddings=features.float().cpu().tolist(),
+        dimensions=features.shape[-1],
+        model=os.environ.get("IMAGE_EMBEDDINGS_MODEL_NAME", DEFAULT_IMAGE_MODEL_NAME),
+        inference_time_ms=round(elapsed_ms, 2),
+    )
+
 @app.get("/")
 async def root():
     return {
@@ -157,7 +266,9 @@ async def root():
         "model": os.environ.get("EMBEDDINGS_MODEL_NAME", DEFAULT_MODEL_NAME),
         "endpoints": {
             "health": "/health",
-            "embed": "/embed (POST)"
+            "embed": "/embed (POST)",
+            "embed_sparse": "/embed_sparse (POST)",
+            "embed_image": "/embed_image (POST)"
         }
     }
 
@@ -0,0 +1,273 @@
+"""
+Streaming helpers shared by the Slack and Telegram gateways.
+
+- one aiohttp session per gateway process (get_http_session)
+- agent_reply_events: SSE consumer for /v1/chat/completions with
+  metadata.progress, yielding draft tokens, tool activity and final content
+- ProgressiveReply: edits a placeholder message as events arrive, no more
+  often than the platform allows
+- ChatQueues: requests from one chat run one at a time, and at most
+  GATEWAY_MAX_CONCURRENCY run overall, so a burst in one channel queues
+  behind itself instead of starving the others
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+GATEWAY_EDIT_INTERVAL_S = float(os.getenv("GATEWAY_EDIT_INTERVAL_S", "1.2"))
+GATEWAY_CHAT_CONCURRENCY = int(os.getenv("GATEWAY_CHAT_CONCURRENCY", "1"))
+GATEWAY_MAX_CONCURRENCY = int(os.getenv("GATEWAY_MAX_CONCURRENCY", "8"))
+GATEWAY_REQUEST_TIMEOUT_S = float(os.getenv("GATEWAY_REQUEST_TIMEOUT_S", "600"))
+
+PLACEHOLDER_TEXT = "⏳ …"
+
+_MARKERS = re.compile(r"\[(TOOL_RESULTS|SPEECH|BBX_SESSION)\][\s\S]*?\[/\1\]")
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Shared client session for Agent API calls (created on first use)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=GATEWAY_REQUEST_TIMEOUT_S),
+            connector=aiohttp.TCPConnector(limit=GATEWAY_MAX_CONCURRENCY * 2),
+        )
+    return _session
+
+
+async def close_http_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+class AgentAPIError(Exception):
+    """Non-200 response from the Agent API."""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"Agent API error: {status} - {body[:200]}")
+        self.status = status
+
+
+def display_text(content: str) -> str:
+    """Agent content without the hidden data tags meant for the web frontend."""
+    return _MARKERS.sub("", content).strip()
+
+
+def split_message(text: str, limit: int) -> List[str]:
+    """Split text into platform-sized messages, preferring line breaks."""
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        parts.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    parts.append(text)
+    return parts
+
+
+async def agent_reply_events(
+    session: aiohttp.ClientSession,
+    url: str,
+    payload: Dict,
+    headers: Dict[str, str],
+) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Stream an Agent API chat completion.
+
+    Args:
+        session: Shared client session
+        url: /v1/chat/completions URL
+        payload: Request body (stream and metadata.progress are set here)
+        headers: Request headers
+
+    Yields:
+        ("token", text) draft answer tokens, ("tool_start" | "tool_end", name)
+        tool activity, ("content", text) pieces of the final answer
+
+    Raises:
+        AgentAPIError: On a non-200 response
+    """
+    payload = {**payload, "stream": True, "metadata": {**(payload.get("metadata") or {}), "progress": True}}
+    async with session.post(url, json=payload, headers=headers) as resp:
+        if resp.status != 200:
+            raise AgentAPIError(resp.status, await resp.text())
+
+        async for raw in resp.content:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if "error" in chunk and "choices" not in chunk:
+                raise AgentAPIError(500, str(chunk["error"]))
+
+            progress = chunk.get("bbx_progress")
+            if progress:
+                kind = progress.get("type")
+                if kind == "token":
+                    yield "token", progress.get("text", "")
+                elif kind in ("tool_start", "tool_end"):
+                    yield kind, progress.get("tool") or ""
+                continue
+            for choice in chunk.get("choices", []):
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    yield "content", content
+
+
+class ProgressiveReply:
+    """Rate-limited progressive edits of one placeholder message."""
+
+    def __init__(
+        self,
+        edit: Callable[[str], Awaitable[None]],
+        min_interval: float = GATEWAY_EDIT_INTERVAL_S,
+        max_chars: int = 4000,
+    ):
+        self._edit = edit
+        self.min_interval = min_interval
+        self.max_chars = max_chars
+        self._shown = PLACEHOLDER_TEXT
+        self._pending: Optional[str] = None
+        self._last_edit = 0.0
+        self._flusher: Optional[asyncio.Task] = None
+        self.edits = 0
+
+    async def update(self, text: str) -> None:
+        """Show ``text`` now, or as soon as the rate limit allows (latest text wins)."""
+        text = self._fit(text)
+        if text == self._shown:
+            self._pending = None
+            return
+        self._pending = text
+        wait = self._last_edit + self.min_interval - time.monotonic()
+        if wait <= 0:
+            await self._flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later(wait))
+
+    async def finish(self, text: str) -> None:
+        """Show the final text (waiting out the rate limit if needed)."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        self._pending = self._fit(text)
+        wait = self._last_edit + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if self._pending != self._shown:
+            await self._flush()
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._flush()
+
+    async def _flush(self) -> None:
+        text, self._pending = self._pending, None
+        if text is None or text == self._shown:
+            return
+        self._last_edit = time.monotonic()
+        try:
+            await self._edit(text)
+            self._shown = text
+            self.edits += 1
+        except Exception as e:
+            logger.warning(f"Progressive edit failed: {e}")
+
+    def _fit(self, text: str) -> str:
+        text = text or PLACEHOLDER_TEXT
+        if len(text) > self.max_chars:
+            text = text[: self.max_chars - 1] + "…"
+        return text
+
+
+def progress_text(draft: str, tool: Optional[str]) -> str:
+    """Interim message body: draft answer plus the running tool, if any."""
+    status = f"🔧 {tool} …" if tool else ""
+    if draft and status:
+        return f"{draft}\n\n{status}"
+    return draft or status or PLACEHOLDER_TEXT
+
+
+async def stream_reply(
+    session: aiohttp.ClientSession,
+    url: str,
+    payload: Dict,
+    headers: Dict[str, str],
+    reply: ProgressiveReply,
+) -> str:
+    """
+    Stream an agent reply into ``reply`` and return the final display text.
+
+    Draft tokens and tool activity are shown as they arrive; the final
+    answer (validated server-side) replaces the draft once complete.
+    """
+    draft = ""
+    content = ""
+    tool: Optional[str] = None
+    async for kind, value in agent_reply_events(session, url, payload, headers):
+        if kind == "content":
+            content += value
+            continue
+        if kind == "token":
+            draft += value
+        elif kind == "tool_start":
+            tool = value
+            # The model's text before a tool call is a plan, not the answer
+            draft = ""
+        elif kind == "tool_end":
+            tool = None
+        await reply.update(progress_text(draft, tool))
+    return display_text(content)
+
+
+class ChatQueues:
+    """Per-chat FIFO plus a global cap on concurrent agent requests."""
+
+    def __init__(
+        self,
+        per_chat: int = GATEWAY_CHAT_CONCURRENCY,
+        total: int = GATEWAY_MAX_CONCURRENCY,
+    ):
+        self.per_chat = max(1, per_chat)
+        self._global = asyncio.Semaphore(max(1, total))
+        self._chats: Dict[str, asyncio.Semaphore] = {}
+        self._waiting: Dict[str, int] = {}
+
+    async def run(self, chat_id: str, job: Callable[[], Awaitable]):
+        """Run ``job`` once this chat and the gateway both have a free slot."""
+        chat = self._chats.setdefault(chat_id, asyncio.Semaphore(self.per_chat))
+        self._waiting[chat_id] = self._waiting.get(chat_id, 0) + 1
+        try:
+            async with chat:
+                async with self._global:
+                    return await job()
+        finally:
+            self._waiting[chat_id] -= 1
+            if not self._waiting[chat_id]:
+                # Nobody else holds or waits for this chat's semaphore
+                del self._waiting[chat_id]
+                self._chats.pop(chat_id, None)
+
+    def pending(self, chat_id: str) -> int:
+        """Requests from a chat that are running or queued."""
+        return self._waiting.get(chat_id, 0)
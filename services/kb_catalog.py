@@ -0,0 +1,339 @@
+"""
+Document-level catalog for the knowledge base.
+
+Qdrant stores one point per chunk, so answering "which documents are in this
+collection" from Qdrant means scrolling every point. The admin UI instead
+reads the ``kb_documents`` table, which holds one row per (collection, doc_id)
+and is kept in step by the indexing and delete paths in admin_endpoints.
+
+Existing collections are backfilled once from Qdrant (payload fields only,
+never chunk text) the first time they are listed. Writers that bypass
+admin_endpoints (the scripts/ seeders, TroubleshootingIndexer, DocumentIndexer
+used directly) do not touch the catalog, so documents they add or remove only
+show up after a resync (``GET /admin/kb/documents?resync=true``).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Payload keys needed to describe a document; everything else (text, image
+# paths, enrichment tags) stays in Qdrant
+CATALOG_PAYLOAD_FIELDS = [
+    "doc_id", "source", "source_file", "file_type", "domain",
+    "upload_date", "uploaded_by", "has_images", "timestamp",
+]
+
+BACKFILL_PAGE_SIZE = 1000
+
+_backfill_lock = asyncio.Lock()
+
+
+# ------------------------------------------------------------------
+# Payload helpers
+# ------------------------------------------------------------------
+
+def document_key(payload: Dict[str, Any], point_id: Any = None) -> str:
+    """Group key for a chunk: doc_id, else source filename, else the point id."""
+    return payload.get("doc_id") or payload.get("source") or str(point_id)
+
+
+def _parse_upload_date(payload: Dict[str, Any]) -> Optional[datetime]:
+    value = payload.get("upload_date")
+    if value:
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            parsed = None
+        if parsed is not None:
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    if payload.get("timestamp"):
+        try:
+            return datetime.fromtimestamp(payload["timestamp"], tz=timezone.utc)
+        except (TypeError, ValueError, OSError):
+            pass
+    return None
+
+
+def summarize_payloads(
+    payloads: Iterable[Tuple[Dict[str, Any], Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Group chunk payloads into document rows.
+
+    Args:
+        payloads: ``(payload, point_id)`` pairs; point_id may be None
+
+    Returns:
+        Mapping of document key to catalog row (chunk_count = chunks seen)
+    """
+    docs: Dict[str, Dict[str, Any]] = {}
+    for payload, point_id in payloads:
+        payload = payload or {}
+        key = document_key(payload, point_id)
+        doc = docs.get(key)
+        if doc is None:
+            source = payload.get("source_file") or payload.get("source", "")
+            file_type = payload.get("file_type", "")
+            if not file_type and "." in source:
+                file_type = source.rsplit(".", 1)[-1].lower()
+            doc = docs[key] = {
+                "doc_id": key,
+                "source_file": source,
+                "file_type": file_type,
+                "domain": payload.get("domain", ""),
+                "upload_date": _parse_upload_date(payload),
+                "uploaded_by": payload.get("uploaded_by", ""),
+                "has_images": False,
+                "chunk_count": 0,
+            }
+        doc["chunk_count"] += 1
+        doc["has_images"] = doc["has_images"] or bool(payload.get("has_images"))
+    return docs
+
+
+# ------------------------------------------------------------------
+# Database operations
+# ------------------------------------------------------------------
+
+async def init_kb_catalog(pool: asyncpg.Pool) -> None:
+    """Create catalog tables if they don't exist."""
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS kb_documents (
+                collection VARCHAR(255) NOT NULL,
+                doc_id VARCHAR(255) NOT NULL,
+                source_file TEXT NOT NULL DEFAULT '',
+                file_type VARCHAR(20) NOT NULL DEFAULT '',
+                domain VARCHAR(50) NOT NULL DEFAULT '',
+                upload_date TIMESTAMPTZ,
+                uploaded_by VARCHAR(100) NOT NULL DEFAULT '',
+                has_images BOOLEAN NOT NULL DEFAULT FALSE,
+                chunk_count INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (collection, doc_id)
+            )
+        """)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS kb_catalog_backfills (
+                collection VARCHAR(255) PRIMARY KEY,
+                documents INTEGER NOT NULL,
+                completed_at TIMESTAMPTZ DEFAULT NOW()
+            )
+        """)
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_kb_documents_listing "
+            "ON kb_documents(collection, upload_date DESC NULLS LAST, doc_id)"
+        )
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_kb_documents_filters "
+            "ON kb_documents(collection, domain, file_type)"
+        )
+
+
+async def record_documents(
+    pool: asyncpg.Pool,
+    collection: str,
+    payloads: Iterable[Tuple[Dict[str, Any], Any]],
+    replace: bool = False,
+) -> int:
+    """
+    Upsert catalog rows for newly indexed chunks.
+
+    Args:
+        pool: asyncpg pool
+        collection: Qdrant collection name
+        payloads: ``(payload, point_id)`` pairs of the upserted points
+        replace: Overwrite chunk counts instead of adding to them (backfill/resync)
+
+    Returns:
+        Number of documents written
+    """
+    docs = summarize_payloads(payloads)
+    if not docs:
+        return 0
+    async with pool.acquire() as conn:
+        await _write_rows(conn, collection, docs, replace)
+    return len(docs)
+
+
+async def _write_rows(conn, collection: str, docs: Dict[str, Dict[str, Any]], replace: bool) -> None:
+    if replace:
+        conflict = "chunk_count = EXCLUDED.chunk_count, has_images = EXCLUDED.has_images"
+    else:
+        conflict = (
+            "chunk_count = kb_documents.chunk_count + EXCLUDED.chunk_count, "
+            "has_images = kb_documents.has_images OR EXCLUDED.has_images"
+        )
+    await conn.executemany(
+        f"""INSERT INTO kb_documents
+               (collection, doc_id, source_file, file_type, domain,
+                upload_date, uploaded_by, has_images, chunk_count)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            ON CONFLICT (collection, doc_id) DO UPDATE SET
+                {conflict}, updated_at = NOW()""",
+        [
+            (
+                collection, d["doc_id"], d["source_file"], d["file_type"], d["domain"],
+                d["upload_date"], d["uploaded_by"], d["has_images"], d["chunk_count"],
+            )
+            for d in docs.values()
+        ],
+    )
+
+
+async def remove_document(pool: asyncpg.Pool, collection: str, doc_id: str) -> None:
+    """Drop a document from the catalog."""
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "DELETE FROM kb_documents WHERE collection = $1 AND doc_id = $2",
+            collection, doc_id,
+        )
+
+
+async def list_documents(
+    pool: asyncpg.Pool,
+    collection: str,
+    domain: Optional[str] = None,
+    file_type: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Page through catalogued documents, newest first.
+
+    Returns:
+        (documents, total matching documents)
+    """
+    conditions = ["collection = $1"]
+    params: List[Any] = [collection]
+    if domain:
+        params.append(domain)
+        conditions.append(f"domain = ${len(params)}")
+    if file_type:
+        params.append(file_type)
+        conditions.append(f"file_type = ${len(params)}")
+    if search:
+        # Match the search text literally, not as a LIKE pattern
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+        n = len(params)
+        conditions.append(f"(source_file ILIKE ${n} ESCAPE '\\' OR doc_id ILIKE ${n} ESCAPE '\\')")
+    where = " AND ".join(conditions)
+
+    async with pool.acquire() as conn:
+        total = await conn.fetchval(f"SELECT COUNT(*) FROM kb_documents WHERE {where}", *params)
+        rows = await conn.fetch(
+            f"""SELECT doc_id, source_file, file_type, domain, upload_date,
+                       uploaded_by, chunk_count, has_images
+                FROM kb_documents
+                WHERE {where}
+                ORDER BY upload_date DESC NULLS LAST, doc_id
+                LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}""",
+            *params, limit, offset,
+        )
+
+    documents = [
+        {
+            "doc_id": r["doc_id"],
+            "source_file": r["source_file"],
+            "file_type": r["file_type"],
+            "domain": r["domain"],
+            "upload_date": r["upload_date"].isoformat() if r["upload_date"] else "",
+            "uploaded_by": r["uploaded_by"],
+            "chunk_count": r["chunk_count"],
+            "has_images": r["has_images"],
+        }
+        for r in rows
+    ]
+    return documents, total
+
+
+# ------------------------------------------------------------------
+# Backfill from Qdrant
+# ------------------------------------------------------------------
+
+async def scan_collection(
+    client, collection: str, scroll_filter=None
+) -> List[Tuple[Dict[str, Any], Any]]:
+    """Scroll a collection (AsyncQdrantClient) returning only catalog payload fields."""
+    payloads: List[Tuple[Dict[str, Any], Any]] = []
+    page_offset = None
+    while True:
+        points, page_offset = await client.scroll(
+            collection_name=collection,
+            scroll_filter=scroll_filter,
+            limit=BACKFILL_PAGE_SIZE,
+            offset=page_offset,
+            with_payload=CATALOG_PAYLOAD_FIELDS,
+            with_vectors=False,
+        )
+        payloads.extend((p.payload or {}, p.id) for p in points)
+        if page_offset is None:
+            break
+    return payloads
+
+
+async def ensure_backfilled(
+    pool: asyncpg.Pool, client, collection: str, force: bool = False
+) -> bool:
+    """
+    Build the catalog for a collection from Qdrant, once.
+
+    Args:
+        pool: asyncpg pool
+        client: AsyncQdrantClient
+        collection: Collection to backfill
+        force: Rebuild even if already backfilled (drops stale rows)
+
+    Returns:
+        True if a backfill ran
+    """
+    async with _backfill_lock:
+        if not force:
+            async with pool.acquire() as conn:
+                done = await conn.fetchval(
+                    "SELECT 1 FROM kb_catalog_backfills WHERE collection = $1", collection
+                )
+            if done:
+                return False
+
+        payloads = await scan_collection(client, collection)
+
+        docs = summarize_payloads(payloads)
+
+        # Replace the collection's rows atomically so listings never see a half-built catalog
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("DELETE FROM kb_documents WHERE collection = $1", collection)
+                if docs:
+                    await _write_rows(conn, collection, docs, replace=True)
+                await conn.execute(
+                    """INSERT INTO kb_catalog_backfills (collection, documents)
+                       VALUES ($1, $2)
+                       ON CONFLICT (collection) DO UPDATE SET
+                           documents = EXCLUDED.documents, completed_at = NOW()""",
+                    collection, len(docs),
+                )
+        logger.info(
+            f"KB catalog backfilled for '{collection}': {len(docs)} documents from {len(payloads)} points"
+        )
+        return True
+
+
+async def sync_document(
+    pool: asyncpg.Pool, client, collection: str, doc_key: str, field: str = "source"
+) -> None:
+    """Recount one document from Qdrant (for indexers that don't report payloads)."""
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+    scroll_filter = Filter(must=[FieldCondition(key=field, match=MatchValue(value=doc_key))])
+    payloads = await scan_collection(client, collection, scroll_filter)
+    if payloads:
+        await record_documents(pool, collection, payloads, replace=True)
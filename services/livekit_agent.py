@@ -20,6 +20,14 @@ Environment Variables:
     LIVEKIT_API_KEY: API key (auto-generated in dev mode)
     LIVEKIT_API_SECRET: API secret (auto-generated in dev mode)
     OPENAI_BASE_URL: For local LLM (default: http://localhost:8080/v1)
+    SPEECH_SIDECAR_SOCKET: Unix socket of a running speech sidecar
+        (python -m services.speech.sidecar); job processes then share its
+        warm ASR/TTS models instead of loading their own
+    VOICE_MEMORY_PROFILING: Set to 1 for tracemalloc snapshots, per-session
+        buffer gauges and "memory_debug" data-channel commands
+        (see services/voice_memory.py)
+    VOICE_MEMORY_GC_MB: RSS above which the memory monitor forces a full
+        garbage collection (default: 3000, 0 disables)
 """
 
 import logging
@@ -40,6 +48,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from services import voice_memory  # reads VOICE_MEMORY_* from the environment
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -773,8 +783,18 @@ def prewarm(proc: JobProcess):
     """Preload models for faster session startup."""
     logger.info("Prewarming: Loading VAD model...")
     proc.userdata["vad"] = silero.VAD.load()
+
+    # ASR/TTS models live in the speech sidecar (if running); just connect to it
+    if LOCAL_ADAPTERS_AVAILABLE:
+        from services.livekit_local import attach_speech_sidecar
+        proc.userdata["speech_sidecar"] = attach_speech_sidecar()
     logger.info("Prewarming complete")
 
+    # Trace from process start so the baseline snapshot predates any session
+    profiler = voice_memory.get_profiler()
+    if profiler is not None:
+        profiler.enable()
+
     # Memory monitoring will be started in the session entrypoint
     logger.info("Prewarming complete - memory monitor will start with session")
 
@@ -782,6 +802,12 @@ def prewarm(proc: JobProcess):
 server.setup_fnc = prewarm
 
 
+# Full collections pause the event loop (and the audio with it); 0 disables them
+VOICE_MEMORY_GC_MB = float(os.environ.get("VOICE_MEMORY_GC_MB", "3000"))
+
+_memory_monitor_task = None
+
+
 async def monitor_memory():
     """
     Monitor memory usage and trigger garbage collection when needed.
@@ -793,7 +819,7 @@ async def monitor_memory():
             await asyncio.sleep(60)  # Check every minute
             mem_mb = process.memory_info().rss / 1024 / 1024
 
-            if mem_mb > 3000:  # 3GB threshold
+            if VOICE_MEMORY_GC_MB and mem_mb > VOICE_MEMORY_GC_MB:
                 logger.warning(f"High memory usage detected: {mem_mb:.1f}MB - forcing garbage collection")
                 gc.collect()
                 # Log memory after GC
@@ -807,6 +833,40 @@ async def monitor_memory():
             logger.error(f"Error in memory monitor: {e}")
 
 
+def start_memory_monitor():
+    """Start the memory monitor once per process, plus the profiler if enabled."""
+    global _memory_monitor_task
+    if _memory_monitor_task is None or _memory_monitor_task.done():
+        _memory_monitor_task = asyncio.create_task(monitor_memory())
+    profiler = voice_memory.get_profiler()
+    if profiler is not None:
+        profiler.start()
+
+
+def handle_memory_debug(room, profiler):
+    """Answer "memory_debug" data-channel commands from room participants."""
+
+    async def reply(message, identity):
+        try:
+            response = await profiler.handle_command(message)
+            payload = json.dumps(response).encode('utf-8')
+            destinations = [identity] if identity else []
+            await room.local_participant.publish_data(payload, reliable=True, destination_identities=destinations)
+            logger.info(f"🧠 Answered memory_debug '{response['command']}' for {identity or 'room'}")
+        except Exception as e:
+            logger.error(f"❌ memory_debug command failed: {e}")
+
+    @room.on("data_received")
+    def on_data_received(packet):
+        try:
+            message = json.loads(packet.data.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError):
+            return
+        if isinstance(message, dict) and message.get("type") == "memory_debug":
+            identity = packet.participant.identity if packet.participant else None
+            asyncio.create_task(reply(message, identity))
+
+
 async def entrypoint(ctx: JobContext):
     """
     Production-ready BestBox Voice Agent entrypoint.
@@ -816,6 +876,8 @@ async def entrypoint(ctx: JobContext):
     logger.info(f"🎯 BESTBOX SESSION START - Room: {ctx.room.name}")
     
     session_start_time = time.time()
+    # Session buffers created from here on are reported under this room
+    voice_memory.current_session.set(ctx.room.name)
     
     try:
         # Phase 1: Initialize core session configuration
@@ -1059,7 +1121,10 @@ async def entrypoint(ctx: JobContext):
         ctx.add_shutdown_callback(log_usage)
         
         # Start memory monitoring
-        asyncio.create_task(monitor_memory())
+        start_memory_monitor()
+        profiler = voice_memory.get_profiler()
+        if profiler is not None:
+            handle_memory_debug(ctx.room, profiler)
         
         # Phase 7: Start session with voice agent + TTS
         logger.info("🔧 Phase 6: Starting session with voice-enabled agent...")
@@ -3,7 +3,7 @@ import asyncio
 import logging
 import time
 import uuid
-from typing import AsyncIterable
+from typing import AsyncIterable, Optional
 import numpy as np
 
 from livekit import agents, rtc
@@ -13,6 +13,8 @@ from livekit.agents.utils import aio
 
 from services.speech.asr import StreamingASR, ASRConfig
 from services.speech.tts import StreamingTTS, TTSConfig
+from services.speech import sidecar as speech_sidecar
+from services import voice_memory
 
 logger = logging.getLogger("livekit.local")
 
@@ -21,12 +23,48 @@ _SHARED_ASR_MODEL = None
 _SHARED_TTS_ENGINE = None
 _MODEL_LOCK = asyncio.Lock()
 
+
+def attach_speech_sidecar() -> bool:
+    """
+    Attach this job process to the speech sidecar, if one is configured.
+
+    Called from the LiveKit prewarm hook: it only checks the sidecar and opens
+    the TTS connection, so no models are loaded in the job process.
+
+    Returns:
+        True if speech will be served by the sidecar
+    """
+    global _SHARED_TTS_ENGINE
+    if not speech_sidecar.SPEECH_SIDECAR_SOCKET:
+        return False
+    try:
+        info = speech_sidecar.ping()
+        if info.get("tts_loaded"):
+            _SHARED_TTS_ENGINE = speech_sidecar.RemoteTTS()
+    except (OSError, speech_sidecar.SpeechSidecarError) as e:
+        logger.warning(f"⚠️ Speech sidecar unavailable ({e}), models will load in-process")
+        return False
+    logger.info(f"🔌 Attached to speech sidecar (PID {info['pid']}, {info['rss_mb']:.0f}MB)")
+    return True
+
+
 async def get_shared_asr() -> StreamingASR:
     """
     Get a NEW ASR instance for the session, but sharing the heavy Whisper model.
     This prevents state pollution (buffers) between sessions while saving memory.
+
+    With SPEECH_SIDECAR_SOCKET set, the session lives in the speech sidecar and
+    the model is shared across all job processes instead.
     """
     global _SHARED_ASR_MODEL
+    if speech_sidecar.SPEECH_SIDECAR_SOCKET:
+        try:
+            session_asr = await asyncio.to_thread(speech_sidecar.RemoteASR)
+            logger.info("🆕 Opened ASR session in speech sidecar")
+            return session_asr
+        except (OSError, speech_sidecar.SpeechSidecarError) as e:
+            logger.warning(f"⚠️ Speech sidecar unavailable ({e}), loading ASR in-process")
+
     async with _MODEL_LOCK:
         if _SHARED_ASR_MODEL is None:
             logger.info("🔧 Initializing PRIMARY ASR model holder...")
@@ -58,6 +96,12 @@ async def get_shared_tts() -> StreamingTTS:
     """Get or create shared TTS engine instance."""
     global _SHARED_TTS_ENGINE
     async with _MODEL_LOCK:
+        if _SHARED_TTS_ENGINE is None and speech_sidecar.SPEECH_SIDECAR_SOCKET:
+            try:
+                _SHARED_TTS_ENGINE = await asyncio.to_thread(speech_sidecar.RemoteTTS)
+                logger.info("🔌 Using speech sidecar for TTS")
+            except (OSError, speech_sidecar.SpeechSidecarError) as e:
+                logger.warning(f"⚠️ Speech sidecar unavailable ({e}), loading TTS in-process")
         if _SHARED_TTS_ENGINE is None:
             logger.info("🔧 Initializing shared TTS engine (first session)...")
             _SHARED_TTS_ENGINE = StreamingTTS(TTSConfig(sample_rate=24000, fallback_to_piper=True))
@@ -112,12 +156,22 @@ def resample_16k(pcm: np.ndarray, orig_sr: int) -> np.ndarray:
         return pcm[indices]
 
 
+def _reset_asr(asr: StreamingASR, language: Optional[str]) -> None:
+    asr.reset()
+    if language:
+        asr.set_language(language)
+
+
 class LocalSTT(stt.STT):
     def __init__(self, config: ASRConfig = None, asr_instance: StreamingASR = None):
         super().__init__(capabilities=stt.STTCapabilities(streaming=True, interim_results=True))
         self.config = config or ASRConfig()
         # Use provided ASR instance (shared) or create new one (fallback)
         self._asr = asr_instance if asr_instance is not None else StreamingASR(self.config)
+        # Sidecar-backed sessions keep their audio buffers in the sidecar
+        if isinstance(self._asr, StreamingASR):
+            voice_memory.track("asr_speech_buffer_samples", self._asr, lambda asr: len(asr.speech_buffer))
+            voice_memory.track("asr_ring_buffer_samples", self._asr, lambda asr: len(asr.buffer))
 
     def _recognize_impl(self, buffer: AsyncIterable[rtc.AudioFrame], language: str = None) -> AsyncIterable[stt.SpeechEvent]:
         """
@@ -127,10 +181,8 @@ class LocalSTT(stt.STT):
         return self.recognize(buffer, language)
 
     async def recognize(self, buffer: AsyncIterable[rtc.AudioFrame], language: str = None) -> AsyncIterable[stt.SpeechEvent]:
-        # Reset ASR state
-        self._asr.reset()
-        if language:
-            self._asr.set_language(language)
+        # Reset ASR state (a blocking socket call when the ASR lives in the sidecar)
+        await asyncio.to_thread(_reset_asr, self._asr, language)
 
         async for frame in buffer:
             # Convert AudioFrame to int16 numpy array
@@ -174,6 +226,12 @@ class LocalSTT(stt.STT):
         # Accept any additional parameters (like conn_options) via **kwargs
         return LocalSpeechStream(self, self._asr, language=language)
 
+    async def aclose(self) -> None:
+        # Sidecar-backed sessions hold a connection and server-side ASR state
+        if isinstance(self._asr, speech_sidecar.RemoteASR):
+            self._asr.close()
+        await super().aclose()
+
 
 class LocalSpeechStream(stt.RecognizeStream):
     def __init__(self, local_stt: 'LocalSTT', asr: StreamingASR, *, language: str = None):
@@ -188,11 +246,12 @@ class LocalSpeechStream(stt.RecognizeStream):
         super().__init__(stt=local_stt, conn_options=conn_options)
         self._asr = asr
         self._language = language
-        self._asr.reset()
-        if language:
-            self._asr.set_language(language)
+        # Off the event loop: with the sidecar this waits for the connection
+        # lock, which a previous stream's inference may still hold
+        self._reset_task = asyncio.create_task(asyncio.to_thread(_reset_asr, asr, language))
         self._queue = asyncio.Queue()
         self._input_queue = asyncio.Queue()
+        voice_memory.track("stt_input_frames", self, lambda stream: stream._input_queue.qsize())
         self._main_task = asyncio.create_task(self._run())
 
     def push_frame(self, frame: rtc.AudioFrame) -> None:
@@ -221,6 +280,7 @@ class LocalSpeechStream(stt.RecognizeStream):
         frame_count = 0
 
         try:
+            await self._reset_task
             while True:
                 frame = await self._input_queue.get()
                 if frame is None:
@@ -360,6 +420,7 @@ class LocalTTSStream(tts.SynthesizeStream):
         super().__init__(tts=local_tts, conn_options=conn_options)
         self._tts_engine = tts_engine
         self._closed = False
+        voice_memory.track("tts_input_chunks", self, lambda stream: stream._input_ch.qsize())
         logger.info("🔊 TTS: LocalTTSStream initialized")
 
     async def _run(self, output_emitter) -> None:
@@ -50,6 +50,13 @@ tool_execution_success = Counter(
     ['tool_name', 'status']  # status: success | error
 )
 
+tool_latency_seconds = Histogram(
+    'bestbox_tool_latency_seconds',
+    'Tool execution latency by tool name and result',
+    ['tool_name', 'status'],  # status: success | error | timeout
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+)
+
 # ==========================================================
 # User Feedback Tracking
 # ==========================================================
@@ -174,6 +181,110 @@ tool_calls_total = Counter(
     ['tool_name', 'result']  # result: success | error | timeout
 )
 
+# ==========================================================
+# Per-Node LLM Tracking (agents/utils.py client registry)
+# ==========================================================
+
+llm_call_latency = Histogram(
+    'bestbox_llm_call_seconds',
+    'LLM call latency by graph node',
+    ['node'],  # router | erp_agent | mold_agent | react | direct | ...
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+)
+
+llm_node_tokens = Counter(
+    'bestbox_llm_node_tokens_total',
+    'LLM token usage by graph node and direction',
+    ['node', 'direction']  # direction: input | output
+)
+
+llm_ttft_seconds = Histogram(
+    'bestbox_llm_ttft_seconds',
+    'Time to first streamed token by graph node',
+    ['node'],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0]
+)
+
+llm_prefill_tokens = Histogram(
+    'bestbox_llm_prefill_tokens',
+    'Prompt tokens processed per call (input minus server cache hits)',
+    ['node'],
+    buckets=[64, 256, 512, 1000, 2000, 4000, 8000, 16000]
+)
+
+llm_client_cache = Counter(
+    'bestbox_llm_client_cache_total',
+    'LLM client registry lookups',
+    ['result']  # result: hit | miss
+)
+
+# ==========================================================
+# Plugin Hook Tracking (plugins/hooks.py)
+# ==========================================================
+
+plugin_hook_latency = Histogram(
+    'bestbox_plugin_hook_seconds',
+    'Plugin hook handler latency',
+    ['plugin', 'event'],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+)
+
+plugin_hook_errors = Counter(
+    'bestbox_plugin_hook_errors_total',
+    'Plugin hook handler exceptions',
+    ['plugin', 'event']
+)
+
+# ==========================================================
+# Write-Behind Logging (services/write_behind.py)
+# ==========================================================
+
+write_behind_queue_depth = Gauge(
+    'bestbox_write_behind_queue_depth',
+    'Rows waiting in a write-behind queue',
+    ['writer']
+)
+
+write_behind_rows = Counter(
+    'bestbox_write_behind_rows_total',
+    'Write-behind rows by outcome',
+    ['writer', 'outcome']  # outcome: written | spilled | replayed | dead_lettered
+)
+
+write_behind_flush_seconds = Histogram(
+    'bestbox_write_behind_flush_seconds',
+    'Write-behind batch write latency',
+    ['writer'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
+# ==========================================================
+# Voice Agent Memory (services/voice_memory.py, opt-in)
+# ==========================================================
+
+voice_memory_rss_bytes = Gauge(
+    'bestbox_voice_memory_rss_bytes',
+    'Resident set size of the voice agent job process'
+)
+
+voice_traced_memory_bytes = Gauge(
+    'bestbox_voice_traced_memory_bytes',
+    'Python heap traced by tracemalloc',
+    ['kind']  # kind: current | peak
+)
+
+voice_allocation_site_bytes = Gauge(
+    'bestbox_voice_allocation_site_bytes',
+    'Traced memory of the largest allocation sites (file:line)',
+    ['site']
+)
+
+voice_session_buffer_size = Gauge(
+    'bestbox_voice_session_buffer_size',
+    'Items held in a voice session buffer (unit in the buffer name)',
+    ['session', 'buffer']
+)
+
 # ==========================================================
 # Usage Example
 # ==========================================================
@@ -181,7 +292,7 @@ tool_calls_total = Counter(
 """
 Example usage in agent_api.py:
 
-from observability import (
+from services.observability import (
     agent_requests,
     agent_latency,
     llm_tokens_generated,
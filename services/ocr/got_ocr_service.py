@@ -2,12 +2,17 @@
 
 FastAPI service providing GPU-accelerated OCR capabilities using stepfun-ai/GOT-OCR2_0 model.
 Optimized for P100 GPU (16GB VRAM, CUDA 11.8).
+
+Both /ocr and /ocr/batch go through one OCRBatcher. Uploads are decoded and
+resized on a thread pool, then the model runs in batches of up to
+OCR_BATCH_SIZE images on its own thread.
 """
 
+import io
+import json
 import logging
 import os
-import tempfile
-from pathlib import Path
+import sys
 from typing import Optional, List
 
 # Force disable bfloat16 for P100 compatibility before importing torch
@@ -19,7 +24,11 @@ import torch
 torch.cuda.is_bf16_supported = lambda: False
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from transformers import StoppingCriteria
+
+from services.ocr.ocr_batcher import OCRBatcher
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +40,11 @@ logger = logging.getLogger("ocr-gpu-service")
 # Configuration
 MODEL_NAME = "stepfun-ai/GOT-OCR2_0"
 MAX_IMAGE_SIZE = 2048  # Resize larger images to save VRAM
+# GOT encodes every image as 256 patch tokens, so all prompts of one ocr_type
+# have the same length and a batch needs no input padding
+IMAGE_TOKEN_LEN = 256
+STOP_STR = "<|im_end|>"
+GOT_SYSTEM_PROMPT = "<|im_start|>system\nYou should follow the instructions carefully and explain your answers in detail."
 
 class OCRResponse(BaseModel):
     """OCR extraction response."""
@@ -83,22 +97,87 @@ def get_model():
     
     return _model, _tokenizer
 
-def resize_image_if_needed(image_path: Path) -> Path:
-    """Resize image if larger than MAX_IMAGE_SIZE to save VRAM."""
+def preprocess_image(content: bytes):
+    """Decode an upload and resize it to MAX_IMAGE_SIZE to save VRAM (runs on the preprocessing pool)."""
     from PIL import Image
-    
-    with Image.open(image_path) as img:
-        if max(img.size) > MAX_IMAGE_SIZE:
-            ratio = MAX_IMAGE_SIZE / max(img.size)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            
-            resized_path = image_path.with_suffix('.resized.png')
-            img.save(resized_path)
-            logger.info(f"Resized image from {img.size} to {new_size}")
-            return resized_path
-    
-    return image_path
+
+    img = Image.open(io.BytesIO(content)).convert("RGB")
+    if max(img.size) > MAX_IMAGE_SIZE:
+        ratio = MAX_IMAGE_SIZE / max(img.size)
+        new_size = (int(img.width * ratio), int(img.height * ratio))
+        logger.info(f"Resized image from {img.size} to {new_size}")
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+    return img
+
+
+class _AllRowsStopped(StoppingCriteria):
+    """Stop once every row has emitted STOP_STR (GOT's own criterion only checks row 0)."""
+
+    def __init__(self, tokenizer, prompt_len: int):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self.done: Optional[List[bool]] = None
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        tails = self.tokenizer.batch_decode(input_ids[:, max(self.prompt_len, input_ids.shape[1] - 8):])
+        self.done = [
+            done or STOP_STR in tail
+            for done, tail in zip(self.done or [False] * len(tails), tails)
+        ]
+        return all(self.done)
+
+
+def _got_module(model):
+    """The model's remote-code module, if it has the image processor batching needs."""
+    module = sys.modules.get(type(model).__module__)
+    return module if hasattr(module, "GOTImageEvalProcessor") else None
+
+
+def infer_batch(images: List, ocr_type: str = "ocr") -> List[str]:
+    """Run GOT-OCR on preprocessed images in one generate() call (runs on the inference thread)."""
+    model, tokenizer = get_model()
+    got = _got_module(model)
+
+    if got is None or len(images) == 1:
+        # Force float16 for P100 compatibility
+        with torch.autocast(device_type='cuda', dtype=torch.float16):
+            return [model.chat(tokenizer, image, ocr_type=ocr_type, gradio_input=True) for image in images]
+
+    # Same prompt and image transform as the model's chat(), for a whole batch
+    query = (
+        "<img>" + "<imgpad>" * IMAGE_TOKEN_LEN + "</img>\n"
+        + ("OCR with format: " if ocr_type == "format" else "OCR: ")
+    )
+    prompt = f"{GOT_SYSTEM_PROMPT}{STOP_STR}<|im_start|>user\n{query}{STOP_STR}<|im_start|>assistant\n"
+    input_ids = torch.as_tensor(tokenizer([prompt] * len(images)).input_ids).to(model.device)
+    processor = got.GOTImageEvalProcessor(image_size=1024)
+    pixels = [processor(image).unsqueeze(0).half().to(model.device) for image in images]
+
+    with torch.autocast(device_type='cuda', dtype=torch.float16), torch.inference_mode():
+        output_ids = model.generate(
+            input_ids,
+            images=pixels,
+            do_sample=False,
+            num_beams=1,
+            no_repeat_ngram_size=20,
+            max_new_tokens=4096,
+            stopping_criteria=[_AllRowsStopped(tokenizer, input_ids.shape[1])],
+        )
+
+    prompt_len = input_ids.shape[1]
+    return [tokenizer.decode(row[prompt_len:]).split(STOP_STR, 1)[0].strip() for row in output_ids]
+
+
+_batcher: Optional[OCRBatcher] = None
+
+
+def get_batcher() -> OCRBatcher:
+    """Get the process-wide OCR batcher."""
+    global _batcher
+    if _batcher is None:
+        _batcher = OCRBatcher(infer_batch, preprocess_image)
+    return _batcher
+
 
 @app.get("/health", response_model=HealthResponse)
 def health():
@@ -125,43 +204,44 @@ def health():
 async def ocr(file: UploadFile = File(...), ocr_type: str = "ocr"):
     """Extract text from a single image using GPU."""
     try:
-        model, tokenizer = get_model()
-        
-        suffix = Path(file.filename or "image.png").suffix
-        if not suffix: suffix = ".png"
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = Path(tmp.name)
-        
-        try:
-            image_path = resize_image_if_needed(tmp_path)
-            logger.info(f"Running GPU OCR (type={ocr_type})")
-            # Force float16 for P100 compatibility
-            with torch.autocast(device_type='cuda', dtype=torch.float16):
-                result = model.chat(tokenizer, str(image_path), ocr_type=ocr_type)
-            return OCRResponse(text=result)
-        finally:
-            if tmp_path.exists(): tmp_path.unlink()
-            resized_path = tmp_path.with_suffix('.resized.png')
-            if resized_path.exists(): resized_path.unlink()
-                
+        logger.info(f"Running GPU OCR (type={ocr_type})")
+        text = await get_batcher().submit(await file.read(), ocr_type)
+        return OCRResponse(text=text)
     except Exception as e:
         logger.error(f"OCR failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _to_response(result) -> OCRResponse:
+    if isinstance(result, Exception):
+        return OCRResponse(text="", success=False, error=str(result))
+    return OCRResponse(text=result)
+
 @app.post("/ocr/batch", response_model=List[OCRResponse])
-async def ocr_batch(files: List[UploadFile] = File(...), ocr_type: str = "ocr"):
-    """Batch OCR processing."""
-    results = []
-    for file in files:
-        try:
-            result = await ocr(file, ocr_type)
-            results.append(result)
-        except Exception as e:
-            results.append(OCRResponse(text="", success=False, error=str(e)))
-    return results
+async def ocr_batch(files: List[UploadFile] = File(...), ocr_type: str = "ocr", stream: bool = False):
+    """Batch OCR processing.
+
+    Images are preprocessed concurrently and run through the model in batches.
+    Returns results in upload order; with ?stream=true, returns NDJSON lines
+    ({"index": i, ...OCRResponse}) as each batch finishes.
+    """
+    contents = [await file.read() for file in files]
+    results = get_batcher().submit_many(contents, ocr_type)
+
+    if stream:
+        async def lines():
+            async for index, result in results:
+                yield json.dumps({"index": index, **_to_response(result).model_dump()}, ensure_ascii=False) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    ordered: List[Optional[OCRResponse]] = [None] * len(contents)
+    async for index, result in results:
+        ordered[index] = _to_response(result)
+    return ordered
+
+@app.on_event("shutdown")
+async def shutdown():
+    if _batcher is not None:
+        await _batcher.close()
 
 if __name__ == "__main__":
     import uvicorn
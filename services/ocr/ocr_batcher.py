@@ -0,0 +1,159 @@
+"""Dynamic batching for OCR model inference.
+
+Requests submit raw image bytes. Decoding and resizing run in a thread pool,
+and the prepared images are queued for one inference thread. That thread
+drains the queue into batches of up to ``batch_size`` images with the same
+ocr_type. It waits at most ``wait_ms`` for a batch to fill, then runs the
+model once per batch.
+
+The event loop only awaits futures, so it stays responsive while the model
+runs. Preprocessing of later images overlaps with inference of the current
+batch. Concurrent /ocr and /ocr/batch requests share batches.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("ocr-gpu-service")
+
+OCR_BATCH_SIZE = int(os.environ.get("OCR_BATCH_SIZE", "8"))
+OCR_BATCH_WAIT_MS = float(os.environ.get("OCR_BATCH_WAIT_MS", "20"))
+OCR_PREPROCESS_WORKERS = int(os.environ.get("OCR_PREPROCESS_WORKERS", "4"))
+
+
+@dataclass
+class _Item:
+    image: Any
+    ocr_type: str
+    future: asyncio.Future = field(repr=False)
+
+
+class OCRBatcher:
+    """Queue images for batched inference on a single model thread.
+
+    Args:
+        infer: ``infer(images, ocr_type) -> texts``; called on the inference thread
+        preprocess: ``preprocess(content) -> image``; called on the preprocessing pool
+        batch_size: Maximum images per model call
+        wait_ms: How long a partial batch waits for more images
+        preprocess_workers: Threads decoding/resizing images
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[List[Any], str], List[str]],
+        preprocess: Callable[[bytes], Any],
+        batch_size: int = OCR_BATCH_SIZE,
+        wait_ms: float = OCR_BATCH_WAIT_MS,
+        preprocess_workers: int = OCR_PREPROCESS_WORKERS,
+    ):
+        self.infer = infer
+        self.preprocess = preprocess
+        self.batch_size = max(1, batch_size)
+        self.wait_s = max(0.0, wait_ms) / 1000
+        self._preprocess_pool = ThreadPoolExecutor(max_workers=max(1, preprocess_workers),
+                                                   thread_name_prefix="ocr-preprocess")
+        self._infer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-infer")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.stats: Dict[str, float] = {"batches": 0, "images": 0, "infer_seconds": 0.0}
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        return self._queue
+
+    async def submit(self, content: bytes, ocr_type: str = "ocr") -> str:
+        """OCR one image (batched with whatever else is queued)."""
+        loop = asyncio.get_running_loop()
+        image = await loop.run_in_executor(self._preprocess_pool, self.preprocess, content)
+        future = loop.create_future()
+        self._ensure_worker().put_nowait(_Item(image, ocr_type, future))
+        return await future
+
+    async def submit_many(
+        self,
+        contents: Sequence[bytes],
+        ocr_type: str = "ocr",
+    ) -> AsyncIterator[Tuple[int, Union[str, Exception]]]:
+        """OCR several images; yields (index, text or error) as their batches finish."""
+
+        async def one(index: int, content: bytes) -> Tuple[int, Union[str, Exception]]:
+            try:
+                return index, await self.submit(content, ocr_type)
+            except Exception as e:
+                return index, e
+
+        tasks = [asyncio.create_task(one(i, c)) for i, c in enumerate(contents)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[_Item]:
+        batch = [await queue.get()]
+        deadline = time.monotonic() + self.wait_s
+        while len(batch) < self.batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch(queue)
+            groups: Dict[str, List[_Item]] = {}
+            for item in batch:
+                if not item.future.cancelled():
+                    groups.setdefault(item.ocr_type, []).append(item)
+
+            for ocr_type, items in groups.items():
+                start = time.perf_counter()
+                try:
+                    texts = await loop.run_in_executor(
+                        self._infer_pool, self.infer, [item.image for item in items], ocr_type
+                    )
+                    if len(texts) != len(items):
+                        raise RuntimeError(f"Model returned {len(texts)} results for {len(items)} images")
+                except Exception as e:
+                    logger.error(f"OCR batch of {len(items)} failed: {e}")
+                    for item in items:
+                        if not item.future.done():
+                            item.future.set_exception(e)
+                    continue
+                finally:
+                    self.stats["batches"] += 1
+                    self.stats["images"] += len(items)
+                    self.stats["infer_seconds"] += time.perf_counter() - start
+
+                for item, text in zip(items, texts):
+                    if not item.future.done():
+                        item.future.set_result(text)
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._preprocess_pool.shutdown(wait=False)
+        self._infer_pool.shutdown(wait=False)
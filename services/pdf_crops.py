@@ -0,0 +1,186 @@
+"""
+Parallel page-crop rendering for GLM-OCR image harvesting.
+
+Rendering a clip with PyMuPDF and encoding it is CPU-bound and holds the GIL,
+so crops are rendered in a small process pool, split by page: every task
+opens the PDF itself and renders the crops of a few pages. The admin event
+loop only awaits the results, which keeps it responsive while a large upload
+is cropped.
+
+Crops are encoded as JPEG by default (PDF_CROP_FORMAT=jpeg|webp|png,
+PDF_CROP_QUALITY for the lossy formats). PNG, the old format, encodes about
+3x slower; WebP gives smaller files at a higher encode cost.
+
+Usage:
+    from services.pdf_crops import render_crops
+
+    results = await render_crops(pdf_path, [(0, "p0_img0", (x0, y0, x1, y1))], out_dir)
+    # [(image_id, path or None, error or None), ...] in job order
+"""
+
+import asyncio
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import fitz  # PyMuPDF
+except Exception:  # pragma: no cover
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+PDF_CROP_WORKERS = int(os.getenv("PDF_CROP_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_CROP_FORMAT = os.getenv("PDF_CROP_FORMAT", "jpeg").lower()
+PDF_CROP_QUALITY = int(os.getenv("PDF_CROP_QUALITY", "85"))
+# Pages per pool task: small enough to spread a document across workers,
+# large enough that opening the PDF is amortised over several pages
+PDF_CROP_PAGES_PER_TASK = int(os.getenv("PDF_CROP_PAGES_PER_TASK", "4"))
+
+CROP_EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp", "png": ".png"}
+CROP_MEDIA_TYPES = {".jpg": "image/jpeg", ".webp": "image/webp", ".png": "image/png"}
+
+# (page index, image_id, clip rect in PDF points)
+CropJob = Tuple[int, str, Tuple[float, float, float, float]]
+CropResult = Tuple[str, Optional[str], Optional[str]]
+
+
+def encode_pixmap(pix, image_format: str, quality: int) -> bytes:
+    """Encode a PyMuPDF pixmap as PNG (native) or JPEG/WebP (Pillow)."""
+    if image_format == "png":
+        return pix.tobytes("png")
+    from PIL import Image
+
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}[pix.n]
+    image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    if image_format == "jpeg" and mode == "RGBA":
+        image = image.convert("RGB")
+    buf = io.BytesIO()
+    if image_format == "webp":
+        # method=0 is the fastest effort level; WebP still encodes slower than JPEG but smaller
+        image.save(buf, "WEBP", quality=quality, method=0)
+    else:
+        image.save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def render_page_crops(
+    pdf_path: str,
+    jobs: Sequence[CropJob],
+    out_dir: str,
+    dpi: int = 200,
+    image_format: str = PDF_CROP_FORMAT,
+    quality: int = PDF_CROP_QUALITY,
+) -> List[CropResult]:
+    """Render and save crops (runs in a pool worker; opens its own copy of the PDF)."""
+    extension = CROP_EXTENSIONS[image_format]
+    results: List[CropResult] = []
+    pdf = fitz.open(pdf_path)
+    try:
+        for page_idx, image_id, rect in jobs:
+            try:
+                pix = pdf[page_idx].get_pixmap(clip=fitz.Rect(*rect), dpi=dpi)
+                out_path = os.path.join(out_dir, f"{image_id}{extension}")
+                with open(out_path, "wb") as f:
+                    f.write(encode_pixmap(pix, image_format, quality))
+                results.append((image_id, out_path, None))
+            except Exception as exc:
+                results.append((image_id, None, str(exc)))
+    finally:
+        pdf.close()
+    return results
+
+
+_crop_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_crop_pool() -> ProcessPoolExecutor:
+    """Get the process-wide crop rendering pool (spawned: the API process is threaded)."""
+    global _crop_pool
+    with _pool_lock:
+        if _crop_pool is None:
+            _crop_pool = ProcessPoolExecutor(
+                max_workers=PDF_CROP_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(shutdown_crop_pool)
+    return _crop_pool
+
+
+def shutdown_crop_pool() -> None:
+    global _crop_pool
+    with _pool_lock:
+        if _crop_pool is not None:
+            _crop_pool.shutdown(wait=False, cancel_futures=True)
+            _crop_pool = None
+
+
+def _split_by_page(jobs: Sequence[CropJob], pages_per_task: int) -> List[List[CropJob]]:
+    by_page: Dict[int, List[CropJob]] = {}
+    for job in jobs:
+        by_page.setdefault(job[0], []).append(job)
+    pages = sorted(by_page)
+    return [
+        [job for page in pages[i:i + pages_per_task] for job in by_page[page]]
+        for i in range(0, len(pages), pages_per_task)
+    ]
+
+
+async def render_crops(
+    pdf_path: Path,
+    jobs: Sequence[CropJob],
+    out_dir: Path,
+    dpi: int = 200,
+    image_format: str = PDF_CROP_FORMAT,
+    quality: int = PDF_CROP_QUALITY,
+) -> List[CropResult]:
+    """
+    Render crops off the event loop, split by page across the process pool.
+
+    Args:
+        pdf_path: Source PDF
+        jobs: Crops to render
+        out_dir: Existing directory for the encoded crops
+        dpi: Render resolution
+        image_format: jpeg, webp or png
+        quality: Encoder quality for jpeg/webp
+
+    Returns:
+        (image_id, path, error) per job, in job order
+    """
+    if fitz is None:
+        raise RuntimeError("pymupdf_not_installed")
+    if image_format not in CROP_EXTENSIONS:
+        raise ValueError(f"Unsupported crop format: {image_format}")
+    if not jobs:
+        return []
+
+    args = (str(pdf_path),)
+    tail = (str(out_dir), dpi, image_format, quality)
+    tasks = _split_by_page(jobs, max(1, PDF_CROP_PAGES_PER_TASK))
+
+    # A few pages are not worth a round-trip to another process
+    if PDF_CROP_WORKERS <= 1 or len(tasks) == 1:
+        return await asyncio.to_thread(render_page_crops, *args, list(jobs), *tail)
+
+    loop = asyncio.get_running_loop()
+    pool = get_crop_pool()
+    try:
+        chunks = await asyncio.gather(
+            *(loop.run_in_executor(pool, render_page_crops, *args, task, *tail) for task in tasks)
+        )
+    except BrokenProcessPool:
+        logger.warning("Crop pool broke (worker died), rendering in-process")
+        shutdown_crop_pool()
+        return await asyncio.to_thread(render_page_crops, *args, list(jobs), *tail)
+
+    rendered = {result[0]: result for chunk in chunks for result in chunk}
+    return [rendered[image_id] for _, image_id, _ in jobs]
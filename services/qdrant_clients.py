@@ -0,0 +1,126 @@
+"""Process-wide Qdrant clients.
+
+Every service, tool and endpoint gets its Qdrant connection from here instead
+of constructing ``QdrantClient(host=..., port=...)`` per call, so connection
+setup happens once per process and configuration is read in one place:
+
+- ``get_qdrant_client()``: shared synchronous client (thread-safe), for sync
+  code and worker threads
+- ``get_async_qdrant_client()``: ``AsyncQdrantClient`` for async handlers, one
+  per event loop (gRPC/httpx connections are bound to the loop that made them)
+
+Both prefer gRPC (QDRANT_GRPC_PORT) and keep connections alive; set
+QDRANT_PREFER_GRPC=false to use REST only.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+logger = logging.getLogger(__name__)
+
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
+QDRANT_API_KEY = os.getenv("QDRANT_API_KEY") or None
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "30"))
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "32"))
+
+_ClientKey = Tuple[str, int]
+
+_sync_clients: Dict[_ClientKey, QdrantClient] = {}
+_sync_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, AsyncQdrantClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _client_kwargs(host: str, port: int) -> Dict:
+    return {
+        "host": host,
+        "port": port,
+        "grpc_port": QDRANT_GRPC_PORT,
+        "prefer_grpc": QDRANT_PREFER_GRPC,
+        "api_key": QDRANT_API_KEY,
+        # HTTPS is only needed (and only sensible) with an API key
+        "https": bool(QDRANT_API_KEY),
+        "timeout": QDRANT_TIMEOUT,
+        # qdrant-client disables REST keep-alive for localhost unless limits are given
+        "limits": httpx.Limits(
+            max_connections=QDRANT_POOL_SIZE, max_keepalive_connections=QDRANT_POOL_SIZE
+        ),
+        "grpc_options": {
+            "grpc.keepalive_time_ms": 30_000,
+            "grpc.keepalive_permit_without_calls": 1,
+        },
+    }
+
+
+def get_qdrant_client(host: Optional[str] = None, port: Optional[int] = None) -> QdrantClient:
+    """
+    Shared synchronous Qdrant client.
+
+    Args:
+        host: Qdrant host (default: QDRANT_HOST)
+        port: Qdrant REST port (default: QDRANT_PORT)
+
+    Returns:
+        The process-wide client for that host/port
+    """
+    key = (host or QDRANT_HOST, int(port or QDRANT_PORT))
+    client = _sync_clients.get(key)
+    if client is None:
+        with _sync_lock:
+            client = _sync_clients.get(key)
+            if client is None:
+                client = QdrantClient(**_client_kwargs(*key))
+                _sync_clients[key] = client
+                logger.info(f"Qdrant client for {key[0]}:{key[1]} (grpc={QDRANT_PREFER_GRPC})")
+    return client
+
+
+def get_async_qdrant_client(host: Optional[str] = None, port: Optional[int] = None) -> AsyncQdrantClient:
+    """
+    Shared ``AsyncQdrantClient`` for the running event loop.
+
+    Args:
+        host: Qdrant host (default: QDRANT_HOST)
+        port: Qdrant REST port (default: QDRANT_PORT)
+
+    Returns:
+        The client for that host/port on the current loop
+    """
+    loop = asyncio.get_running_loop()
+    key = (host or QDRANT_HOST, int(port or QDRANT_PORT))
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(key)
+    if client is None:
+        client = AsyncQdrantClient(**_client_kwargs(*key))
+        clients[key] = client
+    return client
+
+
+async def close_qdrant_clients() -> None:
+    """Close the async clients of the running loop and all sync clients (shutdown)."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Closing async Qdrant client failed: {e}")
+
+    with _sync_lock:
+        sync_clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in sync_clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Closing Qdrant client failed: {e}")
@@ -0,0 +1,164 @@
+"""Qdrant collection profiles: quantization, storage and HNSW settings.
+
+A profile decides how a collection trades RAM for recall:
+
+- full: float32 vectors and payloads in RAM (the previous behaviour)
+- int8: scalar int8 quantized vectors in RAM, originals and payloads on
+  disk, rescored against the originals (about 4x less vector RAM)
+- binary: 1-bit quantized vectors in RAM with heavier oversampling and
+  rescoring (about 32x less vector RAM, best for large collections)
+- compact: int8 with a sparser HNSW graph, for the smallest footprint
+- accurate: int8 with a denser graph and wider search beam
+
+QDRANT_COLLECTION_PROFILE selects the profile for new collections and for
+query-time search params. It defaults to full; the quantized profiles are
+opt-in until scripts/benchmark_collection_profiles.py has measured their
+recall and latency on our collections. Existing collections are converted
+with scripts/migrate_qdrant_collections.py. Collections also get keyword
+payload indexes on the fields we filter by, so filtered search doesn't scan
+on-disk payloads.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client import models
+
+QDRANT_COLLECTION_PROFILE = os.getenv("QDRANT_COLLECTION_PROFILE", "full")
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage and index settings for one profile."""
+
+    quantization: Optional[str] = None  # None, "int8" or "binary"
+    oversampling: float = 1.0
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_ef: Optional[int] = None  # search beam; None uses Qdrant's default
+
+
+PROFILES: Dict[str, CollectionProfile] = {
+    "full": CollectionProfile(),
+    "int8": CollectionProfile(
+        quantization="int8", oversampling=2.0, on_disk_vectors=True, on_disk_payload=True,
+    ),
+    "binary": CollectionProfile(
+        quantization="binary", oversampling=3.0, on_disk_vectors=True, on_disk_payload=True,
+    ),
+    "compact": CollectionProfile(
+        quantization="int8", oversampling=2.0, on_disk_vectors=True, on_disk_payload=True,
+        hnsw_m=8, hnsw_ef_construct=64, hnsw_ef=64,
+    ),
+    "accurate": CollectionProfile(
+        quantization="int8", oversampling=3.0, on_disk_vectors=True, on_disk_payload=True,
+        hnsw_m=32, hnsw_ef_construct=200, hnsw_ef=128,
+    ),
+}
+
+# Payload fields used in filters, per collection (KB_PAYLOAD_INDEXES for the rest)
+_KEYWORD = models.PayloadSchemaType.KEYWORD
+PAYLOAD_INDEXES: Dict[str, Dict[str, models.PayloadSchemaType]] = {
+    "troubleshooting_cases": {"case_id": _KEYWORD, "part_number": _KEYWORD},
+    "troubleshooting_issues": {
+        "case_id": _KEYWORD,
+        "issue_id": _KEYWORD,
+        "part_number": _KEYWORD,
+        "trial_version": _KEYWORD,
+        "result_t1": _KEYWORD,
+    },
+    "troubleshooting_images": {
+        "case_id": _KEYWORD,
+        "issue_id": _KEYWORD,
+        "image_id": _KEYWORD,
+        "defect_type": _KEYWORD,
+    },
+}
+KB_PAYLOAD_INDEXES: Dict[str, models.PayloadSchemaType] = {
+    "doc_id": _KEYWORD,
+    "source": _KEYWORD,
+    "source_url": _KEYWORD,
+    "domain": _KEYWORD,
+    "file_type": _KEYWORD,
+}
+
+
+def get_profile(name: Optional[str] = None) -> CollectionProfile:
+    """Profile by name (default: QDRANT_COLLECTION_PROFILE).
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    name = name or QDRANT_COLLECTION_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown Qdrant collection profile '{name}' (choose from {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def _quantization_config(profile: CollectionProfile):
+    if profile.quantization == "int8":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True,
+            )
+        )
+    if profile.quantization == "binary":
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def vector_params(
+    size: int, distance: models.Distance = models.Distance.COSINE, profile: Optional[str] = None
+) -> models.VectorParams:
+    """Dense ``vectors_config`` for a new collection."""
+    return models.VectorParams(size=size, distance=distance, on_disk=get_profile(profile).on_disk_vectors)
+
+
+def collection_params(profile: Optional[str] = None) -> Dict[str, Any]:
+    """Extra ``create_collection`` keyword arguments (HNSW, quantization, payload storage)."""
+    p = get_profile(profile)
+    return {
+        "hnsw_config": models.HnswConfigDiff(m=p.hnsw_m, ef_construct=p.hnsw_ef_construct),
+        "quantization_config": _quantization_config(p),
+        "on_disk_payload": p.on_disk_payload,
+    }
+
+
+def search_params(profile: Optional[str] = None) -> Optional[models.SearchParams]:
+    """Query-time params matching the profile (None for full precision defaults).
+
+    Quantization params are ignored by collections that aren't quantized, so
+    this is safe to pass while collections are being migrated.
+    """
+    p = get_profile(profile)
+    if not p.quantization and p.hnsw_ef is None:
+        return None
+    quantization = None
+    if p.quantization:
+        quantization = models.QuantizationSearchParams(rescore=True, oversampling=p.oversampling)
+    return models.SearchParams(hnsw_ef=p.hnsw_ef, quantization=quantization)
+
+
+def payload_indexes(collection: str) -> List[Tuple[str, models.PayloadSchemaType]]:
+    """(field, schema) payload indexes to create for a collection."""
+    return list(PAYLOAD_INDEXES.get(collection, KB_PAYLOAD_INDEXES).items())
+
+
+def migration_diff(profile: Optional[str] = None, vector_names: Tuple[str, ...] = ("",)) -> Dict[str, Any]:
+    """``update_collection`` keyword arguments converting a collection in place.
+
+    Args:
+        profile: Target profile (default: QDRANT_COLLECTION_PROFILE)
+        vector_names: Dense vector names of the collection ("" is the unnamed vector)
+    """
+    p = get_profile(profile)
+    return {
+        # on_disk moves the float32 originals (used only for rescoring) out of RAM
+        "vectors_config": {name: models.VectorParamsDiff(on_disk=p.on_disk_vectors) for name in vector_names},
+        "hnsw_config": models.HnswConfigDiff(m=p.hnsw_m, ef_construct=p.hnsw_ef_construct),
+        "quantization_config": _quantization_config(p) or models.Disabled.DISABLED,
+        "collection_params": models.CollectionParamsDiff(on_disk_payload=p.on_disk_payload),
+    }
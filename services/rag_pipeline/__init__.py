@@ -1,7 +1,17 @@
 """RAG Pipeline services for BestBox."""
 
-from .chunker import TextChunker
-from .ingest import DocumentIngester
-from .vector_store import VectorStore
+from .chunker import StreamingChunker, TextChunker
 
-__all__ = ["DocumentIngester", "TextChunker", "VectorStore"]
+__all__ = ["DocumentIngester", "StreamingChunker", "TextChunker", "VectorStore"]
+
+
+def __getattr__(name):
+    # Imported on first use: ingest pulls in docling, which the chunker
+    # users (admin upload path, indexer) don't need
+    if name == "DocumentIngester":
+        from .ingest import DocumentIngester
+        return DocumentIngester
+    if name == "VectorStore":
+        from .vector_store import VectorStore
+        return VectorStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,24 +1,285 @@
 """Text chunking module for RAG pipeline.
 
-This module provides functionality to split documents into fixed-size chunks
-with overlap for optimal retrieval in RAG systems.
+This module provides the single chunker shared by every ingest path
+(TextChunker, DocumentIndexer, the admin upload pipeline). Text is consumed
+incrementally, split at headings and sentence boundaries (including CJK
+punctuation), measured with the embedding model's tokenizer and packed into
+token-bounded chunks with overlap. Chunks are yielded as they fill, so a very
+large document is never held fully tokenized in memory.
 """
 
-from typing import Any, Dict, List, Optional
+import logging
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-import tiktoken
+logger = logging.getLogger(__name__)
+
+# Tokenizer of the embedding model (BGE-M3). Set to "heuristic" to skip loading it.
+EMBEDDINGS_TOKENIZER = os.getenv("EMBEDDINGS_TOKENIZER", "BAAI/bge-m3")
+
+# Sentence/line ends: CJK and Latin terminators (plus closing quotes/brackets),
+# a period followed by whitespace, or a line break
+_BOUNDARY = re.compile(r"(?:[。！？!?；;…]+[”’\"」』）)\]]*|\.(?=\s)|\n+)[ \t]*")
+_HEADING = re.compile(r"^\s{0,3}(#{1,6})\s+(.+?)\s*#*\s*$")
+
+# Text with no boundary at all is flushed once the pending tail gets this long
+_MAX_PENDING_CHARS = 64 * 1024
+_FEED_CHARS = 256 * 1024
+
+
+_CJK = re.compile("[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BGE-M3 token count: one per CJK character, ~4 chars per token otherwise."""
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(tokenizer_name: str = EMBEDDINGS_TOKENIZER) -> Callable[[List[str]], List[int]]:
+    """
+    Return a batch token counter for the embedding model.
+
+    Uses the Hugging Face fast tokenizer when it can be loaded, otherwise
+    falls back to estimate_tokens.
+    """
+    if tokenizer_name and tokenizer_name != "heuristic":
+        try:
+            from transformers import AutoTokenizer
+
+            # The embeddings service fills the local HF cache; never stall ingest on a download
+            tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, local_files_only=True)
+
+            def _count(texts: List[str]) -> List[int]:
+                if not texts:
+                    return []
+                encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+                return [len(ids) for ids in encoded]
+
+            return _count
+        except Exception as e:
+            logger.warning(f"Tokenizer {tokenizer_name} unavailable ({e}), using estimated token counts")
+
+    return lambda texts: [estimate_tokens(t) for t in texts]
+
+
+class StreamingChunker:
+    """Token-bounded, structure-preserving chunker over a text stream.
+
+    Attributes:
+        max_tokens: Maximum tokens per chunk
+        overlap_tokens: Tokens of trailing sentences repeated at the start of
+            the next chunk (never across a heading)
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 512,
+        overlap_tokens: int = 64,
+        count_tokens: Optional[Callable[[List[str]], List[int]]] = None,
+    ):
+        """Initialize the StreamingChunker.
+
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_tokens: Overlap between consecutive chunks, in tokens
+            count_tokens: Batch token counter (default: embedding model tokenizer)
+
+        Raises:
+            ValueError: If max_tokens <= 0 or overlap_tokens not in [0, max_tokens)
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be in range [0, max_tokens)")
+
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens = count_tokens or get_token_counter()
+
+    def iter_chunks(
+        self, stream: Union[str, Iterable[str]], section: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield chunks from text or an iterable of text pieces (e.g. file blocks).
+
+        Args:
+            stream: Whole text, or pieces of it in order
+            section: Optional section title applied to every chunk; markdown
+                headings found in the text are appended to it
+
+        Yields:
+            {"text", "chunk_id", "start_char", "end_char", "token_count", "section"}
+            where character offsets refer to the concatenated stream
+        """
+        if isinstance(stream, str):
+            # Walk a big string in slices so sentence splitting stays incremental
+            text = stream
+            stream = (text[i:i + _FEED_CHARS] for i in range(0, len(text), _FEED_CHARS))
+
+        builder = _ChunkBuilder(self, section)
+        pending = ""
+        pending_start = 0
+
+        for piece in stream:
+            if not piece:
+                continue
+            pending += piece
+            # Only complete sentences are consumed; the unterminated tail waits for more text
+            consumed = yield from builder.feed(pending, pending_start, final=False)
+            if not consumed and len(pending) > _MAX_PENDING_CHARS:
+                consumed = yield from builder.feed(pending, pending_start, final=True)
+            pending_start += consumed
+            pending = pending[consumed:]
+
+        if pending:
+            yield from builder.feed(pending, pending_start, final=True)
+        yield from builder.finish()
+
+    def chunk_text(self, text: str, section: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Chunk a whole string (convenience wrapper around iter_chunks)."""
+        return list(self.iter_chunks(text, section=section))
+
+    def split_oversized(self, text: str, tokens: int) -> List[Tuple[str, int, int]]:
+        """Hard-split a unit with no usable boundary into pieces under max_tokens.
+
+        Returns:
+            (piece, token_count, offset within text) tuples
+        """
+        parts = max(2, math.ceil(tokens / self.max_tokens))
+        size = max(1, math.ceil(len(text) / parts))
+        pieces = [(text[i:i + size], i) for i in range(0, len(text), size)]
+        counts = self.count_tokens([p for p, _ in pieces])
+
+        result: List[Tuple[str, int, int]] = []
+        for (piece, offset), count in zip(pieces, counts):
+            if count > self.max_tokens and len(piece) > 1:
+                result.extend(
+                    (sub, sub_count, offset + sub_offset)
+                    for sub, sub_count, sub_offset in self.split_oversized(piece, count)
+                )
+            else:
+                result.append((piece, count, offset))
+        return result
+
+
+class _ChunkBuilder:
+    """Packing state for one StreamingChunker.iter_chunks call."""
+
+    def __init__(self, chunker: StreamingChunker, section: Optional[str]):
+        self.chunker = chunker
+        self.base_section = section
+        self.headings: List[Tuple[int, str]] = []
+        self.units: List[Tuple[str, int, int]] = []  # (text, tokens, start_char)
+        self.tokens = 0
+        self.carried = 0  # leading units repeated from the previous chunk
+        self.chunk_id = 0
+        self.at_line_start = True
+        self.has_body = False
+
+    @property
+    def section(self) -> Optional[str]:
+        path = [self.base_section] if self.base_section else []
+        path.extend(title for _, title in self.headings)
+        return " > ".join(path) if path else None
+
+    def feed(self, text: str, start: int, final: bool) -> Iterator[Dict[str, Any]]:
+        """Consume whole sentences from text; returns the number of chars consumed.
+
+        Unless *final*, text after the last boundary is left for the next call.
+        """
+        spans = []
+        prev = 0
+        for match in _BOUNDARY.finditer(text):
+            if match.end() > prev:
+                spans.append((prev, match.end()))
+                prev = match.end()
+        if final and prev < len(text):
+            spans.append((prev, len(text)))
+            prev = len(text)
+
+        units = [text[a:b] for a, b in spans]
+        counts = self.chunker.count_tokens(units)
+
+        for (a, _), unit, tokens in zip(spans, units, counts):
+            line_start = text[a - 1] == "\n" if a else self.at_line_start
+            heading = _HEADING.match(unit) if line_start else None
+            if heading:
+                # New section: close the current chunk without overlap (a chunk
+                # holding only headings is kept so they prefix the section body)
+                if self.has_body:
+                    yield from self._emit(carry=False)
+                level = len(heading.group(1))
+                self.headings = [h for h in self.headings if h[0] < level]
+                self.headings.append((level, heading.group(2)))
+            if tokens > self.chunker.max_tokens:
+                for piece, piece_tokens, offset in self.chunker.split_oversized(unit, tokens):
+                    yield from self._add(piece, piece_tokens, start + a + offset)
+            else:
+                yield from self._add(unit, tokens, start + a)
+            self.has_body = self.has_body or (not heading and bool(unit.strip()))
+        if prev:
+            self.at_line_start = text[prev - 1] == "\n"
+        return prev
+
+    def _add(self, unit: str, tokens: int, start: int) -> Iterator[Dict[str, Any]]:
+        if self.units and self.tokens + tokens > self.chunker.max_tokens:
+            yield from self._emit(carry=True)
+            # Drop carried overlap if it leaves no room for this unit
+            while self.units and self.tokens + tokens > self.chunker.max_tokens:
+                _, dropped, _ = self.units.pop(0)
+                self.tokens -= dropped
+                self.carried -= 1
+        self.units.append((unit, tokens, start))
+        self.tokens += tokens
+
+    def _emit(self, carry: bool) -> Iterator[Dict[str, Any]]:
+        if len(self.units) > self.carried:
+            text = "".join(u for u, _, _ in self.units)
+            stripped = text.strip()
+            if stripped:
+                lead = len(text) - len(text.lstrip())
+                start = self.units[0][2] + lead
+                yield {
+                    "text": stripped,
+                    "chunk_id": self.chunk_id,
+                    "start_char": start,
+                    "end_char": start + len(stripped),
+                    "token_count": self.tokens,
+                    "section": self.section,
+                }
+                self.chunk_id += 1
+
+        kept: List[Tuple[str, int, int]] = []
+        if carry and self.chunker.overlap_tokens:
+            budget = self.chunker.overlap_tokens
+            for unit in reversed(self.units[1:]):
+                if unit[1] > budget:
+                    break
+                kept.insert(0, unit)
+                budget -= unit[1]
+        self.units = kept
+        self.tokens = sum(t for _, t, _ in kept)
+        self.carried = len(kept)
+        self.has_body = False
+
+    def finish(self) -> Iterator[Dict[str, Any]]:
+        yield from self._emit(carry=False)
 
 
 class TextChunker:
-    """Splits text into fixed-size chunks with overlap using tiktoken.
+    """Splits text into token-bounded chunks with overlap.
 
-    Uses cl100k_base encoding (GPT-like tokenization) to ensure accurate
-    token counting for LLM context windows.
+    Thin wrapper over StreamingChunker kept for existing callers; token counts
+    use the embedding model's tokenizer.
 
     Attributes:
         chunk_size: Maximum number of tokens per chunk (default: 512)
         overlap_percentage: Percentage of overlap between chunks (default: 0.2)
-        encoding: tiktoken encoding instance for token counting
+        overlap_tokens: Overlap between chunks in tokens
     """
 
     def __init__(self, chunk_size: int = 512, overlap_percentage: float = 0.2):
@@ -39,9 +300,7 @@ class TextChunker:
         self.chunk_size = chunk_size
         self.overlap_percentage = overlap_percentage
         self.overlap_tokens = int(chunk_size * overlap_percentage)
-
-        # Use cl100k_base encoding (same as GPT-3.5/GPT-4)
-        self.encoding = tiktoken.get_encoding("cl100k_base")
+        self._chunker = StreamingChunker(max_tokens=chunk_size, overlap_tokens=self.overlap_tokens)
 
     def chunk_text(
         self, text: str, section: Optional[str] = None
@@ -67,81 +326,10 @@ class TextChunker:
         Examples:
             >>> chunker = TextChunker(chunk_size=512, overlap_percentage=0.2)
             >>> chunks = chunker.chunk_text("Long document text...")
-            >>> print(chunks[0]["token_count"])
-            512
             >>> chunks = chunker.chunk_text("Section text...", section="Introduction")
             >>> print(chunks[0]["section"])
             'Introduction'
         """
-        # Handle empty text
         if not text or not text.strip():
             return []
-
-        # Encode entire text to tokens
-        tokens = self.encoding.encode(text)
-        total_tokens = len(tokens)
-
-        # If text is shorter than chunk_size, return as single chunk
-        if total_tokens <= self.chunk_size:
-            return [{
-                "text": text,
-                "chunk_id": 0,
-                "start_char": 0,
-                "end_char": len(text),
-                "token_count": total_tokens,
-                "section": section
-            }]
-
-        chunks = []
-        chunk_id = 0
-        start_token_idx = 0
-        current_char_pos = 0
-
-        # Calculate step size (chunk_size - overlap)
-        step_size = self.chunk_size - self.overlap_tokens
-
-        while start_token_idx < total_tokens:
-            # Calculate end token index for this chunk
-            end_token_idx = min(start_token_idx + self.chunk_size, total_tokens)
-
-            # Extract token slice for this chunk
-            chunk_tokens = tokens[start_token_idx:end_token_idx]
-
-            # Decode tokens back to text
-            chunk_text = self.encoding.decode(chunk_tokens)
-
-            # Calculate character positions incrementally
-            # For the first chunk, start_char is 0 (already set by current_char_pos)
-            # For subsequent chunks, we need to account for overlap
-            start_char = current_char_pos
-            end_char = current_char_pos + len(chunk_text)
-
-            # Create chunk dictionary
-            chunks.append({
-                "text": chunk_text,
-                "chunk_id": chunk_id,
-                "start_char": start_char,
-                "end_char": end_char,
-                "token_count": len(chunk_tokens),
-                "section": section
-            })
-
-            # Update character position for next chunk
-            # Only advance by the non-overlapping portion (step_size tokens)
-            if start_token_idx + step_size < total_tokens:
-                # Decode the step_size tokens to find how many chars to advance
-                step_tokens = tokens[start_token_idx:start_token_idx + step_size]
-                current_char_pos += len(self.encoding.decode(step_tokens))
-            else:
-                # Last chunk, no need to update position
-                current_char_pos = end_char
-
-            # Move to next chunk position
-            start_token_idx += step_size
-            chunk_id += 1
-
-            # Break if we've processed all tokens
-            if end_token_idx >= total_tokens:
-                break
-
-        return chunks
+        return self._chunker.chunk_text(text, section=section)
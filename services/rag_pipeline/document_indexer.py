@@ -1,14 +1,45 @@
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
+import asyncio
+import collections
 import os
 import logging
 import uuid
 import time
 from qdrant_client import QdrantClient, models as qmodels
+from services.qdrant_clients import get_qdrant_client
 from services.embeddings.client import EmbeddingService
+from services.rag_pipeline.chunker import StreamingChunker, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# Embedding requests are cut by estimated tokens (long chunks cost more on the
+# embeddings server than short ones) and by item count
+EMBED_BATCH_TOKENS = int(os.getenv("INDEX_EMBED_BATCH_TOKENS", "8192"))
+EMBED_BATCH_SIZE = int(os.getenv("INDEX_EMBED_BATCH_SIZE", "32"))
+EMBED_CONCURRENCY = int(os.getenv("INDEX_EMBED_CONCURRENCY", "4"))
+UPSERT_BATCH_SIZE = int(os.getenv("INDEX_UPSERT_BATCH_SIZE", "256"))
+
+CHUNK_TOKENS = int(os.getenv("INDEX_CHUNK_TOKENS", "512"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("INDEX_CHUNK_OVERLAP_TOKENS", "64"))
+
+
+def token_batches(
+    texts: List[str], max_tokens: int = EMBED_BATCH_TOKENS, max_items: int = EMBED_BATCH_SIZE
+) -> Iterator[List[int]]:
+    """Yield index lists of consecutive texts that fit one embedding request."""
+    batch: List[int] = []
+    budget = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if batch and (budget + cost > max_tokens or len(batch) >= max_items):
+            yield batch
+            batch, budget = [], 0
+        batch.append(i)
+        budget += cost
+    if batch:
+        yield batch
+
 class DocumentIndexer:
     """Index documents into Qdrant for RAG retrieval."""
     
@@ -17,10 +48,11 @@ class DocumentIndexer:
         collection_name: str = "mold_reference_kb", 
         qdrant_host: str = "localhost", 
         qdrant_port: int = 6333, 
-        embeddings_url: str = None
+        embeddings_url: str = None,
+        qdrant_client: Optional[QdrantClient] = None,
     ):
         self.collection = collection_name
-        self.qdrant = QdrantClient(host=qdrant_host, port=qdrant_port)
+        self.qdrant = qdrant_client or get_qdrant_client(qdrant_host, qdrant_port)
         self.embeddings = EmbeddingService()
         
         # Ensure collection exists
@@ -59,34 +91,25 @@ class DocumentIndexer:
                 logger.warning("No chunks generated from text")
                 return False
             
-            points = []
-            for i, chunk in enumerate(chunks):
-                vector = await self.embeddings.get_embedding(chunk)
-                if not vector:
-                    continue
-                
-                point_id = str(uuid.uuid4())
-                payload = {
-                    "source": metadata.get("source", "unknown"),
-                    "chunk_index": i,
-                    "text": chunk,
-                    "domain": metadata.get("domain", "general"),
-                    "title": metadata.get("title", "Untitled"),
-                    "timestamp": int(time.time()),
-                }
-                
-                points.append(qmodels.PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload=payload
-                ))
+            timestamp = int(time.time())
 
-            if points:
-                self.qdrant.upsert(
-                    collection_name=self.collection,
-                    points=points
+            def _point(i: int, vector: List[float]) -> qmodels.PointStruct:
+                return qmodels.PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector=vector,
+                    payload={
+                        "source": metadata.get("source", "unknown"),
+                        "chunk_index": i,
+                        "text": chunks[i],
+                        "domain": metadata.get("domain", "general"),
+                        "title": metadata.get("title", "Untitled"),
+                        "timestamp": timestamp,
+                    },
                 )
-                logger.info(f"Indexed {len(points)} chunks into {self.collection}")
+
+            indexed = await self._embed_and_upsert(chunks, _point)
+            if indexed:
+                logger.info(f"Indexed {indexed} chunks into {self.collection}")
                 return True
                 
             return False
@@ -95,17 +118,75 @@ class DocumentIndexer:
             logger.error(f"Indexing failed: {e}")
             return False
 
-    def _chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-        """Simple text chunker with overlap."""
+    async def _embed_and_upsert(self, chunks: List[str], make_point) -> int:
+        """
+        Embed chunks in token-budgeted batches and upsert them as they arrive.
+
+        Up to EMBED_CONCURRENCY embedding requests are in flight at once
+        (windowed, so a huge document doesn't hold every vector in memory).
+        Points are upserted in UPSERT_BATCH_SIZE groups on a worker thread
+        while the next embedding batches keep running. Chunks whose batch
+        failed to embed are skipped.
+
+        Returns:
+            Number of points upserted
+        """
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+        async def _embed(indices: List[int]):
+            async with semaphore:
+                vectors = await self.embeddings.get_embeddings_batch([chunks[i] for i in indices])
+            if len(vectors) != len(indices):
+                logger.warning(
+                    f"Embedding batch failed ({len(vectors)} vectors for {len(indices)} chunks), skipping"
+                )
+                return indices, []
+            return indices, vectors
+
+        batches = token_batches(chunks, EMBED_BATCH_TOKENS, EMBED_BATCH_SIZE)
+        in_flight: "collections.deque[asyncio.Task]" = collections.deque()
+        pending_upsert: Optional[asyncio.Future] = None
+        buffer: List[qmodels.PointStruct] = []
+        upserted = 0
+
+        async def _flush(points: List[qmodels.PointStruct]):
+            nonlocal pending_upsert, upserted
+            # One upsert in flight at a time keeps Qdrant writes ordered
+            if pending_upsert is not None:
+                await pending_upsert
+            pending_upsert = asyncio.ensure_future(asyncio.to_thread(
+                self.qdrant.upsert, collection_name=self.collection, points=points
+            ))
+            upserted += len(points)
+
+        def _fill():
+            for indices in batches:
+                in_flight.append(asyncio.create_task(_embed(indices)))
+                if len(in_flight) > EMBED_CONCURRENCY:
+                    break
+
+        try:
+            _fill()
+            while in_flight:
+                indices, vectors = await in_flight.popleft()
+                _fill()
+                buffer.extend(make_point(i, v) for i, v in zip(indices, vectors))
+                if len(buffer) >= UPSERT_BATCH_SIZE:
+                    await _flush(buffer[:UPSERT_BATCH_SIZE])
+                    buffer = buffer[UPSERT_BATCH_SIZE:]
+            if buffer:
+                await _flush(buffer)
+            if pending_upsert is not None:
+                await pending_upsert
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        return upserted
+
+    def _chunk_text(self, text: str) -> List[str]:
+        """Split text into token-bounded, sentence-aligned chunks."""
         if not text:
             return []
-            
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            if chunk.strip():
-                chunks.append(chunk)
-            start += (chunk_size - overlap)
-        return chunks
+        chunker = StreamingChunker(max_tokens=CHUNK_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS)
+        return [chunk["text"] for chunk in chunker.iter_chunks(text)]
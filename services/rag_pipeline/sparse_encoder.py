@@ -0,0 +1,128 @@
+"""Sparse (lexical) vectors for hybrid search.
+
+Two encoders are supported, selected with SPARSE_ENCODER:
+
+- "lexical" (default): Latin words plus CJK character bigrams, hashed into
+  SPARSE_VECTOR_SIZE buckets with BM25-style saturated term frequencies.
+  Collections store them in the "text" sparse vector with Qdrant's IDF
+  modifier, so IDF is maintained server-side as documents are indexed.
+  Latin tokens hash exactly as the previous ``[A-Za-z0-9_]+`` vectors did,
+  so existing English sparse data keeps matching.
+- "bge-m3": BGE-M3 lexical weights from the embeddings service
+  (``POST /embed_sparse``), stored in the "bge_m3" sparse vector.
+
+Documents and queries must use the same encoder as the collection.
+"""
+
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+import requests
+from qdrant_client.models import Modifier, SparseIndexParams, SparseVector, SparseVectorParams
+
+logger = logging.getLogger(__name__)
+
+SPARSE_ENCODER = os.getenv("SPARSE_ENCODER", "lexical")
+SPARSE_VECTOR_SIZE = int(os.getenv("SPARSE_VECTOR_SIZE", "65536"))
+EMBEDDINGS_URL = os.getenv("EMBEDDINGS_URL", "http://localhost:8081")
+
+# BM25 term-frequency saturation (no length normalization: chunks are token-bounded)
+BM25_K1 = 1.2
+
+_LATIN = re.compile(r"[A-Za-z0-9_]+")
+_CJK_RUN = re.compile("[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def sparse_vector_name(encoder: Optional[str] = None) -> str:
+    """Named sparse vector the encoder's vectors live in."""
+    return "bge_m3" if (encoder or SPARSE_ENCODER) == "bge-m3" else "text"
+
+
+def sparse_vector_params(encoder: Optional[str] = None) -> Dict[str, SparseVectorParams]:
+    """``sparse_vectors_config`` entry for a collection using this encoder."""
+    encoder = encoder or SPARSE_ENCODER
+    params = SparseVectorParams(
+        index=SparseIndexParams(on_disk=False),
+        # Lexical vectors carry term frequencies only; Qdrant applies IDF
+        modifier=Modifier.IDF if encoder != "bge-m3" else None,
+    )
+    return {sparse_vector_name(encoder): params}
+
+
+def lexical_terms(text: str) -> List[str]:
+    """Latin words and CJK bigrams (single CJK characters stand alone)."""
+    terms = _LATIN.findall(text.lower())
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def _bucket(term: str) -> int:
+    return int(hashlib.md5(term.encode("utf-8")).hexdigest()[:8], 16) % SPARSE_VECTOR_SIZE
+
+
+def lexical_sparse_vector(text: str, query: bool = False) -> SparseVector:
+    """
+    Hashed lexical sparse vector.
+
+    Args:
+        text: Document or query text
+        query: Queries weight each distinct term 1.0; documents use saturated TF
+
+    Returns:
+        SparseVector (empty if the text has no terms)
+    """
+    counts: Dict[int, int] = {}
+    for term in lexical_terms(text):
+        idx = _bucket(term)
+        counts[idx] = counts.get(idx, 0) + 1
+
+    indices = list(counts)
+    if query:
+        values = [1.0] * len(indices)
+    else:
+        values = [tf * (BM25_K1 + 1) / (tf + BM25_K1) for tf in (counts[i] for i in indices)]
+    return SparseVector(indices=indices, values=values)
+
+
+def bge_m3_sparse_vectors(texts: List[str], timeout: float = 30) -> Optional[List[SparseVector]]:
+    """BGE-M3 lexical weights from the embeddings service, or None if unavailable."""
+    try:
+        response = requests.post(
+            f"{EMBEDDINGS_URL}/embed_sparse",
+            json={"inputs": texts},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return [
+            SparseVector(indices=item["indices"], values=item["values"])
+            for item in response.json()["sparse"]
+        ]
+    except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+        logger.error(f"Sparse embeddings service error: {e}")
+        return None
+
+
+def encode_query(text: str, encoder: Optional[str] = None) -> Optional[SparseVector]:
+    """Sparse vector for a search query (None if it has no lexical content)."""
+    if (encoder or SPARSE_ENCODER) == "bge-m3":
+        vectors = bge_m3_sparse_vectors([text], timeout=5)
+        vector = vectors[0] if vectors else None
+    else:
+        vector = lexical_sparse_vector(text, query=True)
+    if vector is None or not vector.indices:
+        return None
+    return vector
+
+
+def encode_documents(texts: List[str], encoder: Optional[str] = None) -> List[Optional[SparseVector]]:
+    """Sparse vectors for documents being indexed (None entries are skipped)."""
+    if (encoder or SPARSE_ENCODER) == "bge-m3":
+        return bge_m3_sparse_vectors(texts) or [None] * len(texts)
+    return [lexical_sparse_vector(t) for t in texts]
@@ -5,12 +5,12 @@ from typing import List, Dict, Any, Optional
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
-    VectorParams,
     PointStruct,
-    SparseVectorParams,
-    SparseIndexParams,
 )
 
+from services.qdrant_profiles import collection_params, payload_indexes, vector_params
+from services.rag_pipeline.sparse_encoder import sparse_vector_name, sparse_vector_params
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +55,7 @@ class VectorStore:
         vector_size: int = 1024,
         distance: Distance = Distance.COSINE,
         enable_bm25: bool = True,
+        profile: Optional[str] = None,
     ) -> None:
         """
         Create a new Qdrant collection with dense and optional sparse vectors.
@@ -64,32 +65,27 @@ class VectorStore:
             vector_size: Dimension of dense vectors (default: 1024 for BGE-M3)
             distance: Distance metric (default: COSINE)
             enable_bm25: Whether to enable BM25 sparse vectors (default: True)
+            profile: Storage/quantization profile (default: QDRANT_COLLECTION_PROFILE)
         """
         if self.collection_exists(collection_name):
             logger.warning(f"Collection '{collection_name}' already exists, skipping creation")
             return
 
         try:
-            vectors_config = VectorParams(
-                size=vector_size,
-                distance=distance,
-            )
+            vectors_config = vector_params(vector_size, distance, profile)
 
             sparse_vectors_config = None
             if enable_bm25:
-                sparse_vectors_config = {
-                    "text": SparseVectorParams(
-                        index=SparseIndexParams(
-                            on_disk=False,
-                        )
-                    )
-                }
+                sparse_vectors_config = sparse_vector_params()
 
             self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=vectors_config,
                 sparse_vectors_config=sparse_vectors_config,
+                **collection_params(profile),
             )
+            for field, schema in payload_indexes(collection_name):
+                self.client.create_payload_index(collection_name, field, schema)
             logger.info(f"Created collection '{collection_name}' with vector_size={vector_size}, bm25={enable_bm25}")
         except Exception as e:
             logger.error(f"Error creating collection '{collection_name}': {e}")
@@ -146,7 +142,7 @@ class VectorStore:
                 if "sparse_vector" in doc:
                     point_kwargs["vector"] = {
                         "": doc["vector"],  # Default dense vector
-                        "text": doc["sparse_vector"],  # Named sparse vector
+                        sparse_vector_name(): doc["sparse_vector"],  # Named sparse vector
                     }
 
                 points.append(PointStruct(**point_kwargs))
@@ -3,17 +3,27 @@
 import asyncio
 import logging
 import os
+import re
 import subprocess
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+SERVICE_HEALTH_TIMEOUT_S = float(os.getenv("SERVICE_HEALTH_TIMEOUT_S", "5"))
+# /admin/services answers from a snapshot no older than this
+SERVICE_STATUS_TTL_S = float(os.getenv("SERVICE_STATUS_TTL_S", "15"))
+# Background refresh period (0 = refresh on demand only)
+SERVICE_STATUS_REFRESH_S = float(os.getenv("SERVICE_STATUS_REFRESH_S", "10"))
+
+ProcessTable = List[Tuple[int, str]]  # (pid, command line)
+
 
 class ServiceStatus(Enum):
     """Service operational status."""
@@ -175,17 +185,75 @@ class ServiceManager:
         self.working_dir = working_dir or Path.cwd()
         self._lock = asyncio.Lock()
         self._active_operations: Dict[str, asyncio.Task] = {}
+        self._http: Optional[httpx.AsyncClient] = None
+        self._refresh_lock = asyncio.Lock()
+        self._refreshed_at = 0.0
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def get_all_services(self, max_age: float = SERVICE_STATUS_TTL_S) -> List[ServiceInfo]:
+        """
+        Get status of all registered services.
+
+        Args:
+            max_age: Return the last snapshot if it is at most this many
+                seconds old; 0 forces a fresh poll
+
+        Returns:
+            ServiceInfo for every registered service
+        """
+        if time.monotonic() - self._refreshed_at > max_age:
+            await self.refresh()
+        return list(SERVICES.values())
+
+    async def refresh(self) -> List[ServiceInfo]:
+        """Poll every service concurrently (one process table scan, shared HTTP client)."""
+        started = time.monotonic()
+        async with self._refresh_lock:
+            # Another caller refreshed while we waited for the lock
+            if self._refreshed_at >= started:
+                return list(SERVICES.values())
+            processes = await self._scan_processes()
+            services = await asyncio.gather(
+                *(self.get_service_status(name, processes) for name in SERVICES)
+            )
+            self._refreshed_at = time.monotonic()
+        return list(services)
 
-    async def get_all_services(self) -> List[ServiceInfo]:
-        """Get status of all registered services."""
-        services = []
-        for service_def in SERVICES.values():
-            info = await self.get_service_status(service_def.name)
-            services.append(info)
-        return services
+    def start_refresher(self, interval: float = SERVICE_STATUS_REFRESH_S) -> None:
+        """Keep the status snapshot warm from a background task."""
+        if interval <= 0 or (self._refresher and not self._refresher.done()):
+            return
+        self._refresher = asyncio.create_task(self._refresh_loop(interval))
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Service status refresh failed: {e}")
+            await asyncio.sleep(interval)
 
-    async def get_service_status(self, name: str) -> ServiceInfo:
-        """Get current status of a service."""
+    async def close(self) -> None:
+        """Stop the background refresher and close the shared HTTP client."""
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._http and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+
+    async def get_service_status(self, name: str, processes: Optional[ProcessTable] = None) -> ServiceInfo:
+        """
+        Get current status of a service.
+
+        Args:
+            name: Registered service name
+            processes: Process table from _scan_processes (scanned here when omitted)
+        """
         if name not in SERVICES:
             raise ValueError(f"Unknown service: {name}")
 
@@ -193,7 +261,7 @@ class ServiceManager:
 
         try:
             if service.process_pattern:
-                pid = await self._find_process(service.process_pattern)
+                pid = await self._find_process(service.process_pattern, processes)
                 service.pid = pid
 
                 if pid:
@@ -302,8 +370,24 @@ class ServiceManager:
         await asyncio.sleep(2)
         return await self.start_service(name)
 
-    async def _find_process(self, pattern: str) -> Optional[int]:
-        """Find process by pattern and return PID."""
+    async def _scan_processes(self) -> Optional[ProcessTable]:
+        """Read every process command line from /proc (None where /proc is unavailable)."""
+        if not os.path.isdir("/proc"):
+            return None
+        return await asyncio.to_thread(_read_proc_table)
+
+    async def _find_process(self, pattern: str, processes: Optional[ProcessTable] = None) -> Optional[int]:
+        """Find process by pattern (as pgrep -f) and return the lowest PID."""
+        if processes is None:
+            processes = await self._scan_processes()
+        if processes is not None:
+            try:
+                regex = re.compile(pattern)
+            except re.error:
+                return None
+            pids = [pid for pid, cmdline in processes if regex.search(cmdline)]
+            return min(pids) if pids else None
+
         try:
             result = await asyncio.create_subprocess_exec(
                 "pgrep", "-f", pattern,
@@ -323,27 +407,22 @@ class ServiceManager:
     async def _check_health(self, url: str) -> Dict:
         """Check service health via HTTP."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url)
-                is_healthy = response.status_code == 200
-
-                if is_healthy:
-                    content_type = response.headers.get("content-type", "")
-                    if "application/json" in content_type:
-                        try:
-                            json_data = response.json()
-                            return {
-                                "healthy": True,
-                                "status_code": response.status_code,
-                                "response": json_data,
-                            }
-                        except Exception:
-                            return {
-                                "healthy": True,
-                                "status_code": response.status_code,
-                                "response_text": response.text[:200],
-                            }
-                    else:
+            if self._http is None or self._http.is_closed:
+                self._http = httpx.AsyncClient(timeout=SERVICE_HEALTH_TIMEOUT_S)
+            response = await self._http.get(url)
+            is_healthy = response.status_code == 200
+
+            if is_healthy:
+                content_type = response.headers.get("content-type", "")
+                if "application/json" in content_type:
+                    try:
+                        json_data = response.json()
+                        return {
+                            "healthy": True,
+                            "status_code": response.status_code,
+                            "response": json_data,
+                        }
+                    except Exception:
                         return {
                             "healthy": True,
                             "status_code": response.status_code,
@@ -351,10 +430,16 @@ class ServiceManager:
                         }
                 else:
                     return {
-                        "healthy": False,
+                        "healthy": True,
                         "status_code": response.status_code,
-                        "response_text": response.text[:200] if response.text else None,
+                        "response_text": response.text[:200],
                     }
+            else:
+                return {
+                    "healthy": False,
+                    "status_code": response.status_code,
+                    "response_text": response.text[:200] if response.text else None,
+                }
         except Exception as e:
             return {"healthy": False, "error": str(e)}
 
@@ -402,6 +487,22 @@ class ServiceManager:
             raise
 
 
+def _read_proc_table() -> ProcessTable:
+    """(pid, space-joined argv) for every readable /proc entry."""
+    table: ProcessTable = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                raw = f.read()
+        except OSError:
+            continue
+        if raw:
+            table.append((int(entry.name), raw.rstrip(b"\0").replace(b"\0", b" ").decode("utf-8", "replace")))
+    return table
+
+
 _service_manager: Optional[ServiceManager] = None
 
 
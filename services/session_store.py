@@ -2,23 +2,137 @@
 Session store for BestBox agent conversations.
 
 Persists session metadata and messages (including ReAct traces) to PostgreSQL.
+Messages are written behind the request (services/write_behind.py).
 """
 
 import json
 import logging
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 import asyncpg
 
+from services.write_behind import WriteBehindLog
+
 logger = logging.getLogger(__name__)
 
+# Columns returned by the list/detail views; everything except the
+# reasoning_trace/tool_calls blobs, which are loaded per message on demand
+SESSION_COLUMNS = (
+    "id, user_id, channel, started_at, ended_at, message_count, status, rating, rating_note, "
+    "tokens_prompt_total, tokens_completion_total, last_message_at"
+)
+MESSAGE_COLUMNS = (
+    "id, role, content, tokens_prompt, tokens_completion, latency_ms, created_at, "
+    "reasoning_trace IS NOT NULL AS has_reasoning_trace, tool_calls IS NOT NULL AS has_tool_calls"
+)
+
+# Schema of migrations/008_session_pagination.sql, applied at startup
+COUNTER_COLUMNS = ("tokens_prompt_total", "tokens_completion_total", "last_message_at")
+_ADD_COUNTER_COLUMNS = [
+    "ALTER TABLE sessions ADD COLUMN IF NOT EXISTS tokens_prompt_total BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE sessions ADD COLUMN IF NOT EXISTS tokens_completion_total BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE sessions ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP",
+]
+_BACKFILL_COUNTERS = """
+    UPDATE sessions s
+    SET message_count = m.messages,
+        tokens_prompt_total = m.tokens_prompt,
+        tokens_completion_total = m.tokens_completion,
+        last_message_at = m.last_message_at
+    FROM (
+        SELECT session_id,
+               COUNT(*) AS messages,
+               COALESCE(SUM(tokens_prompt), 0) AS tokens_prompt,
+               COALESCE(SUM(tokens_completion), 0) AS tokens_completion,
+               MAX(created_at) AS last_message_at
+        FROM session_messages
+        GROUP BY session_id
+    ) m
+    WHERE s.id = m.session_id
+"""
+_SESSION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_messages_session_created "
+    "ON session_messages(session_id, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_user_started ON sessions(user_id, started_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_status_started ON sessions(status, started_at DESC)",
+]
+
+
+async def init_session_tables(pool: asyncpg.Pool) -> None:
+    """Add the session summary counters and paging indexes if they are missing.
+
+    Idempotent. The counters are backfilled from session_messages only when
+    the columns are first added.
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # API workers starting together would otherwise all backfill
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('bestbox_session_tables'))")
+            present = await conn.fetchval(
+                """
+                SELECT COUNT(*) FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'sessions'
+                  AND column_name = ANY($1::text[])
+                """,
+                list(COUNTER_COLUMNS),
+            )
+            if present < len(COUNTER_COLUMNS):
+                for statement in _ADD_COUNTER_COLUMNS:
+                    await conn.execute(statement)
+                await conn.execute(_BACKFILL_COUNTERS)
+                logger.info("Added session summary counters (migration 008) and backfilled them")
+            for statement in _SESSION_INDEXES:
+                await conn.execute(statement)
+
+
+async def _write_messages(conn, records: List[Dict[str, Any]]) -> None:
+    """Insert a batch of messages and bump each session's counters once."""
+    await conn.executemany(
+        """
+        INSERT INTO session_messages (
+            session_id, role, content, reasoning_trace, tool_calls,
+            tokens_prompt, tokens_completion, latency_ms, created_at
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, to_timestamp($9))
+        """,
+        [
+            (
+                r["session_id"], r["role"], r["content"], r["reasoning_trace"], r["tool_calls"],
+                r["tokens_prompt"], r["tokens_completion"], r["latency_ms"], r["created_at"],
+            )
+            for r in records
+        ],
+    )
+    totals: Dict[str, List[Any]] = {}
+    for r in records:
+        t = totals.setdefault(r["session_id"], [0, 0, 0, 0.0])
+        t[0] += 1
+        t[1] += r["tokens_prompt"] or 0
+        t[2] += r["tokens_completion"] or 0
+        t[3] = max(t[3], r["created_at"])
+    await conn.executemany(
+        """
+        UPDATE sessions
+        SET message_count = message_count + $2,
+            tokens_prompt_total = tokens_prompt_total + $3,
+            tokens_completion_total = tokens_completion_total + $4,
+            last_message_at = GREATEST(last_message_at, to_timestamp($5)),
+            ended_at = NULL,
+            status = 'active'
+        WHERE id = $1
+        """,
+        [(session_id, *t) for session_id, t in totals.items()],
+    )
+
 
 class SessionStore:
     """PostgreSQL-backed session store."""
 
     def __init__(self, pool: asyncpg.Pool):
         self._pool = pool
+        self._messages = WriteBehindLog(pool, "session_messages", _write_messages)
 
     @classmethod
     async def create(cls) -> "SessionStore":
@@ -32,7 +146,14 @@ class SessionStore:
             min_size=1,
             max_size=5,
         )
-        return cls(pool)
+        try:
+            await init_session_tables(pool)
+        except Exception:
+            await pool.close()
+            raise
+        store = cls(pool)
+        store._messages.start()
+        return store
 
     async def create_session(self, user_id: str, channel: str) -> str:
         """Create a new session and return session_id."""
@@ -71,61 +192,97 @@ class SessionStore:
         tool_calls: Optional[List[Dict[str, Any]]] = None,
         metrics: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """Add a message to a session."""
+        """Queue a message for the session (written within WRITE_BEHIND_FLUSH_MS)."""
         metrics = metrics or {}
-        async with self._pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO session_messages (
-                    session_id, role, content, reasoning_trace, tool_calls,
-                    tokens_prompt, tokens_completion, latency_ms
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                """,
-                session_id,
-                role,
-                content,
-                json.dumps(reasoning_trace) if reasoning_trace else None,
-                json.dumps(tool_calls) if tool_calls else None,
-                metrics.get("tokens_prompt"),
-                metrics.get("tokens_completion"),
-                metrics.get("latency_ms"),
-            )
-            await conn.execute(
-                """
-                UPDATE sessions
-                SET message_count = message_count + 1,
-                    ended_at = NULL,
-                    status = 'active'
-                WHERE id = $1
-                """,
-                session_id,
-            )
+        await self._messages.submit({
+            "session_id": session_id,
+            "role": role,
+            "content": content,
+            "reasoning_trace": json.dumps(reasoning_trace) if reasoning_trace else None,
+            "tool_calls": json.dumps(tool_calls) if tool_calls else None,
+            "tokens_prompt": metrics.get("tokens_prompt"),
+            "tokens_completion": metrics.get("tokens_completion"),
+            "latency_ms": metrics.get("latency_ms"),
+            "created_at": time.time(),
+        })
+
+    async def get_session(
+        self,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get session metadata and summary counters with one page of messages.
 
-    async def get_session(self, session_id: str) -> Dict[str, Any]:
-        """Get session metadata with all messages."""
+        Messages are paged newest-first by (created_at, id) and returned in
+        chronological order without their reasoning_trace/tool_calls blobs
+        (see get_message_details).
+
+        Args:
+            session_id: Session to load
+            limit: Messages per page
+            before: Message ID cursor; returns the page preceding that message
+
+        Returns:
+            Session row plus ``messages`` and ``next_before`` (cursor for the
+            previous page, None at the start of the session), or {} if the
+            session doesn't exist
+        """
+        await self._messages.flush()
         async with self._pool.acquire() as conn:
             session = await conn.fetchrow(
-                """
-                SELECT * FROM sessions WHERE id = $1
+                f"""
+                SELECT {SESSION_COLUMNS} FROM sessions WHERE id = $1
                 """,
                 session_id,
             )
             if not session:
                 return {}
 
-            messages = await conn.fetch(
+            keyset = ""
+            params: List[Any] = [session_id, limit + 1]
+            if before:
+                params.append(before)
+                keyset = """
+                    AND (created_at, id) < (
+                        SELECT created_at, id FROM session_messages WHERE id = $3 AND session_id = $1
+                    )
                 """
-                SELECT * FROM session_messages
-                WHERE session_id = $1
-                ORDER BY created_at ASC
+            messages = await conn.fetch(
+                f"""
+                SELECT {MESSAGE_COLUMNS} FROM session_messages
+                WHERE session_id = $1 {keyset}
+                ORDER BY created_at DESC, id DESC
+                LIMIT $2
                 """,
-                session_id,
+                *params,
             )
 
+        page = [dict(row) for row in messages[:limit]]
+        page.reverse()
         return {
             **dict(session),
-            "messages": [dict(row) for row in messages],
+            "messages": page,
+            "next_before": str(page[0]["id"]) if len(messages) > limit else None,
+        }
+
+    async def get_message_details(self, session_id: str, message_id: str) -> Dict[str, Any]:
+        """Load the reasoning_trace and tool_calls of one message ({} if not found)."""
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT id, reasoning_trace, tool_calls FROM session_messages
+                WHERE id = $1 AND session_id = $2
+                """,
+                message_id,
+                session_id,
+            )
+        if not row:
+            return {}
+        return {
+            "id": str(row["id"]),
+            "reasoning_trace": json.loads(row["reasoning_trace"]) if row["reasoning_trace"] else None,
+            "tool_calls": json.loads(row["tool_calls"]) if row["tool_calls"] else None,
         }
 
     async def list_sessions(
@@ -135,7 +292,11 @@ class SessionStore:
         user_id: Optional[str] = None,
         status: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """List sessions for admin view."""
+        """List sessions for admin view.
+
+        Message and token counts come from the counters on the session row,
+        kept up to date by the batched message writes.
+        """
         filters = []
         params: List[Any] = []
 
@@ -151,7 +312,7 @@ class SessionStore:
         params.extend([limit, offset])
 
         query = f"""
-            SELECT * FROM sessions
+            SELECT {SESSION_COLUMNS} FROM sessions
             {where_clause}
             ORDER BY started_at DESC
             LIMIT ${len(params) - 1} OFFSET ${len(params)}
@@ -164,6 +325,8 @@ class SessionStore:
 
     async def update_session_status(self, session_id: str, status: str) -> None:
         """Update session status."""
+        # Pending messages would otherwise reactivate the session afterwards
+        await self._messages.flush()
         async with self._pool.acquire() as conn:
             await conn.execute(
                 """
@@ -190,5 +353,6 @@ class SessionStore:
             )
 
     async def close(self) -> None:
-        """Close underlying pool."""
+        """Flush queued messages and close underlying pool."""
+        await self._messages.close()
         await self._pool.close()
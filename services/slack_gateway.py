@@ -2,11 +2,20 @@
 import os
 import logging
 import asyncio
-import aiohttp
-import json
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 
+from services.gateway_streaming import (
+    PLACEHOLDER_TEXT,
+    AgentAPIError,
+    ChatQueues,
+    ProgressiveReply,
+    close_http_session,
+    get_http_session,
+    split_message,
+    stream_reply,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("slack_gateway")
@@ -15,6 +24,9 @@ logger = logging.getLogger("slack_gateway")
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_APP_TOKEN = os.environ.get("SLACK_APP_TOKEN")
 AGENT_API_URL = os.environ.get("AGENT_API_URL", "http://localhost:8000/v1/chat/completions")
+# chat.update is a Tier 3 method (~50/min); one edit per second per reply stays well inside it
+SLACK_EDIT_INTERVAL_S = float(os.environ.get("SLACK_EDIT_INTERVAL_S", "1.0"))
+SLACK_MAX_CHARS = 3900
 
 if not SLACK_BOT_TOKEN:
     logger.error("SLACK_BOT_TOKEN is not set")
@@ -23,6 +35,7 @@ if not SLACK_APP_TOKEN:
 
 # Initialize Bolt App
 app = AsyncApp(token=SLACK_BOT_TOKEN)
+chat_queues = ChatQueues()
 
 @app.event("app_mention")
 async def handle_app_mentions(event, say):
@@ -58,57 +71,63 @@ async def process_message(event, say):
     except Exception as e:
         logger.warning(f"Failed to add reaction: {e}")
 
+    # One request at a time per channel; other channels are not held up
+    await chat_queues.run(
+        channel_id,
+        lambda: reply_with_agent(user_id, channel_id, text, ts, thread_ts, say)
+    )
+
+async def set_reaction(channel_id, ts, name):
+    try:
+        await app.client.reactions_remove(channel=channel_id, timestamp=ts, name="eyes")
+        await app.client.reactions_add(channel=channel_id, timestamp=ts, name=name)
+    except Exception:
+        pass
+
+async def reply_with_agent(user_id, channel_id, text, ts, thread_ts, say):
+    """Post a placeholder in the thread and edit it as the agent streams its reply."""
+    placeholder = await say(text=PLACEHOLDER_TEXT, thread_ts=thread_ts)
+    reply_ts = placeholder["ts"]
+
+    async def edit(new_text):
+        await app.client.chat_update(channel=channel_id, ts=reply_ts, text=new_text)
+
+    reply = ProgressiveReply(edit, min_interval=SLACK_EDIT_INTERVAL_S, max_chars=SLACK_MAX_CHARS)
+
     try:
-        # Call Agent API
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "messages": [
-                    {"role": "user", "content": text}
-                ],
-                "model": "bestbox-agent",
-                "stream": False,
-                # Use thread_ts as session_id to maintain context per thread
-                "thread_id": f"slack-{channel_id}-{thread_ts}"
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "x-user-id": f"slack:{user_id}"
-            }
-
-            async with session.post(AGENT_API_URL, json=payload, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    response_text = data["choices"][0]["message"]["content"]
-                    
-                    # Send response back to Slack
-                    await say(text=response_text, thread_ts=thread_ts)
-                    
-                    # Update reaction to success
-                    try:
-                        await app.client.reactions_remove(channel=channel_id, timestamp=ts, name="eyes")
-                        await app.client.reactions_add(channel=channel_id, timestamp=ts, name="white_check_mark")
-                    except:
-                        pass
-                else:
-                    error_text = await resp.text()
-                    logger.error(f"Agent API error: {resp.status} - {error_text}")
-                    await say(text=f"Check your connection to BestBox Agent API. Error: {resp.status}", thread_ts=thread_ts)
-                    
-                    try:
-                        await app.client.reactions_remove(channel=channel_id, timestamp=ts, name="eyes")
-                        await app.client.reactions_add(channel=channel_id, timestamp=ts, name="warning")
-                    except:
-                        pass
+        payload = {
+            "messages": [
+                {"role": "user", "content": text}
+            ],
+            "model": "bestbox-agent",
+            # Use thread_ts as session_id to maintain context per thread
+            "thread_id": f"slack-{channel_id}-{thread_ts}"
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "x-user-id": f"slack:{user_id}"
+        }
+
+        response_text = await stream_reply(get_http_session(), AGENT_API_URL, payload, headers, reply)
+
+        # Final answer replaces the draft; overflow goes to follow-up messages
+        parts = split_message(response_text or "(no response)", SLACK_MAX_CHARS)
+        await reply.finish(parts[0])
+        for part in parts[1:]:
+            await say(text=part, thread_ts=thread_ts)
+
+        await set_reaction(channel_id, ts, "white_check_mark")
+
+    except AgentAPIError as e:
+        logger.error(str(e))
+        await reply.finish(f"Check your connection to BestBox Agent API. Error: {e.status}")
+        await set_reaction(channel_id, ts, "warning")
 
     except Exception as e:
         logger.error(f"Error processing message: {e}")
-        await say(text=f"I encountered an internal error: {str(e)}", thread_ts=thread_ts)
-        try:
-            await app.client.reactions_remove(channel=channel_id, timestamp=ts, name="eyes")
-            await app.client.reactions_add(channel=channel_id, timestamp=ts, name="x")
-        except:
-            pass
+        await reply.finish(f"I encountered an internal error: {str(e)}")
+        await set_reaction(channel_id, ts, "x")
 
 async def main():
     if not SLACK_APP_TOKEN:
@@ -117,7 +136,10 @@ async def main():
 
     handler = AsyncSocketModeHandler(app, SLACK_APP_TOKEN)
     logger.info("⚡️ BestBox Slack Gateway is running!")
-    await handler.start_async()
+    try:
+        await handler.start_async()
+    finally:
+        await close_http_session()
 
 if __name__ == "__main__":
     import argparse
@@ -0,0 +1,437 @@
+"""
+Speech Inference Sidecar for BestBox LiveKit Agents
+
+LiveKit runs each room in its own job process. Loading Whisper and TTS inside
+every job process makes the first utterance in a new room wait for a model
+load, and keeps one copy of the models per process. The sidecar holds a single
+warm copy and serves job processes over a Unix socket:
+
+    python -m services.speech.sidecar --socket /tmp/bestbox-speech.sock
+    SPEECH_SIDECAR_SOCKET=/tmp/bestbox-speech.sock python services/livekit_agent.py dev
+
+Job processes attach as thin clients. RemoteASR and RemoteTTS expose the
+StreamingASR / StreamingTTS methods the LiveKit adapters use, so they drop in
+for the in-process engines. Each RemoteASR owns one connection, and the
+sidecar keeps that connection's ASR state (buffers, VAD, language) while
+sharing the Whisper model across connections.
+
+Wire format (both directions): 8-byte header (JSON length, payload length,
+network order), a JSON object, then raw bytes (PCM16 audio).
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from services.speech.asr import ASRConfig, StreamingASR
+from services.speech.tts import StreamingTTS, TTSConfig
+
+logger = logging.getLogger(__name__)
+
+# Empty = job processes load models in-process (previous behaviour)
+SPEECH_SIDECAR_SOCKET = os.getenv("SPEECH_SIDECAR_SOCKET", "")
+# Whisper inferences / TTS syntheses run at once across all rooms
+SPEECH_SIDECAR_ASR_CONCURRENCY = int(os.getenv("SPEECH_SIDECAR_ASR_CONCURRENCY", "2"))
+SPEECH_SIDECAR_TTS_CONCURRENCY = int(os.getenv("SPEECH_SIDECAR_TTS_CONCURRENCY", "2"))
+SPEECH_SIDECAR_TIMEOUT = float(os.getenv("SPEECH_SIDECAR_TIMEOUT", "60"))
+
+_HEADER = struct.Struct("!II")
+
+
+class SpeechSidecarError(RuntimeError):
+    """The sidecar rejected or failed a request."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            return None
+        received += n
+    return bytes(buf)
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any], payload: bytes = b"") -> None:
+    """Write one framed message."""
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body), len(payload)) + body + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """Read one framed message; None when the peer closed the connection."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    body_len, payload_len = _HEADER.unpack(header)
+    body = _recv_exact(sock, body_len) if body_len else b"{}"
+    payload = _recv_exact(sock, payload_len) if payload_len else b""
+    if body is None or payload is None:
+        return None
+    return json.loads(body), payload
+
+
+def _rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        return 0.0
+
+
+# ==============================================================================
+# Server
+# ==============================================================================
+
+class _BoundedModel:
+    """Shared Whisper model that caps concurrent inferences across sessions."""
+
+    def __init__(self, model, limit: threading.BoundedSemaphore):
+        self._model = model
+        self._limit = limit
+
+    def transcribe(self, audio, **kwargs):
+        with self._limit:
+            segments, info = self._model.transcribe(audio, **kwargs)
+            # faster-whisper decodes lazily while segments are iterated
+            return list(segments), info
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+class _Connection(socketserver.BaseRequestHandler):
+    """One client connection: requests are handled in order, ASR state is per connection."""
+
+    server: "_SidecarServer"
+
+    def handle(self):
+        sidecar = self.server.sidecar
+        asr: Optional[StreamingASR] = None
+        sidecar._connection_opened()
+        try:
+            while True:
+                message = recv_message(self.request)
+                if message is None:
+                    return
+                request, payload = message
+                op = request.get("op")
+                try:
+                    result, out = None, b""
+                    if op == "ping":
+                        result = sidecar.info()
+                    elif op == "asr_open":
+                        asr = sidecar.new_asr_session(request.get("language"))
+                    elif op == "tts":
+                        out = sidecar.synthesize(request.get("text", ""), request.get("language"))
+                        result = {"sample_rate": sidecar.tts_sample_rate}
+                    elif asr is None:
+                        raise SpeechSidecarError(f"{op}: no ASR session on this connection")
+                    elif op == "asr_feed":
+                        result = asr.feed_audio(np.frombuffer(payload, dtype=np.int16))
+                    elif op == "asr_finalize":
+                        result = asr.finalize()
+                    elif op == "asr_reset":
+                        asr.reset()
+                    elif op == "asr_set_language":
+                        asr.set_language(request.get("language") or "")
+                    else:
+                        raise SpeechSidecarError(f"Unknown op: {op}")
+                    send_message(self.request, {"ok": True, "result": result}, out)
+                except Exception as e:
+                    logger.error(f"Sidecar {op} failed: {e}")
+                    send_message(self.request, {"ok": False, "error": str(e)})
+        except (ConnectionError, OSError) as e:
+            logger.debug(f"Sidecar client disconnected: {e}")
+        finally:
+            sidecar._connection_closed()
+
+
+class _SidecarServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, sidecar: "SpeechSidecar"):
+        self.sidecar = sidecar
+        super().__init__(socket_path, _Connection)
+
+
+class SpeechSidecar:
+    """
+    Holds one warm ASR model and TTS engine and serves them over a Unix socket.
+
+    Usage:
+        sidecar = SpeechSidecar("/tmp/bestbox-speech.sock")
+        sidecar.load()
+        sidecar.serve_forever()
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        asr_config: Optional[ASRConfig] = None,
+        tts_config: Optional[TTSConfig] = None,
+        enable_tts: bool = True,
+        asr_concurrency: int = SPEECH_SIDECAR_ASR_CONCURRENCY,
+        tts_concurrency: int = SPEECH_SIDECAR_TTS_CONCURRENCY,
+    ):
+        self.socket_path = socket_path
+        # Same defaults as livekit_local's in-process engines
+        self.asr_config = asr_config or ASRConfig()
+        self.tts_config = tts_config or TTSConfig(sample_rate=24000, fallback_to_piper=True)
+        self.enable_tts = enable_tts
+        self._asr_limit = threading.BoundedSemaphore(max(1, asr_concurrency))
+        self._tts_limit = threading.BoundedSemaphore(max(1, tts_concurrency))
+        self._asr_model = None
+        self._tts: Optional[StreamingTTS] = None
+        self._server: Optional[_SidecarServer] = None
+        self._started = time.time()
+        self._stats_lock = threading.Lock()
+        self._connections = 0
+        self._asr_sessions = 0
+        self._tts_requests = 0
+
+    def load(self) -> None:
+        """Load and warm the models before accepting clients."""
+        start = time.perf_counter()
+        holder = StreamingASR(dataclasses.replace(self.asr_config))
+        self._asr_model = _BoundedModel(holder.model, self._asr_limit)
+        # First inference initialises the backend; pay for it here, not in a room
+        self._asr_model.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1)
+        logger.info(f"Sidecar ASR warm ({self.asr_config.model_size}) in {time.perf_counter() - start:.1f}s")
+
+        if self.enable_tts:
+            start = time.perf_counter()
+            self._tts = StreamingTTS(dataclasses.replace(self.tts_config))
+            _ = self._tts.tts
+            logger.info(f"Sidecar TTS warm in {time.perf_counter() - start:.1f}s")
+
+    @property
+    def tts_sample_rate(self) -> int:
+        return self._tts.sample_rate if self._tts else self.tts_config.sample_rate
+
+    def new_asr_session(self, language: Optional[str] = None) -> StreamingASR:
+        """Fresh ASR state (buffers, VAD, language) sharing the warm model."""
+        if self._asr_model is None:
+            raise SpeechSidecarError("ASR model not loaded")
+        session = StreamingASR(dataclasses.replace(self.asr_config))
+        session._model = self._asr_model
+        if language:
+            session.set_language(language)
+        with self._stats_lock:
+            self._asr_sessions += 1
+        return session
+
+    def synthesize(self, text: str, language: Optional[str] = None) -> bytes:
+        if self._tts is None:
+            raise SpeechSidecarError("TTS not enabled in this sidecar")
+        with self._stats_lock:
+            self._tts_requests += 1
+        with self._tts_limit:
+            return self._tts.synthesize(text, language)
+
+    def info(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "pid": os.getpid(),
+                "rss_mb": round(_rss_mb(), 1),
+                "uptime_s": round(time.time() - self._started, 1),
+                "asr_loaded": self._asr_model is not None,
+                "tts_loaded": self._tts is not None,
+                "tts_sample_rate": self.tts_sample_rate,
+                "connections": self._connections,
+                "asr_sessions": self._asr_sessions,
+                "tts_requests": self._tts_requests,
+            }
+
+    def _connection_opened(self):
+        with self._stats_lock:
+            self._connections += 1
+
+    def _connection_closed(self):
+        with self._stats_lock:
+            self._connections -= 1
+
+    def start(self) -> None:
+        """Bind the socket (replacing a stale one) and serve on a background thread."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _SidecarServer(self.socket_path, self)
+        threading.Thread(target=self._server.serve_forever, name="speech-sidecar", daemon=True).start()
+        logger.info(f"Speech sidecar listening on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        self.start()
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            stop.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# ==============================================================================
+# Client
+# ==============================================================================
+
+class SidecarConnection:
+    """Blocking request/response connection to the sidecar (thread-safe).
+
+    A timeout or socket error mid-exchange leaves an unread (or half-read)
+    reply on the socket, which the next call would take as its own answer.
+    Such a connection is closed and every later call raises ConnectionError,
+    so callers reconnect or fall back to in-process models.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = SPEECH_SIDECAR_TIMEOUT):
+        self.socket_path = socket_path or SPEECH_SIDECAR_SOCKET
+        if not self.socket_path:
+            raise SpeechSidecarError("SPEECH_SIDECAR_SOCKET is not set")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.socket_path)
+        self._lock = threading.Lock()
+        self._broken = False
+
+    def call(self, op: str, payload: bytes = b"", **params) -> Tuple[Any, bytes]:
+        with self._lock:
+            if self._broken:
+                raise ConnectionError("Speech sidecar connection is broken")
+            try:
+                send_message(self._sock, {"op": op, **params}, payload)
+                reply = recv_message(self._sock)
+            except Exception as e:
+                self._broken = True
+                self.close()
+                raise ConnectionError(f"Speech sidecar '{op}' failed: {e!r}") from e
+            if reply is None:
+                self._broken = True
+                self.close()
+                raise ConnectionError("Speech sidecar closed the connection")
+        response, data = reply
+        if not response.get("ok"):
+            raise SpeechSidecarError(response.get("error", "unknown error"))
+        return response.get("result"), data
+
+    @property
+    def broken(self) -> bool:
+        return self._broken
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def ping(socket_path: Optional[str] = None, timeout: float = 2.0) -> Dict[str, Any]:
+    """Check the sidecar is up; returns its info (pid, rss_mb, models loaded)."""
+    conn = SidecarConnection(socket_path, timeout=timeout)
+    try:
+        return conn.call("ping")[0]
+    finally:
+        conn.close()
+
+
+class RemoteASR:
+    """StreamingASR interface backed by a session in the sidecar."""
+
+    def __init__(self, socket_path: Optional[str] = None, language: Optional[str] = None):
+        self._conn = SidecarConnection(socket_path)
+        self._conn.call("asr_open", language=language)
+
+    def reset(self):
+        self._conn.call("asr_reset")
+
+    def set_language(self, language: str):
+        self._conn.call("asr_set_language", language=language)
+
+    def feed_audio(self, pcm: np.ndarray) -> Optional[Dict[str, Any]]:
+        if pcm.dtype != np.int16:
+            pcm = pcm.astype(np.int16)
+        return self._conn.call("asr_feed", pcm.tobytes())[0]
+
+    def finalize(self) -> Dict[str, Any]:
+        return self._conn.call("asr_finalize")[0]
+
+    def close(self):
+        self._conn.close()
+
+
+class RemoteTTS:
+    """StreamingTTS interface backed by the sidecar's TTS engine."""
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self._socket_path = socket_path
+        self._conn = SidecarConnection(socket_path)
+        self._sample_rate = self._conn.call("ping")[0]["tts_sample_rate"]
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    def synthesize(self, text: str, language: Optional[str] = None, speaker_wav: Optional[str] = None) -> bytes:
+        if not text.strip():
+            return b""
+        if self._conn.broken:
+            # Synthesis is stateless, so the shared engine can simply reconnect
+            self._conn = SidecarConnection(self._socket_path)
+        return self._conn.call("tts", text=text, language=language)[1]
+
+    async def synthesize_async(self, text: str, language: str = None) -> bytes:
+        return await asyncio.to_thread(self.synthesize, text, language)
+
+    def close(self):
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BestBox speech inference sidecar")
+    parser.add_argument("--socket", default=SPEECH_SIDECAR_SOCKET or "/tmp/bestbox-speech.sock",
+                        help="Unix socket path (default: $SPEECH_SIDECAR_SOCKET)")
+    parser.add_argument("--no-tts", action="store_true", help="Serve ASR only")
+    parser.add_argument("--asr-concurrency", type=int, default=SPEECH_SIDECAR_ASR_CONCURRENCY)
+    parser.add_argument("--tts-concurrency", type=int, default=SPEECH_SIDECAR_TTS_CONCURRENCY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sidecar = SpeechSidecar(
+        args.socket,
+        enable_tts=not args.no_tts,
+        asr_concurrency=args.asr_concurrency,
+        tts_concurrency=args.tts_concurrency,
+    )
+    try:
+        sidecar.load()
+    except Exception as e:
+        logger.error(f"Failed to load speech models: {e}")
+        sys.exit(1)
+    sidecar.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
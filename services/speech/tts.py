@@ -12,6 +12,8 @@ from typing import Optional, Generator, List, Dict, Any
 from dataclasses import dataclass
 from pathlib import Path
 
+from services import voice_memory
+
 logger = logging.getLogger(__name__)
 
 
@@ -449,6 +451,8 @@ class TTSQueue:
         self.max_queue_size = max_queue_size
         self._queue: List[str] = []
         self._audio_queue: List[bytes] = []
+        voice_memory.track("tts_queue_phrases", self, lambda q: len(q._queue))
+        voice_memory.track("tts_audio_chunks", self, lambda q: len(q._audio_queue))
         
     def enqueue(self, text: str) -> bool:
         """
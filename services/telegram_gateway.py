@@ -2,11 +2,20 @@
 import os
 import logging
 import asyncio
-import aiohttp
-import json
 from telegram import Update
 from telegram.ext import ApplicationBuilder, ContextTypes, CommandHandler, MessageHandler, filters
 
+from services.gateway_streaming import (
+    PLACEHOLDER_TEXT,
+    AgentAPIError,
+    ChatQueues,
+    ProgressiveReply,
+    close_http_session,
+    get_http_session,
+    split_message,
+    stream_reply,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("telegram_gateway")
@@ -14,10 +23,15 @@ logger = logging.getLogger("telegram_gateway")
 # Load environment variables
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
 AGENT_API_URL = os.environ.get("AGENT_API_URL", "http://localhost:8000/v1/chat/completions")
+# Telegram allows about one message edit per second per chat
+TELEGRAM_EDIT_INTERVAL_S = float(os.environ.get("TELEGRAM_EDIT_INTERVAL_S", "1.5"))
+TELEGRAM_MAX_CHARS = 4096
 
 if not TELEGRAM_BOT_TOKEN:
     logger.error("TELEGRAM_BOT_TOKEN is not set")
 
+chat_queues = ChatQueues()
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle incoming messages"""
     if not update.message or not update.message.text:
@@ -33,39 +47,48 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Indicate typing status
     await context.bot.send_chat_action(chat_id=chat_id, action="typing")
 
+    # One request at a time per chat; other chats are not held up
+    await chat_queues.run(str(chat_id), lambda: reply_with_agent(context, chat_id, user_id, text))
+
+async def reply_with_agent(context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_id: int, text: str):
+    """Send a placeholder and edit it as the agent streams its reply."""
+    placeholder = await context.bot.send_message(chat_id=chat_id, text=PLACEHOLDER_TEXT)
+
+    async def edit(new_text):
+        await context.bot.edit_message_text(chat_id=chat_id, message_id=placeholder.message_id, text=new_text)
+
+    reply = ProgressiveReply(edit, min_interval=TELEGRAM_EDIT_INTERVAL_S, max_chars=TELEGRAM_MAX_CHARS)
+
     try:
-        # Call Agent API
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "messages": [
-                    {"role": "user", "content": text}
-                ],
-                "model": "bestbox-agent",
-                "stream": False,
-                # Use chat_id as session_id to maintain context per chat
-                "thread_id": f"telegram-{chat_id}"
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "x-user-id": f"telegram:{user_id}"
-            }
-
-            async with session.post(AGENT_API_URL, json=payload, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    response_text = data["choices"][0]["message"]["content"]
-                    
-                    # Send response back to Telegram
-                    await context.bot.send_message(chat_id=chat_id, text=response_text)
-                else:
-                    error_text = await resp.text()
-                    logger.error(f"Agent API error: {resp.status} - {error_text}")
-                    await context.bot.send_message(chat_id=chat_id, text=f"⚠️ BestBox API Error: {resp.status}")
+        payload = {
+            "messages": [
+                {"role": "user", "content": text}
+            ],
+            "model": "bestbox-agent",
+            # Use chat_id as session_id to maintain context per chat
+            "thread_id": f"telegram-{chat_id}"
+        }
+
+        headers = {
+            "Content-Type": "application/json",
+            "x-user-id": f"telegram:{user_id}"
+        }
+
+        response_text = await stream_reply(get_http_session(), AGENT_API_URL, payload, headers, reply)
+
+        # Final answer replaces the draft; overflow goes to follow-up messages
+        parts = split_message(response_text or "(no response)", TELEGRAM_MAX_CHARS)
+        await reply.finish(parts[0])
+        for part in parts[1:]:
+            await context.bot.send_message(chat_id=chat_id, text=part)
+
+    except AgentAPIError as e:
+        logger.error(str(e))
+        await reply.finish(f"⚠️ BestBox API Error: {e.status}")
 
     except Exception as e:
         logger.error(f"Error processing message: {e}")
-        await context.bot.send_message(chat_id=chat_id, text=f"⚠️ Internal Error: {str(e)}")
+        await reply.finish(f"⚠️ Internal Error: {str(e)}")
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await context.bot.send_message(chat_id=update.effective_chat.id, text="Hello! I'm BestBox Agent. How can I help you?")
@@ -75,7 +98,18 @@ def main():
         logger.error("Cannot start Telegram Gateway without TELEGRAM_BOT_TOKEN")
         return
 
-    application = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+    async def on_shutdown(application):
+        await close_http_session()
+
+    # Updates from different chats are handled concurrently; chat_queues
+    # keeps each chat's own messages in order
+    application = (
+        ApplicationBuilder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
     
     start_handler = CommandHandler('start', start)
     message_handler = MessageHandler(filters.TEXT & (~filters.COMMAND), handle_message)
@@ -411,13 +411,13 @@ class TroubleshootingDataSync:
         Returns:
             Dict with backfill statistics
         """
-        from qdrant_client import QdrantClient
+        from services.qdrant_clients import get_qdrant_client
 
         logger.info("🔄 Starting backfill from Qdrant to PostgreSQL...")
 
         stats = {"cases_synced": 0, "issues_synced": 0, "errors": []}
 
-        qdrant = QdrantClient(host="localhost", port=6333)
+        qdrant = get_qdrant_client()
 
         # Backfill cases
         logger.info("   Backfilling cases...")
@@ -1,11 +1,13 @@
 """Evaluation suite for troubleshooting text-to-SQL."""
 
 from .test_cases import TEST_CASES, get_test_cases_by_category, get_all_test_cases
-from .run_evals import Evaluator
+from .run_evals import Evaluator, compare_to_baseline, summarize_timings
 
 __all__ = [
     "TEST_CASES",
     "get_test_cases_by_category",
     "get_all_test_cases",
     "Evaluator",
+    "compare_to_baseline",
+    "summarize_timings",
 ]
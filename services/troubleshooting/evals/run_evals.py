@@ -2,19 +2,28 @@
 """
 Run Evaluations for Troubleshooting Text-to-SQL
 
-Evaluates the text-to-SQL system against test cases.
+Evaluates the text-to-SQL system against test cases. Cases run concurrently
+(--workers); each records per-stage timings (expansion, intent, context, llm,
+validation, execution) and its LLM calls and tokens. With --baseline the run
+is compared against a stored report: a lower pass rate, or stage latency or
+tokens per case beyond --tolerance, counts as a regression.
 
 Usage:
     python -m services.troubleshooting.evals.run_evals
     python -m services.troubleshooting.evals.run_evals --category counting
     python -m services.troubleshooting.evals.run_evals --verbose
+    python -m services.troubleshooting.evals.run_evals --workers 8 --output evals.json
+    python -m services.troubleshooting.evals.run_evals --baseline evals_baseline.json --tolerance 0.2
 """
 
 import argparse
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime
 
@@ -29,22 +38,32 @@ from services.troubleshooting.evals.test_cases import (
 from services.troubleshooting.query_expander import QueryExpander
 from services.troubleshooting.text_to_sql import TextToSQLGenerator
 from services.troubleshooting.hybrid_searcher import HybridSearcher
+from services.troubleshooting.llm_usage import LLMUsage, track_llm_usage
 
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", "4"))
+EVAL_STAGES = ("expansion", "intent", "context", "llm", "validation", "execution")
+# Allowed relative slowdown (and token growth) against the baseline
+EVAL_BASELINE_TOLERANCE = float(os.getenv("EVAL_BASELINE_TOLERANCE", "0.2"))
+# Absolute slack, so millisecond stages do not trip the relative check on noise
+BASELINE_MIN_DELTA_S = 0.01
+
 
 class Evaluator:
     """Evaluate text-to-SQL system against test cases."""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, workers: int = EVAL_WORKERS):
         """
         Initialize evaluator.
 
         Args:
             verbose: Print detailed output
+            workers: Test cases evaluated concurrently
         """
         self.verbose = verbose
+        self.workers = max(1, workers)
         self.expander = None
         self.generator = None
         self.searcher = None
@@ -92,13 +111,21 @@ class Evaluator:
             "passed": 0,
             "failed": 0,
             "skipped": 0,
+            "workers": self.workers,
             "by_category": {},
             "details": [],
         }
 
-        for tc in test_cases:
-            result = self._evaluate_test_case(tc, skip_execution)
+        # Cases are independent; each spends most of its time waiting on the LLM
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            details = list(executor.map(lambda tc: self._evaluate_test_case(tc, skip_execution), test_cases))
+        results["wall_seconds"] = round(time.perf_counter() - start, 3)
+
+        for tc, result in zip(test_cases, details):
             results["details"].append(result)
+            if self.verbose:
+                self._print_result(result)
 
             # Update counters
             if result["status"] == "PASS":
@@ -116,6 +143,16 @@ class Evaluator:
             if result["status"] == "PASS":
                 results["by_category"][cat]["passed"] += 1
 
+        results["timings"] = summarize_timings(details)
+        llm = LLMUsage()
+        for result in details:
+            for key in ("calls", "prompt_tokens", "completion_tokens", "seconds"):
+                setattr(llm, key, getattr(llm, key) + result["llm"][key])
+        results["llm"] = {
+            **llm.to_dict(),
+            "tokens_per_case": round(llm.total_tokens / len(details), 1) if details else 0,
+        }
+
         return results
 
     def _evaluate_test_case(
@@ -131,11 +168,29 @@ class Evaluator:
             "status": "PASS",
             "checks": [],
         }
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
 
+        with track_llm_usage() as usage:
+            self._run_checks(tc, result, timings, skip_execution)
+
+        result["timings"] = {stage: round(timings[stage], 4) for stage in EVAL_STAGES if stage in timings}
+        result["total_seconds"] = round(time.perf_counter() - start, 4)
+        result["llm"] = usage.to_dict()
+        return result
+
+    def _run_checks(
+        self,
+        tc: Dict,
+        result: Dict,
+        timings: Dict[str, float],
+        skip_execution: bool,
+    ) -> None:
+        """Run a test case's checks, recording results and stage timings in place."""
         try:
             # Check 1: Intent classification
             if self.expander:
-                expansion = self.expander.expand(tc["question"])
+                expansion = self.expander.expand(tc["question"], timings=timings)
                 intent_result = self._check_intent(tc, expansion)
                 result["checks"].append(intent_result)
                 result["expansion"] = expansion
@@ -155,6 +210,7 @@ class Evaluator:
                 sql_result = self.generator.generate(
                     tc["question"],
                     expanded_query=expansion.get("expanded") if self.expander else None,
+                    timings=timings,
                 )
                 result["generated_sql"] = sql_result.get("sql")
 
@@ -165,7 +221,9 @@ class Evaluator:
 
                 # Check 4: SQL execution (if not skipped)
                 if not skip_execution and sql_result.get("valid") and sql_result.get("sql"):
+                    exec_start = time.perf_counter()
                     exec_result = self.generator.execute(sql_result["sql"])
+                    timings["execution"] = time.perf_counter() - exec_start
                     result["execution_result"] = exec_result
 
                     if exec_result.get("error"):
@@ -180,11 +238,6 @@ class Evaluator:
             result["status"] = "SKIP"
             result["error"] = str(e)
 
-        if self.verbose:
-            self._print_result(result)
-
-        return result
-
     def _check_intent(self, tc: Dict, expansion: Dict) -> Dict:
         """Check if intent was classified correctly."""
         expected = tc.get("expected_intent")
@@ -260,6 +313,104 @@ class Evaluator:
         print()
 
 
+def _percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile (q in 0-100) of a non-empty list."""
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize_timings(details: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """
+    Per-stage latency summary over evaluated cases.
+
+    Args:
+        details: Per-case results carrying ``timings`` and ``total_seconds``
+
+    Returns:
+        {stage: {count, mean, p50, p95, total}}, plus "case" for whole cases
+    """
+    samples: Dict[str, List[float]] = {}
+    for result in details:
+        for stage, seconds in result.get("timings", {}).items():
+            samples.setdefault(stage, []).append(seconds)
+        if "total_seconds" in result:
+            samples.setdefault("case", []).append(result["total_seconds"])
+
+    summary = {}
+    for stage in (*EVAL_STAGES, "case"):
+        values = samples.get(stage)
+        if not values:
+            continue
+        summary[stage] = {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 4),
+            "p50": round(_percentile(values, 50), 4),
+            "p95": round(_percentile(values, 95), 4),
+            "total": round(sum(values), 4),
+        }
+    return summary
+
+
+def compare_to_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = EVAL_BASELINE_TOLERANCE,
+) -> Dict[str, Any]:
+    """
+    Compare an evaluation run against a stored baseline report.
+
+    A stage regresses when its p50 or p95 exceeds the baseline by more than
+    ``tolerance`` (relative) and BASELINE_MIN_DELTA_S (absolute). Tokens per
+    case use the same relative tolerance; any pass-rate drop is a regression.
+
+    Args:
+        results: Report from Evaluator.evaluate
+        baseline: Earlier report to compare against
+        tolerance: Allowed relative increase, e.g. 0.2 for +20%
+
+    Returns:
+        Dict with regressions (messages), newly_failing case IDs and ok
+    """
+    regressions = []
+
+    def rate(report: Dict) -> float:
+        return report["passed"] / report["total"] if report.get("total") else 0.0
+
+    if rate(results) < rate(baseline):
+        regressions.append(f"pass rate {rate(results):.1%} < baseline {rate(baseline):.1%}")
+
+    baseline_status = {d["id"]: d["status"] for d in baseline.get("details", [])}
+    newly_failing = [
+        d["id"] for d in results.get("details", [])
+        if baseline_status.get(d["id"]) == "PASS" and d["status"] != "PASS"
+    ]
+
+    base_timings = baseline.get("timings", {})
+    for stage, stats in results.get("timings", {}).items():
+        base = base_timings.get(stage)
+        if not base:
+            continue
+        for key in ("p50", "p95"):
+            current, previous = stats[key], base[key]
+            if current > previous * (1 + tolerance) and current - previous > BASELINE_MIN_DELTA_S:
+                regressions.append(f"{stage} {key} {current * 1000:.0f}ms > baseline {previous * 1000:.0f}ms")
+
+    current_tokens = results.get("llm", {}).get("tokens_per_case", 0)
+    previous_tokens = baseline.get("llm", {}).get("tokens_per_case", 0)
+    if previous_tokens and current_tokens > previous_tokens * (1 + tolerance):
+        regressions.append(f"tokens/case {current_tokens:.0f} > baseline {previous_tokens:.0f}")
+
+    return {
+        "tolerance": tolerance,
+        "regressions": regressions,
+        "newly_failing": newly_failing,
+        "ok": not regressions,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run text-to-SQL evaluations"
@@ -284,6 +435,28 @@ def main():
         type=str,
         help="Output results to JSON file",
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=EVAL_WORKERS,
+        help=f"Test cases evaluated concurrently (default: {EVAL_WORKERS})",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Baseline results JSON to compare against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=EVAL_BASELINE_TOLERANCE,
+        help=f"Allowed relative latency/token increase over the baseline (default: {EVAL_BASELINE_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run's results to --baseline instead of comparing",
+    )
     args = parser.parse_args()
 
     print("=" * 70)
@@ -301,7 +474,7 @@ def main():
     print()
 
     # Run evaluation
-    evaluator = Evaluator(verbose=args.verbose)
+    evaluator = Evaluator(verbose=args.verbose, workers=args.workers)
     results = evaluator.evaluate(test_cases, skip_execution=args.skip_execution)
 
     # Print summary
@@ -321,14 +494,42 @@ def main():
         print(f"  {cat}: {stats['passed']}/{stats['total']} ({rate:.1f}%)")
     print()
 
+    print(f"Latency ({results['workers']} workers, {results['wall_seconds']:.1f}s wall):")
+    for stage, stats in results["timings"].items():
+        print(f"  {stage:<11} p50 {stats['p50'] * 1000:7.0f}ms  p95 {stats['p95'] * 1000:7.0f}ms  (n={stats['count']})")
+    llm = results["llm"]
+    print(f"LLM: {llm['calls']} calls, {llm['total_tokens']} tokens "
+          f"({llm['prompt_tokens']} prompt + {llm['completion_tokens']} completion), "
+          f"{llm['tokens_per_case']} tokens/case")
+    print()
+
+    comparison: Optional[Dict[str, Any]] = None
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Baseline updated: {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare_to_baseline(results, json.load(f), args.tolerance)
+        results["baseline"] = {"path": args.baseline, **comparison}
+        print(f"Baseline ({args.baseline}, tolerance {args.tolerance:.0%}):")
+        for message in comparison["regressions"]:
+            print(f"  REGRESSION: {message}")
+        if comparison["newly_failing"]:
+            print(f"  Newly failing: {', '.join(comparison['newly_failing'])}")
+        if comparison["ok"]:
+            print("  No regressions")
+        print()
+
     # Save results if requested
     if args.output:
         with open(args.output, "w") as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         print(f"Results saved to: {args.output}")
 
-    # Exit with error code if any failures
-    sys.exit(0 if results["failed"] == 0 else 1)
+    # Exit with error code if any failures or baseline regressions
+    ok = results["failed"] == 0 and (comparison is None or comparison["ok"])
+    sys.exit(0 if ok else 1)
 
 
 if __name__ == "__main__":
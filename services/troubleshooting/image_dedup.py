@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Image Dedup Index for VLM Enrichment
+
+Remembers the VLM analysis of every processed troubleshooting image under
+two keys:
+
+- sha256 of the file bytes: re-uploads of a workbook produce byte-identical
+  images under new timestamp-prefixed image IDs
+- 64-bit DCT perceptual hash: the same photo pasted into several issues or
+  trial versions is re-encoded/resized by Excel, so only its pHash matches
+
+VLProcessor looks images up here before submitting VLM jobs and reuses the
+stored analysis for exact duplicates and for near-duplicates within
+VLM_DEDUP_PHASH_DISTANCE bits. The index is a SQLite file next to the
+processed data (VLM_DEDUP_DB).
+
+Usage:
+    from services.troubleshooting.image_dedup import ImageAnalysisIndex, hash_image
+
+    index = ImageAnalysisIndex()
+    sha, phash = hash_image(path)
+    match = index.lookup(sha, phash)
+    if match is None:
+        index.store(sha, phash, image_id, analysis, vlm_seconds)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+VLM_DEDUP_ENABLED = os.getenv("VLM_DEDUP_ENABLED", "true").lower() == "true"
+VLM_DEDUP_DB = os.getenv("VLM_DEDUP_DB", "data/troubleshooting/processed/vlm_image_index.sqlite")
+# 64-bit pHash; a handful of bits absorbs re-encoding and resizing without
+# merging different photos of the same part
+VLM_DEDUP_PHASH_DISTANCE = int(os.getenv("VLM_DEDUP_PHASH_DISTANCE", "4"))
+
+_HASH_SIZE = 8
+_DCT_SIZE = 32
+_n = np.arange(_DCT_SIZE)
+_DCT_MATRIX = np.cos(np.pi * (2 * _n[None, :] + 1) * _n[:, None] / (2 * _DCT_SIZE))
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def perceptual_hash(img: Image.Image) -> int:
+    """64-bit DCT perceptual hash (same construction as imagehash.phash)."""
+    pixels = np.asarray(
+        img.convert("L").resize((_DCT_SIZE, _DCT_SIZE), Image.Resampling.LANCZOS), dtype=np.float64
+    )
+    low = (_DCT_MATRIX @ pixels @ _DCT_MATRIX.T)[:_HASH_SIZE, :_HASH_SIZE].flatten()
+    bits = low > np.median(low)
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def hash_image(path: Path) -> Tuple[str, int]:
+    """(sha256 of the file bytes, perceptual hash) of an image file."""
+    data = Path(path).read_bytes()
+    with Image.open(path) as img:
+        phash = perceptual_hash(img)
+    return hashlib.sha256(data).hexdigest(), phash
+
+
+def hamming_distances(phashes: np.ndarray, phash: int) -> np.ndarray:
+    """Bit distance from ``phash`` to each entry of a uint64 array."""
+    xor = phashes ^ np.uint64(phash)
+    return _POPCOUNT8[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+@dataclass
+class AnalysisMatch:
+    """A stored analysis reused for a new image."""
+
+    image_id: str  # image the analysis was made for
+    analysis: Dict
+    vlm_seconds: float  # what that VLM job took
+    exact: bool
+    distance: int
+
+
+class ImageAnalysisIndex:
+    """SQLite-backed exact-hash and pHash index of VLM image analyses."""
+
+    def __init__(self, db_path: str = VLM_DEDUP_DB, max_distance: int = VLM_DEDUP_PHASH_DISTANCE):
+        self.db_path = Path(db_path)
+        self.max_distance = max_distance
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS image_analyses (
+                sha256 TEXT PRIMARY KEY,
+                phash INTEGER NOT NULL,
+                image_id TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                vlm_seconds REAL NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        # pHashes are scanned in memory; SQLite INTEGER is signed 64-bit
+        rows = self._conn.execute("SELECT sha256, phash FROM image_analyses").fetchall()
+        self._shas = [sha for sha, _ in rows]
+        self._phashes = np.array([phash for _, phash in rows], dtype=np.int64).view(np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._shas)
+
+    def lookup(self, sha256: str, phash: int) -> Optional[AnalysisMatch]:
+        """Stored analysis of an identical or near-identical image, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT image_id, analysis, vlm_seconds FROM image_analyses WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            if row:
+                return AnalysisMatch(row[0], json.loads(row[1]), row[2], exact=True, distance=0)
+
+            if not self._shas or self.max_distance <= 0:
+                return None
+            distances = hamming_distances(self._phashes, phash)
+            best = int(np.argmin(distances))
+            if distances[best] > self.max_distance:
+                return None
+            row = self._conn.execute(
+                "SELECT image_id, analysis, vlm_seconds FROM image_analyses WHERE sha256 = ?",
+                (self._shas[best],),
+            ).fetchone()
+            return AnalysisMatch(row[0], json.loads(row[1]), row[2], exact=False, distance=int(distances[best]))
+
+    def store(self, sha256: str, phash: int, image_id: str, analysis: Dict, vlm_seconds: float) -> None:
+        """Record the VLM analysis of an image."""
+        signed = int(np.array([phash], dtype=np.uint64).view(np.int64)[0])
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO image_analyses (sha256, phash, image_id, analysis, vlm_seconds)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (sha256, signed, image_id, json.dumps(analysis, ensure_ascii=False), vlm_seconds),
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                self._shas.append(sha256)
+                self._phashes = np.append(self._phashes, np.uint64(phash))
+
+    def close(self) -> None:
+        self._conn.close()
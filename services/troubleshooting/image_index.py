@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Troubleshooting Image Index
+
+Visual-similarity search over extracted case images, without a VLM
+round-trip. Each case image is embedded with the embeddings service's
+vision encoder (/embed_image, CPU-friendly CLIP by default) at ingest time
+and stored in the troubleshooting_images collection with its issue_id.
+"Similar defects" for an uploaded photo is then one image embedding plus a
+kNN query grouped by issue.
+
+Usage:
+    from services.troubleshooting.image_index import TroubleshootingImageIndex
+
+    index = TroubleshootingImageIndex()
+    index.index_case_images(case_id, [(issue_id, issue_number, images), ...])
+    groups = index.search_file("/path/to/photo.jpg", top_k=5)
+"""
+
+import base64
+import io
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from PIL import Image
+from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchValue, PointStruct
+
+from services.qdrant_clients import get_qdrant_client
+from services.qdrant_profiles import collection_params, payload_indexes, search_params, vector_params
+
+logger = logging.getLogger(__name__)
+
+TROUBLESHOOTING_IMAGE_COLLECTION = "troubleshooting_images"
+TROUBLESHOOTING_IMAGE_INDEX = os.getenv("TROUBLESHOOTING_IMAGE_INDEX", "true").lower() == "true"
+IMAGE_EMBED_BATCH = int(os.getenv("IMAGE_EMBED_BATCH", "16"))
+# The encoder works at 224-384px; downscaling client-side keeps requests small
+IMAGE_EMBED_MAX_SIDE = int(os.getenv("IMAGE_EMBED_MAX_SIDE", "448"))
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".gif", ".tif", ".tiff"}
+PROCESSED_IMAGES_DIR = Path(__file__).parent.parent.parent / "data" / "troubleshooting" / "processed" / "images"
+
+IssueImages = Tuple[str, object, List[Dict]]  # (issue_id, issue_number, images)
+
+
+def encode_image_file(path: Path, max_side: int = IMAGE_EMBED_MAX_SIDE) -> str:
+    """Downscaled JPEG of an image file, base64-encoded for /embed_image."""
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+        img.thumbnail((max_side, max_side))
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=90)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def resolve_image_path(image: Dict) -> Optional[Path]:
+    """Local file for an extracted image entry (its file_path, else the processed images dir)."""
+    candidates = []
+    if image.get("file_path"):
+        candidates.append(Path(image["file_path"]))
+    if image.get("image_id"):
+        candidates.append(PROCESSED_IMAGES_DIR / f"{image['image_id']}.jpg")
+    for path in candidates:
+        if path.is_file():
+            return path
+    return None
+
+
+class ImageEmbeddingClient:
+    """Client for the embeddings service's /embed_image endpoint."""
+
+    def __init__(self, embeddings_url: str = "", timeout: float = 60.0):
+        if not embeddings_url:
+            embeddings_url = os.getenv(
+                "EMBEDDINGS_URL",
+                os.getenv("EMBEDDINGS_BASE_URL", "http://localhost:8004"),
+            )
+        if embeddings_url.endswith("/v1"):
+            embeddings_url = embeddings_url[:-3]
+        self.embeddings_url = embeddings_url
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def embed_encoded(self, images: List[str]) -> List[List[float]]:
+        """Embed base64-encoded images (normalized vectors)."""
+        response = self._session.post(
+            f"{self.embeddings_url}/embed_image",
+            json={"images": images},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+    def embed_files(self, paths: Sequence[Path]) -> List[List[float]]:
+        """Embed image files in batches of IMAGE_EMBED_BATCH."""
+        vectors: List[List[float]] = []
+        for lo in range(0, len(paths), IMAGE_EMBED_BATCH):
+            batch = [encode_image_file(p) for p in paths[lo:lo + IMAGE_EMBED_BATCH]]
+            vectors.extend(self.embed_encoded(batch))
+        return vectors
+
+
+class TroubleshootingImageIndex:
+    """Image-embedding collection linked to troubleshooting issues."""
+
+    def __init__(
+        self,
+        qdrant_client=None,
+        embedder: Optional[ImageEmbeddingClient] = None,
+        collection: str = TROUBLESHOOTING_IMAGE_COLLECTION,
+    ):
+        self.client = qdrant_client or get_qdrant_client()
+        self.embedder = embedder or ImageEmbeddingClient()
+        self.collection = collection
+        self._collection_ready = False
+
+    def _ensure_collection(self, vector_size: int) -> None:
+        """Create the collection on first write (its size comes from the encoder)."""
+        if self._collection_ready:
+            return
+        if not self.client.collection_exists(self.collection):
+            logger.info(f"Creating collection '{self.collection}' ({vector_size}-dim)...")
+            self.client.create_collection(
+                collection_name=self.collection,
+                vectors_config=vector_params(vector_size),
+                **collection_params()
+            )
+            for field, schema in payload_indexes(self.collection):
+                self.client.create_payload_index(self.collection, field, schema)
+        self._collection_ready = True
+
+    def index_case_images(self, case_id: str, issues: List[IssueImages]) -> int:
+        """
+        Embed and upsert every image of a case's issues.
+
+        Point IDs derive from image_id, so re-indexing a case overwrites its
+        images instead of duplicating them.
+
+        Args:
+            case_id: Case the issues belong to
+            issues: (issue_id, issue_number, images) per issue
+
+        Returns:
+            Number of images indexed
+        """
+        entries = []
+        for issue_id, issue_number, images in issues:
+            for image in images:
+                path = resolve_image_path(image)
+                if path is None:
+                    logger.debug(f"   Image file missing for {image.get('image_id')}, skipping")
+                    continue
+                entries.append((issue_id, issue_number, image, path))
+        if not entries:
+            return 0
+
+        vectors = self.embedder.embed_files([path for _, _, _, path in entries])
+        self._ensure_collection(len(vectors[0]))
+
+        points = [
+            PointStruct(
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"troubleshooting-image:{image['image_id']}")),
+                vector=vector,
+                payload={
+                    "image_id": image["image_id"],
+                    "issue_id": issue_id,
+                    "case_id": case_id,
+                    "issue_number": issue_number,
+                    "defect_type": image.get("defect_type") or "",
+                    "vl_description": image.get("vl_description") or "",
+                    "file_path": str(path),
+                },
+            )
+            for (issue_id, issue_number, image, path), vector in zip(entries, vectors)
+        ]
+        self.client.upsert(collection_name=self.collection, points=points)
+        return len(points)
+
+    def delete_case(self, case_id: str) -> None:
+        """Remove all images of a case."""
+        if not self.client.collection_exists(self.collection):
+            return
+        self.client.delete(
+            collection_name=self.collection,
+            points_selector=FilterSelector(
+                filter=Filter(must=[FieldCondition(key="case_id", match=MatchValue(value=case_id))])
+            ),
+        )
+
+    def search(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        images_per_issue: int = 1,
+        query_filter: Optional[Filter] = None,
+    ) -> List[Dict]:
+        """
+        kNN over case images, grouped so each issue appears once.
+
+        Args:
+            vector: Image embedding to match
+            top_k: Number of issues to return
+            images_per_issue: Matching images to return per issue
+            query_filter: Optional payload filter (e.g. by case_id)
+
+        Returns:
+            Best-first list of {"issue_id", "case_id", "score", "images"}
+        """
+        result = self.client.query_points_groups(
+            collection_name=self.collection,
+            query=vector,
+            group_by="issue_id",
+            limit=top_k,
+            group_size=images_per_issue,
+            query_filter=query_filter,
+            search_params=search_params(),
+            with_payload=True,
+        )
+        return [
+            {
+                "issue_id": group.id,
+                "case_id": group.hits[0].payload.get("case_id"),
+                "score": group.hits[0].score,
+                "images": [hit.payload for hit in group.hits],
+            }
+            for group in result.groups
+        ]
+
+    def search_file(self, path: Path, top_k: int = 5, images_per_issue: int = 1, **kwargs) -> List[Dict]:
+        """Embed an image file and return its most similar issues (see search)."""
+        vector = self.embedder.embed_files([Path(path)])[0]
+        return self.search(vector, top_k=top_k, images_per_issue=images_per_issue, **kwargs)
@@ -6,6 +6,9 @@ Creates and manages dual-level Qdrant collections:
 - troubleshooting_cases: Case-level search
 - troubleshooting_issues: Issue-level search
 
+plus troubleshooting_images (one image embedding per extracted case image,
+see image_index.py) unless TROUBLESHOOTING_IMAGE_INDEX=false.
+
 Usage:
     from services.troubleshooting.indexer import TroubleshootingIndexer
 
@@ -22,9 +25,10 @@ if __name__ == "__main__":
     project_root = Path(__file__).parent.parent.parent
     sys.path.insert(0, str(project_root))
 
-from qdrant_client import QdrantClient
+from services.qdrant_clients import get_qdrant_client
+from services.qdrant_profiles import collection_params, payload_indexes, vector_params
 from qdrant_client.models import (
-    Distance, VectorParams, PointStruct,
+    Distance, PointStruct,
     Filter, FilterSelector, FieldCondition, MatchValue
 )
 import uuid
@@ -32,6 +36,12 @@ from typing import Dict, List
 import logging
 
 from services.troubleshooting.embedder import TroubleshootingEmbedder
+from services.troubleshooting.image_index import (
+    TROUBLESHOOTING_IMAGE_COLLECTION,
+    TROUBLESHOOTING_IMAGE_INDEX,
+    ImageEmbeddingClient,
+    TroubleshootingImageIndex,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,8 +67,12 @@ class TroubleshootingIndexer:
             qdrant_port: Qdrant server port
             embeddings_url: Embeddings service URL
         """
-        self.client = QdrantClient(host=qdrant_host, port=qdrant_port)
+        self.client = get_qdrant_client(qdrant_host, qdrant_port)
         self.embedder = TroubleshootingEmbedder(embeddings_url=embeddings_url)
+        self.image_index = (
+            TroubleshootingImageIndex(self.client, ImageEmbeddingClient(embeddings_url))
+            if TROUBLESHOOTING_IMAGE_INDEX else None
+        )
 
         logger.info(f"Indexer initialized: Qdrant={qdrant_host}:{qdrant_port}")
 
@@ -89,11 +103,11 @@ class TroubleshootingIndexer:
                 logger.info(f"Creating collection '{collection_name}'...")
                 self.client.create_collection(
                     collection_name=collection_name,
-                    vectors_config=VectorParams(
-                        size=config["vector_size"],
-                        distance=config["distance"]
-                    )
+                    vectors_config=vector_params(config["vector_size"], config["distance"]),
+                    **collection_params()
                 )
+                for field, schema in payload_indexes(collection_name):
+                    self.client.create_payload_index(collection_name, field, schema)
                 logger.info(f"✅ Created '{collection_name}'")
 
     def index_case(self, case_data: Dict, force_reindex: bool = True) -> Dict[str, int]:
@@ -121,11 +135,15 @@ class TroubleshootingIndexer:
         # Level 2: Issue-level indexing
         issue_point_ids = self._index_issue_level(case_data)
 
-        logger.info(f"   ✅ Indexed: 1 case + {len(issue_point_ids)} issues")
+        # Image embeddings for visual similarity search
+        image_points = self._index_images(case_data)
+
+        logger.info(f"   ✅ Indexed: 1 case + {len(issue_point_ids)} issues + {image_points} images")
 
         return {
             "case_points": 1,
             "issue_points": len(issue_point_ids),
+            "image_points": image_points,
             "case_point_id": case_point_id,
             "issue_point_ids": issue_point_ids
         }
@@ -200,7 +218,7 @@ class TroubleshootingIndexer:
             # Create unique issue_id using case_id + issue_number + excel_row
             # This handles cases where the same issue_number appears multiple times
             # in different rows of the same Excel file
-            issue_id = f"{case_data['case_id']}-{issue['issue_number']}-{issue['excel_row']}"
+            issue_id = self._issue_id(case_data, issue)
 
             payload = {
                 "issue_id": issue_id,
@@ -253,6 +271,29 @@ class TroubleshootingIndexer:
 
         return point_ids
 
+    @staticmethod
+    def _issue_id(case_data: Dict, issue: Dict) -> str:
+        # case_id + issue_number + excel_row: the same issue_number can appear
+        # in several rows of one Excel file
+        return f"{case_data['case_id']}-{issue['issue_number']}-{issue['excel_row']}"
+
+    def _index_images(self, case_data: Dict) -> int:
+        """Embed the case's extracted images; failures don't fail the case."""
+        if not self.image_index:
+            return 0
+        issues = [
+            (self._issue_id(case_data, issue), issue['issue_number'], issue.get('images', []))
+            for issue in case_data['issues']
+            if issue.get('images')
+        ]
+        if not issues:
+            return 0
+        try:
+            return self.image_index.index_case_images(case_data['case_id'], issues)
+        except Exception as e:
+            logger.warning(f"   ⚠️  Image embedding skipped for {case_data['case_id']}: {e}")
+            return 0
+
     def _generate_case_summary(self, case_data: Dict) -> str:
         """Generate text summary for case-level search"""
 
@@ -351,6 +392,9 @@ class TroubleshootingIndexer:
             points_selector=selector,
         )
 
+        if self.image_index:
+            self.image_index.delete_case(case_id)
+
         logger.info(f"   ✅ Deleted case {case_id}")
 
     def get_collection_stats(self) -> Dict:
@@ -358,7 +402,7 @@ class TroubleshootingIndexer:
 
         stats = {}
 
-        for collection_name in ["troubleshooting_cases", "troubleshooting_issues"]:
+        for collection_name in ["troubleshooting_cases", "troubleshooting_issues", TROUBLESHOOTING_IMAGE_COLLECTION]:
             try:
                 info = self.client.get_collection(collection_name)
                 stats[collection_name] = {
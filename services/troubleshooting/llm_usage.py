@@ -0,0 +1,68 @@
+"""
+LLM call accounting for the troubleshooting pipeline.
+
+The query expander, Text-to-SQL generator and searcher call the LLM
+directly over HTTP. Each call reports its latency and token usage here, and
+``track_llm_usage()`` collects them for the current task (thread or asyncio
+task), so concurrent evaluations or requests are accounted separately:
+
+    with track_llm_usage() as usage:
+        generator.generate("有多少个披锋问题")
+    usage.calls, usage.total_tokens, usage.seconds
+"""
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional
+
+
+@dataclass
+class LLMUsage:
+    """LLM calls, tokens and wall time spent waiting on them."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "total_tokens": self.total_tokens, "seconds": round(self.seconds, 4)}
+
+
+_current: contextvars.ContextVar[Optional[LLMUsage]] = contextvars.ContextVar(
+    "troubleshooting_llm_usage", default=None
+)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[LLMUsage]:
+    """Collect the LLM calls made in this context."""
+    usage = LLMUsage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+def record_llm_call(response: Optional[Dict[str, Any]], seconds: float) -> None:
+    """
+    Account one chat completion against the current tracker (no-op outside one).
+
+    Args:
+        response: Parsed completion body (its ``usage`` block, if any, is read)
+        seconds: Request latency
+    """
+    usage = _current.get()
+    if usage is None:
+        return
+    tokens = (response or {}).get("usage") or {}
+    usage.calls += 1
+    usage.prompt_tokens += int(tokens.get("prompt_tokens") or 0)
+    usage.completion_tokens += int(tokens.get("completion_tokens") or 0)
+    usage.seconds += seconds
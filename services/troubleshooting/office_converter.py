@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Office Conversion Pool
+
+Long-lived headless LibreOffice workers for Excel -> PDF conversion, so page
+rendering no longer pays office startup (and first-run profile creation) for
+every workbook.
+
+Each worker owns a user profile directory under OFFICE_PROFILE_DIR and, when
+unoserver is installed, a persistent ``unoserver`` daemon on its own port
+pair; conversions are sent to it over XML-RPC. Without unoserver a worker
+falls back to one ``soffice --convert-to`` call per workbook, but still with
+its own already-initialized profile, which keeps the profile warm and lets
+OFFICE_POOL_SIZE conversions run side by side (instances sharing the default
+profile block each other).
+
+Requests queue for a free worker. A worker whose daemon has exited is
+restarted before it is handed out, and a failed conversion restarts the
+worker and is retried once.
+
+Usage:
+    from services.troubleshooting.office_converter import get_office_pool
+
+    pdf_path = get_office_pool().convert(excel_path, pdf_dir)
+"""
+
+import atexit
+import logging
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from unoserver.client import UnoClient
+    UNOSERVER_AVAILABLE = True
+except ImportError:
+    UNOSERVER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+OFFICE_POOL_ENABLED = os.getenv("OFFICE_POOL_ENABLED", "true").lower() == "true"
+OFFICE_POOL_SIZE = int(os.getenv("OFFICE_POOL_SIZE", "2"))
+OFFICE_BASE_PORT = int(os.getenv("OFFICE_BASE_PORT", "2003"))
+OFFICE_PROFILE_DIR = os.getenv("OFFICE_PROFILE_DIR", "/tmp/office_pool")
+OFFICE_START_TIMEOUT_S = float(os.getenv("OFFICE_START_TIMEOUT_S", "60"))
+OFFICE_CONVERT_TIMEOUT_S = float(os.getenv("OFFICE_CONVERT_TIMEOUT_S", "180"))
+OFFICE_QUEUE_TIMEOUT_S = float(os.getenv("OFFICE_QUEUE_TIMEOUT_S", "600"))
+UNOSERVER_PATH = os.getenv("UNOSERVER_PATH", "unoserver")
+
+
+def resolve_libreoffice(preferred: Optional[str] = None) -> Optional[str]:
+    """Resolve the LibreOffice executable (preferred path, then libreoffice/soffice on PATH)."""
+    preferred = preferred or os.getenv("LIBREOFFICE_PATH", "libreoffice")
+    if preferred and shutil.which(preferred):
+        return preferred
+    for candidate in ("libreoffice", "soffice"):
+        found = shutil.which(candidate)
+        if found:
+            return found
+    return None
+
+
+def _port_open(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.5)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+class OfficeWorker:
+    """One headless office instance with a dedicated profile."""
+
+    def __init__(self, index: int, libreoffice_path: Optional[str] = None) -> None:
+        self.index = index
+        self.port = OFFICE_BASE_PORT + 2 * index
+        self.uno_port = self.port + 1
+        self.profile_dir = Path(OFFICE_PROFILE_DIR) / f"worker_{index}"
+        self.libreoffice_path = libreoffice_path
+        self.use_daemon = UNOSERVER_AVAILABLE and shutil.which(UNOSERVER_PATH) is not None
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def profile_uri(self) -> str:
+        return self.profile_dir.resolve().as_uri()
+
+    def start(self) -> None:
+        """Start the unoserver daemon (no-op in per-call mode)."""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if not self.use_daemon:
+            return
+
+        command = [
+            UNOSERVER_PATH,
+            "--interface", "127.0.0.1",
+            "--port", str(self.port),
+            "--uno-port", str(self.uno_port),
+            "--user-installation", self.profile_uri,
+        ]
+        libreoffice = resolve_libreoffice(self.libreoffice_path)
+        if libreoffice:
+            command += ["--executable", libreoffice]
+
+        logger.info(f"Starting office worker {self.index} on port {self.port}")
+        self._process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + OFFICE_START_TIMEOUT_S
+        while not _port_open(self.port):
+            if self._process.poll() is not None:
+                raise RuntimeError(f"Office worker {self.index} exited during startup")
+            if time.monotonic() > deadline:
+                self.stop()
+                raise TimeoutError(f"Office worker {self.index} did not start in {OFFICE_START_TIMEOUT_S:.0f}s")
+            time.sleep(0.2)
+
+    def alive(self) -> bool:
+        if not self.use_daemon:
+            return True
+        return self._process is not None and self._process.poll() is None
+
+    def stop(self) -> None:
+        if self._process is None:
+            return
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+
+    def convert(self, src: Path, pdf_path: Path) -> None:
+        """Convert ``src`` to PDF at ``pdf_path``."""
+        if self.use_daemon:
+            client = UnoClient(server="127.0.0.1", port=str(self.port))
+            client.convert(inpath=str(src), outpath=str(pdf_path), convert_to="pdf")
+            return
+
+        libreoffice = resolve_libreoffice(self.libreoffice_path)
+        if not libreoffice:
+            raise FileNotFoundError(
+                "LibreOffice not found. Install LibreOffice or set LIBREOFFICE_PATH to the executable."
+            )
+        command = [
+            libreoffice,
+            f"-env:UserInstallation={self.profile_uri}",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(pdf_path.parent),
+            str(src)
+        ]
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=OFFICE_CONVERT_TIMEOUT_S)
+        except subprocess.CalledProcessError as exc:
+            stderr = exc.stderr.decode("utf-8", errors="ignore") if exc.stderr else ""
+            raise RuntimeError(f"LibreOffice conversion failed: {stderr}") from exc
+        produced = pdf_path.parent / f"{Path(src).stem}.pdf"
+        if produced != pdf_path and produced.exists():
+            produced.replace(pdf_path)
+
+
+class OfficeConverterPool:
+    """Queue of OfficeWorkers shared by all renderers in the process."""
+
+    def __init__(
+        self,
+        size: int = OFFICE_POOL_SIZE,
+        libreoffice_path: Optional[str] = None,
+        worker_factory: Optional[Callable[[int], OfficeWorker]] = None,
+    ) -> None:
+        factory = worker_factory or (lambda index: OfficeWorker(index, libreoffice_path))
+        self.workers: List[OfficeWorker] = [factory(index) for index in range(max(1, size))]
+        self._idle: "queue.Queue[OfficeWorker]" = queue.Queue()
+        self._started = set()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {"conversions": 0, "failures": 0, "restarts": 0, "queue_wait_s": 0.0}
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    def convert(self, src: Path, out_dir: Path) -> Path:
+        """
+        Convert a workbook to PDF on the next free worker.
+
+        Args:
+            src: Workbook to convert
+            out_dir: Directory for the PDF (named after the workbook)
+
+        Returns:
+            Path of the PDF
+        """
+        src = Path(src)
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pdf_path = out_dir / f"{src.stem}.pdf"
+
+        waited = time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=OFFICE_QUEUE_TIMEOUT_S)
+        except queue.Empty:
+            raise TimeoutError(f"No office worker free after {OFFICE_QUEUE_TIMEOUT_S:.0f}s") from None
+        try:
+            with self._lock:
+                self.stats["queue_wait_s"] += time.perf_counter() - waited
+            self._ensure_running(worker)
+            try:
+                worker.convert(src, pdf_path)
+            except Exception as exc:
+                logger.warning(f"Office worker {worker.index} failed on {src.name} ({exc}); restarting and retrying")
+                with self._lock:
+                    self.stats["restarts"] += 1
+                worker.restart()
+                worker.convert(src, pdf_path)
+        except Exception:
+            with self._lock:
+                self.stats["failures"] += 1
+            raise
+        finally:
+            self._idle.put(worker)
+
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF not found after conversion: {pdf_path}")
+        with self._lock:
+            self.stats["conversions"] += 1
+        return pdf_path
+
+    def _ensure_running(self, worker: OfficeWorker) -> None:
+        """Start a worker on first use, restart it if its process died."""
+        if worker.index not in self._started:
+            worker.start()
+            self._started.add(worker.index)
+        elif not worker.alive():
+            logger.warning(f"Office worker {worker.index} exited; restarting")
+            with self._lock:
+                self.stats["restarts"] += 1
+            worker.restart()
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.stop()
+        self._started.clear()
+
+
+_pool_instance: Optional[OfficeConverterPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_office_pool() -> OfficeConverterPool:
+    """Get the process-wide office conversion pool."""
+    global _pool_instance
+    with _pool_lock:
+        if _pool_instance is None:
+            _pool_instance = OfficeConverterPool()
+            atexit.register(_pool_instance.close)
+    return _pool_instance
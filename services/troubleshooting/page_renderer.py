@@ -2,23 +2,32 @@
 """
 Page Renderer for troubleshooting Excel files.
 
-Converts Excel to PDF using LibreOffice headless and renders page images.
-Also builds page context mapping rows/images to pages based on Excel page breaks.
+Converts Excel to PDF using the shared headless LibreOffice pool and renders
+page images. Also builds page context mapping rows/images to pages based on
+Excel page breaks.
+
+Pages are rasterized by parallel pdftoppm calls (VLM_RENDER_WORKERS), each
+writing its PNG straight to disk, so no page is held in memory and each page
+is available as soon as it is produced (see iter_page_images).
 """
 
 import logging
 import os
-import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from openpyxl import load_workbook
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from .office_converter import OFFICE_POOL_ENABLED, OfficeConverterPool, get_office_pool, resolve_libreoffice
 
 logger = logging.getLogger(__name__)
 
+VLM_RENDER_WORKERS = int(os.getenv("VLM_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
 
 @dataclass
 class PageRenderResult:
@@ -38,13 +47,20 @@ class PageRenderer:
         output_dir: Path,
         dpi: Optional[int] = None,
         libreoffice_path: Optional[str] = None,
-        rows_per_page_fallback: Optional[int] = None
+        rows_per_page_fallback: Optional[int] = None,
+        office_pool: Optional[OfficeConverterPool] = None,
+        render_workers: Optional[int] = None,
+        use_office_pool: bool = OFFICE_POOL_ENABLED
     ) -> None:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.dpi = dpi or int(os.getenv("VLM_PAGE_RENDER_DPI", "150"))
         self.libreoffice_path = libreoffice_path or os.getenv("LIBREOFFICE_PATH", "libreoffice")
         self.rows_per_page_fallback = rows_per_page_fallback or int(os.getenv("VLM_ROWS_PER_PAGE", "50"))
+        self.office_pool = office_pool
+        if self.office_pool is None and use_office_pool:
+            self.office_pool = get_office_pool()
+        self.render_workers = max(1, render_workers or VLM_RENDER_WORKERS)
 
     def render(self, excel_path: Path, case_data: Dict) -> PageRenderResult:
         """
@@ -73,6 +89,10 @@ class PageRenderer:
         pdf_dir = self.output_dir / "pdf"
         pdf_dir.mkdir(parents=True, exist_ok=True)
 
+        if self.office_pool is not None:
+            logger.info("Rendering Excel to PDF via office pool")
+            return self.office_pool.convert(excel_path, pdf_dir)
+
         libreoffice = self._resolve_libreoffice()
         if not libreoffice:
             raise FileNotFoundError(
@@ -103,28 +123,51 @@ class PageRenderer:
 
     def _resolve_libreoffice(self) -> Optional[str]:
         """Resolve LibreOffice executable path."""
-        if self.libreoffice_path and shutil.which(self.libreoffice_path):
-            return self.libreoffice_path
-        for candidate in ("libreoffice", "soffice"):
-            found = shutil.which(candidate)
-            if found:
-                return found
-        return None
+        return resolve_libreoffice(self.libreoffice_path)
 
-    def _convert_pdf_to_images(self, pdf_path: Path) -> List[Path]:
-        """Convert PDF pages to PNG images."""
+    def iter_page_images(self, pdf_path: Path) -> Iterator[Tuple[int, Path]]:
+        """
+        Rasterize PDF pages in parallel, yielding each page as it is written.
+
+        Args:
+            pdf_path: PDF to rasterize
+
+        Yields:
+            (page_number, png_path) in completion order
+        """
         pages_dir = self.output_dir / "pages"
         pages_dir.mkdir(parents=True, exist_ok=True)
+        page_count = int(pdfinfo_from_path(str(pdf_path))["Pages"])
 
-        logger.info("Rendering PDF pages to images")
-        images = convert_from_path(str(pdf_path), dpi=self.dpi)
-        page_paths: List[Path] = []
-        for index, image in enumerate(images, start=1):
-            page_path = pages_dir / f"page_{index:02d}.png"
-            image.save(page_path, "PNG")
-            page_paths.append(page_path)
+        logger.info(f"Rendering {page_count} PDF pages to images ({self.render_workers} workers)")
+        with ThreadPoolExecutor(max_workers=min(self.render_workers, max(1, page_count))) as pool:
+            futures = {
+                pool.submit(self._render_page, pdf_path, pages_dir, page): page
+                for page in range(1, page_count + 1)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _render_page(self, pdf_path: Path, pages_dir: Path, page: int) -> Path:
+        """Render one page with pdftoppm directly to page_XX.png."""
+        name = f"page_{page:02d}"
+        convert_from_path(
+            str(pdf_path),
+            dpi=self.dpi,
+            first_page=page,
+            last_page=page,
+            output_folder=str(pages_dir),
+            output_file=name,
+            single_file=True,
+            fmt="png",
+            paths_only=True
+        )
+        return pages_dir / f"{name}.png"
 
-        return page_paths
+    def _convert_pdf_to_images(self, pdf_path: Path) -> List[Path]:
+        """Convert PDF pages to PNG images (ordered by page)."""
+        pages = dict(self.iter_page_images(pdf_path))
+        return [pages[page] for page in sorted(pages)]
 
     def _get_page_ranges(self, excel_path: Path) -> List[Tuple[int, int]]:
         """Determine row ranges per page based on Excel page breaks."""
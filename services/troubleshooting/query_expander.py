@@ -25,6 +25,8 @@ Usage:
 import os
 import sys
 import re
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Literal, Optional, Tuple
 import logging
@@ -37,6 +39,8 @@ if __name__ == "__main__":
 import psycopg2
 import requests
 
+from services.troubleshooting.llm_usage import record_llm_call
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -112,6 +116,7 @@ class QueryExpander:
         # Cache synonyms in memory for fast lookup
         self._synonym_cache: Dict[str, str] = {}
         self._cache_loaded = False
+        self._cache_lock = threading.Lock()
 
         logger.info("QueryExpander initialized")
 
@@ -124,47 +129,61 @@ class QueryExpander:
         if self._cache_loaded:
             return
 
-        try:
-            conn = self._get_pg_connection()
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT synonym, canonical_term, confidence
-                    FROM troubleshooting_synonyms
-                    ORDER BY confidence DESC
-                    """
-                )
-                for row in cur.fetchall():
-                    synonym, canonical, confidence = row
-                    # Only cache if not already present (higher confidence first)
-                    if synonym not in self._synonym_cache:
-                        self._synonym_cache[synonym] = canonical
-
-            conn.close()
-            self._cache_loaded = True
-            logger.info(f"Loaded {len(self._synonym_cache)} synonyms into cache")
-        except Exception as e:
-            logger.warning(f"Failed to load synonym cache: {e}")
-
-    def expand(self, query: str) -> Dict:
+        # Concurrent callers wait for one load; the cache is swapped in whole
+        with self._cache_lock:
+            if self._cache_loaded:
+                return
+            try:
+                conn = self._get_pg_connection()
+                cache: Dict[str, str] = {}
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT synonym, canonical_term, confidence
+                        FROM troubleshooting_synonyms
+                        ORDER BY confidence DESC
+                        """
+                    )
+                    for row in cur.fetchall():
+                        synonym, canonical, confidence = row
+                        # Only cache if not already present (higher confidence first)
+                        if synonym not in cache:
+                            cache[synonym] = canonical
+
+                conn.close()
+                self._synonym_cache = cache
+                self._cache_loaded = True
+                logger.info(f"Loaded {len(self._synonym_cache)} synonyms into cache")
+            except Exception as e:
+                logger.warning(f"Failed to load synonym cache: {e}")
+
+    def expand(self, query: str, timings: Optional[Dict[str, float]] = None) -> Dict:
         """
         Expand and classify a query.
 
         Args:
             query: Raw user query (possibly from ASR)
+            timings: If given, receives seconds spent in "expansion" and "intent"
 
         Returns:
             Dict with expansion results
         """
+        start = time.perf_counter()
+
         # Step 1: Clean ASR artifacts
         cleaned = self._clean_asr(query)
 
         # Step 2: Expand synonyms
         expanded, synonyms_used = self._expand_synonyms(cleaned)
+        expanded_at = time.perf_counter()
 
         # Step 3: Classify intent
         intent, confidence = self._classify_intent(expanded)
 
+        if timings is not None:
+            timings["expansion"] = expanded_at - start
+            timings["intent"] = time.perf_counter() - expanded_at
+
         return {
             "original": query,
             "cleaned": cleaned,
@@ -291,6 +310,7 @@ class QueryExpander:
 {{"intent": "STRUCTURED|SEMANTIC|HYBRID", "confidence": 0.0-1.0, "reasoning": "简短解释"}}"""
 
         try:
+            start = time.perf_counter()
             response = requests.post(
                 f"{self.llm_url}/v1/chat/completions",
                 json={
@@ -303,6 +323,7 @@ class QueryExpander:
             )
 
             result = response.json()
+            record_llm_call(result, time.perf_counter() - start)
             content = result["choices"][0]["message"]["content"]
 
             # Extract JSON from response
@@ -434,7 +455,7 @@ class QueryExpander:
     def refresh_cache(self):
         """Force refresh of synonym cache."""
         self._cache_loaded = False
-        self._synonym_cache.clear()
+        self._synonym_cache = {}
         self._load_synonym_cache()
 
 
@@ -24,15 +24,18 @@ if __name__ == "__main__":
     project_root = Path(__file__).parent.parent.parent
     sys.path.insert(0, str(project_root))
 
-from qdrant_client import QdrantClient
+from services.qdrant_clients import get_qdrant_client
+from services.qdrant_profiles import search_params
 from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny
 import requests
 from typing import List, Dict, Literal, Optional
 import json
 import logging
+import time
 
 from services.troubleshooting.embedder import TroubleshootingEmbedder
 from services.troubleshooting.cache import TroubleshootingCache
+from services.troubleshooting.llm_usage import record_llm_call
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -51,8 +54,8 @@ class TroubleshootingSearcher:
             os.getenv("EMBEDDINGS_BASE_URL", "http://localhost:8004"),
         ),
         reranker_url: str = os.getenv("RERANKER_URL", "http://172.23.0.3:8003"),
-        qdrant_host: str = "localhost",
-        qdrant_port: int = 6333,
+        qdrant_host: Optional[str] = None,
+        qdrant_port: Optional[int] = None,
         enable_cache: bool = True,
     ):
         """Initialize searcher with service URLs"""
@@ -71,7 +74,7 @@ class TroubleshootingSearcher:
         self.embeddings_url = embeddings_url
         self.reranker_url = reranker_url
 
-        self.qdrant = QdrantClient(host=qdrant_host, port=qdrant_port)
+        self.qdrant = get_qdrant_client(qdrant_host, qdrant_port)
         self.embedder = TroubleshootingEmbedder(embeddings_url=embeddings_url)
 
         # Initialize cache for embeddings and search results
@@ -205,6 +208,7 @@ class TroubleshootingSearcher:
 {{"mode": "CASE_LEVEL|ISSUE_LEVEL|HYBRID", "confidence": 0.0-1.0, "reasoning": "简短解释"}}"""
 
         try:
+            start = time.perf_counter()
             response = requests.post(
                 f"{self.llm_url}/v1/chat/completions",
                 json={
@@ -217,6 +221,7 @@ class TroubleshootingSearcher:
             )
 
             result = response.json()
+            record_llm_call(result, time.perf_counter() - start)
             content = result['choices'][0]['message']['content']
 
             # Extract JSON from response
@@ -257,6 +262,7 @@ class TroubleshootingSearcher:
             query_filter=qdrant_filter,
             limit=top_k,
             score_threshold=0.5,
+            search_params=search_params(),
             with_payload=True
         )
 
@@ -296,6 +302,7 @@ class TroubleshootingSearcher:
             query_filter=qdrant_filter,
             limit=top_k * 3,
             score_threshold=0.4,
+            search_params=search_params(),
             with_payload=True
         )
 
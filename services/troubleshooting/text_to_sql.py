@@ -27,6 +27,7 @@ import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import logging
@@ -39,6 +40,8 @@ if __name__ == "__main__":
 import psycopg2
 import requests
 
+from services.troubleshooting.llm_usage import record_llm_call
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -419,6 +422,7 @@ class TextToSQLGenerator:
         question: str,
         expanded_query: Optional[str] = None,
         include_explanation: bool = False,
+        timings: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
         """
         Generate SQL from natural language question.
@@ -427,21 +431,30 @@ class TextToSQLGenerator:
             question: The user's question
             expanded_query: Pre-expanded query (with synonyms resolved)
             include_explanation: Include explanation in result
+            timings: If given, receives seconds spent in "context", "llm" and "validation"
 
         Returns:
             Dict with sql, valid, tables_used, context_used, etc.
         """
         query = expanded_query or question
+        start = time.perf_counter()
 
         # Build 6-layer context
         context = self._build_context(query)
+        context_at = time.perf_counter()
 
         # Generate SQL using LLM
         sql, explanation = self._generate_sql_with_llm(question, context)
+        llm_at = time.perf_counter()
 
         # Validate SQL
         is_valid, error = self._validate_sql(sql)
 
+        if timings is not None:
+            timings["context"] = context_at - start
+            timings["llm"] = llm_at - context_at
+            timings["validation"] = time.perf_counter() - llm_at
+
         # Extract tables used
         tables_used = self._extract_tables(sql)
 
@@ -513,6 +526,7 @@ class TextToSQLGenerator:
 {{"sql": "SELECT ...", "explanation": "简短解释查询逻辑"}}"""
 
         try:
+            start = time.perf_counter()
             response = requests.post(
                 f"{self.llm_url}/v1/chat/completions",
                 json={
@@ -525,6 +539,7 @@ class TextToSQLGenerator:
             )
 
             result = response.json()
+            record_llm_call(result, time.perf_counter() - start)
             content = result["choices"][0]["message"]["content"]
 
             # Extract JSON
@@ -8,17 +8,20 @@ Orchestrates page rendering, VLM validation, correction, and review queue creati
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .correction_engine import CorrectionEngine
 from .page_renderer import PageRenderer
 from .review_queue import ReviewQueue
-from .vlm_validator import VLMMappingValidator
+from .vlm_validator import PageValidationResult, VLMMappingValidator
 
 logger = logging.getLogger(__name__)
 
+VLM_VALIDATION_CONCURRENCY = int(os.getenv("VLM_VALIDATION_CONCURRENCY", "4"))
+
 
 class ValidationPipeline:
     """End-to-end mapping validation pipeline."""
@@ -27,13 +30,15 @@ class ValidationPipeline:
         self,
         output_dir: Path,
         auto_correct_threshold: Optional[float] = None,
-        skip_review_queue: bool = False
+        skip_review_queue: bool = False,
+        concurrency: Optional[int] = None
     ) -> None:
         self.output_dir = Path(output_dir)
         self.auto_correct_threshold = auto_correct_threshold or float(
             os.getenv("VLM_AUTO_CORRECT_THRESHOLD", "0.90")
         )
         self.skip_review_queue = skip_review_queue
+        self.concurrency = max(1, concurrency or VLM_VALIDATION_CONCURRENCY)
 
     async def validate_case(self, excel_path: Path, case_data: Dict) -> Dict:
         """
@@ -56,38 +61,42 @@ class ValidationPipeline:
         try:
             render_dir = self.output_dir / "validation" / case_data["case_id"]
             renderer = PageRenderer(output_dir=render_dir)
-            render_result = renderer.render(excel_path, case_data)
+            # Conversion and rasterization block on subprocesses; keep the loop free
+            render_result = await asyncio.to_thread(renderer.render, excel_path, case_data)
 
             page_image_map = {
                 index + 1: path for index, path in enumerate(render_result.page_images)
             }
             total_pages = len(render_result.page_images)
 
-            validations: List[Dict] = []
-
             max_pages = int(os.getenv("VLM_VALIDATION_MAX_PAGES", "0"))
             page_items = list(render_result.page_context.items())
             if max_pages > 0:
                 page_items = page_items[:max_pages]
 
+            jobs = []
             for page_key, context in page_items:
                 page_number = int(page_key.split("_")[-1])
                 page_image = page_image_map.get(page_number)
                 if not page_image:
                     continue
-
-                rows = self._build_rows_payload(case_data, context.get("rows", []))
-                images = self._build_images_payload(case_data, context.get("images", []))
-
-                result = await validator.validate_page(
-                    case_id=case_data["case_id"],
-                    page_number=page_number,
-                    total_pages=total_pages,
-                    page_image=page_image,
-                    rows=rows,
-                    images=images
+                jobs.append(
+                    (
+                        page_number,
+                        page_image,
+                        self._build_rows_payload(case_data, context.get("rows", [])),
+                        self._build_images_payload(case_data, context.get("images", []))
+                    )
                 )
 
+            started = time.perf_counter()
+            page_results = await self._validate_pages(validator, case_data["case_id"], total_pages, jobs)
+            validation_seconds = time.perf_counter() - started
+
+            # Merge in page order regardless of completion order
+            validations: List[Dict] = []
+            for page_number in sorted(page_results):
+                result, _ = page_results[page_number]
                 for validation in result.validations:
                     validation.setdefault("page_number", page_number)
                 validations.extend(result.validations)
@@ -102,7 +111,7 @@ class ValidationPipeline:
                     correction_result["corrections"]
                 )
 
-            self._update_case_summary(case_data, validations, correction_result)
+            self._update_case_summary(case_data, validations, correction_result, page_results, validation_seconds)
 
             return case_data
 
@@ -117,6 +126,52 @@ class ValidationPipeline:
             )
             return case_data
 
+    async def _validate_pages(
+        self,
+        validator: VLMMappingValidator,
+        case_id: str,
+        total_pages: int,
+        jobs: List[Tuple[int, Path, List[Dict], List[Dict]]]
+    ) -> Dict[int, Tuple[PageValidationResult, float]]:
+        """
+        Validate pages concurrently (at most self.concurrency in flight) over one shared VLM client.
+
+        Returns:
+            page_number -> (result, seconds spent on that page)
+        """
+        if not jobs:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        client = validator.create_client()
+
+        async def validate(page_number: int, page_image: Path, rows: List[Dict], images: List[Dict]):
+            async with semaphore:
+                start = time.perf_counter()
+                result = await validator.validate_page(
+                    case_id=case_id,
+                    page_number=page_number,
+                    total_pages=total_pages,
+                    page_image=page_image,
+                    rows=rows,
+                    images=images,
+                    client=client
+                )
+                return page_number, result, time.perf_counter() - start
+
+        results: Dict[int, Tuple[PageValidationResult, float]] = {}
+        try:
+            for next_done in asyncio.as_completed([validate(*job) for job in jobs]):
+                page_number, result, seconds = await next_done
+                results[page_number] = (result, seconds)
+                logger.info(
+                    f"Validated page {page_number}/{total_pages} in {seconds:.1f}s "
+                    f"({len(result.validations)} mappings, {len(results)}/{len(jobs)} pages done)"
+                )
+        finally:
+            await client.close()
+        return results
+
     def _build_rows_payload(self, case_data: Dict, row_ids: List[str]) -> List[Dict]:
         rows = []
         issue_map = {issue.get("row_id"): issue for issue in case_data.get("issues", [])}
@@ -162,7 +217,14 @@ class ValidationPipeline:
                     )
         return images_payload
 
-    def _update_case_summary(self, case_data: Dict, validations: List[Dict], correction_result: Dict) -> None:
+    def _update_case_summary(
+        self,
+        case_data: Dict,
+        validations: List[Dict],
+        correction_result: Dict,
+        page_results: Dict[int, Tuple[PageValidationResult, float]],
+        validation_seconds: float
+    ) -> None:
         confidences = [float(v.get("confidence", 0.0)) for v in validations if v.get("confidence") is not None]
         average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
 
@@ -173,7 +235,16 @@ class ValidationPipeline:
             "total_images": sum(len(issue.get("images", [])) for issue in case_data.get("issues", [])),
             "auto_corrected": correction_result.get("auto_corrected", 0),
             "pending_review": correction_result.get("pending_review", 0),
-            "average_confidence": average_confidence
+            "average_confidence": average_confidence,
+            "validation_seconds": round(validation_seconds, 2),
+            "page_timings": [
+                {
+                    "page_number": page_number,
+                    "seconds": round(seconds, 2),
+                    "validations": len(result.validations)
+                }
+                for page_number, (result, seconds) in sorted(page_results.items())
+            ]
         }
 
 
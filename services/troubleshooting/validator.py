@@ -9,7 +9,7 @@ import json
 import re
 import logging
 from typing import Set, Optional, Tuple
-from qdrant_client import QdrantClient
+from services.qdrant_clients import get_qdrant_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ def get_valid_case_ids(qdrant_host: str = "localhost", qdrant_port: int = 6333)
         return _valid_case_ids_cache
 
     try:
-        qdrant = QdrantClient(host=qdrant_host, port=qdrant_port)
+        qdrant = get_qdrant_client(qdrant_host, qdrant_port)
 
         # Get all unique case_ids from troubleshooting_issues
         valid_ids = set()
@@ -13,19 +13,29 @@ Usage:
 
     # Or async with external VLM service:
     enriched_case = await processor.enrich_case_async(case_data)
+
+Images already analysed (byte-identical or perceptually near-identical,
+see image_dedup.py) reuse the stored analysis instead of a new VLM job;
+processor.dedup_summary() reports the dedup ratio and VLM time saved.
 """
 
 import os
 import asyncio
 import requests
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import logging
 import time
 
+from services.troubleshooting.image_dedup import (
+    VLM_DEDUP_ENABLED,
+    ImageAnalysisIndex,
+    hash_image,
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -69,6 +79,9 @@ class VLProcessor:
         self.enabled = enabled or os.getenv("VLM_ENABLED", "false").lower() == "true"
         self.use_vlm_service = use_vlm_service and VLM_CLIENT_AVAILABLE
         self.service_available = False
+        self._dedup_index: Optional[ImageAnalysisIndex] = None
+        # Totals over every case enriched by this processor (one ingest run)
+        self.dedup_stats = {"images": 0, "submitted": 0, "reused": 0, "vlm_seconds_saved": 0.0}
 
         if not self.enabled:
             logger.info("VL processing DISABLED (text-only search mode)")
@@ -160,44 +173,149 @@ class VLProcessor:
             self._add_empty_vl_fields(all_images)
             return case_data
 
+        # Reuse stored analyses for duplicates; submit one job per distinct image
+        stats = {"images": len(all_images), "submitted": 0, "reused": 0, "vlm_seconds_saved": 0.0}
+        pending, followers = await self._dedup_images(all_images, stats)
+        if stats["reused"]:
+            logger.info(
+                f"   Dedup: reusing analyses for {stats['reused']}/{len(all_images)} images "
+                f"(~{stats['vlm_seconds_saved']:.0f}s of VLM time)"
+            )
+
         # Process images with VLM service
         client = VLMServiceClient(base_url=self.vlm_service_url)
 
-        processed_count = 0
+        processed_count = stats["reused"]
         failed_count = 0
 
         # Process images concurrently (with limit)
         semaphore = asyncio.Semaphore(self.max_workers)
 
-        async def process_with_limit(img: Dict) -> Dict:
+        async def process_with_limit(img: Dict) -> Tuple[Dict, float]:
             async with semaphore:
-                return await self._process_image_vlm(client, img)
+                start = time.perf_counter()
+                result = await self._process_image_vlm(client, img)
+                return result, time.perf_counter() - start
 
-        tasks = [process_with_limit(img) for img in all_images]
+        tasks = [process_with_limit(img) for img, _ in pending]
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        stats["submitted"] = len(pending)
 
-        for img, result in zip(all_images, results):
+        for (img, hashes), result in zip(pending, results):
+            duplicates = followers.get(id(img), [])
             if isinstance(result, Exception):
                 logger.warning(f"   Failed to process {img['image_id']}: {result}")
-                self._add_empty_vl_fields([img])
-                failed_count += 1
+                self._add_empty_vl_fields([img] + duplicates)
+                failed_count += 1 + len(duplicates)
             else:
                 # Merge VLM result into image data
-                img.update(result)
+                analysis, seconds = result
+                img.update(analysis)
                 processed_count += 1
+                if hashes and self._dedup_index is not None:
+                    self._dedup_index.store(*hashes, img['image_id'], analysis, seconds)
+                for duplicate in duplicates:
+                    self._apply_reused(duplicate, analysis, img['image_id'])
+                    stats["reused"] += 1
+                    stats["vlm_seconds_saved"] += seconds
+                    processed_count += 1
 
         await client.close()
 
-        logger.info(f"   Processed: {processed_count} images")
+        logger.info(f"   Processed: {processed_count} images ({stats['submitted']} VLM jobs)")
         if failed_count > 0:
             logger.warning(f"   Failed: {failed_count} images")
 
         # Add case-level VLM metadata
         case_data['vlm_processed'] = True
         case_data['vlm_processed_count'] = processed_count
+        case_data['vlm_dedup'] = {
+            **stats,
+            "vlm_seconds_saved": round(stats["vlm_seconds_saved"], 1),
+            "dedup_ratio": round(stats["reused"] / len(all_images), 3),
+        }
+        for key in self.dedup_stats:
+            self.dedup_stats[key] += stats[key]
 
         return case_data
 
+    def _get_dedup_index(self) -> Optional[ImageAnalysisIndex]:
+        """Lazy-load the image dedup index (None when VLM_DEDUP_ENABLED=false)."""
+        if self._dedup_index is None and VLM_DEDUP_ENABLED:
+            self._dedup_index = ImageAnalysisIndex()
+        return self._dedup_index
+
+    async def _dedup_images(
+        self, images: List[Dict], stats: Dict
+    ) -> Tuple[List[Tuple[Dict, Optional[Tuple[str, int]]]], Dict[int, List[Dict]]]:
+        """
+        Apply stored analyses to known images and group duplicates within the case.
+
+        Returns:
+            (images to submit with their hashes, duplicates of each submitted
+            image keyed by id() of that image)
+        """
+        index = self._get_dedup_index()
+        if index is None:
+            return [(img, None) for img in images], {}
+
+        hashes = await asyncio.gather(*(asyncio.to_thread(self._hash_image, img) for img in images))
+        pending: List[Tuple[Dict, Optional[Tuple[str, int]]]] = []
+        followers: Dict[int, List[Dict]] = {}
+
+        for img, image_hashes in zip(images, hashes):
+            if image_hashes is None:
+                pending.append((img, None))
+                continue
+            match = index.lookup(*image_hashes)
+            if match is not None:
+                self._apply_reused(img, match.analysis, match.image_id)
+                stats["reused"] += 1
+                stats["vlm_seconds_saved"] += match.vlm_seconds
+                continue
+            leader = next(
+                (
+                    other for other, other_hashes in pending
+                    if other_hashes and (
+                        other_hashes[0] == image_hashes[0]
+                        or self._phash_distance(other_hashes[1], image_hashes[1]) <= index.max_distance
+                    )
+                ),
+                None,
+            )
+            if leader is not None:
+                followers.setdefault(id(leader), []).append(img)
+            else:
+                pending.append((img, image_hashes))
+
+        return pending, followers
+
+    @staticmethod
+    def _hash_image(img: Dict) -> Optional[Tuple[str, int]]:
+        try:
+            return hash_image(Path(img['file_path']))
+        except Exception as e:
+            logger.debug(f"   Could not hash {img.get('image_id')}: {e}")
+            return None
+
+    @staticmethod
+    def _phash_distance(a: int, b: int) -> int:
+        return bin(a ^ b).count("1")
+
+    @staticmethod
+    def _apply_reused(img: Dict, analysis: Dict, source_image_id: str) -> None:
+        img.update(analysis)
+        img['vlm_reused_from'] = source_image_id
+
+    def dedup_summary(self) -> Dict:
+        """Dedup ratio and VLM seconds saved across all cases enriched so far."""
+        images = self.dedup_stats["images"]
+        return {
+            **self.dedup_stats,
+            "vlm_seconds_saved": round(self.dedup_stats["vlm_seconds_saved"], 1),
+            "dedup_ratio": round(self.dedup_stats["reused"] / images, 3) if images else 0.0,
+        }
+
     async def _process_image_vlm(self, client: "VLMServiceClient", image_data: Dict) -> Dict:
         """
         Process single image with external VLM service.
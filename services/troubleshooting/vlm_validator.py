@@ -53,6 +53,10 @@ class VLMMappingValidator:
             logger.warning("VLM client not available; mapping validation disabled")
             self.enabled = False
 
+    def create_client(self) -> "VLMServiceClient":
+        """VLM client that can be shared by concurrent validate_page calls."""
+        return VLMServiceClient(base_url=self.vlm_service_url)
+
     async def validate_page(
         self,
         case_id: str,
@@ -60,7 +64,8 @@ class VLMMappingValidator:
         total_pages: int,
         page_image: Path,
         rows: List[Dict],
-        images: List[Dict]
+        images: List[Dict],
+        client: Optional["VLMServiceClient"] = None
     ) -> PageValidationResult:
         """
         Validate mappings for a single page.
@@ -70,6 +75,8 @@ class VLMMappingValidator:
             page_image: Rendered page image path
             rows: List of row dicts for this page
             images: List of image dicts for this page
+            client: Shared VLM client (not closed here); a private one is
+                created and closed when omitted
 
         Returns:
             PageValidationResult with validation entries
@@ -90,10 +97,27 @@ class VLMMappingValidator:
             max_tokens=2048
         )
 
-        result_text = None
+        owns_client = client is None
+        if owns_client:
+            client = self.create_client()
+        try:
+            return await self._validate_with_retries(
+                client, page_number, page_image, extracted_image_paths, mapping_context
+            )
+        finally:
+            if owns_client:
+                await client.close()
+
+    async def _validate_with_retries(
+        self,
+        client: "VLMServiceClient",
+        page_number: int,
+        page_image: Path,
+        extracted_image_paths: List[Path],
+        mapping_context: Dict
+    ) -> PageValidationResult:
         for attempt in range(1, self.max_retries + 2):
             try:
-                client = VLMServiceClient(base_url=self.vlm_service_url)
                 response = await client.validate_mappings(
                     page_image_path=page_image,
                     extracted_image_paths=extracted_image_paths,
@@ -112,7 +136,6 @@ class VLMMappingValidator:
                     job_id=job_id,
                     timeout=int(os.getenv("VLM_TIMEOUT", 600))
                 )
-                await client.close()
 
                 validations = self._extract_validations(result_payload)
                 average_confidence = self._average_confidence(validations)
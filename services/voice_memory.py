@@ -0,0 +1,377 @@
+"""
+Opt-in memory profiling for the LiveKit voice agent.
+
+Enable it with VOICE_MEMORY_PROFILING=1. The job process then:
+
+- starts tracemalloc (VOICE_MEMORY_TRACE_FRAMES frames per allocation) and
+  every VOICE_MEMORY_INTERVAL_S takes a snapshot. It logs the allocation
+  sites that grew the most since the previous sample.
+- tracks the size of per-session buffers: the ASR speech buffer, the STT
+  frame queue and the TTS input/phrase queues. Buffers are registered with
+  track() and labelled with the room the session belongs to.
+- exports RSS, traced memory, the top allocation sites and the buffer sizes
+  as Prometheus gauges. With VOICE_MEMORY_METRICS_PORT set, each job process
+  serves /metrics on the first free port from there.
+- answers "memory_debug" data-channel commands (see handle_command):
+  take a named snapshot, diff two snapshots, or report the current stats.
+
+When it is off, track() is a no-op and nothing is started.
+
+Usage:
+    from services import voice_memory
+
+    voice_memory.current_session.set(ctx.room.name)
+    voice_memory.track("asr_speech_buffer_samples", asr, lambda a: len(a.speech_buffer))
+
+    profiler = voice_memory.get_profiler()  # None unless enabled
+    if profiler:
+        profiler.start()
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from prometheus_client import start_http_server
+    from services.observability import (
+        voice_allocation_site_bytes,
+        voice_memory_rss_bytes,
+        voice_session_buffer_size,
+        voice_traced_memory_bytes,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+logger = logging.getLogger("bestbox-voice")
+
+VOICE_MEMORY_PROFILING = os.getenv("VOICE_MEMORY_PROFILING", "false").lower() in ("1", "true", "yes")
+VOICE_MEMORY_INTERVAL_S = float(os.getenv("VOICE_MEMORY_INTERVAL_S", "60"))
+VOICE_MEMORY_TRACE_FRAMES = int(os.getenv("VOICE_MEMORY_TRACE_FRAMES", "10"))
+VOICE_MEMORY_TOP_N = int(os.getenv("VOICE_MEMORY_TOP_N", "15"))
+# Named snapshots kept for diffs (the baseline is kept on top of these)
+VOICE_MEMORY_MAX_SNAPSHOTS = int(os.getenv("VOICE_MEMORY_MAX_SNAPSHOTS", "4"))
+# 0 = no /metrics server; job processes take the first free port from here
+VOICE_MEMORY_METRICS_PORT = int(os.getenv("VOICE_MEMORY_METRICS_PORT", "0"))
+VOICE_MEMORY_METRICS_PORT_SPAN = 32
+
+# Room name of the session being set up; buffers registered under it
+current_session: ContextVar[str] = ContextVar("voice_memory_session", default="-")
+
+# tracemalloc's own bookkeeping and import machinery are noise in every diff
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def _kb(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+class VoiceMemoryProfiler:
+    """tracemalloc snapshots, per-session buffer sizes and their gauges.
+
+    Args:
+        interval_s: Seconds between periodic samples
+        top_n: Allocation sites reported per sample, diff and gauge
+        trace_frames: Frames tracemalloc records per allocation
+        max_snapshots: Named snapshots kept for diffs
+    """
+
+    def __init__(
+        self,
+        interval_s: float = VOICE_MEMORY_INTERVAL_S,
+        top_n: int = VOICE_MEMORY_TOP_N,
+        trace_frames: int = VOICE_MEMORY_TRACE_FRAMES,
+        max_snapshots: int = VOICE_MEMORY_MAX_SNAPSHOTS,
+    ):
+        self.interval_s = interval_s
+        self.top_n = top_n
+        self.trace_frames = trace_frames
+        self.max_snapshots = max(1, max_snapshots)
+        self.metrics_port: Optional[int] = None
+        # Only the opt-in profiler needs psutil; importers of services.speech don't
+        import psutil
+
+        self._process = psutil.Process()
+        self._lock = threading.Lock()
+        # (session, buffer, weakref to owner, size function)
+        self._buffers: List[Tuple[str, str, weakref.ref, Callable[[Any], int]]] = []
+        self._exported: set = set()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._last: Optional[tracemalloc.Snapshot] = None
+        self._snapshots: "OrderedDict[str, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._next_id = 1
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Buffers
+    # ------------------------------------------------------------------
+
+    def track(self, buffer: str, owner: Any, size: Callable[[Any], int], session: Optional[str] = None) -> None:
+        """Report ``size(owner)`` as buffer ``buffer`` of the current session while owner is alive."""
+        entry = (session or current_session.get(), buffer, weakref.ref(owner), size)
+        with self._lock:
+            self._buffers.append(entry)
+
+    def buffer_sizes(self) -> Dict[str, Dict[str, int]]:
+        """Current buffer sizes, ``{session: {buffer: items}}``; forgets dead owners."""
+        sizes: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            alive = []
+            for session, buffer, ref, size in self._buffers:
+                owner = ref()
+                if owner is None:
+                    continue
+                alive.append((session, buffer, ref, size))
+                try:
+                    n = int(size(owner))
+                except Exception:
+                    continue
+                per_session = sizes.setdefault(session, {})
+                # Several owners of one kind (e.g. successive STT streams) add up
+                per_session[buffer] = per_session.get(buffer, 0) + n
+            self._buffers = alive
+        return sizes
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def top_sites(self, snapshot: tracemalloc.Snapshot, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Largest allocation sites of a snapshot."""
+        stats = snapshot.statistics("lineno")[:limit or self.top_n]
+        return [{"site": _site(s), "size_kb": _kb(s.size), "count": s.count} for s in stats]
+
+    def snapshot(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """Take and keep a named snapshot; the oldest one is dropped past max_snapshots."""
+        snap = self._take()
+        with self._lock:
+            if label:
+                snapshot_id = label
+            else:
+                snapshot_id = f"s{self._next_id}"
+                self._next_id += 1
+            self._snapshots.pop(snapshot_id, None)
+            self._snapshots[snapshot_id] = (time.time(), snap)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        traced = sum(stat.size for stat in snap.statistics("filename"))
+        return {"id": snapshot_id, "traced_kb": _kb(traced), "snapshots": self.snapshot_ids()}
+
+    def snapshot_ids(self) -> List[str]:
+        with self._lock:
+            names = list(self._snapshots)
+        return (["baseline"] if self._baseline is not None else []) + names
+
+    def _get(self, snapshot_id: str) -> tracemalloc.Snapshot:
+        if snapshot_id == "baseline" and self._baseline is not None:
+            return self._baseline
+        with self._lock:
+            found = self._snapshots.get(snapshot_id)
+        if found is None:
+            raise KeyError(f"Unknown snapshot '{snapshot_id}' (have: {', '.join(self.snapshot_ids()) or 'none'})")
+        return found[1]
+
+    def diff(
+        self,
+        older: Optional[str] = None,
+        newer: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compare two snapshots by allocation site.
+
+        Args:
+            older: Snapshot id to diff from (default: baseline)
+            newer: Snapshot id to diff to (default: a fresh snapshot)
+            limit: Sites to return (default: top_n)
+
+        Returns:
+            Sites sorted by absolute growth, with sizes in KB
+        """
+        older = older or "baseline"
+        before = self._get(older)
+        after = self._get(newer) if newer else self._take()
+        stats = after.compare_to(before, "lineno")
+        return {
+            "from": older,
+            "to": newer or "now",
+            "traced_diff_kb": _kb(sum(s.size_diff for s in stats)),
+            "top": [
+                {
+                    "site": _site(s),
+                    "size_kb": _kb(s.size),
+                    "size_diff_kb": _kb(s.size_diff),
+                    "count_diff": s.count_diff,
+                }
+                for s in stats[:limit or self.top_n]
+            ],
+        }
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def sample(self) -> Dict[str, Any]:
+        """Take a periodic sample: update gauges and log the fastest-growing sites."""
+        rss = self._process.memory_info().rss
+        snap = self._take()
+        current, peak = tracemalloc.get_traced_memory()
+        sites = self.top_sites(snap)
+        growth = []
+        if self._last is not None:
+            growth = [s for s in snap.compare_to(self._last, "lineno")[:5] if s.size_diff > 0]
+        self._last = snap
+        buffers = self.buffer_sizes()
+
+        if PROMETHEUS_AVAILABLE:
+            voice_memory_rss_bytes.set(rss)
+            voice_traced_memory_bytes.labels(kind="current").set(current)
+            voice_traced_memory_bytes.labels(kind="peak").set(peak)
+            voice_allocation_site_bytes.clear()
+            for site in sites:
+                voice_allocation_site_bytes.labels(site=site["site"]).set(site["size_kb"] * 1024)
+            exported = set()
+            for session, sizes in buffers.items():
+                for buffer, n in sizes.items():
+                    voice_session_buffer_size.labels(session=session, buffer=buffer).set(n)
+                    exported.add((session, buffer))
+            # Drop the series of sessions that have ended
+            for session, buffer in self._exported - exported:
+                voice_session_buffer_size.remove(session, buffer)
+            self._exported = exported
+
+        logger.info(
+            f"🧠 Memory: RSS {rss / 1024 / 1024:.1f}MB, traced {current / 1024 / 1024:.1f}MB "
+            f"(peak {peak / 1024 / 1024:.1f}MB), buffers {buffers or '{}'}"
+        )
+        for stat in growth:
+            logger.info(f"🧠   +{_kb(stat.size_diff)}KB ({stat.count_diff:+d} blocks) at {_site(stat)}")
+        return {
+            "rss_mb": round(rss / 1024 / 1024, 1),
+            "traced_mb": round(current / 1024 / 1024, 1),
+            "traced_peak_mb": round(peak / 1024 / 1024, 1),
+            "gc_counts": gc.get_count(),
+            "buffers": buffers,
+            "top": sites,
+        }
+
+    def start_metrics_server(self, base_port: int = VOICE_MEMORY_METRICS_PORT) -> Optional[int]:
+        """Serve /metrics on the first free port from base_port (one per job process)."""
+        if not PROMETHEUS_AVAILABLE or base_port <= 0 or self.metrics_port is not None:
+            return self.metrics_port
+        for port in range(base_port, base_port + VOICE_MEMORY_METRICS_PORT_SPAN):
+            try:
+                start_http_server(port)
+            except OSError:
+                continue
+            self.metrics_port = port
+            logger.info(f"🧠 Voice memory metrics on :{port}/metrics (PID {os.getpid()})")
+            return port
+        logger.warning(f"No free metrics port in {base_port}-{base_port + VOICE_MEMORY_METRICS_PORT_SPAN - 1}")
+        return None
+
+    def enable(self) -> None:
+        """Start tracing and the metrics server; safe to call more than once."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        if self._baseline is None:
+            self._baseline = self._take()
+        self.start_metrics_server()
+
+    def start(self) -> None:
+        """Enable profiling and start periodic sampling (needs a running event loop)."""
+        self.enable()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="voice-memory-profiler")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                # Snapshots walk every traced block; keep that off the audio loop
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.error(f"Error in memory profiler: {e}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Debug commands
+    # ------------------------------------------------------------------
+
+    async def handle_command(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a "memory_debug" data-channel command.
+
+        Message fields:
+            command: "snapshot" (optional "label"), "diff" (optional "from",
+                "to", "limit") or "stats"
+
+        Returns:
+            A "memory_debug_result" message with "result" or "error"
+        """
+        command = message.get("command", "stats")
+        try:
+            if command == "snapshot":
+                result = await asyncio.to_thread(self.snapshot, message.get("label"))
+            elif command == "diff":
+                result = await asyncio.to_thread(
+                    self.diff, message.get("from"), message.get("to"), message.get("limit")
+                )
+            elif command == "stats":
+                result = await asyncio.to_thread(self.sample)
+                result["snapshots"] = self.snapshot_ids()
+            else:
+                raise ValueError(f"Unknown memory_debug command '{command}'")
+        except (KeyError, ValueError) as e:
+            return {"type": "memory_debug_result", "command": command, "error": e.args[0]}
+        return {"type": "memory_debug_result", "command": command, "result": result}
+
+
+_profiler: Optional[VoiceMemoryProfiler] = None
+
+
+def get_profiler() -> Optional[VoiceMemoryProfiler]:
+    """Get the process-wide profiler, or None unless VOICE_MEMORY_PROFILING is set."""
+    global _profiler
+    if _profiler is None and VOICE_MEMORY_PROFILING:
+        _profiler = VoiceMemoryProfiler()
+    return _profiler
+
+
+def track(buffer: str, owner: Any, size: Callable[[Any], int]) -> None:
+    """Register a session buffer with the profiler (no-op when profiling is off)."""
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.track(buffer, owner, size)
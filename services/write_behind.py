@@ -0,0 +1,273 @@
+"""
+Write-behind logging to PostgreSQL.
+
+Per-turn audit writes (conversation_log, session_messages and their session
+counters) used to cost two round-trips on the request path each. A
+WriteBehindLog queues the rows instead and a background task writes them in
+batches: every WRITE_BEHIND_FLUSH_MS, or sooner once WRITE_BEHIND_FLUSH_ROWS
+are waiting. The batch writer gets the whole batch on one connection, so it
+can use executemany and aggregate per-session counter updates.
+
+The queue is bounded. When it is full, callers wait up to
+WRITE_BEHIND_ENQUEUE_TIMEOUT_MS for room and then the row goes to a JSONL
+spill file instead; batches that exceed WRITE_BEHIND_WRITE_TIMEOUT_S or lose
+the connection are spilled the same way. Spilled rows are replayed once
+writes succeed again. close() flushes everything still queued.
+
+A batch rejected by the database itself (a constraint violation, a bad
+value) is retried in halves so the good rows still land. Rows that fail on
+their own are spilled with an attempt count, and after
+WRITE_BEHIND_MAX_ATTEMPTS they go to a dead-letter file
+(``<name>.dead.jsonl``) for manual inspection instead of being replayed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from services.observability import (
+        write_behind_flush_seconds,
+        write_behind_queue_depth,
+        write_behind_rows,
+    )
+    WRITE_BEHIND_METRICS_AVAILABLE = True
+except ImportError:
+    WRITE_BEHIND_METRICS_AVAILABLE = False
+
+try:
+    import asyncpg
+    _CONNECTION_ERRORS = (OSError, asyncpg.InterfaceError, asyncpg.PostgresConnectionError)
+except ImportError:
+    _CONNECTION_ERRORS = (OSError,)
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "10000"))
+WRITE_BEHIND_FLUSH_ROWS = int(os.getenv("WRITE_BEHIND_FLUSH_ROWS", "500"))
+WRITE_BEHIND_FLUSH_MS = int(os.getenv("WRITE_BEHIND_FLUSH_MS", "200"))
+WRITE_BEHIND_ENQUEUE_TIMEOUT_MS = int(os.getenv("WRITE_BEHIND_ENQUEUE_TIMEOUT_MS", "50"))
+WRITE_BEHIND_WRITE_TIMEOUT_S = float(os.getenv("WRITE_BEHIND_WRITE_TIMEOUT_S", "5"))
+WRITE_BEHIND_REPLAY_INTERVAL_S = float(os.getenv("WRITE_BEHIND_REPLAY_INTERVAL_S", "30"))
+WRITE_BEHIND_SPILL_DIR = os.getenv("WRITE_BEHIND_SPILL_DIR", "data/write_behind")
+# Failed writes of a single row before it is moved to the dead-letter file
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "3"))
+
+# Spill-file field carrying a row's failed attempts; stripped before writing
+_ATTEMPTS_KEY = "_write_behind_attempts"
+
+Record = Dict[str, Any]
+BatchWriter = Callable[[Any, List[Record]], Awaitable[None]]
+
+
+class WriteBehindLog:
+    """Bounded queue of rows written to PostgreSQL in batches.
+
+    Records must be JSON-serializable dicts (they may be spilled to disk) and
+    should carry their own timestamp, since they reach the database later
+    than they happened.
+
+    Args:
+        pool: asyncpg pool (or anything with an ``acquire()`` context manager)
+        name: Writer name, used for metrics and the spill file name
+        write_batch: ``async (conn, records)`` writing one batch; runs in a
+            transaction
+    """
+
+    def __init__(
+        self,
+        pool: Any,
+        name: str,
+        write_batch: BatchWriter,
+        queue_size: int = WRITE_BEHIND_QUEUE_SIZE,
+        flush_rows: int = WRITE_BEHIND_FLUSH_ROWS,
+        flush_ms: int = WRITE_BEHIND_FLUSH_MS,
+        enqueue_timeout_ms: int = WRITE_BEHIND_ENQUEUE_TIMEOUT_MS,
+        spill_dir: str = WRITE_BEHIND_SPILL_DIR,
+    ):
+        self._pool = pool
+        self.name = name
+        self._write_batch = write_batch
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_ms / 1000
+        self._enqueue_timeout = enqueue_timeout_ms / 1000
+        self.spill_path = Path(spill_dir) / f"{name}.jsonl"
+        self.dead_letter_path = Path(spill_dir) / f"{name}.dead.jsonl"
+        # Failed attempts of the spilled rows being replayed, by id(record)
+        self._attempts: Dict[int, int] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._last_replay = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flush task (needs a running event loop)."""
+        if not self.running:
+            self._closing = False
+            self._task = asyncio.create_task(self._run(), name=f"write-behind-{self.name}")
+
+    async def close(self) -> None:
+        """Stop the flush task and write everything still queued."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def submit(self, record: Record) -> None:
+        """Queue a record for the next batch.
+
+        Waits briefly for room when the queue is full, then spills the record
+        to disk rather than holding up the caller. Without a running flush
+        task (e.g. in scripts) the record is written immediately.
+        """
+        if not self.running:
+            await self._write([record])
+            return
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._queue.put(record), self._enqueue_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Write-behind queue '{self.name}' full, spilling to {self.spill_path}")
+                await asyncio.to_thread(self._spill, [record])
+                return
+        self._observe_depth()
+        if self._queue.qsize() >= self._flush_rows:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write all queued records now, in batches of at most flush_rows."""
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch = []
+                while len(batch) < self._flush_rows and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                self._observe_depth()
+                await self._write(batch)
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_replay >= WRITE_BEHIND_REPLAY_INTERVAL_S:
+                    self._last_replay = time.monotonic()
+                    await self._replay()
+            except Exception as e:
+                logger.error(f"Write-behind '{self.name}' flush loop error: {e}")
+
+    def _observe_depth(self) -> None:
+        if WRITE_BEHIND_METRICS_AVAILABLE:
+            write_behind_queue_depth.labels(writer=self.name).set(self._queue.qsize())
+
+    def _count(self, outcome: str, rows: int) -> None:
+        if WRITE_BEHIND_METRICS_AVAILABLE:
+            write_behind_rows.labels(writer=self.name, outcome=outcome).inc(rows)
+
+    async def _write(self, batch: List[Record], outcome: str = "written") -> bool:
+        """Write one batch, isolating rows the database rejects.
+
+        Returns:
+            False if the database could not be reached (timeout or lost
+            connection) and the batch was spilled for a later replay
+        """
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._write_in_transaction(batch), WRITE_BEHIND_WRITE_TIMEOUT_S)
+        except Exception as e:
+            if isinstance(e, (asyncio.TimeoutError,) + _CONNECTION_ERRORS):
+                reason = "timed out" if isinstance(e, asyncio.TimeoutError) else f"failed: {e}"
+                logger.warning(f"Write-behind '{self.name}' batch of {len(batch)} {reason}; spilling to disk")
+                await asyncio.to_thread(self._spill, batch)
+                return False
+            if len(batch) == 1:
+                await asyncio.to_thread(self._reject, batch[0], e)
+                return True
+            # The database rejected some row; bisect so the others still land
+            logger.warning(f"Write-behind '{self.name}' batch of {len(batch)} failed: {e}; retrying in halves")
+            mid = len(batch) // 2
+            if not await self._write(batch[:mid], outcome):
+                await asyncio.to_thread(self._spill, batch[mid:])
+                return False
+            return await self._write(batch[mid:], outcome)
+        if WRITE_BEHIND_METRICS_AVAILABLE:
+            write_behind_flush_seconds.labels(writer=self.name).observe(time.perf_counter() - start)
+        self._count(outcome, len(batch))
+        return True
+
+    async def _write_in_transaction(self, batch: List[Record]) -> None:
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await self._write_batch(conn, batch)
+
+    def _append(self, path: Path, records: List[Record], attempts: Dict[int, int]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                if attempts.get(id(record)):
+                    record = {**record, _ATTEMPTS_KEY: attempts[id(record)]}
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def _spill(self, records: List[Record]) -> None:
+        self._append(self.spill_path, records, self._attempts)
+        self._count("spilled", len(records))
+
+    def _reject(self, record: Record, error: Exception) -> None:
+        """Spill a row the database rejected, or dead-letter it after too many attempts."""
+        attempts = {id(record): self._attempts.get(id(record), 0) + 1}
+        if attempts[id(record)] < WRITE_BEHIND_MAX_ATTEMPTS:
+            self._append(self.spill_path, [record], attempts)
+            self._count("spilled", 1)
+            return
+        logger.error(
+            f"Write-behind '{self.name}' row failed {attempts[id(record)]} times ({error}); "
+            f"moving it to {self.dead_letter_path}"
+        )
+        self._append(self.dead_letter_path, [record], attempts)
+        self._count("dead_lettered", 1)
+
+    def _take_spilled(self) -> List[Record]:
+        if not self.spill_path.exists():
+            return []
+        replaying = self.spill_path.with_suffix(".replaying")
+        self.spill_path.rename(replaying)
+        with open(replaying, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        replaying.unlink()
+        return records
+
+    async def _replay(self) -> None:
+        """Write spilled records back; stops (re-spilling the rest) if the database is unreachable."""
+        records = await asyncio.to_thread(self._take_spilled)
+        if not records:
+            return
+        logger.info(f"Replaying {len(records)} spilled '{self.name}' records")
+        for record in records:
+            attempts = record.pop(_ATTEMPTS_KEY, 0)
+            if attempts:
+                self._attempts[id(record)] = attempts
+        try:
+            for lo in range(0, len(records), self._flush_rows):
+                if not await self._write(records[lo:lo + self._flush_rows], outcome="replayed"):
+                    await asyncio.to_thread(self._spill, records[lo + self._flush_rows:])
+                    return
+        finally:
+            self._attempts.clear()
@@ -19,6 +19,8 @@ from typing import Dict, List, Optional, Any
 from qdrant_client import QdrantClient
 from qdrant_client.models import Filter, FieldCondition, MatchValue, PointStruct
 
+from services.qdrant_clients import get_qdrant_client
+
 from .schemas import (
     UploadMoldCaseInput,
     UpdateCaseMetadataInput,
@@ -45,7 +47,7 @@ OUTPUT_DIR = os.getenv("TROUBLESHOOTING_OUTPUT_DIR", "data/troubleshooting/proce
 
 def _get_qdrant_client() -> QdrantClient:
     """Get configured Qdrant client."""
-    return QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    return get_qdrant_client(QDRANT_HOST, QDRANT_PORT)
 
 
 def _get_extractor():
@@ -608,13 +610,17 @@ def batch_index_cases(
                 failed_files.append(str(xlsx_file.name))
 
         logger.info(f"Batch indexing complete: {indexed_count} indexed, {skipped_count} skipped, {failed_count} failed")
+        vlm_dedup = vl_processor.dedup_summary() if vl_processor else None
+        if vlm_dedup:
+            logger.info(f"VLM dedup: {vlm_dedup}")
 
         return BatchIndexCasesResult(
             success=True,
             indexed_count=indexed_count,
             skipped_count=skipped_count,
             failed_count=failed_count,
-            failed_files=failed_files
+            failed_files=failed_files,
+            vlm_dedup=vlm_dedup
         ).model_dump()
 
     except Exception as e:
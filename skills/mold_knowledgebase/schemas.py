@@ -196,6 +196,7 @@ class BatchIndexCasesResult(BaseModel):
     skipped_count: int
     failed_count: int
     failed_files: List[str] = []
+    vlm_dedup: Optional[Dict[str, Any]] = None  # dedup ratio and VLM seconds saved
     error: Optional[str] = None
 
 
@@ -0,0 +1,77 @@
+"""Tests for admin token verification caches."""
+
+import time
+
+import pytest
+from authlib.jose import JsonWebKey, JsonWebToken
+
+from services import admin_auth
+
+
+def _key(kid):
+    return JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": kid})
+
+
+def _issue(key, kid, exp_in=3600):
+    now = int(time.time())
+    claims = {"iss": "http://idp", "sub": "alice", "groups": ["admin"], "iat": now, "exp": now + exp_in}
+    return JsonWebToken(["RS256"]).encode({"alg": "RS256", "kid": kid}, claims, key).decode()
+
+
+@pytest.fixture
+def idp(monkeypatch):
+    state = {"keys": [_key("k1")], "fetches": 0}
+
+    async def fake_metadata():
+        return {"jwks_uri": "http://idp/jwks.json"}
+
+    async def fake_fetch(uri):
+        state["fetches"] += 1
+        return {"keys": [k.as_dict(is_private=False) for k in state["keys"]]}
+
+    admin_auth.clear_oidc_caches()
+    monkeypatch.setattr(admin_auth, "get_oidc_metadata", fake_metadata)
+    monkeypatch.setattr(admin_auth, "_fetch_jwks", fake_fetch)
+    yield state
+    admin_auth.clear_oidc_caches()
+
+
+@pytest.mark.asyncio
+async def test_local_jwt_skips_oidc(monkeypatch):
+    async def fail(token):
+        raise AssertionError("OIDC verifier should not be called for local tokens")
+
+    monkeypatch.setattr(admin_auth, "verify_oidc_token", fail)
+    token = admin_auth.create_jwt_token("u-1", "admin", "admin")
+
+    claims = await admin_auth.verify_token(token)
+
+    assert claims["username"] == "admin"
+
+
+@pytest.mark.asyncio
+async def test_jwks_cached_and_refreshed_on_new_kid(idp, monkeypatch):
+    monkeypatch.setattr(admin_auth, "OIDC_JWKS_MIN_REFRESH_SECONDS", 0)
+    first = _issue(idp["keys"][0], "k1")
+    assert (await admin_auth.verify_token(first))["role"] == "admin"
+    admin_auth._verified_tokens.clear()
+    assert await admin_auth.verify_token(first)
+    assert idp["fetches"] == 1
+
+    # Key rotation: a token signed with an unseen kid triggers one refresh
+    idp["keys"].append(_key("k2"))
+    rotated = _issue(idp["keys"][1], "k2")
+    assert await admin_auth.verify_token(rotated)
+    assert idp["fetches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_verified_token_cache_bounded_by_exp(idp):
+    token = _issue(idp["keys"][0], "k1", exp_in=3600)
+    await admin_auth.verify_token(token)
+
+    _, expires_at = next(iter(admin_auth._verified_tokens.values()))
+    assert expires_at <= time.time() + admin_auth.OIDC_TOKEN_CACHE_TTL_SECONDS
+
+    admin_auth._verified_tokens[admin_auth._token_cache_key(token)] = ({"sub": "x"}, time.time() - 1)
+    assert admin_auth._cached_claims(token) is None
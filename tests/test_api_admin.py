@@ -10,8 +10,11 @@ class DummySessionStore:
     async def list_sessions(self, *args, **kwargs):
         return [{"id": "session-1"}]
 
-    async def get_session(self, session_id: str):
-        return {"id": session_id, "messages": []}
+    async def get_session(self, session_id: str, limit: int = 50, before=None):
+        return {"id": session_id, "messages": [], "next_before": None}
+
+    async def get_message_details(self, session_id: str, message_id: str):
+        return {"id": message_id, "reasoning_trace": [], "tool_calls": None} if message_id == "m-1" else {}
 
     async def add_rating(self, session_id: str, rating: str, note: str):
         return None
@@ -28,6 +31,16 @@ def test_admin_endpoints(monkeypatch):
 
     detail_resp = client.get("/admin/sessions/session-1", headers={"admin-token": "test-token"})
     assert detail_resp.status_code == 200
+    cursor = "0b9e5c1e-6a7f-4d2b-9c1a-3f2e8d7c6b5a"
+    page_resp = client.get(f"/admin/sessions/session-1?before={cursor}", headers={"admin-token": "test-token"})
+    assert page_resp.status_code == 200
+    bad_cursor_resp = client.get("/admin/sessions/session-1?before=m-1", headers={"admin-token": "test-token"})
+    assert bad_cursor_resp.status_code == 422
+
+    message_resp = client.get("/admin/sessions/session-1/messages/m-1", headers={"admin-token": "test-token"})
+    assert message_resp.status_code == 200
+    missing_resp = client.get("/admin/sessions/session-1/messages/m-2", headers={"admin-token": "test-token"})
+    assert missing_resp.status_code == 404
 
     rating_resp = client.post(
         "/admin/sessions/session-1/rating",
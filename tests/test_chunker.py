@@ -139,3 +139,42 @@ def test_section_preservation():
         chunks = chunker.chunk_text(sample_text[:500], section=section_name)
         assert all(chunk["section"] == section_name for chunk in chunks), \
             f"All chunks should have section '{section_name}'"
+
+
+def test_streaming_chunker_splits_cjk_at_sentence_boundaries():
+    """CJK text is split at 。！？ rather than mid-sentence."""
+    from services.rag_pipeline.chunker import StreamingChunker, estimate_tokens
+
+    sentence = "产品表面出现披锋，建议检查分型面贴合度。"
+    chunker = StreamingChunker(
+        max_tokens=50, overlap_tokens=0,
+        count_tokens=lambda texts: [estimate_tokens(t) for t in texts],
+    )
+    chunks = chunker.chunk_text(sentence * 10)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk["text"].endswith("。")
+        assert chunk["token_count"] <= 50
+
+
+def test_streaming_chunker_headings_and_streamed_input():
+    """Headings start new chunks and feeding pieces gives the same chunks as one string."""
+    from services.rag_pipeline.chunker import StreamingChunker, estimate_tokens
+
+    text = (
+        "# Manual\n\n## Flash\nCheck the parting line. Re-polish the cavity.\n\n"
+        "## Short shot\nIncrease injection pressure. Verify the vents.\n"
+    )
+    chunker = StreamingChunker(
+        max_tokens=200, overlap_tokens=0,
+        count_tokens=lambda texts: [estimate_tokens(t) for t in texts],
+    )
+
+    whole = chunker.chunk_text(text)
+    streamed = list(chunker.iter_chunks(text[i:i + 5] for i in range(0, len(text), 5)))
+
+    assert [c["section"] for c in whole] == ["Manual > Flash", "Manual > Short shot"]
+    assert whole[1]["text"].startswith("## Short shot")
+    assert [c["text"] for c in streamed] == [c["text"] for c in whole]
+    assert all(text[c["start_char"]:c["end_char"]] == c["text"] for c in whole)
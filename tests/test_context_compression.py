@@ -4,9 +4,9 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 
-from agents.context_manager import compress_if_needed
+from agents.context_manager import apply_prefix_stable_window, compress_if_needed
 
 
 @pytest.mark.asyncio
@@ -27,3 +27,38 @@ async def test_compress_if_needed_summarizes():
 
     assert "Summary" in compressed[0].content
     assert len(compressed) == 3
+
+
+def _turn(i):
+    return [
+        HumanMessage(content=f"question {i}"),
+        AIMessage(content="", tool_calls=[{"id": f"c{i}", "name": "lookup", "args": {}}]),
+        ToolMessage(content=f"result {i}", tool_call_id=f"c{i}"),
+        AIMessage(content=f"answer {i}"),
+    ]
+
+
+def test_prefix_stable_window_trims_in_blocks():
+    history = _turn(0) + _turn(1)[:1]
+    first = apply_prefix_stable_window(history, max_messages=6, block_size=4)
+    assert first == history
+
+    history += _turn(1)[1:3]
+    second = apply_prefix_stable_window(history, max_messages=6, block_size=4)
+    assert second[0] is history[4]
+
+    # Growing within the block keeps the same start, so the prompt is append-only
+    history += _turn(1)[3:] + _turn(2)[:1]
+    third = apply_prefix_stable_window(history, max_messages=6, block_size=4)
+    assert third[:len(second)] == second
+
+
+def test_prefix_stable_window_keeps_summary_first_and_skips_orphan_tool_results():
+    summary = SystemMessage(content="Previous conversation summary: ...")
+    history = [summary] + _turn(0) + _turn(1)
+
+    window = apply_prefix_stable_window(history, max_messages=6, block_size=1)
+
+    assert window[0] is summary
+    assert not isinstance(window[1], ToolMessage)
+    assert len(window) - 1 <= 6
@@ -0,0 +1,57 @@
+"""Tests for batched document indexing."""
+
+import pytest
+from qdrant_client import QdrantClient
+
+from services.rag_pipeline import document_indexer
+from services.rag_pipeline.document_indexer import DocumentIndexer, token_batches
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    async def get_embeddings_batch(self, texts):
+        self.calls.append(len(texts))
+        if any("FAIL" in t for t in texts):
+            return []
+        return [[0.1] * 1024 for _ in texts]
+
+
+def test_token_batches_respects_token_budget_and_size():
+    texts = ["a" * 400, "b" * 400, "c" * 400, "d"]
+    assert list(token_batches(texts, max_tokens=250, max_items=8)) == [[0, 1], [2, 3]]
+    assert list(token_batches(texts, max_tokens=10_000, max_items=3)) == [[0, 1, 2], [3]]
+
+    # CJK characters cost about a token each
+    assert list(token_batches(["模具" * 100] * 2, max_tokens=250)) == [[0], [1]]
+
+
+@pytest.mark.asyncio
+async def test_index_document_batches_embeddings_and_upserts(monkeypatch):
+    monkeypatch.setattr(document_indexer, "UPSERT_BATCH_SIZE", 3)
+    indexer = DocumentIndexer(collection_name="test_docs", qdrant_client=QdrantClient(":memory:"))
+    indexer.embeddings = FakeEmbeddings()
+
+    ok = await indexer.index_document("x" * 8000, {"source": "manual.txt"})
+
+    chunks = indexer._chunk_text("x" * 8000)
+    assert ok
+    assert sum(indexer.embeddings.calls) == len(chunks)
+    assert len(indexer.embeddings.calls) < len(chunks)
+    points, _ = indexer.qdrant.scroll("test_docs", limit=100)
+    assert sorted(p.payload["chunk_index"] for p in points) == list(range(len(chunks)))
+
+
+@pytest.mark.asyncio
+async def test_failed_embedding_batch_is_skipped(monkeypatch):
+    monkeypatch.setattr(document_indexer, "EMBED_BATCH_SIZE", 1)
+    indexer = DocumentIndexer(collection_name="test_docs", qdrant_client=QdrantClient(":memory:"))
+    indexer.embeddings = FakeEmbeddings()
+    chunks = ["first", "FAIL", "third"]
+
+    upserted = await indexer._embed_and_upsert(
+        chunks, lambda i, v: document_indexer.qmodels.PointStruct(id=i, vector=v, payload={"i": i})
+    )
+
+    assert upserted == 2
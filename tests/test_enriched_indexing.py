@@ -72,7 +72,7 @@ async def test_index_with_enrichment_creates_double_points():
     # 2 texts to embed: original + enriched
     embed_response = _mock_embeddings_response(count=2)
 
-    mock_qdrant = MagicMock()
+    mock_qdrant = AsyncMock()
     mock_qdrant.get_collection.return_value = True
 
     # Mock httpx.AsyncClient as an async context manager
@@ -86,7 +86,7 @@ async def test_index_with_enrichment_creates_double_points():
     with (
         patch("httpx.AsyncClient", return_value=mock_async_client_cm),
         patch(
-            "qdrant_client.QdrantClient", return_value=mock_qdrant
+            "services.qdrant_clients.get_async_qdrant_client", return_value=mock_qdrant
         ),
     ):
         from services.admin_endpoints import _index_chunks_with_enrichment
@@ -99,7 +99,7 @@ async def test_index_with_enrichment_creates_double_points():
 
     # Should have upserted 2 points (original + enriched)
     assert result == 2
-    mock_qdrant.upsert.assert_called_once()
+    mock_qdrant.upsert.assert_awaited_once()
     upsert_kwargs = mock_qdrant.upsert.call_args
     points = upsert_kwargs.kwargs.get("points", [])
     assert len(points) == 2
@@ -123,7 +123,7 @@ async def test_index_without_enrichment_falls_back():
     # 1 text to embed: just original
     embed_response = _mock_embeddings_response(count=1)
 
-    mock_qdrant = MagicMock()
+    mock_qdrant = AsyncMock()
     mock_qdrant.get_collection.return_value = True
 
     mock_http_client = AsyncMock()
@@ -136,7 +136,7 @@ async def test_index_without_enrichment_falls_back():
     with (
         patch("httpx.AsyncClient", return_value=mock_async_client_cm),
         patch(
-            "qdrant_client.QdrantClient", return_value=mock_qdrant
+            "services.qdrant_clients.get_async_qdrant_client", return_value=mock_qdrant
         ),
     ):
         from services.admin_endpoints import _index_chunks_with_enrichment
@@ -149,7 +149,7 @@ async def test_index_without_enrichment_falls_back():
 
     # Should have upserted 1 point (original only)
     assert result == 1
-    mock_qdrant.upsert.assert_called_once()
+    mock_qdrant.upsert.assert_awaited_once()
     upsert_kwargs = mock_qdrant.upsert.call_args
     points = upsert_kwargs.kwargs.get("points", [])
     assert len(points) == 1
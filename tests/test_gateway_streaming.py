@@ -0,0 +1,167 @@
+"""Tests for streaming Slack/Telegram gateway replies."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.gateway_streaming import (
+    ChatQueues,
+    ProgressiveReply,
+    get_http_session,
+    close_http_session,
+    split_message,
+    stream_reply,
+)
+
+
+def _chunk(delta=None, progress=None):
+    chunk = {"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta or {}, "finish_reason": None}]}
+    if progress:
+        chunk["bbx_progress"] = progress
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+async def _agent_api(request):
+    body = await request.json()
+    assert body["stream"] is True and body["metadata"]["progress"] is True
+    resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+    await resp.prepare(request)
+    for event in [
+        _chunk(progress={"type": "token", "text": "Let me check"}),
+        _chunk(progress={"type": "tool_start", "tool": "search_troubleshooting_kb"}),
+        _chunk(progress={"type": "tool_end", "tool": "search_troubleshooting_kb"}),
+        _chunk(progress={"type": "token", "text": "Flash is "}),
+        _chunk(progress={"type": "token", "text": "caused by..."}),
+        _chunk(delta={"role": "assistant", "content": '[TOOL_RESULTS][{"x": 1}][/TOOL_RESULTS]\n\nFlash is caused by '}),
+        _chunk(delta={"content": "high pressure.\n\n[BBX_SESSION]s1[/BBX_SESSION]"}),
+        b"data: [DONE]\n\n",
+    ]:
+        await resp.write(event)
+        await asyncio.sleep(0.01)
+    return resp
+
+
+@pytest.mark.asyncio
+async def test_stream_reply_shows_progress_then_final_answer():
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", _agent_api)
+    server = TestServer(app)
+    await server.start_server()
+    shown = []
+
+    async def edit(text):
+        shown.append(text)
+
+    try:
+        reply = ProgressiveReply(edit, min_interval=0)
+        final = await stream_reply(
+            get_http_session(), str(server.make_url("/v1/chat/completions")),
+            {"messages": [{"role": "user", "content": "flash?"}]}, {}, reply,
+        )
+        await reply.finish(final)
+    finally:
+        await close_http_session()
+        await server.close()
+
+    assert "🔧 search_troubleshooting_kb …" in shown[1]
+    assert "Flash is caused by..." in shown
+    assert shown[-1] == final == "Flash is caused by high pressure."
+
+
+@pytest.mark.asyncio
+async def test_progressive_edits_are_rate_limited_and_latest_wins():
+    edits = []
+
+    async def edit(text):
+        edits.append((time.monotonic(), text))
+
+    reply = ProgressiveReply(edit, min_interval=0.1)
+    for n in range(20):
+        await reply.update(f"draft {n}")
+        await asyncio.sleep(0.01)
+    await reply.finish("final")
+
+    assert edits[0][1] == "draft 0" and edits[-1][1] == "final"
+    assert len(edits) <= 5
+    gaps = [b[0] - a[0] for a, b in zip(edits, edits[1:])]
+    assert min(gaps) >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_chat_queues_serialize_per_chat_without_starving_others():
+    queues = ChatQueues(per_chat=1, total=2)
+    order = []
+
+    async def job(name, seconds):
+        order.append(("start", name))
+        await asyncio.sleep(seconds)
+        order.append(("end", name))
+
+    burst = [queues.run("busy", lambda n=n: job(f"busy{n}", 0.05)) for n in range(4)]
+    other = queues.run("quiet", lambda: job("quiet", 0.01))
+    await asyncio.gather(*burst, other)
+
+    # The quiet chat ran alongside the first burst message, not after all four
+    assert order.index(("end", "quiet")) < order.index(("start", "busy1"))
+    # Burst messages ran one at a time, in order
+    busy = [e for e in order if e[1].startswith("busy")]
+    assert busy == [(k, f"busy{n}") for n in range(4) for k in ("start", "end")]
+    assert queues.pending("busy") == 0
+
+
+def test_split_message_prefers_line_breaks():
+    text = "a" * 30 + "\n" + "b" * 30
+    assert split_message(text, 40) == ["a" * 30, "b" * 30]
+    assert split_message("c" * 50, 20) == ["c" * 20, "c" * 20, "c" * 10]
+
+
+def test_progress_event_mapping():
+    from services.agent_api import progress_event
+
+    token = SimpleNamespace(content="Hello")
+    assert progress_event({"event": "on_chat_model_stream", "data": {"chunk": token},
+                           "metadata": {"langgraph_node": "mold_agent"}}) == {"type": "token", "text": "Hello"}
+    assert progress_event({"event": "on_chat_model_stream", "data": {"chunk": token},
+                           "metadata": {"langgraph_node": "router"}}) is None
+    assert progress_event({"event": "on_tool_start", "name": "search_kb"}) == {"type": "tool_start", "tool": "search_kb"}
+    assert progress_event({"event": "on_chain_start", "name": "LangGraph"}) is None
+
+
+def test_progress_stream_is_logged_with_the_gateway_user(monkeypatch):
+    agent_api = pytest.importorskip("services.agent_api")
+    from fastapi.testclient import TestClient
+
+    class FakeGraph:
+        async def astream_events(self, inputs, version):
+            yield {"event": "on_tool_start", "name": "search_kb"}
+            final = {"messages": [SimpleNamespace(content="Flash is caused by high pressure.")],
+                     "current_agent": "mold_agent", "confidence": 0.9}
+            yield {"event": "on_chain_end", "parent_ids": [], "data": {"output": final}}
+
+    logged = []
+
+    async def log_conversation(**record):
+        logged.append(record)
+
+    monkeypatch.setattr(agent_api, "agent_app", FakeGraph())
+    monkeypatch.setattr(agent_api, "log_conversation", log_conversation)
+    monkeypatch.setattr(agent_api, "VALIDATOR_AVAILABLE", False)
+
+    resp = TestClient(agent_api.app).post(
+        "/v1/chat/completions",
+        json={"messages": [{"role": "user", "content": "flash?"}], "stream": True,
+              "thread_id": "tg-1", "metadata": {"progress": True}},
+        headers={"x-user-id": "telegram:42"},
+    )
+
+    assert "bbx_progress" in resp.text and resp.text.endswith("data: [DONE]\n\n")
+    assert len(logged) == 1
+    record = logged[0]
+    assert record["user_id"] == "telegram:42" and record["session_id"] == "tg-1"
+    assert record["user_message"] == "flash?" and record["agent_type"] == "mold_agent"
+    assert "Flash is caused by high pressure." in record["agent_response"]
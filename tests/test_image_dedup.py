@@ -0,0 +1,78 @@
+"""Tests for image dedup before VLM enrichment."""
+
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from services.troubleshooting import vl_processor as vl_module
+from services.troubleshooting.image_dedup import ImageAnalysisIndex, hash_image
+from services.troubleshooting.vl_processor import VLProcessor
+
+
+def _photo(path, seed, size=(200, 150)):
+    rng = np.random.default_rng(seed)
+    img = Image.fromarray((rng.random((30, 40, 3)) * 255).astype(np.uint8)).resize(size)
+    ImageDraw.Draw(img).ellipse((40, 30, 120, 110), fill=(250, 250, 250))
+    img.save(path, "JPEG", quality=95)
+    return path
+
+
+def test_phash_matches_reencoded_copies_only(tmp_path):
+    original = _photo(tmp_path / "a.jpg", seed=1)
+    Image.open(original).resize((160, 120)).save(tmp_path / "a_small.jpg", "JPEG", quality=70)
+    other = _photo(tmp_path / "b.jpg", seed=2)
+
+    index = ImageAnalysisIndex(str(tmp_path / "index.sqlite"))
+    sha, phash = hash_image(original)
+    index.store(sha, phash, "a", {"defect_type": "披锋"}, vlm_seconds=20.0)
+
+    assert index.lookup(*hash_image(original)).exact is True
+    near = index.lookup(*hash_image(tmp_path / "a_small.jpg"))
+    assert near is not None and not near.exact and near.analysis == {"defect_type": "披锋"}
+    assert index.lookup(*hash_image(other)) is None
+
+    # Reloaded from disk
+    assert len(ImageAnalysisIndex(str(tmp_path / "index.sqlite"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_enrich_submits_one_job_per_distinct_image(tmp_path, monkeypatch):
+    a = _photo(tmp_path / "a.jpg", seed=1)
+    b = _photo(tmp_path / "b.jpg", seed=2)
+    shutil.copy(a, tmp_path / "20240101_a.jpg")  # re-upload under a new prefix
+
+    class FakeClient:
+        def __init__(self, base_url):
+            pass
+
+        async def close(self):
+            pass
+
+    submitted = []
+
+    async def fake_vlm(client, img):
+        submitted.append(img["image_id"])
+        return {"vl_description": f"desc {img['image_id']}", "defect_type": "披锋"}
+
+    monkeypatch.setattr(vl_module, "VLMServiceClient", FakeClient, raising=False)
+    processor = VLProcessor(enabled=False)
+    processor.enabled = processor.service_available = True
+    processor._dedup_index = ImageAnalysisIndex(str(tmp_path / "index.sqlite"))
+    monkeypatch.setattr(processor, "_process_image_vlm", fake_vlm)
+
+    def case(case_id, images):
+        return {"case_id": case_id, "issues": [
+            {"images": [{"image_id": i, "file_path": str(p)} for i, p in images]}
+        ]}
+
+    first = await processor.enrich_case_async(case("C1", [("a1", a), ("b1", b), ("a2", a)]))
+    assert sorted(submitted) == ["a1", "b1"]
+    reused = first["issues"][0]["images"][2]
+    assert reused["vlm_reused_from"] == "a1" and reused["vl_description"] == "desc a1"
+
+    second = await processor.enrich_case_async(case("C2", [("a3", tmp_path / "20240101_a.jpg")]))
+    assert len(submitted) == 2
+    assert second["vlm_dedup"]["dedup_ratio"] == 1.0
+    assert processor.dedup_summary()["reused"] == 2 and processor.dedup_summary()["submitted"] == 2
@@ -0,0 +1,112 @@
+"""Tests for the troubleshooting image similarity index."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from qdrant_client import QdrantClient, models
+
+import tools.troubleshooting_tools as troubleshooting_tools
+from services.troubleshooting.image_index import TroubleshootingImageIndex
+
+
+class ColorEmbedder:
+    """Mean RGB colour as a (normalized) image embedding."""
+
+    def embed_files(self, paths):
+        vectors = []
+        for path in paths:
+            mean = np.asarray(Image.open(path).convert("RGB"), dtype=np.float32).mean(axis=(0, 1)) + 1.0
+            vectors.append((mean / np.linalg.norm(mean)).tolist())
+        return vectors
+
+
+def _image(tmp_path, name, color):
+    path = tmp_path / f"{name}.jpg"
+    Image.new("RGB", (32, 32), color).save(path)
+    return {"image_id": name, "file_path": str(path), "defect_type": "披锋"}
+
+
+def _index(tmp_path):
+    client = QdrantClient(":memory:")
+    index = TroubleshootingImageIndex(client, ColorEmbedder())
+    indexed = index.index_case_images("TS-1", [
+        ("TS-1-1-5", 1, [_image(tmp_path, "red1", (250, 10, 10)), _image(tmp_path, "red2", (240, 20, 10))]),
+        ("TS-1-2-6", 2, [_image(tmp_path, "blue", (10, 10, 250)), {"image_id": "missing"}]),
+    ])
+    assert indexed == 3
+    return client, index
+
+
+def test_search_groups_images_by_issue_and_delete_case(tmp_path):
+    client, index = _index(tmp_path)
+
+    query = tmp_path / "query.jpg"
+    Image.new("RGB", (32, 32), (245, 15, 12)).save(query)
+    groups = index.search_file(query, top_k=2)
+
+    assert [g["issue_id"] for g in groups] == ["TS-1-1-5", "TS-1-2-6"]
+    assert groups[0]["case_id"] == "TS-1" and len(groups[0]["images"]) == 1
+
+    index.delete_case("TS-1")
+    assert client.count(index.collection).count == 0
+
+
+def test_find_similar_defects_uses_visual_index_without_vlm(tmp_path, monkeypatch):
+    client, index = _index(tmp_path)
+    client.create_collection("troubleshooting_issues", vectors_config=models.VectorParams(size=3, distance=models.Distance.COSINE))
+    client.upsert("troubleshooting_issues", points=[models.PointStruct(
+        id=1, vector=[1.0, 0.0, 0.0],
+        payload={"issue_id": "TS-1-2-6", "issue_number": 2, "problem": "蓝色缺陷", "solution": "调整"},
+    )])
+    monkeypatch.setattr(troubleshooting_tools, "get_image_index", lambda: index)
+    monkeypatch.setattr(troubleshooting_tools, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(troubleshooting_tools, "_find_similar_by_description", lambda *a: {"error": "VLM called"})
+
+    query = tmp_path / "query.png"
+    Image.new("RGB", (32, 32), (5, 5, 240)).save(query)
+    result = json.loads(troubleshooting_tools.find_similar_defects.invoke({"file_path": str(query), "top_k": 1}))
+
+    assert result["search_mode"] == "visual"
+    case = result["similar_cases"][0]
+    assert case["problem"] == "蓝色缺陷" and case["images"][0]["image_url"].endswith("/blue")
+
+
+def test_uncollected_descriptions_are_evicted(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    class FakeAnalyzer:
+        def invoke(self, args):
+            release.wait(5)
+            return json.dumps({"status": "success", "analysis": {"summary": args["file_path"]}})
+
+    monkeypatch.setattr(troubleshooting_tools, "analyze_document_realtime", FakeAnalyzer())
+    monkeypatch.setattr(troubleshooting_tools, "_pending_descriptions", {})
+    monkeypatch.setattr(troubleshooting_tools, "_description_finished_at", {})
+    finished = troubleshooting_tools._description_finished_at
+
+    def start_and_wait(path):
+        release.clear()
+        assert troubleshooting_tools._background_description(path)["status"] == "pending"
+        release.set()
+        key = str(Path(path).resolve())
+        deadline = time.monotonic() + 5
+        while key not in finished and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return key
+
+    first, second = str(tmp_path / "a.png"), str(tmp_path / "b.png")
+
+    # Collected within the TTL: the result comes back once, then the entry is gone
+    start_and_wait(first)
+    assert troubleshooting_tools._background_description(first)["summary"] == first
+    assert troubleshooting_tools._pending_descriptions == {} and finished == {}
+
+    # Never collected: dropped once it has been finished for longer than the TTL
+    key = start_and_wait(second)
+    finished[key] -= troubleshooting_tools.DESCRIPTION_RESULT_TTL_SECONDS + 1
+    troubleshooting_tools._background_description(first)
+    assert key not in troubleshooting_tools._pending_descriptions and key not in finished
@@ -0,0 +1,111 @@
+"""Tests for the knowledge base document catalog."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from services import kb_catalog
+
+
+class FakeConn:
+    def __init__(self):
+        self.calls = []
+
+    async def fetchval(self, query, *args):
+        self.calls.append((query, args))
+        return 1
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        return [{
+            "doc_id": "doc-1", "source_file": "manual.pdf", "file_type": "pdf",
+            "domain": "mold", "upload_date": datetime(2026, 1, 2, tzinfo=timezone.utc),
+            "uploaded_by": "admin", "chunk_count": 3, "has_images": True,
+        }]
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConn()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def test_summarize_payloads_groups_chunks_by_document():
+    payloads = [
+        ({"doc_id": "d1", "source_file": "a.PDF", "domain": "mold",
+          "upload_date": "2026-01-02T00:00:00+00:00"}, "p1"),
+        ({"doc_id": "d1", "source_file": "a.PDF", "has_images": True}, "p2"),
+        ({"source": "legacy.docx", "timestamp": 1700000000}, "p3"),
+    ]
+
+    docs = kb_catalog.summarize_payloads(payloads)
+
+    assert docs["d1"]["chunk_count"] == 2
+    assert docs["d1"]["has_images"] is True
+    assert docs["d1"]["file_type"] == "pdf"
+    assert docs["legacy.docx"]["upload_date"] == datetime.fromtimestamp(1700000000, tz=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_list_documents_filters_and_pages_in_sql():
+    pool = FakePool()
+
+    documents, total = await kb_catalog.list_documents(
+        pool, "mold_reference_kb", domain="mold", search="manual", limit=10, offset=20
+    )
+
+    count_query, count_args = pool.conn.calls[0]
+    page_query, page_args = pool.conn.calls[1]
+    assert "domain = $2" in count_query and "ILIKE $3" in count_query
+    assert count_args == ("mold_reference_kb", "mold", "%manual%")
+    assert "LIMIT $4 OFFSET $5" in page_query
+    assert page_args[-2:] == (10, 20)
+    assert total == 1
+    assert documents[0]["upload_date"] == "2026-01-02T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_list_documents_search_matches_wildcards_literally():
+    pool = FakePool()
+
+    await kb_catalog.list_documents(pool, "mold_reference_kb", search="50%_off\\v2")
+
+    count_query, count_args = pool.conn.calls[0]
+    assert "ILIKE $2 ESCAPE '\\'" in count_query
+    assert count_args == ("mold_reference_kb", "%50\\%\\_off\\\\v2%")
+
+
+@pytest.mark.asyncio
+async def test_catalog_row_survives_a_failed_qdrant_delete(monkeypatch):
+    admin_endpoints = pytest.importorskip("services.admin_endpoints")
+    import services.qdrant_clients as qdrant_clients
+
+    class FakeQdrant:
+        def __init__(self, fail):
+            self.fail = fail
+
+        async def scroll(self, **kwargs):
+            return [object(), object()], None
+
+        async def delete(self, **kwargs):
+            if self.fail:
+                raise ConnectionError("qdrant unavailable")
+
+    removed = []
+
+    async def remove_document(pool, collection, doc_id):
+        removed.append(doc_id)
+
+    monkeypatch.setattr(kb_catalog, "remove_document", remove_document)
+
+    monkeypatch.setattr(qdrant_clients, "get_async_qdrant_client", lambda: FakeQdrant(fail=True))
+    assert await admin_endpoints._delete_from_qdrant("doc-1", "mold_reference_kb", FakePool()) == 0
+    assert removed == []
+
+    monkeypatch.setattr(qdrant_clients, "get_async_qdrant_client", lambda: FakeQdrant(fail=False))
+    assert await admin_endpoints._delete_from_qdrant("doc-1", "mold_reference_kb", FakePool()) == 2
+    assert removed == ["doc-1"]
@@ -0,0 +1,43 @@
+from langchain_core.tools import tool
+
+from agents import utils
+
+
+@tool
+def lookup_a(query: str) -> str:
+    """Look up A."""
+    return query
+
+
+@tool
+def lookup_b(query: str) -> str:
+    """Look up B."""
+    return query
+
+
+def setup_function():
+    utils.clear_llm_cache()
+
+
+def test_get_llm_reuses_client_per_key():
+    first = utils.get_llm(temperature=0.2)
+    second = utils.get_llm(temperature=0.2)
+    other = utils.get_llm(temperature=0.7)
+
+    assert first is second
+    assert first is not other
+    assert first.http_client is other.http_client
+
+
+def test_get_llm_with_tools_caches_bind_tools():
+    bound = utils.get_llm_with_tools([lookup_a, lookup_b])
+
+    assert utils.get_llm_with_tools([lookup_a, lookup_b]) is bound
+    assert utils.get_llm_with_tools([lookup_a]) is not bound
+
+
+def test_clear_llm_cache_drops_clients():
+    first = utils.get_llm()
+    utils.clear_llm_cache()
+
+    assert utils.get_llm() is not first
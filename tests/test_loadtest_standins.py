@@ -0,0 +1,68 @@
+"""Tests for the load-test backend stand-ins."""
+
+import os
+import sys
+from typing import Literal
+
+from fastapi.testclient import TestClient
+from langchain_core.tools import tool
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from loadtest_standins import LLMStandIn, create_llm_app, create_qdrant_app, embed_text  # noqa: E402
+
+
+class Route(BaseModel):
+    destination: Literal["erp_agent", "mold_agent", "general_agent"]
+    reasoning: str
+
+
+@tool
+def search_troubleshooting_kb(query: str, top_k: int = 3) -> str:
+    """Search the troubleshooting knowledge base."""
+    return query
+
+
+def _llm(app, **kwargs):
+    return ChatOpenAI(base_url="http://testserver/v1", api_key="x", model="stand-in",
+                      http_client=TestClient(app), **kwargs)
+
+
+def test_llm_stand_in_speaks_openai_for_langchain():
+    app = create_llm_app(LLMStandIn(ttft_ms=0, tokens_per_s=0, answer_tokens=5, tool_rate=1.0))
+
+    route = _llm(app, streaming=True).with_structured_output(Route).invoke("产品披锋怎么解决？")
+    assert route.destination == "mold_agent"
+
+    reply = _llm(app, streaming=True).bind_tools([search_troubleshooting_kb]).invoke("披锋")
+    assert reply.tool_calls[0]["name"] == "search_troubleshooting_kb"
+    assert reply.tool_calls[0]["args"] == {"query": "披锋"}
+
+    answer = _llm(app).invoke("hello")
+    assert len(answer.content.split()) == 5
+
+    stats = TestClient(app).get("/stats").json()
+    assert stats["routes"]["POST /v1/chat/completions"]["calls"] == 3
+
+
+def test_qdrant_facade_round_trip():
+    from qdrant_client.http import models
+
+    client = TestClient(create_qdrant_app())
+    assert client.put("/collections/docs", json={"vectors": {"size": 1024, "distance": "Cosine"}}).status_code == 200
+    points = [{"id": n, "vector": embed_text(f"doc {n}"), "payload": {"domain": "erp" if n % 2 else "crm"}}
+              for n in range(1, 11)]
+    assert client.put("/collections/docs/points?wait=true", json={"points": points}).status_code == 200
+
+    body = {"query": embed_text("doc 3"), "limit": 3, "with_payload": True,
+            "filter": {"must": [{"key": "domain", "match": {"value": "erp"}}]}}
+    result = models.QueryResponse.model_validate(client.post("/collections/docs/points/query", json=body).json()["result"])
+    assert result.points[0].id == 3
+    assert all(p.payload["domain"] == "erp" for p in result.points)
+    # Shared direction keeps unrelated texts above the searchers' score thresholds
+    assert 0.5 < result.points[1].score < 0.95
+
+    assert client.get("/collections/missing/exists").json()["result"] == {"exists": False}
+    assert client.post("/collections/docs/points/count", json={"exact": True}).json()["result"] == {"count": 10}
@@ -0,0 +1,105 @@
+"""Tests for batched GOT-OCR inference."""
+
+import asyncio
+import io
+import json
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from services.ocr.ocr_batcher import OCRBatcher
+
+
+def _decode(content: bytes) -> str:
+    if content.startswith(b"bad"):
+        raise ValueError("cannot identify image file")
+    return content.decode()
+
+
+class FakeModel:
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.batches = []
+        self.threads = set()
+
+    def infer(self, images, ocr_type):
+        self.batches.append(list(images))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.seconds)
+        if "boom" in images:
+            raise RuntimeError("CUDA out of memory")
+        return [f"{ocr_type}:{image}" for image in images]
+
+
+@pytest.mark.asyncio
+async def test_images_are_batched_and_results_stream_back_by_index():
+    model = FakeModel()
+    batcher = OCRBatcher(model.infer, _decode, batch_size=4, wait_ms=20, preprocess_workers=2)
+    try:
+        contents = [f"page{i}".encode() for i in range(10)] + [b"bad-jpeg"]
+        results = [r async for r in batcher.submit_many(contents, "format")]
+    finally:
+        await batcher.close()
+
+    by_index = dict(results)
+    assert [by_index[i] for i in range(10)] == [f"format:page{i}" for i in range(10)]
+    assert isinstance(by_index[10], ValueError)
+    # 10 good pages in batches of at most 4, all on the single inference thread
+    assert sorted(len(b) for b in model.batches) == [2, 4, 4]
+    assert len(model.threads) == 1 and model.threads.pop().startswith("ocr-infer")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_batches_and_failures_stay_in_their_batch():
+    model = FakeModel(seconds=0.1)
+    batcher = OCRBatcher(model.infer, _decode, batch_size=8, wait_ms=20)
+    try:
+        first = asyncio.create_task(batcher.submit(b"a"))
+        await asyncio.sleep(0.05)  # "a" is now running alone
+        rest = await asyncio.gather(
+            *(batcher.submit(c) for c in (b"b", b"c", b"boom")), return_exceptions=True
+        )
+        after = await batcher.submit(b"d")
+    finally:
+        await batcher.close()
+
+    assert await first == "ocr:a"
+    assert all(isinstance(r, RuntimeError) for r in rest)
+    assert after == "ocr:d"
+    assert [sorted(b) for b in model.batches] == [["a"], ["b", "boom", "c"], ["d"]]
+
+
+def test_batch_endpoint_streams_ndjson():
+    got_ocr_service = pytest.importorskip("services.ocr.got_ocr_service")
+    from fastapi.testclient import TestClient
+
+    def png(color):
+        buf = io.BytesIO()
+        Image.new("RGB", (3000, 1000), color).save(buf, "PNG")
+        return buf.getvalue()
+
+    sizes = []
+
+    def infer(images, ocr_type):
+        sizes.extend(image.size for image in images)
+        return [f"{image.getpixel((0, 0))}" for image in images]
+
+    got_ocr_service._batcher = OCRBatcher(infer, got_ocr_service.preprocess_image, batch_size=2)
+    try:
+        client = TestClient(got_ocr_service.app)
+        files = [("files", (f"p{i}.png", png(c), "image/png")) for i, c in enumerate(["red", "blue", "white"])]
+        files.append(("files", ("broken.png", b"not an image", "image/png")))
+
+        resp = client.post("/ocr/batch?stream=true", files=files)
+        lines = sorted((json.loads(line) for line in resp.text.splitlines()), key=lambda r: r["index"])
+        assert [r["text"] for r in lines[:3]] == ["(255, 0, 0)", "(0, 0, 255)", "(255, 255, 255)"]
+        assert lines[3]["success"] is False and lines[3]["error"]
+
+        ordered = client.post("/ocr/batch", files=files[:2]).json()
+        assert [r["text"] for r in ordered] == ["(255, 0, 0)", "(0, 0, 255)"]
+    finally:
+        got_ocr_service._batcher = None
+
+    assert set(sizes) == {(2048, 682)}
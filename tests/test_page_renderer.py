@@ -0,0 +1,114 @@
+"""Tests for the office conversion pool and parallel page rasterization."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.troubleshooting import page_renderer as renderer_module
+from services.troubleshooting.office_converter import OfficeConverterPool
+from services.troubleshooting.page_renderer import PageRenderer
+
+
+class FakeWorker:
+    """Stands in for an office daemon; writes a dummy PDF."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, index):
+        self.index = index
+        self.starts = 0
+        self.running = False
+        self.fail_next = False
+
+    def start(self):
+        self.starts += 1
+        self.running = True
+
+    def alive(self):
+        return self.running
+
+    def stop(self):
+        self.running = False
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def convert(self, src, pdf_path):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionRefusedError("daemon gone")
+        with FakeWorker.lock:
+            FakeWorker.active += 1
+            FakeWorker.peak = max(FakeWorker.peak, FakeWorker.active)
+        time.sleep(0.02)
+        pdf_path.write_bytes(b"%PDF-1.4")
+        with FakeWorker.lock:
+            FakeWorker.active -= 1
+
+
+def test_pool_queues_requests_and_restarts_workers(tmp_path):
+    FakeWorker.peak = 0
+    pool = OfficeConverterPool(size=2, worker_factory=FakeWorker)
+    books = [tmp_path / f"case_{n}.xlsx" for n in range(6)]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        pdfs = list(executor.map(lambda book: pool.convert(book, tmp_path / "pdf"), books))
+
+    assert [p.name for p in pdfs] == [f"case_{n}.pdf" for n in range(6)]
+    assert FakeWorker.peak == 2
+    # Started once each, on first use
+    assert [w.starts for w in pool.workers] == [1, 1]
+
+    # A dead daemon is restarted before use; a failed conversion is retried once
+    worker = pool.workers[0]
+    pool.workers[1].fail_next = True
+    worker.running = False
+    pool.convert(books[0], tmp_path / "pdf")
+    pool.convert(books[1], tmp_path / "pdf")
+    assert pool.stats["restarts"] == 2 and pool.stats["failures"] == 0
+    assert pool.stats["conversions"] == 8
+
+
+def test_pages_are_rendered_in_parallel_and_streamed(tmp_path, monkeypatch):
+    pdf = tmp_path / "case.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    calls = []
+
+    def fake_convert(path, dpi, first_page, last_page, output_folder, output_file, **kwargs):
+        assert first_page == last_page and kwargs["single_file"] and kwargs["paths_only"]
+        calls.append(first_page)
+        # Later pages finish first
+        time.sleep(0.01 * (5 - first_page))
+        out = f"{output_folder}/{output_file}.png"
+        open(out, "wb").write(b"png")
+        return [out]
+
+    monkeypatch.setattr(renderer_module, "pdfinfo_from_path", lambda path: {"Pages": 4})
+    monkeypatch.setattr(renderer_module, "convert_from_path", fake_convert)
+    renderer = PageRenderer(tmp_path / "render", office_pool=OfficeConverterPool(1, worker_factory=FakeWorker),
+                            render_workers=4)
+
+    streamed = [page for page, path in renderer.iter_page_images(pdf)]
+    assert sorted(streamed) == [1, 2, 3, 4] and streamed != [1, 2, 3, 4]
+
+    pages = renderer._convert_pdf_to_images(pdf)
+    assert [p.name for p in pages] == ["page_01.png", "page_02.png", "page_03.png", "page_04.png"]
+    assert all(p.exists() for p in pages)
+
+
+def test_pool_failure_propagates(tmp_path):
+    class BrokenWorker(FakeWorker):
+        def convert(self, src, pdf_path):
+            raise RuntimeError("cannot load document")
+
+    pool = OfficeConverterPool(size=1, worker_factory=BrokenWorker)
+    with pytest.raises(RuntimeError):
+        pool.convert(tmp_path / "bad.xlsx", tmp_path)
+    assert pool.stats["failures"] == 1
+    # The worker is returned to the queue
+    assert pool._idle.qsize() == 1
@@ -0,0 +1,65 @@
+"""Tests for parallel GLM-OCR page-crop extraction."""
+
+import asyncio
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from services import pdf_crops
+from services.pdf_crops import _split_by_page, encode_pixmap
+
+
+def _pixmap(width=40, height=20):
+    samples = bytes([200, 30, 30]) * (width * height)
+    return SimpleNamespace(n=3, width=width, height=height, samples=samples, alpha=0)
+
+
+@pytest.mark.parametrize("image_format,pil_format", [("jpeg", "JPEG"), ("webp", "WEBP")])
+def test_encode_pixmap_lossy_formats(image_format, pil_format):
+    image = Image.open(io.BytesIO(encode_pixmap(_pixmap(), image_format, quality=80)))
+    assert image.format == pil_format and image.size == (40, 20)
+
+
+def test_jobs_are_split_by_whole_pages():
+    jobs = [(page, f"p{page}_img{i}", (0, 0, 1, 1)) for page in (0, 3, 1, 2, 3) for i in range(2)]
+    tasks = _split_by_page(jobs, pages_per_task=2)
+    assert [[j[0] for j in task] for task in tasks] == [[0, 0, 1, 1], [2, 2, 3, 3, 3, 3]]
+
+
+def test_extract_images_from_pdf_renders_deduplicated_crops(tmp_path, monkeypatch):
+    fitz = pytest.importorskip("fitz")
+    from services.admin_endpoints import _extract_images_from_pdf, _replace_image_placeholders
+
+    pdf_path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        page = doc.new_page(width=300, height=300)
+        page.draw_rect(fitz.Rect(50, 50, 150, 150), color=(1, 0, 0), fill=(1, 0, 0))
+    doc.save(str(pdf_path))
+    doc.close()
+
+    image = {"label": "image", "bbox_2d": [50, 50, 150, 150]}
+    json_result = [
+        [image, dict(image), {"label": "text", "bbox_2d": [0, 0, 10, 10]}],
+        [{"label": "chart", "bbox_2d": [150, 150, 50, 50]}],
+        [{"label": "image", "bbox_2d": [290, 290, 400, 400]}],
+    ]
+    # Force the process pool: one page per task
+    monkeypatch.setattr(pdf_crops, "PDF_CROP_WORKERS", 2)
+    monkeypatch.setattr(pdf_crops, "PDF_CROP_PAGES_PER_TASK", 1)
+    try:
+        manifest = asyncio.run(_extract_images_from_pdf(
+            pdf_path, json_result, doc_id="d1", collection="kb", base_dir=tmp_path, image_format="jpeg",
+        ))
+    finally:
+        pdf_crops.shutdown_crop_pool()
+
+    images = {k: v for k, v in manifest.items() if not k.startswith("__")}
+    assert sorted(images) == ["p0_img0", "p1_img0", "p2_img0"]
+    assert images["p0_img0"]["path"].endswith("kb/d1/p0_img0.jpg")
+    assert Image.open(images["p0_img0"]["path"]).format == "JPEG"
+
+    markdown = "a ![](page=0,bbox=[50, 50, 150, 150]) b ![](page=1,bbox=[150, 150, 50, 50])"
+    assert _replace_image_placeholders(markdown, manifest) == "a <!-- image:p0_img0 --> b <!-- image:p1_img0 -->"
@@ -5,6 +5,7 @@ Tests for the plugin system.
 import pytest
 import tempfile
 import json
+import threading
 from pathlib import Path
 
 from plugins import (
@@ -232,6 +233,70 @@ class TestHookRunner:
         assert result.get("modified") is True
 
 
+    def test_hook_chain_compiled_on_register(self):
+        """Test that the handler chain is rebuilt only when hooks are registered."""
+        registry = PluginRegistry()
+
+        def hook(context):
+            return None
+
+        registry.register_hook("plugin1", HookEvent.AFTER_TOOL_CALL.value, hook)
+        chain = registry.get_hook_chain(HookEvent.AFTER_TOOL_CALL.value)
+
+        assert registry.get_hook_chain(HookEvent.AFTER_TOOL_CALL.value) is chain
+        assert not registry.get_hook_chain(HookEvent.BEFORE_ROUTING.value)
+
+        registry.register_hook("plugin2", HookEvent.AFTER_TOOL_CALL.value, hook, read_only=True)
+        updated = registry.get_hook_chain(HookEvent.AFTER_TOOL_CALL.value)
+
+        assert updated is not chain
+        assert len(updated.mutating) == 1
+        assert len(updated.read_only) == 1
+
+    def test_read_only_hooks_run_in_background(self):
+        """Test that read-only hooks see the state but cannot replace it."""
+        registry = PluginRegistry()
+        runner = HookRunner(registry)
+        seen = threading.Event()
+
+        def observer(context):
+            assert context.state["messages"] == ["hi"]
+            seen.set()
+            return {"replaced": True}
+
+        registry.register_hook(
+            "audit", HookEvent.BEFORE_ROUTING.value, observer, read_only=True
+        )
+
+        state = {"messages": ["hi"]}
+        result = runner.run_sync(HookEvent.BEFORE_ROUTING, state)
+
+        assert result is state
+        assert seen.wait(timeout=2)
+
+    @pytest.mark.asyncio
+    async def test_async_run_calls_sync_hooks_inline(self):
+        """Test that run() executes sync hooks without a thread-pool hop."""
+        registry = PluginRegistry()
+        runner = HookRunner(registry)
+        threads = []
+
+        def hook(context):
+            threads.append(threading.current_thread())
+            return {**context.state, "seen": True}
+
+        async def async_hook(context):
+            return {**context.state, "async_seen": True}
+
+        registry.register_hook("plugin1", HookEvent.BEFORE_ROUTING.value, hook, priority=100)
+        registry.register_hook("plugin2", HookEvent.BEFORE_ROUTING.value, async_hook, priority=200)
+
+        result = await runner.run(HookEvent.BEFORE_ROUTING, {"messages": []})
+
+        assert threads == [threading.current_thread()]
+        assert result["seen"] and result["async_seen"]
+
+
 class TestPluginLoader:
     """Test PluginLoader functionality."""
 
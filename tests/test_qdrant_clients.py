@@ -0,0 +1,37 @@
+"""Tests for the process-wide Qdrant clients."""
+
+import asyncio
+
+import pytest
+
+from services import qdrant_clients
+
+
+@pytest.fixture(autouse=True)
+def _fresh_clients(monkeypatch):
+    monkeypatch.setattr(qdrant_clients, "_sync_clients", {})
+    monkeypatch.setattr(qdrant_clients, "QDRANT_PREFER_GRPC", False)
+
+
+def test_sync_client_is_shared_per_host_and_port():
+    client = qdrant_clients.get_qdrant_client("127.0.0.1", 1)
+
+    assert qdrant_clients.get_qdrant_client("127.0.0.1", 1) is client
+    assert qdrant_clients.get_qdrant_client("127.0.0.1", 2) is not client
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_shared_within_a_loop():
+    client = qdrant_clients.get_async_qdrant_client("127.0.0.1", 1)
+    assert qdrant_clients.get_async_qdrant_client("127.0.0.1", 1) is client
+
+    # Another loop (e.g. a worker thread running asyncio.run) gets its own client
+    other = await asyncio.to_thread(lambda: asyncio.run(_make_client()))
+    assert other is not client
+
+    await qdrant_clients.close_qdrant_clients()
+    assert qdrant_clients.get_async_qdrant_client("127.0.0.1", 1) is not client
+
+
+async def _make_client():
+    return qdrant_clients.get_async_qdrant_client("127.0.0.1", 1)
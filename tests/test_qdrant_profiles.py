@@ -0,0 +1,47 @@
+"""Tests for Qdrant collection profiles."""
+
+import pytest
+from qdrant_client import models
+
+from services.qdrant_profiles import (
+    collection_params,
+    migration_diff,
+    payload_indexes,
+    search_params,
+    vector_params,
+)
+
+
+def test_quantized_profiles_rescore_and_move_originals_to_disk():
+    assert search_params("full") is None
+    assert collection_params("full")["quantization_config"] is None
+
+    params = search_params("int8")
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 2.0
+    assert vector_params(1024, profile="int8").on_disk is True
+    assert collection_params("binary")["quantization_config"].binary.always_ram is True
+
+    with pytest.raises(ValueError):
+        search_params("fp4")
+
+
+def test_migration_diff_and_payload_indexes():
+    diff = migration_diff("full", vector_names=("", "image"))
+    assert diff["quantization_config"] == models.Disabled.DISABLED
+    assert set(diff["vectors_config"]) == {"", "image"}
+    assert diff["collection_params"].on_disk_payload is False
+
+    assert ("part_number", models.PayloadSchemaType.KEYWORD) in payload_indexes("troubleshooting_issues")
+    assert dict(payload_indexes("mold_reference_kb"))["doc_id"] == models.PayloadSchemaType.KEYWORD
+
+
+def test_default_profile_keeps_vectors_in_ram(monkeypatch):
+    import importlib
+
+    import services.qdrant_profiles as qdrant_profiles
+
+    monkeypatch.delenv("QDRANT_COLLECTION_PROFILE", raising=False)
+    importlib.reload(qdrant_profiles)
+    assert qdrant_profiles.QDRANT_COLLECTION_PROFILE == "full"
+    assert qdrant_profiles.collection_params()["quantization_config"] is None
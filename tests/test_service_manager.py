@@ -0,0 +1,101 @@
+"""Tests for concurrent, cached service status polling."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from services import service_manager as sm_module
+from services.service_manager import ServiceInfo, ServiceManager, ServiceStatus
+
+
+def _service(name, pattern, health_url):
+    return ServiceInfo(
+        name=name, display_name=name, port=0, health_url=health_url,
+        status=ServiceStatus.UNKNOWN, process_pattern=pattern, start_script="",
+    )
+
+
+@pytest.fixture
+def services(monkeypatch):
+    registry = {
+        "api": _service("api", r"uvicorn.*8000", "http://api/health"),
+        "worker": _service("worker", "worker.py", ""),
+        "external": _service("external", "", "http://external/health"),
+        "dead": _service("dead", "missing-binary", "http://dead/health"),
+    }
+    monkeypatch.setattr(sm_module, "SERVICES", registry)
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_refresh_polls_concurrently_with_one_scan(services, monkeypatch):
+    manager = ServiceManager()
+    scans = []
+
+    async def fake_scan():
+        scans.append(1)
+        return [(300, "python uvicorn app:app --port 8000"), (120, "python worker.py"), (7, "bash")]
+
+    async def slow_health(url):
+        await asyncio.sleep(0.2)
+        return {"healthy": url != "http://external/health"}
+
+    monkeypatch.setattr(manager, "_scan_processes", fake_scan)
+    monkeypatch.setattr(manager, "_check_health", slow_health)
+
+    start = time.perf_counter()
+    result = await manager.get_all_services()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35  # two 0.2 s health checks ran side by side
+    assert len(scans) == 1
+    status = {s.name: (s.status, s.pid) for s in result}
+    assert status == {
+        "api": (ServiceStatus.RUNNING, 300),
+        "worker": (ServiceStatus.RUNNING, 120),
+        "external": (ServiceStatus.ERROR, None),
+        "dead": (ServiceStatus.STOPPED, None),
+    }
+
+    # Served from the snapshot within the TTL; max_age=0 forces a poll
+    await manager.get_all_services()
+    assert len(scans) == 1
+    await manager.get_all_services(max_age=0)
+    assert len(scans) == 2
+
+    # Concurrent callers share one poll
+    await asyncio.gather(*(manager.refresh() for _ in range(5)))
+    assert len(scans) == 3
+
+
+@pytest.mark.asyncio
+async def test_background_refresher_keeps_snapshot_warm(services, monkeypatch):
+    manager = ServiceManager()
+    polls = []
+
+    async def fake_refresh():
+        polls.append(time.monotonic())
+        manager._refreshed_at = time.monotonic()
+
+    monkeypatch.setattr(manager, "refresh", fake_refresh)
+    manager.start_refresher(interval=0.05)
+    manager.start_refresher(interval=0.05)  # idempotent
+    await asyncio.sleep(0.18)
+    await manager.close()
+
+    assert 3 <= len(polls) <= 5
+    count = len(polls)
+    await asyncio.sleep(0.1)
+    assert len(polls) == count
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+async def test_proc_scan_finds_own_process():
+    manager = ServiceManager()
+    processes = await manager._scan_processes()
+    assert any(pid == os.getpid() for pid, _ in processes)
+    assert await manager._find_process("pytest", processes) is not None
+    assert await manager._find_process("no-such-process-pattern-xyz", processes) is None
@@ -52,3 +52,67 @@ async def test_list_sessions_returns_list():
     store = SessionStore(DummyPoolContext())
     sessions = await store.list_sessions()
     assert isinstance(sessions, list)
+
+
+class PagingConn(DummyConn):
+    def __init__(self):
+        self.queries = []
+
+    async def fetchrow(self, query, *args):
+        self.queries.append((query, args))
+        return {"id": args[0], "message_count": 3}
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        # Newest first, one row past the page size
+        return [{"id": f"m{n}", "role": "user", "has_reasoning_trace": True} for n in (3, 2, 1)][: args[1]]
+
+
+@pytest.mark.asyncio
+async def test_get_session_pages_newest_first_without_blobs():
+    pool = DummyPoolContext()
+    pool.conn = PagingConn()
+    store = SessionStore(pool)
+
+    session = await store.get_session("s1", limit=2)
+    assert [m["id"] for m in session["messages"]] == ["m2", "m3"]
+    assert session["next_before"] == "m2"
+
+    query, args = pool.conn.queries[-1]
+    assert "SELECT *" not in query and "reasoning_trace IS NOT NULL" in query
+    assert args == ("s1", 3)
+
+    await store.get_session("s1", limit=2, before="m2")
+    query, args = pool.conn.queries[-1]
+    assert "(created_at, id) <" in query and args == ("s1", 3, "m2")
+
+
+class SchemaConn(DummyConn):
+    def __init__(self, present):
+        self.present = present
+        self.statements = []
+
+    def transaction(self):
+        return DummyAcquire(self)
+
+    async def execute(self, query, *args):
+        self.statements.append(" ".join(query.split()))
+
+    async def fetchval(self, query, *args):
+        return self.present
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("present,migrated", [(0, True), (3, False)])
+async def test_init_session_tables_adds_missing_counters_once(present, migrated):
+    from services.session_store import init_session_tables
+
+    pool = DummyPoolContext()
+    pool.conn = SchemaConn(present)
+    await init_session_tables(pool)
+
+    statements = pool.conn.statements
+    altered = [s for s in statements if s.startswith("ALTER TABLE sessions ADD COLUMN IF NOT EXISTS")]
+    assert len(altered) == (3 if migrated else 0)
+    assert any(s.startswith("UPDATE sessions s") for s in statements) == migrated
+    assert sum("CREATE INDEX IF NOT EXISTS" in s for s in statements) == 3
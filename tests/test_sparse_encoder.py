@@ -0,0 +1,47 @@
+"""Tests for CJK-aware sparse vectors and fused hybrid search."""
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from services.rag_pipeline.sparse_encoder import (
+    encode_documents,
+    encode_query,
+    lexical_terms,
+    sparse_vector_name,
+    sparse_vector_params,
+)
+from tools import rag_tools
+
+
+def test_chinese_queries_produce_sparse_terms():
+    assert lexical_terms("产品披锋 T1 flash。模") == ["t1", "flash", "产品", "品披", "披锋", "模"]
+    assert encode_query("产品表面披锋怎么处理") is not None
+    assert encode_query("？！") is None
+
+
+def test_hybrid_search_fuses_server_side_and_reports_agreement(monkeypatch):
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        rag_tools.COLLECTION_NAME,
+        vectors_config=VectorParams(size=2, distance=Distance.COSINE),
+        sparse_vectors_config=sparse_vector_params(),
+    )
+    texts = ["模具披锋处理方法", "注塑缩水原因分析", "parting line flash"]
+    dense = [[1.0, 0.0], [0.0, 1.0], [0.9, 0.1]]
+    client.upsert(rag_tools.COLLECTION_NAME, points=[
+        PointStruct(id=i, vector={"": d, sparse_vector_name(): s}, payload={"text": t, "domain": "mold"})
+        for i, (t, d, s) in enumerate(zip(texts, dense, encode_documents(texts)))
+    ])
+    monkeypatch.setattr(rag_tools, "get_qdrant_client", lambda: client)
+
+    hybrid = rag_tools._hybrid_search_dense_sparse(
+        [1.0, 0.0], encode_query("披锋"), domain="mold", limit=3, top_k=1
+    )
+
+    assert hybrid["results"][0]["payload"]["text"] == "模具披锋处理方法"
+    assert hybrid["agreement"] == 1.0
+
+    sparse_only = rag_tools._hybrid_search_dense_sparse(
+        [0.0, 1.0], encode_query("披锋"), limit=3, dense_weight=0
+    )
+    assert [r["id"] for r in sparse_only["results"]] == [0]
@@ -0,0 +1,166 @@
+"""Tests for the speech inference sidecar and its thin clients."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from services.speech.sidecar import RemoteASR, RemoteTTS, SpeechSidecar, SpeechSidecarError, ping
+
+
+class FakeASRSession:
+    def __init__(self, language):
+        self.language = language
+        self.samples = 0
+
+    def reset(self):
+        self.samples = 0
+
+    def set_language(self, language):
+        self.language = language
+
+    def feed_audio(self, pcm):
+        self.samples += len(pcm)
+        return {"type": "partial", "text": f"{self.samples}"} if self.samples >= 8000 else None
+
+    def finalize(self):
+        text, self.samples = f"{self.samples} samples ({self.language})", 0
+        return {"type": "final", "text": text, "language": self.language}
+
+
+class FakeTTS:
+    sample_rate = 24000
+
+    def synthesize(self, text, language=None):
+        return np.full(len(text) * 10, 7, dtype=np.int16).tobytes()
+
+
+class FakeSidecar(SpeechSidecar):
+    def load(self):
+        self._tts = FakeTTS()
+
+    def new_asr_session(self, language=None):
+        with self._stats_lock:
+            self._asr_sessions += 1
+        return FakeASRSession(language)
+
+
+@pytest.fixture
+def sidecar(tmp_path):
+    server = FakeSidecar(str(tmp_path / "speech.sock"))
+    server.load()
+    server.start()
+    yield server
+    server.shutdown()
+
+
+def test_remote_sessions_keep_separate_state_on_one_sidecar(sidecar):
+    def utterance(n):
+        asr = RemoteASR(sidecar.socket_path, language="zh")
+        asr.reset()
+        partial = None
+        for _ in range(n):
+            partial = asr.feed_audio(np.zeros(320, dtype=np.int16)) or partial
+        final = asr.finalize()
+        asr.close()
+        return partial, final
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(utterance, [10, 30, 50, 70]))
+
+    assert [final["text"] for _, final in results] == [
+        "3200 samples (zh)", "9600 samples (zh)", "16000 samples (zh)", "22400 samples (zh)",
+    ]
+    assert results[0][0] is None and results[1][0] == {"type": "partial", "text": "9600"}
+
+    tts = RemoteTTS(sidecar.socket_path)
+    assert tts.sample_rate == 24000
+    assert np.frombuffer(tts.synthesize("你好"), dtype=np.int16).tolist() == [7] * 20
+    assert tts.synthesize("  ") == b""
+
+    info = ping(sidecar.socket_path)
+    assert info["asr_sessions"] == 4 and info["tts_requests"] == 1 and info["tts_loaded"]
+    tts.close()
+
+
+def test_errors_are_reported_without_dropping_the_connection(sidecar):
+    asr = RemoteASR(sidecar.socket_path)
+    with pytest.raises(SpeechSidecarError, match="Unknown op"):
+        asr._conn.call("transcribe_everything")
+    asr.set_language("en")
+    asr.feed_audio(np.zeros(100, dtype=np.float32))
+    assert asr.finalize()["text"] == "100 samples (en)"
+    asr.close()
+
+    with pytest.raises(OSError):
+        ping(sidecar.socket_path + ".missing")
+
+
+def test_a_timed_out_reply_is_not_read_as_the_next_answer(tmp_path):
+    class SlowTTS(FakeTTS):
+        def synthesize(self, text, language=None):
+            if text == "slow":
+                time.sleep(0.3)
+            return super().synthesize(text, language)
+
+    class SlowSidecar(FakeSidecar):
+        def load(self):
+            self._tts = SlowTTS()
+
+    server = SlowSidecar(str(tmp_path / "speech.sock"))
+    server.load()
+    server.start()
+    try:
+        tts = RemoteTTS(server.socket_path)
+        conn = tts._conn
+        conn._sock.settimeout(0.1)
+        with pytest.raises(ConnectionError):
+            tts.synthesize("slow")
+        with pytest.raises(ConnectionError, match="broken"):
+            conn.call("ping")
+
+        # The shared TTS engine reconnects and gets its own reply back
+        assert len(tts.synthesize("hi")) == 2 * 10 * 2
+        assert tts._conn is not conn
+        tts.close()
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stream_setup_does_not_block_the_event_loop_on_a_busy_sidecar():
+    import asyncio
+    import threading
+    import time
+
+    livekit_local = pytest.importorskip("services.livekit_local")
+
+    class BusyRemoteASR(FakeASRSession):
+        """reset() waits on the connection lock, as RemoteASR does behind an inference."""
+
+        def __init__(self):
+            super().__init__("en")
+            self.reset_thread = None
+
+        def reset(self):
+            self.reset_thread = threading.current_thread()
+            time.sleep(0.3)
+            super().reset()
+
+    asr = BusyRemoteASR()
+    stt = livekit_local.LocalSTT(asr_instance=asr)
+    stream = stt.stream(language="zh")
+
+    ticks = 0
+    start = time.perf_counter()
+    while asr.reset_thread is None or time.perf_counter() - start < 0.3:
+        await asyncio.sleep(0.01)
+        ticks += 1
+    # The base RecognizeStream runs _run() too; stop both readers of the frame queue
+    stream._input_queue.put_nowait(None)
+    await stream.aclose()
+
+    assert asr.reset_thread is not threading.main_thread()
+    assert asr.language == "zh"
+    assert ticks >= 15  # the loop kept running while reset() blocked
@@ -0,0 +1,98 @@
+"""Tests for the concurrent text-to-SQL evaluation runner."""
+
+import threading
+import time
+
+from services.troubleshooting.evals import Evaluator, compare_to_baseline
+from services.troubleshooting.llm_usage import record_llm_call, track_llm_usage
+
+
+class FakeExpander:
+    def expand(self, query, timings=None):
+        timings["expansion"] = 0.001
+        timings["intent"] = 0.002
+        record_llm_call({"usage": {"prompt_tokens": 10, "completion_tokens": 2}}, 0.002)
+        return {"expanded": query, "intent": "STRUCTURED", "synonyms_used": []}
+
+
+class FakeGenerator:
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def generate(self, question, expanded_query=None, timings=None):
+        # Every worker must be inside generate at once, or the barrier times out
+        self.barrier.wait(timeout=5)
+        timings["llm"] = 0.05
+        record_llm_call({"usage": {"prompt_tokens": 100, "completion_tokens": 20}}, 0.05)
+        sql = "SELECT COUNT(*) FROM troubleshooting_issues" if "count" in question else "SELECT 1"
+        return {"sql": sql, "valid": True}
+
+    def execute(self, sql, limit=50):
+        time.sleep(0.01)
+        return {"rows": [[1]]}
+
+
+def _cases(n):
+    return [
+        {
+            "id": f"case_{i}",
+            "question": "count issues" if i % 2 == 0 else "list issues",
+            "category": "counting",
+            "expected_intent": "STRUCTURED",
+            "expected_sql_patterns": ["COUNT"],
+        }
+        for i in range(n)
+    ]
+
+
+def _run(workers, cases):
+    evaluator = Evaluator(workers=workers)
+    evaluator._init_components = lambda: None
+    evaluator.expander = FakeExpander()
+    evaluator.generator = FakeGenerator(threading.Barrier(workers))
+    return evaluator.evaluate(cases)
+
+
+def test_cases_run_concurrently_with_timings_and_llm_usage():
+    results = _run(4, _cases(8))
+
+    assert [d["id"] for d in results["details"]] == [f"case_{i}" for i in range(8)]
+    assert results["passed"] == 4 and results["failed"] == 4
+    assert results["workers"] == 4
+
+    detail = results["details"][0]
+    assert set(detail["timings"]) == {"expansion", "intent", "llm", "execution"}
+    assert detail["llm"]["calls"] == 2 and detail["llm"]["total_tokens"] == 132
+
+    assert results["timings"]["llm"]["p50"] == 0.05
+    assert results["timings"]["execution"]["count"] == 8
+    assert results["llm"]["calls"] == 16
+    assert results["llm"]["tokens_per_case"] == 132
+
+
+def test_llm_usage_is_only_recorded_inside_a_tracker():
+    record_llm_call({"usage": {"prompt_tokens": 5}}, 0.1)
+    with track_llm_usage() as usage:
+        record_llm_call(None, 0.1)
+    assert usage.calls == 1 and usage.total_tokens == 0
+
+
+def test_compare_to_baseline_flags_regressions_beyond_tolerance():
+    baseline = _run(2, _cases(4))
+    assert compare_to_baseline(baseline, baseline)["ok"]
+
+    slower = {
+        **baseline,
+        "passed": baseline["passed"] - 1,
+        "details": [{**d, "status": "FAIL"} for d in baseline["details"]],
+        "timings": {**baseline["timings"], "llm": {"p50": 0.5, "p95": 0.06}},
+        "llm": {**baseline["llm"], "tokens_per_case": 150},
+    }
+    comparison = compare_to_baseline(slower, baseline, tolerance=0.2)
+
+    assert not comparison["ok"]
+    assert comparison["newly_failing"] == ["case_0", "case_2"]
+    messages = " | ".join(comparison["regressions"])
+    assert "pass rate" in messages and "llm p50" in messages
+    # +10ms on a 50ms stage is within tolerance; +14% tokens is too
+    assert "llm p95" not in messages and "tokens/case" not in messages
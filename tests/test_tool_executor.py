@@ -0,0 +1,86 @@
+"""Tests for concurrent tool execution."""
+
+import asyncio
+import time
+
+from langchain_core.tools import tool
+
+from agents.react_node import execute_tool
+from agents.tool_executor import abandoned_tool_calls, execute_tool_calls
+from services.tool_results_context import BESTBOX_TOOL_RESULTS_SESSION_ID
+
+
+@tool
+def slow_lookup(query: str) -> str:
+    """Slow sync lookup."""
+    time.sleep(0.3)
+    return f"sync:{query}"
+
+
+@tool
+async def async_lookup(query: str) -> str:
+    """Async lookup."""
+    await asyncio.sleep(0.3)
+    return f"async:{query}"
+
+
+@tool
+def session_lookup(query: str) -> str:
+    """Return the request-scoped session id."""
+    return str(BESTBOX_TOOL_RESULTS_SESSION_ID.get())
+
+
+@tool
+def broken_lookup(query: str) -> str:
+    """Always fails."""
+    raise ValueError("boom")
+
+
+TOOLS = {t.name: t for t in [slow_lookup, async_lookup, session_lookup, broken_lookup]}
+
+
+def _call(name, i):
+    return {"name": name, "args": {"query": str(i)}, "id": f"call_{i}"}
+
+
+def test_tool_calls_run_concurrently_in_order():
+    calls = [_call("slow_lookup", 0), _call("async_lookup", 1), _call("slow_lookup", 2)]
+
+    start = time.perf_counter()
+    messages = execute_tool_calls(calls, TOOLS)
+    elapsed = time.perf_counter() - start
+
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert [m.content for m in messages] == ["sync:0", "async:1", "sync:2"]
+    assert elapsed < 0.8
+
+
+def test_tool_timeout_and_errors_become_error_messages():
+    calls = [_call("slow_lookup", 0), _call("broken_lookup", 1), _call("missing_tool", 2)]
+
+    messages = execute_tool_calls(calls, TOOLS, timeout=0.05)
+
+    assert all(m.status == "error" for m in messages)
+    assert "timed out" in messages[0].content
+    assert "boom" in messages[1].content
+    assert "not a valid tool" in messages[2].content
+
+    # The timed-out sync call keeps its thread until it returns
+    assert abandoned_tool_calls() == 1
+    time.sleep(0.4)
+    assert abandoned_tool_calls() == 0
+
+
+def test_react_tool_errors_are_not_wrapped_twice():
+    result = execute_tool("broken_lookup", {"query": "x"}, TOOLS)
+    assert result == "Error: ValueError('boom')\n Please fix your mistakes."
+
+
+def test_tool_calls_see_request_context():
+    token = BESTBOX_TOOL_RESULTS_SESSION_ID.set("session-42")
+    try:
+        messages = execute_tool_calls([_call("session_lookup", 0)], TOOLS)
+    finally:
+        BESTBOX_TOOL_RESULTS_SESSION_ID.reset(token)
+
+    assert messages[0].content == "session-42"
@@ -0,0 +1,82 @@
+"""Tests for concurrent per-page VLM mapping validation."""
+
+import asyncio
+
+import pytest
+
+from services.troubleshooting import validation_pipeline as pipeline_module
+from services.troubleshooting.page_renderer import PageRenderResult
+from services.troubleshooting.validation_pipeline import ValidationPipeline
+from services.troubleshooting.vlm_validator import PageValidationResult
+
+
+class FakeClient:
+    closed = 0
+
+    async def close(self):
+        FakeClient.closed += 1
+
+
+class FakeValidator:
+    enabled = True
+    in_flight = 0
+    peak = 0
+    clients = set()
+
+    def create_client(self):
+        return FakeClient()
+
+    async def validate_page(self, case_id, page_number, total_pages, page_image, rows, images, client=None):
+        FakeValidator.clients.add(id(client))
+        FakeValidator.in_flight += 1
+        FakeValidator.peak = max(FakeValidator.peak, FakeValidator.in_flight)
+        # Early pages are slowest, so completion order is reversed
+        await asyncio.sleep(0.01 * (total_pages - page_number + 1))
+        FakeValidator.in_flight -= 1
+        return PageValidationResult(page_number, [{
+            "image_id": f"img{page_number}",
+            "current_mapping": f"row{page_number}",
+            "validated_mapping": f"row{page_number}",
+            "status": "correct",
+            "confidence": 0.95,
+        }], 95.0)
+
+
+class FakeRenderer:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def render(self, excel_path, case_data):
+        pages = [self.output_dir / f"page_{n:02d}.png" for n in range(1, 7)]
+        context = {f"page_{n}": {"rows": [], "images": []} for n in range(1, 7)}
+        return PageRenderResult(self.output_dir / "case.pdf", pages, context, [])
+
+
+@pytest.mark.asyncio
+async def test_pages_are_validated_concurrently_and_merged_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_module, "VLMMappingValidator", FakeValidator)
+    monkeypatch.setattr(pipeline_module, "PageRenderer", FakeRenderer)
+    merged = []
+
+    class RecordingEngine:
+        def __init__(self, auto_correct_threshold):
+            pass
+
+        def apply_corrections(self, case_data, validations):
+            merged.extend(v["page_number"] for v in validations)
+            return {"auto_corrected": 0, "pending_review": 0, "corrections": []}
+
+    monkeypatch.setattr(pipeline_module, "CorrectionEngine", RecordingEngine)
+
+    pipeline = ValidationPipeline(tmp_path, concurrency=3)
+    case_data = await pipeline.validate_case(tmp_path / "case.xlsx", {"case_id": "TS-1", "issues": []})
+
+    assert FakeValidator.peak == 3
+    assert len(FakeValidator.clients) == 1 and FakeClient.closed == 1
+    assert merged == [1, 2, 3, 4, 5, 6]
+
+    summary = case_data["vlm_validation"]
+    assert summary["status"] == "completed" and summary["pages_processed"] == 6
+    assert [t["page_number"] for t in summary["page_timings"]] == [1, 2, 3, 4, 5, 6]
+    # Wall time is below the sum of the per-page times
+    assert summary["validation_seconds"] < sum(t["seconds"] for t in summary["page_timings"])
@@ -0,0 +1,112 @@
+"""Tests for voice agent memory profiling."""
+
+import asyncio
+import gc
+import tracemalloc
+
+import pytest
+
+from services import voice_memory
+from services.observability import voice_session_buffer_size
+from services.voice_memory import VoiceMemoryProfiler
+
+
+class Owner:
+    def __init__(self, n):
+        self.items = list(range(n))
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = VoiceMemoryProfiler(top_n=5)
+    monkeypatch.setattr(voice_memory, "_profiler", profiler)
+    was_tracing = tracemalloc.is_tracing()
+    yield profiler
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def _gauge(session, buffer):
+    for metric in voice_session_buffer_size.collect():
+        for sample in metric.samples:
+            if sample.labels == {"session": session, "buffer": buffer}:
+                return sample.value
+    return None
+
+
+def test_buffers_are_reported_per_session_until_their_owner_goes(profiler):
+    async def session(room, owners):
+        voice_memory.current_session.set(room)
+        for owner in owners:
+            voice_memory.track("items", owner, lambda o: len(o.items))
+
+    a1, a2, b = Owner(3), Owner(4), Owner(10)
+
+    async def both():
+        # Each session task gets its own copy of the context
+        await asyncio.gather(asyncio.create_task(session("room-a", [a1, a2])),
+                             asyncio.create_task(session("room-b", [b])))
+
+    asyncio.run(both())
+    assert profiler.buffer_sizes() == {"room-a": {"items": 7}, "room-b": {"items": 10}}
+
+    profiler.sample()
+    assert _gauge("room-b", "items") == 10
+
+    del b
+    gc.collect()
+    profiler.sample()
+    assert profiler.buffer_sizes() == {"room-a": {"items": 7}}
+    assert _gauge("room-b", "items") is None
+
+
+def test_diff_points_at_the_growing_allocation_site(profiler):
+    profiler.enable()
+    first = profiler.snapshot("before")
+    hoard = [bytes(1024) for _ in range(2000)]  # noqa: F841 - kept alive for the diff
+    profiler.snapshot()
+
+    diff = profiler.diff("before", "s1")
+    top = diff["top"][0]
+    assert first["id"] == "before" and diff["to"] == "s1"
+    assert top["site"].endswith(f"test_voice_memory.py:{test_diff_points_at_the_growing_allocation_site.__code__.co_firstlineno + 3}")
+    assert top["size_diff_kb"] > 2000 and top["count_diff"] >= 2000
+
+    # Default range is baseline -> now
+    assert profiler.diff()["from"] == "baseline"
+
+
+def test_debug_commands(profiler):
+    profiler.max_snapshots = 2
+    profiler.enable()
+
+    async def run(**message):
+        return await profiler.handle_command({"type": "memory_debug", **message})
+
+    async def commands():
+        results = [await run(command="snapshot") for _ in range(3)]
+        results.append(await run(command="diff", **{"from": "s1"}))
+        results.append(await run(command="diff", **{"from": "s2", "to": "s3", "limit": 1}))
+        results.append(await run(command="stats"))
+        results.append(await run(command="explode"))
+        return results
+
+    *snapshots, evicted, diff, stats, unknown = asyncio.run(commands())
+    assert snapshots[-1]["result"]["snapshots"] == ["baseline", "s2", "s3"]
+    assert evicted["error"].startswith("Unknown snapshot 's1'")
+    assert diff["type"] == "memory_debug_result" and len(diff["result"]["top"]) == 1
+    assert stats["result"]["rss_mb"] > 0 and stats["result"]["snapshots"] == ["baseline", "s2", "s3"]
+    assert unknown["error"] == "Unknown memory_debug command 'explode'"
+
+
+def test_local_speech_adapters_register_their_buffers(profiler):
+    livekit_local = pytest.importorskip("services.livekit_local")
+    from services.speech.asr import StreamingASR
+
+    voice_memory.current_session.set("room-c")
+    asr = StreamingASR()
+    stt = livekit_local.LocalSTT(asr_instance=asr)
+    asr.speech_buffer.extend([0] * 1600)
+
+    assert profiler.buffer_sizes()["room-c"] == {"asr_speech_buffer_samples": 1600, "asr_ring_buffer_samples": 0}
+    del stt
@@ -0,0 +1,139 @@
+"""Tests for the write-behind logger."""
+
+import json
+
+import pytest
+
+from services.agent_api import _write_conversations
+from services.session_store import _write_messages
+from services.write_behind import WriteBehindLog
+
+
+class FakeConn:
+    def __init__(self):
+        self.calls = []
+
+    async def executemany(self, query, args):
+        self.calls.append((" ".join(query.split()), list(args)))
+
+    def transaction(self):
+        return _Nothing()
+
+
+class _Nothing:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakePool:
+    def __init__(self, fail=False):
+        self.conn = FakeConn()
+        self.fail = fail
+
+    def acquire(self):
+        if self.fail:
+            raise ConnectionError("postgres down")
+        return _Acquire(self.conn)
+
+
+class _Acquire(_Nothing):
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+
+def _turn(session_id, agent_type, ts):
+    return {
+        "session_id": session_id, "user_id": "u1", "timestamp": ts, "user_message": "q",
+        "agent_response": "a", "agent_type": agent_type, "tool_calls": "[]",
+        "latency_ms": 10, "confidence": 0.9, "trace_id": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_batches_aggregate_session_counters(tmp_path):
+    pool = FakePool()
+    writer = WriteBehindLog(pool, "conversation_log", _write_conversations, flush_rows=3,
+                            flush_ms=60_000, spill_dir=str(tmp_path))
+    writer.start()
+    for i, (sid, agent) in enumerate([("s1", "erp"), ("s1", "crm"), ("s2", "erp"), ("s1", "erp")]):
+        await writer.submit(_turn(sid, agent, 100.0 + i))
+    await writer.close()
+
+    upserts = [args for query, args in pool.conn.calls if "INSERT INTO user_sessions" in query]
+    logged = [args for query, args in pool.conn.calls if "INSERT INTO conversation_log" in query]
+    assert sum(len(rows) for rows in logged) == 4
+    assert all(len(rows) <= 3 for rows in logged)
+    # One upsert row per session per batch, never one per turn
+    assert max(len(rows) for rows in upserts) == 2
+    first = {row[0]: row for row in upserts[0]}
+    assert first["s1"][2] == 2 and json.loads(first["s1"][4]) == {"erp": 1, "crm": 1}
+    assert first["s1"][3] == 101.0
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_spill_to_disk_and_replay(tmp_path):
+    pool = FakePool(fail=True)
+    writer = WriteBehindLog(pool, "session_messages", _write_messages, spill_dir=str(tmp_path))
+    writer.start()
+    for role in ("user", "assistant"):
+        await writer.submit({
+            "session_id": "s1", "role": role, "content": "hi", "reasoning_trace": None,
+            "tool_calls": None, "tokens_prompt": None, "tokens_completion": None,
+            "latency_ms": None, "created_at": 1.0,
+        })
+    await writer.close()
+    assert len(writer.spill_path.read_text().splitlines()) == 2
+    assert pool.conn.calls == []
+
+    pool.fail = False
+    await writer._replay()
+    assert not writer.spill_path.exists()
+    inserts, updates = pool.conn.calls
+    assert len(inserts[1]) == 2
+    assert updates[1] == [("s1", 2, 0, 0, 1.0)]
+
+
+class RejectingConn(FakeConn):
+    """Fails any executemany that contains a poison row, like a constraint violation."""
+
+    async def executemany(self, query, args):
+        args = list(args)
+        if any("poison" in row for row in args):
+            raise ValueError("insert or update violates foreign key constraint")
+        await super().executemany(query, args)
+
+
+async def _write_rows(conn, records):
+    await conn.executemany("INSERT INTO t VALUES ($1)", [(r["n"],) for r in records])
+
+
+@pytest.mark.asyncio
+async def test_poison_rows_are_isolated_and_dead_lettered(tmp_path, monkeypatch):
+    monkeypatch.setattr("services.write_behind.WRITE_BEHIND_MAX_ATTEMPTS", 2)
+    pool = FakePool()
+    pool.conn = RejectingConn()
+    writer = WriteBehindLog(pool, "rows", _write_rows, flush_rows=8, spill_dir=str(tmp_path))
+    for n in ["a", "b", "poison", "c", "d", "e"]:
+        writer._queue.put_nowait({"n": n})
+    await writer.flush()
+
+    written = [row[0] for _, rows in pool.conn.calls for row in rows]
+    assert sorted(written) == ["a", "b", "c", "d", "e"]
+    assert [json.loads(line) for line in writer.spill_path.read_text().splitlines()] == [
+        {"n": "poison", "_write_behind_attempts": 1}
+    ]
+
+    # Replay keeps failing the same row; it moves to the dead-letter file and stops blocking replay
+    writer._spill([{"n": "f"}])
+    await writer._replay()
+    assert not writer.spill_path.exists()
+    assert [json.loads(line) for line in writer.dead_letter_path.read_text().splitlines()] == [
+        {"n": "poison", "_write_behind_attempts": 2}
+    ]
+    assert [row[0] for _, rows in pool.conn.calls for row in rows][-1] == "f"
@@ -1,44 +1,38 @@
 """RAG tools for agent knowledge base access."""
 import logging
-import re
-import hashlib
+import os
 import requests
 from typing import Optional, List, Dict, Any
 from langchain_core.tools import tool
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, SparseVector
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    Fusion,
+    FusionQuery,
+    MatchValue,
+    Prefetch,
+    QueryRequest,
+    SparseVector,
+)
+
+from services.qdrant_clients import get_qdrant_client
+from services.qdrant_profiles import search_params
+from services.rag_pipeline.sparse_encoder import encode_query, sparse_vector_name
 
 logger = logging.getLogger(__name__)
 
 # Service URLs
-EMBEDDINGS_URL = "http://localhost:8081"
-RERANKER_URL = "http://localhost:8082"
-QDRANT_URL = "http://localhost:6333"
+EMBEDDINGS_URL = os.getenv("RAG_EMBEDDINGS_URL", "http://localhost:8081")
+RERANKER_URL = os.getenv("RAG_RERANKER_URL", "http://localhost:8082")
 COLLECTION_NAME = "bestbox_knowledge"
 
 # Request timeout
 TIMEOUT = 5
 
-# Sparse vector config
-SPARSE_VECTOR_SIZE = 65536
-
-
-def _tokenize(text: str) -> List[str]:
-    """Simple tokenizer for sparse vectors."""
-    return re.findall(r"[A-Za-z0-9_]+", text.lower())
-
-
-def _build_sparse_vector(text: str) -> SparseVector:
-    """Build a hashed sparse vector for hybrid search."""
-    term_counts: Dict[int, int] = {}
-    for token in _tokenize(text):
-        token_hash = hashlib.md5(token.encode("utf-8")).hexdigest()
-        idx = int(token_hash[:8], 16) % SPARSE_VECTOR_SIZE
-        term_counts[idx] = term_counts.get(idx, 0) + 1
-
-    indices = list(term_counts.keys())
-    values = [float(term_counts[i]) for i in indices]
-    return SparseVector(indices=indices, values=values)
+# Hybrid search: candidates fetched per branch before server-side fusion
+HYBRID_PREFETCH_LIMIT = 10
+# Skip reranking when this fraction of the dense top-k also ranks in the sparse top-k
+HYBRID_SKIP_RERANK_AGREEMENT = 0.6
 
 
 def _embed_query(query: str) -> Optional[List[float]]:
@@ -82,7 +76,7 @@ def _hybrid_search(
         List of search results with payload and score
     """
     try:
-        client = QdrantClient(url=QDRANT_URL)
+        client = get_qdrant_client()
 
         # Build filter if domain specified
         query_filter = None
@@ -101,6 +95,7 @@ def _hybrid_search(
             collection_name=COLLECTION_NAME,
             query=query_vector,
             query_filter=query_filter,
+            search_params=search_params(),
             limit=limit,
             with_payload=True,
         )
@@ -123,17 +118,39 @@ def _hybrid_search(
 
 def _hybrid_search_dense_sparse(
     query_vector: List[float],
-    query_sparse_vector: SparseVector,
+    query_sparse_vector: Optional[SparseVector],
     domain: Optional[str] = None,
     limit: int = 20,
     dense_weight: float = 0.7,
     sparse_weight: float = 0.3,
-) -> List[Dict[str, Any]]:
+    top_k: int = 5,
+) -> Dict[str, Any]:
     """
-    Perform dense + sparse hybrid search on Qdrant.
+    Perform dense + sparse hybrid search on Qdrant with server-side RRF fusion.
+
+    Dense and sparse candidates are prefetched and fused in one query; the
+    same round trip fetches each branch's own top_k to measure how far lexical
+    and semantic retrieval agree.
+
+    Args:
+        query_vector: Query embedding vector
+        query_sparse_vector: Query sparse vector (None for dense-only)
+        domain: Optional domain filter
+        limit: Maximum fused results to return
+        dense_weight: 0 disables the dense branch
+        sparse_weight: 0 disables the sparse branch
+        top_k: Depth at which branch agreement is measured
+
+    Returns:
+        {"results": [...], "agreement": fraction of dense top_k also in sparse top_k}
     """
+    use_dense = dense_weight > 0
+    use_sparse = sparse_weight > 0 and query_sparse_vector is not None
+    if not use_sparse:
+        return {"results": _hybrid_search(query_vector, domain=domain, limit=limit), "agreement": 0.0}
+
     try:
-        client = QdrantClient(url=QDRANT_URL)
+        client = get_qdrant_client()
 
         query_filter = None
         if domain:
@@ -146,29 +163,57 @@ def _hybrid_search_dense_sparse(
                 ]
             )
 
-        response = client.query_points(
-            collection_name=COLLECTION_NAME,
-            query_vector=("", query_vector),
-            query_sparse_vector=("text", query_sparse_vector),
-            score_weights={"": dense_weight, "text": sparse_weight},
-            query_filter=query_filter,
-            limit=limit,
-            with_payload=True,
+        prefetch_limit = max(HYBRID_PREFETCH_LIMIT, top_k)
+        dense = Prefetch(query=query_vector, filter=query_filter, params=search_params(), limit=prefetch_limit)
+        sparse = Prefetch(
+            query=query_sparse_vector,
+            using=sparse_vector_name(),
+            filter=query_filter,
+            limit=prefetch_limit,
         )
 
+        if not use_dense:
+            fused = QueryRequest(
+                query=query_sparse_vector, using=sparse_vector_name(),
+                filter=query_filter, limit=limit, with_payload=True,
+            )
+        else:
+            fused = QueryRequest(
+                prefetch=[dense, sparse],
+                query=FusionQuery(fusion=Fusion.RRF),
+                filter=query_filter,
+                limit=limit,
+                with_payload=True,
+            )
+        batch = [fused]
+        if use_dense:
+            batch += [
+                QueryRequest(query=query_vector, filter=query_filter, params=search_params(), limit=top_k),
+                QueryRequest(query=query_sparse_vector, using=sparse_vector_name(), filter=query_filter, limit=top_k),
+            ]
+
+        responses = client.query_batch_points(collection_name=COLLECTION_NAME, requests=batch)
+
         search_results = []
-        for point in response.points:
+        for point in responses[0].points:
             search_results.append({
                 "id": point.id,
                 "score": point.score,
                 "payload": point.payload,
             })
 
-        return search_results
+        agreement = 0.0
+        if use_dense:
+            dense_ids = [p.id for p in responses[1].points]
+            sparse_ids = {p.id for p in responses[2].points}
+            if dense_ids:
+                agreement = sum(1 for i in dense_ids if i in sparse_ids) / len(dense_ids)
+
+        return {"results": search_results, "agreement": agreement}
 
     except Exception as e:
         logger.warning(f"Hybrid dense+sparse search failed, falling back to dense-only: {e}")
-        return _hybrid_search(query_vector, domain=domain, limit=limit)
+        return {"results": _hybrid_search(query_vector, domain=domain, limit=limit), "agreement": 0.0}
 
 
 def _rerank_results(
@@ -334,19 +379,25 @@ def search_knowledge_base_hybrid(
             "Please ensure the embeddings service is running (scripts/start-embeddings.sh)."
         )
 
-    sparse_vector = _build_sparse_vector(query)
-    search_results = _hybrid_search_dense_sparse(
+    hybrid = _hybrid_search_dense_sparse(
         query_vector=query_vector,
-        query_sparse_vector=sparse_vector,
+        query_sparse_vector=encode_query(query),
         domain=domain,
-        limit=20,
+        limit=HYBRID_PREFETCH_LIMIT,
         dense_weight=dense_weight,
         sparse_weight=sparse_weight,
+        top_k=top_k,
     )
+    search_results = hybrid["results"]
 
     if not search_results:
         return "No relevant information found in the knowledge base."
 
+    if hybrid["agreement"] >= HYBRID_SKIP_RERANK_AGREEMENT:
+        # Lexical and semantic retrieval already agree; fused order stands
+        logger.info(f"Skipping rerank (lexical agreement {hybrid['agreement']:.2f})")
+        return _format_results(search_results[:top_k])
+
     passages = [result["payload"].get("text", "") for result in search_results]
     ranked_indices = _rerank_results(query, passages)
 
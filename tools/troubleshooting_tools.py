@@ -23,11 +23,18 @@ from typing import Optional, Literal, Any, Dict, List
 import json
 import logging
 import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from services.troubleshooting.searcher import TroubleshootingSearcher
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+from services.troubleshooting.image_index import (
+    IMAGE_EXTENSIONS,
+    TROUBLESHOOTING_IMAGE_INDEX,
+    TroubleshootingImageIndex,
+)
+from services.qdrant_clients import get_qdrant_client
+from qdrant_client.models import Filter, FieldCondition, MatchAny, MatchValue
 
 from tools.document_tools import analyze_document_realtime
 
@@ -422,7 +429,7 @@ def get_troubleshooting_case_details(case_id: str) -> str:
         logger.info(f"Fetching case details: {case_id}")
 
         # Connect to Qdrant
-        qdrant = QdrantClient(host="localhost", port=6333)
+        qdrant = get_qdrant_client()
 
         # Get case-level info
         case_results = qdrant.scroll(
@@ -513,110 +520,222 @@ def get_troubleshooting_case_details(case_id: str) -> str:
 
 
 
+# Visual similarity index and background VLM descriptions for find_similar_defects
+_image_index = None
+_description_executor: Optional[ThreadPoolExecutor] = None
+_pending_descriptions: Dict[str, Future] = {}
+_description_finished_at: Dict[str, float] = {}
+_descriptions_lock = threading.RLock()
+# Finished descriptions nobody came back for are dropped after this long
+DESCRIPTION_RESULT_TTL_SECONDS = 300
+
+
+def get_image_index() -> TroubleshootingImageIndex:
+    """Get or create the troubleshooting image index singleton."""
+    global _image_index
+    if _image_index is None:
+        _image_index = TroubleshootingImageIndex(get_qdrant_client())
+    return _image_index
+
+
+def _background_description(file_path: str) -> Dict[str, Any]:
+    """
+    VLM description of an image without waiting for it.
+
+    The first call starts the analysis in a background thread and reports it
+    as pending; a later call for the same file returns the finished result.
+    """
+    global _description_executor
+    key = str(Path(file_path).resolve())
+    with _descriptions_lock:
+        _evict_stale_descriptions()
+        future = _pending_descriptions.get(key)
+        if future is None:
+            if _description_executor is None:
+                _description_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="defect-vlm")
+            future = _description_executor.submit(analyze_document_realtime.invoke, {"file_path": file_path})
+            _pending_descriptions[key] = future
+            future.add_done_callback(lambda done: _mark_description_finished(key, done))
+        if not future.done():
+            return {"status": "pending", "message": "VLM description is running; call again with the same file to get it"}
+        del _pending_descriptions[key]
+        _description_finished_at.pop(key, None)
+
+    try:
+        vlm_result = json.loads(future.result())
+    except Exception as e:
+        return {"status": "failed", "message": str(e)}
+    if vlm_result.get("status") != "success":
+        return {"status": "failed", "message": vlm_result.get("message")}
+    analysis = vlm_result.get("analysis", {})
+    return {
+        "status": "success",
+        "summary": analysis.get("summary"),
+        "defect_types": [img.get("defect_type") for img in analysis.get("extracted_images", []) if img.get("defect_type")],
+        "confidence": analysis.get("confidence"),
+    }
+
+
+def _mark_description_finished(key: str, future: Future) -> None:
+    with _descriptions_lock:
+        if _pending_descriptions.get(key) is future:
+            _description_finished_at[key] = time.monotonic()
+
+
+def _evict_stale_descriptions() -> None:
+    """Drop finished descriptions older than DESCRIPTION_RESULT_TTL_SECONDS (caller holds the lock)."""
+    cutoff = time.monotonic() - DESCRIPTION_RESULT_TTL_SECONDS
+    for key, finished_at in list(_description_finished_at.items()):
+        if finished_at < cutoff:
+            _pending_descriptions.pop(key, None)
+            del _description_finished_at[key]
+
+
+def _fetch_issues(issue_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Issue payloads from troubleshooting_issues keyed by issue_id."""
+    points, _ = get_qdrant_client().scroll(
+        collection_name="troubleshooting_issues",
+        scroll_filter=Filter(must=[FieldCondition(key="issue_id", match=MatchAny(any=issue_ids))]),
+        limit=len(issue_ids),
+        with_payload=["issue_id", "issue_number", "problem", "solution"],
+        with_vectors=False,
+    )
+    return {p.payload["issue_id"]: p.payload for p in points}
+
+
+def _find_similar_by_image(file_path: str, top_k: int) -> Optional[Dict[str, Any]]:
+    """kNN over case image embeddings (None if the index has no match)."""
+    groups = get_image_index().search_file(Path(file_path), top_k=top_k)
+    if not groups:
+        return None
+    issues = _fetch_issues([g["issue_id"] for g in groups])
+
+    similar_cases = []
+    for group in groups:
+        issue = issues.get(group["issue_id"], {})
+        similar_cases.append({
+            "case_id": group["case_id"],
+            "issue_number": issue.get("issue_number", group["images"][0].get("issue_number")),
+            "problem": issue.get("problem", ""),
+            "solution": issue.get("solution", ""),
+            "relevance_score": group["score"],
+            "similarity_reason": "Visual Match",
+            "images": [
+                {
+                    "image_url": f"/api/troubleshooting/images/{img['image_id']}",
+                    "description": img.get("vl_description", ""),
+                    "defect_type": img.get("defect_type", ""),
+                }
+                for img in group["images"]
+            ],
+        })
+    return {"search_mode": "visual", "similar_cases": similar_cases}
+
+
+def _find_similar_by_description(file_path: str, top_k: int) -> Dict[str, Any]:
+    """VLM analysis of the file, then a text search with the description."""
+    vlm_json = analyze_document_realtime.invoke({"file_path": file_path})
+    vlm_result = json.loads(vlm_json)
+
+    if vlm_result.get("status") != "success":
+        return {
+            "error": "Failed to analyze image for similarity search",
+            "details": vlm_result.get("message")
+        }
+
+    analysis = vlm_result.get("analysis", {})
+
+    # Combine defect types, descriptions, insights, tags and summary into a rich semantic query
+    query_parts = []
+    for img in analysis.get("extracted_images", []):
+        if img.get("defect_type"):
+            query_parts.append(img["defect_type"])
+        if img.get("description"):
+            query_parts.append(img["description"])
+    if analysis.get("key_insights"):
+        query_parts.extend(analysis["key_insights"][:2])  # Top 2 insights
+    if analysis.get("tags"):
+        query_parts.extend(analysis["tags"][:3])  # Top 3 tags
+    if analysis.get("summary"):
+        query_parts.append(analysis["summary"][:200])  # Limit length
+
+    search_query = " ".join(query_parts)
+    logger.info(f"Generated search query: {search_query[:100]}...")
+
+    # We focus on ISSUE level to find specific defects
+    search_results = get_searcher().search(
+        query=search_query,
+        top_k=top_k,
+        classify=False  # Force vector search
+    )
+
+    response = {
+        "search_mode": "description",
+        "query_generated": search_query,
+        "visual_analysis": {
+            "summary": analysis.get("summary"),
+            "defect_types": [img.get("defect_type") for img in analysis.get("extracted_images", []) if img.get("defect_type")],
+            "confidence": analysis.get("confidence")
+        },
+        "similar_cases": []
+    }
+
+    for item in search_results["results"]:
+        if item["type"] == "issue":
+            response["similar_cases"].append({
+                "case_id": item["case_id"],
+                "issue_number": item["issue_number"],
+                "problem": item["problem"],
+                "solution": item["solution"],
+                "relevance_score": item["score"],
+                "similarity_reason": "Semantic Match",
+                "images": [
+                    {
+                        "image_url": f"/api/troubleshooting/images/{img['image_id']}",
+                        "description": img.get('vl_description', '')
+                    }
+                    for img in item.get('images', [])[:1]
+                ]
+            })
+
+    return response
+
+
 @tool
-def find_similar_defects(file_path: str) -> str:
+def find_similar_defects(file_path: str, top_k: int = 5, describe: bool = False) -> str:
     """
     通过上传的图像查找相似的缺陷案例。
     Find similar defect cases based on an uploaded image.
 
-    This tool:
-    1. Analyzes the visual content of the image (VLM).
-    2. Identifies defects, features, and anomalies.
-    3. Searches the knowledge base for cases with similar descriptions.
+    Images are matched visually against the embeddings of all case images,
+    which takes well under a second. Documents (PDF/Excel), or images when the
+    image index is unavailable, fall back to a VLM analysis (15-30s) followed
+    by a search with the generated description.
 
     Args:
         file_path: 图像文件路径 / Path to the image file (or document)
+        top_k: 返回结果数量 / Number of similar issues to return (default: 5)
+        describe: 生成图像描述 / Also start a VLM description of the image.
+            It runs in the background; call again with the same file to get it.
 
     Returns:
-        JSON string with visual analysis and found similar cases.
+        JSON string with found similar cases (and visual analysis, if any).
     """
     try:
         logger.info(f"Finding similar defects for: {file_path}")
 
-        # Step 1: Analyze Document/Image (VLM)
-        # We call the existing tool logic directly or via invoke if needed.
-        # Since we are inside python, we can just call the function wrapper if it wasn't a tool,
-        # but since it is a tool, let's look at how to call it.
-        # Ideally we refactor the logic out, but calling the tool function is fine if arguments match.
-        # Alternatively, use logic shared between them?
-        # Let's call analyze_document_realtime.
-        
-        # Note: analyze_document_realtime returns a JSON string.
-        vlm_json = analyze_document_realtime(file_path) # Call locally
-        vlm_result = json.loads(vlm_json)
-
-        if vlm_result.get("status") != "success":
-            return json.dumps({
-                "error": "Failed to analyze image for similarity search",
-                "details": vlm_result.get("message")
-            }, ensure_ascii=False)
-
-        analysis = vlm_result.get("analysis", {})
-        
-        # Step 2: Construct Search Query
-        # We combine defect type, summary, and tags to form a rich semantic query.
-        query_parts = []
-        
-        # Add defect types from extracted images
-        for img in analysis.get("extracted_images", []):
-            if img.get("defect_type"):
-                query_parts.append(img["defect_type"])
-            if img.get("description"):
-                query_parts.append(img["description"])
-
-        # Add key insights
-        if analysis.get("key_insights"):
-            query_parts.extend(analysis["key_insights"][:2]) # Top 2 insights
-
-        # Add tags
-        if analysis.get("tags"):
-            query_parts.extend(analysis["tags"][:3]) # Top 3 tags
-
-        # Add summary if short enough, otherwise rely on parts
-        if analysis.get("summary"):
-             query_parts.append(analysis["summary"][:200]) # Limit length
-
-        search_query = " ".join(query_parts)
-        logger.info(f"Generated search query: {search_query[:100]}...")
-
-        # Step 3: Search Knowledge Base
-        searcher = get_searcher()
-        # We focus on ISSUE level to find specific defects
-        search_results = searcher.search(
-            query=search_query,
-            top_k=5,
-            classify=False # Force vector search
-        )
-
-        # Step 4: Format Response
-        response = {
-            "query_generated": search_query,
-            "visual_analysis": {
-                "summary": analysis.get("summary"),
-                "defect_types": [img.get("defect_type") for img in analysis.get("extracted_images", []) if img.get("defect_type")],
-                "confidence": analysis.get("confidence")
-            },
-            "similar_cases": []
-        }
-
-        for item in search_results["results"]:
-            if item["type"] == "issue":
-                response["similar_cases"].append({
-                    "case_id": item["case_id"],
-                    "issue_number": item["issue_number"],
-                    "problem": item["problem"],
-                    "solution": item["solution"],
-                    "relevance_score": item["score"],
-                    "similarity_reason": "Visual & Semantic Match", # Placeholder
-                    "images": [
-                        {
-                            "image_url": f"/api/troubleshooting/images/{img['image_id']}",
-                            "description": img.get('vl_description', '')
-                        }
-                        for img in item.get('images', [])[:1]
-                    ]
-                })
-
+        if TROUBLESHOOTING_IMAGE_INDEX and Path(file_path).suffix.lower() in IMAGE_EXTENSIONS:
+            try:
+                response = _find_similar_by_image(file_path, top_k)
+            except Exception as e:
+                logger.warning(f"Visual similarity search failed, falling back to VLM: {e}")
+                response = None
+            if response is not None:
+                if describe:
+                    response["visual_analysis"] = _background_description(file_path)
+                return json.dumps(response, ensure_ascii=False, indent=2)
+
+        response = _find_similar_by_description(file_path, top_k)
         return json.dumps(response, ensure_ascii=False, indent=2)
 
     except Exception as e: